@@ -0,0 +1,50 @@
+"""Add rte_forecast_inputs table (hourly RTE forecast inputs)
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6g7h8
+Create Date: 2026-10-18 12:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e5f6a7b8c9"
+down_revision: Union[str, None] = "c3d4e5f6g7h8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def table_exists(table_name: str) -> bool:
+    """Vérifie si une table existe déjà dans la base de données."""
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    return table_name in inspector.get_table_names()
+
+
+def upgrade() -> None:
+    if table_exists("rte_forecast_inputs"):
+        return
+
+    op.create_table(
+        "rte_forecast_inputs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("source", sa.String(length=20), nullable=False),
+        sa.Column("forecast_type", sa.String(length=20), nullable=False),
+        sa.Column("hour", sa.DateTime(), nullable=False),
+        sa.Column("value", sa.Float(), nullable=False),
+        sa.Column("updated_date", sa.DateTime(), nullable=True),
+        sa.Column("fetched_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("source", "forecast_type", "hour", name="uq_rte_forecast_inputs"),
+    )
+    op.create_index("idx_rte_forecast_inputs_hour", "rte_forecast_inputs", ["hour"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("idx_rte_forecast_inputs_hour", table_name="rte_forecast_inputs")
+    op.drop_table("rte_forecast_inputs")
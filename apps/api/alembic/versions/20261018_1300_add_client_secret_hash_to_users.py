@@ -0,0 +1,61 @@
+"""Add client_secret_hash to users (indexed API key lookup)
+
+Ajoute une empreinte HMAC-SHA256 du client_secret (clé : API_KEY_PEPPER, ou SECRET_KEY par
+défaut) avec un index unique, pour authentifier une clé API sans parcourir tous les utilisateurs.
+Les utilisateurs existants sont complétés ici ; l'application recalcule au démarrage les
+empreintes manquantes ou calculées avec un autre pepper.
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-18 13:00:00
+"""
+
+import hashlib
+import hmac
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f6a7b8c9d0"
+down_revision: Union[str, None] = "d4e5f6a7b8c9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    """Vérifie si une colonne existe déjà dans la table."""
+    inspector = inspect(op.get_bind())
+    return column_name in [column["name"] for column in inspector.get_columns(table_name)]
+
+
+def upgrade() -> None:
+    if not column_exists("users", "client_secret_hash"):
+        with op.batch_alter_table("users") as batch_op:
+            batch_op.add_column(sa.Column("client_secret_hash", sa.String(length=64), nullable=True))
+
+    # Backfill (même calcul que src/utils/auth.hash_client_secret)
+    bind = op.get_bind()
+    pepper = (settings.API_KEY_PEPPER or settings.SECRET_KEY).encode("utf-8")
+    users = bind.execute(sa.text("SELECT id, client_secret FROM users WHERE client_secret_hash IS NULL")).fetchall()
+    for user_id, client_secret in users:
+        digest = hmac.new(pepper, client_secret.encode("utf-8"), hashlib.sha256).hexdigest()
+        bind.execute(
+            sa.text("UPDATE users SET client_secret_hash = :digest WHERE id = :id"),
+            {"digest": digest, "id": user_id},
+        )
+
+    indexes = [index["name"] for index in inspect(bind).get_indexes("users")]
+    if "ix_users_client_secret_hash" not in indexes:
+        op.create_index("ix_users_client_secret_hash", "users", ["client_secret_hash"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_client_secret_hash", table_name="users")
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("client_secret_hash")
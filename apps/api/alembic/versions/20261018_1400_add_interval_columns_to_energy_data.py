@@ -0,0 +1,133 @@
+"""Add interval_minutes and value_wh to consumption_data / production_data
+
+Les valeurs détaillées sont des puissances moyennes (W) sur l'intervalle de la mesure
+(raw_data.interval_length, ex. "PT30M"). La durée de l'intervalle et la valeur normalisée en Wh
+sont désormais calculées à l'ingestion (src/services/energy_values.py) ; les lignes existantes
+sont complétées ici avec le même calcul (30 minutes par défaut, valeur journalière déjà en Wh) :
+en SQL sur PostgreSQL, en Python par lots sur les autres bases (SQLite).
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-18 14:00:00
+"""
+
+import re
+from typing import Any, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f6a7b8c9d0e1"
+down_revision: Union[str, None] = "e5f6a7b8c9d0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ENERGY_TABLES = ("consumption_data", "production_data")
+
+# Lignes complétées par requête hors PostgreSQL
+BACKFILL_BATCH_SIZE = 1000
+
+DEFAULT_INTERVAL_MINUTES = 30
+_DURATION_PATTERN = re.compile(r"PT(\d+)([HM])")
+
+
+def column_exists(table_name: str, column_name: str) -> bool:
+    """Vérifie si une colonne existe déjà dans la table."""
+    inspector = inspect(op.get_bind())
+    return column_name in [column["name"] for column in inspector.get_columns(table_name)]
+
+
+def interval_minutes(raw_data: dict[str, Any] | None) -> int | None:
+    """Durée de l'intervalle d'une mesure détaillée (même calcul que src/services/energy_values.py)"""
+    if not raw_data or raw_data.get("interval_length") is None:
+        return DEFAULT_INTERVAL_MINUTES
+    match = _DURATION_PATTERN.match(str(raw_data["interval_length"]))
+    if not match:
+        return None
+    value = int(match.group(1))
+    return value * 60 if match.group(2) == "H" else value
+
+
+def backfill_postgresql(table_name: str) -> None:
+    # Durée de l'intervalle des données détaillées ("PT30M" -> 30, "PT1H" -> 60)
+    op.execute(f"""
+        UPDATE {table_name}
+        SET interval_minutes = CASE
+            WHEN raw_data IS NULL OR raw_data->>'interval_length' IS NULL THEN 30
+            WHEN raw_data->>'interval_length' ~ '^PT[0-9]+H'
+                THEN substring(raw_data->>'interval_length' from '^PT([0-9]+)H')::integer * 60
+            ELSE substring(raw_data->>'interval_length' from '^PT([0-9]+)M')::integer
+        END
+        WHERE granularity = 'detailed' AND value_wh IS NULL
+    """)
+
+    # Valeur en Wh : W * minutes / 60 pour le détaillé, valeur telle quelle sinon
+    op.execute(f"""
+        UPDATE {table_name}
+        SET value_wh = CASE
+            WHEN interval_minutes > 0 THEN value * interval_minutes / 60.0
+            ELSE value
+        END
+        WHERE value_wh IS NULL
+    """)
+
+
+def backfill_rows(table_name: str) -> None:
+    bind = op.get_bind()
+    table = sa.table(
+        table_name,
+        sa.column("id", sa.String),
+        sa.column("granularity", sa.String),
+        sa.column("value", sa.Integer),
+        sa.column("raw_data", sa.JSON),
+        sa.column("interval_minutes", sa.Integer),
+        sa.column("value_wh", sa.Float),
+    )
+    update = (
+        table.update()
+        .where(table.c.id == sa.bindparam("row_id"))
+        .values(interval_minutes=sa.bindparam("minutes"), value_wh=sa.bindparam("wh"))
+    )
+
+    # value est NOT NULL : chaque lot complété sort du filtre value_wh IS NULL
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, table.c.granularity, table.c.value, table.c.raw_data)
+            .where(table.c.value_wh.is_(None))
+            .limit(BACKFILL_BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+
+        params = []
+        for row_id, granularity, value, raw_data in rows:
+            minutes = interval_minutes(raw_data) if granularity == "detailed" else None
+            wh = value * minutes / 60 if minutes and minutes > 0 else float(value)
+            params.append({"row_id": row_id, "minutes": minutes, "wh": wh})
+        bind.execute(update, params)
+
+
+def upgrade() -> None:
+    is_postgresql = op.get_bind().dialect.name == "postgresql"
+
+    for table_name in ENERGY_TABLES:
+        with op.batch_alter_table(table_name) as batch_op:
+            if not column_exists(table_name, "interval_minutes"):
+                batch_op.add_column(sa.Column("interval_minutes", sa.Integer(), nullable=True))
+            if not column_exists(table_name, "value_wh"):
+                batch_op.add_column(sa.Column("value_wh", sa.Float(), nullable=True))
+
+        if is_postgresql:
+            backfill_postgresql(table_name)
+        else:
+            backfill_rows(table_name)
+
+
+def downgrade() -> None:
+    for table_name in ENERGY_TABLES:
+        with op.batch_alter_table(table_name) as batch_op:
+            batch_op.drop_column("value_wh")
+            batch_op.drop_column("interval_minutes")
@@ -0,0 +1,83 @@
+"""
+Replay the Tempo forecast algorithm on past seasons stored in the database
+
+Compares the historical colors (tempo_days) with the probabilities computed from the stored
+national consumption and generation data, and optionally sweeps the algorithm parameters.
+Requires NumPy (uv sync --extra backtest).
+
+Usage:
+    uv run python scripts/backtest_tempo.py --start 2024-09-01 --end 2025-08-31
+    uv run python scripts/backtest_tempo.py --start 2024-09-01 --end 2025-08-31 \\
+        --sweep normalization_offset=53000,55000,57000 --sweep red_steepness=0.8,1.2,1.6 --json sweep.json
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from dataclasses import fields
+from datetime import date
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.models.database import async_session_maker  # noqa: E402
+from src.services.tempo_backtest import BacktestParams, load_dataset, score, sweep  # noqa: E402
+
+PARAM_NAMES = [f.name for f in fields(BacktestParams)]
+
+
+def _parse_sweep(values: List[str]) -> Dict[str, List[float]]:
+    grid = {}
+    for value in values:
+        name, _, candidates = value.partition("=")
+        if name not in PARAM_NAMES:
+            raise SystemExit(f"Unknown parameter '{name}' (expected one of: {', '.join(PARAM_NAMES)})")
+        grid[name] = [float(candidate) for candidate in candidates.split(",")]
+    return grid
+
+
+async def run(start: date, end: date, grid: Dict[str, List[float]], top: int) -> List[dict]:
+    async with async_session_maker() as db:
+        dataset = await load_dataset(db, start, end)
+
+    if not len(dataset):
+        print(f"No day with both a Tempo color and stored consumption between {start} and {end}")
+        return []
+
+    begin = time.perf_counter()
+    results = sweep(dataset, grid) if grid else [score(dataset, BacktestParams())]
+    elapsed_ms = (time.perf_counter() - begin) * 1000
+    print(f"{len(results)} parameter set(s) evaluated on {len(dataset)} days in {elapsed_ms:.0f}ms\n")
+
+    print(f"{'accuracy':>9}{'brier':>8}{'blue':>7}{'white':>7}{'red':>7}  params")
+    for result in results[:top]:
+        swept = {name: getattr(result.params, name) for name in grid} if grid else "defaults"
+        recalls = [result.per_color[color]["recall"] for color in ("BLUE", "WHITE", "RED")]
+        print(f"{result.accuracy:>9}{result.brier:>8}" + "".join(f"{r:>7}" for r in recalls) + f"  {swept}")
+
+    return [result.to_dict() for result in results]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backtest the Tempo forecast algorithm")
+    parser.add_argument("--start", type=date.fromisoformat, required=True, help="First replayed day (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, required=True, help="Last replayed day (YYYY-MM-DD)")
+    parser.add_argument(
+        "--sweep", action="append", default=[], metavar="PARAM=V1,V2,...",
+        help=f"Candidate values of a parameter (repeatable): {', '.join(PARAM_NAMES)}",
+    )
+    parser.add_argument("--top", type=int, default=10, help="Number of results printed (best Brier score first)")
+    parser.add_argument("--json", type=Path, help="Also write all the results to this JSON file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.start, args.end, _parse_sweep(args.sweep), args.top))
+
+    if args.json and results:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark exporter history reads: full ORM rows vs narrow streamed columns
+
+Reads the whole detailed (else daily) consumption history of one PDL plus the Tempo colors, the
+way HomeAssistantExporter._get_consumption_statistics_by_tariff did before and does now:
+- orm: select(ConsumptionData).scalars().all() and every TempoDay ever stored
+- narrow: find_energy_history + stream_energy_rows (yield_per) + Tempo colors of the range
+
+Reports the median wall time and the peak RSS of each read, then the Python memory peak
+(tracemalloc) of one more traced read. Each read runs in its own subprocess so that the RSS
+peaks do not mix.
+Run it against a database holding a 2-year PDL, e.g. one written by benchmark_fixtures.py.
+
+Usage:
+    uv run python scripts/benchmark_exporter_reads.py --pdl 09990000000000 [--runs N] [--json results.json]
+"""
+import argparse
+import asyncio
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import select  # noqa: E402
+
+from src.models.client_mode import ConsumptionData, DataGranularity  # noqa: E402
+from src.models.database import async_session_maker  # noqa: E402
+from src.models.tempo_day import TempoDay  # noqa: E402
+from src.services.exporters.energy_reader import (  # noqa: E402
+    find_energy_history,
+    load_tempo_colors,
+    stream_energy_rows,
+)
+
+
+async def _read_orm(pdl: str) -> int:
+    """Former read: full ORM objects, detailed then daily, and the whole Tempo calendar"""
+    async with async_session_maker() as db:
+        rows = []
+        for granularity in (DataGranularity.DETAILED, DataGranularity.DAILY):
+            result = await db.execute(
+                select(ConsumptionData)
+                .where(ConsumptionData.usage_point_id == pdl)
+                .where(ConsumptionData.granularity == granularity)
+                .order_by(ConsumptionData.date, ConsumptionData.interval_start)
+            )
+            rows = result.scalars().all()
+            if rows:
+                break
+        tempo_result = await db.execute(select(TempoDay))
+        tempo_colors = {day.id: day.color for day in tempo_result.scalars().all()}
+        return len(rows) + len(tempo_colors)
+
+
+async def _read_narrow(pdl: str) -> int:
+    """Current read: needed columns only, streamed by batches, Tempo colors of the range"""
+    async with async_session_maker() as db:
+        history = await find_energy_history(db, ConsumptionData, pdl)
+        if history is None:
+            return 0
+        tempo_colors = await load_tempo_colors(db, history.first_date - timedelta(days=1), history.last_date)
+        count = 0
+        async for _row in stream_energy_rows(db, ConsumptionData, history):
+            count += 1
+        return count + len(tempo_colors)
+
+
+async def _measure(func: Callable[[], Awaitable[int]], runs: int) -> Dict[str, Any]:
+    """Median wall time and peak RSS of `runs` reads, then the Python peak of one traced read"""
+    durations = []
+    rows = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        rows = await func()
+        durations.append((time.perf_counter() - start) * 1000)
+    # ru_maxrss is in KiB on Linux; read it before tracemalloc adds its own allocations
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    tracemalloc.start()
+    await func()
+    peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return {
+        "rows": rows,
+        "total_ms": round(statistics.median(durations), 1),
+        "peak_mb": round(peak_mb, 2),
+        "peak_rss_mb": round(peak_rss_mb, 1),
+    }
+
+
+CASES: Dict[str, Callable[[str], Awaitable[int]]] = {"orm": _read_orm, "narrow": _read_narrow}
+
+
+async def run_case(case: str, pdl: str, runs: int) -> Dict[str, Any]:
+    """Measure one read in this process"""
+    read = CASES[case]
+    return {"case": case, **await _measure(lambda: read(pdl), runs)}
+
+
+def run(pdl: str, runs: int) -> List[Dict[str, Any]]:
+    """Measure every read, each in a fresh interpreter"""
+    results = []
+    for case in CASES:
+        output = subprocess.run(
+            [sys.executable, __file__, "--pdl", pdl, "--runs", str(runs), "--case", case],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        results.append(json.loads(output.splitlines()[-1]))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark exporter history reads")
+    parser.add_argument("--pdl", required=True, help="Usage point ID with a stored history")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per read (median is reported)")
+    parser.add_argument("--json", type=Path, help="Also write the results to this JSON file")
+    parser.add_argument("--case", choices=CASES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        # Subprocess of run(): print the measure as the last line
+        print(json.dumps(asyncio.run(run_case(args.case, args.pdl, args.runs))))
+        return
+
+    results = run(args.pdl, args.runs)
+
+    print(f"{'case':<10}{'rows':>10}{'total ms':>12}{'peak MB':>10}{'peak RSS MB':>14}")
+    for row in results:
+        print(f"{row['case']:<10}{row['rows']:>10}{row['total_ms']:>12}{row['peak_mb']:>10}{row['peak_rss_mb']:>14}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
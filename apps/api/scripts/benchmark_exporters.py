@@ -0,0 +1,271 @@
+"""
+Benchmark statistics, exporters and local data reads on the synthetic benchmark PDLs
+
+Run scripts/benchmark_fixtures.py first (with at least as many --pdls). Cases, each timed over
+--runs runs:
+- statistics: StatisticsService.get_all_annual_stats of every PDL, per direction
+- local_data: LocalDataService daily (3 years) and detailed (1 month, 2 years) reads
+- exporters: run_full_export of MQTT, Home Assistant (MQTT discovery) and VictoriaMetrics, and the
+  Home Assistant Energy Dashboard statistics build. MQTT clients are replaced by an in-process
+  stand-in accepting every publish (no broker); VictoriaMetrics writes go to a local HTTP
+  stand-in server answering 204.
+
+Prints a table and writes a JSON report (see benchmark_report.py) that can be compared with the
+report of a previous release.
+
+Usage:
+    uv run python scripts/benchmark_exporters.py [--pdls 3] [--runs 3] [--only statistics,exporters]
+        [--json results.json] [--baseline previous.json] [--threshold 20]
+"""
+import argparse
+import asyncio
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import func, select  # noqa: E402
+
+from benchmark_fixtures import BENCH_PDL_PREFIX, DAILY_YEARS  # noqa: E402
+from benchmark_report import add_report_arguments, build_report, finish_report, measure  # noqa: E402
+from src.models import PDL  # noqa: E402
+from src.models.client_mode import ConsumptionData, ProductionData  # noqa: E402
+from src.models.database import async_session_maker  # noqa: E402
+from src.services.exporters.base import BaseExporter, PublishCounter  # noqa: E402
+from src.services.exporters.executor import count_points  # noqa: E402
+from src.services.exporters.home_assistant import HomeAssistantExporter  # noqa: E402
+from src.services.exporters.mqtt import MQTTExporter  # noqa: E402
+from src.services.exporters.victoriametrics import VictoriaMetricsExporter  # noqa: E402
+from src.services.local_data import LocalDataService  # noqa: E402
+from src.services.statistics import StatisticsService  # noqa: E402
+
+GROUPS = ("statistics", "local_data", "exporters")
+
+Case = Tuple[str, str, Callable[[], Awaitable[Dict[str, int]]]]
+
+
+class StandInMQTTClient:
+    """Accepts publishes like aiomqtt.Client, without a broker"""
+
+    def __init__(self) -> None:
+        self.messages = 0
+
+    async def __aenter__(self) -> "StandInMQTTClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+    async def publish(self, topic: str, payload: Any = None, *args: Any, **kwargs: Any) -> None:
+        self.messages += 1
+
+
+def use_mqtt_stand_in(exporter: BaseExporter) -> None:
+    """Make an MQTT-based exporter publish to a StandInMQTTClient (bytes still counted)"""
+
+    async def get_client() -> PublishCounter:
+        return PublishCounter(StandInMQTTClient(), exporter)
+
+    exporter._get_mqtt_client = get_client  # type: ignore[attr-defined]
+
+
+class StandInHTTPServer:
+    """Local HTTP/1.1 server answering 204 No Content to every request (VictoriaMetrics /write stand-in)"""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.bytes_received = 0
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.decode("latin-1").split("\r\n")[1:]:
+                    name, _, value = line.partition(":")
+                    if name.strip().lower() == "content-length":
+                        length = int(value.strip())
+                if length:
+                    await reader.readexactly(length)
+                self.requests += 1
+                self.bytes_received += length
+                writer.write(b"HTTP/1.1 204 No Content\r\nContent-Length: 0\r\n\r\n")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def load_benchmark_pdls(count: int) -> List[Tuple[str, bool]]:
+    """(usage_point_id, has_production) of the first `count` benchmark PDLs"""
+    async with async_session_maker() as db:
+        result = await db.execute(
+            select(PDL.usage_point_id, PDL.has_production)
+            .where(PDL.usage_point_id.like(f"{BENCH_PDL_PREFIX}%"))
+            .order_by(PDL.usage_point_id)
+            .limit(count)
+        )
+        return [(row[0], row[1]) for row in result.all()]
+
+
+async def fixture_sizes(usage_point_ids: List[str]) -> Dict[str, int]:
+    """Stored rows of the benchmark PDLs, recorded in the report next to the timings"""
+    sizes = {}
+    async with async_session_maker() as db:
+        for name, model in (("consumption_rows", ConsumptionData), ("production_rows", ProductionData)):
+            result = await db.execute(select(func.count()).where(model.usage_point_id.in_(usage_point_ids)))
+            sizes[name] = result.scalar() or 0
+    return sizes
+
+
+def statistics_cases(pdls: List[Tuple[str, bool]]) -> List[Case]:
+    async def annual_stats(direction: str) -> Dict[str, int]:
+        count = 0
+        for pdl, has_production in pdls:
+            if direction == "production" and not has_production:
+                continue
+            async with async_session_maker() as db:
+                await StatisticsService(db).get_all_annual_stats(pdl, direction)
+            count += 1
+        return {"pdls": count}
+
+    return [
+        ("statistics", f"annual_stats.{direction}", lambda direction=direction: annual_stats(direction))
+        for direction in ("consumption", "production")
+    ]
+
+
+def local_data_cases(pdls: List[Tuple[str, bool]]) -> List[Case]:
+    today = date.today()
+    ranges = {
+        "daily_3y": (today - timedelta(days=DAILY_YEARS * 365), "daily"),
+        "detail_1m": (today - timedelta(days=30), "detail"),
+        "detail_2y": (today - timedelta(days=2 * 365), "detail"),
+    }
+
+    async def read(direction: str, start: date, kind: str) -> Dict[str, int]:
+        rows = 0
+        for pdl, has_production in pdls:
+            if direction == "production" and not has_production:
+                continue
+            async with async_session_maker() as db:
+                method = getattr(LocalDataService(db), f"get_{direction}_{kind}")
+                records, _missing = await method(pdl, start, today)
+            rows += len(records)
+        return {"rows": rows}
+
+    return [
+        ("local_data", f"{direction}_{name}", lambda direction=direction, start=start, kind=kind: read(direction, start, kind))
+        for direction in ("consumption", "production")
+        for name, (start, kind) in ranges.items()
+    ]
+
+
+def exporter_cases(pdls: List[Tuple[str, bool]], vm_url: str) -> List[Case]:
+    usage_point_ids = [pdl for pdl, _ in pdls]
+
+    async def full_export(make_exporter: Callable[[], BaseExporter]) -> Dict[str, int]:
+        exporter = make_exporter()
+        async with async_session_maker() as db:
+            results = await exporter.run_full_export(db, usage_point_ids)  # type: ignore[attr-defined]
+        return {"points": count_points(results), "bytes": exporter.bytes_sent, "errors": len(results.get("errors", []))}
+
+    def mqtt_exporter() -> BaseExporter:
+        exporter = MQTTExporter({"broker": "stand-in"})
+        use_mqtt_stand_in(exporter)
+        return exporter
+
+    def home_assistant_exporter() -> BaseExporter:
+        exporter = HomeAssistantExporter({"mqtt_broker": "stand-in"})
+        use_mqtt_stand_in(exporter)
+        return exporter
+
+    async def home_assistant_statistics() -> Dict[str, int]:
+        """Energy Dashboard statistics build (sent through the WebSocket API, not timed here)"""
+        exporter = HomeAssistantExporter({"mqtt_broker": "stand-in"})
+        points = 0
+        for pdl, has_production in pdls:
+            async with async_session_maker() as db:
+                by_tariff = await exporter._get_consumption_statistics_by_tariff(db, pdl)
+                points += sum(len(rows) for rows in by_tariff.values())
+                if has_production:
+                    points += len(await exporter._get_production_statistics(db, pdl))
+        return {"points": points}
+
+    return [
+        ("exporters", "mqtt.run_full_export", lambda: full_export(mqtt_exporter)),
+        ("exporters", "home_assistant.run_full_export", lambda: full_export(home_assistant_exporter)),
+        ("exporters", "home_assistant.statistics", home_assistant_statistics),
+        ("exporters", "victoriametrics.run_full_export", lambda: full_export(lambda: VictoriaMetricsExporter({"url": vm_url}))),
+    ]
+
+
+async def run(pdl_count: int, runs: int, groups: List[str], trace_memory: bool) -> Dict[str, Any]:
+    pdls = await load_benchmark_pdls(pdl_count)
+    if not pdls:
+        raise SystemExit("No benchmark PDL found: run scripts/benchmark_fixtures.py first")
+
+    http_stand_in = StandInHTTPServer()
+    vm_url = await http_stand_in.start()
+    try:
+        cases: List[Case] = []
+        if "statistics" in groups:
+            cases += statistics_cases(pdls)
+        if "local_data" in groups:
+            cases += local_data_cases(pdls)
+        if "exporters" in groups:
+            cases += exporter_cases(pdls, vm_url)
+
+        results = []
+        for group, name, case in cases:
+            print(f"  {group}.{name}...")
+            results.append({"group": group, "case": name, **await measure(case, runs, trace_memory)})
+    finally:
+        await http_stand_in.stop()
+
+    usage_point_ids = [pdl for pdl, _ in pdls]
+    context = {
+        "pdls": usage_point_ids,
+        "runs": runs,
+        "groups": groups,
+        "trace_memory": trace_memory,
+        "fixtures": await fixture_sizes(usage_point_ids),
+        "victoriametrics_stand_in": {"requests": http_stand_in.requests, "bytes": http_stand_in.bytes_received},
+    }
+    return build_report("exporters", results, context)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark statistics, exporters and local data reads")
+    parser.add_argument("--pdls", type=int, default=3, help="Benchmark PDLs to use")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per case (median is reported)")
+    parser.add_argument("--only", help=f"Comma-separated groups to run ({', '.join(GROUPS)})")
+    parser.add_argument("--no-memory", action="store_true", help="Do not trace memory (tracemalloc slows the runs down)")
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    groups = [group.strip() for group in args.only.split(",")] if args.only else list(GROUPS)
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"Unknown group(s): {', '.join(sorted(unknown))}")
+
+    report = asyncio.run(run(args.pdls, args.runs, groups, not args.no_memory))
+    sys.exit(finish_report(report, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,406 @@
+"""
+Generate synthetic client-mode PDLs for the benchmarks
+
+Writes into the database of DATABASE_URL: a dedicated local PostgreSQL database migrated with
+alembic, or a SQLite file (tables are created if missing). It writes:
+- a benchmark user and N PDLs (contract and off-peak hours), cycling through the demo profiles
+  of generate_demo_account.py and the BASE / HC/HP / TEMPO pricing options
+- 3 years of daily and 2 years of 30-minute consumption, plus production for solar profiles
+- the Tempo calendar and EcoWatt signals of the same period (days already stored are kept)
+
+Values are deterministic for a given --seed, PDL and day. Fixtures can be regenerated
+identically release after release, and served again by a fake gateway.
+
+Usage:
+    uv run python scripts/benchmark_fixtures.py [--pdls 3] [--seed 42] [--reset] [--json fixtures.json]
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, time, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from zoneinfo import ZoneInfo
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import delete, select  # noqa: E402
+from sqlalchemy.dialects.postgresql import insert as pg_insert  # noqa: E402
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+from generate_demo_account import (  # noqa: E402
+    PDLS as DEMO_PDLS,
+    generate_consumption_value,
+    generate_production_value,
+)
+from src.models import PDL, User  # noqa: E402
+from src.models.client_mode import (  # noqa: E402
+    AddressData,
+    ConsumptionData,
+    ContractData,
+    DataGranularity,
+    MaxPowerData,
+    ProductionData,
+    SyncStatus,
+)
+from src.models.database import async_session_maker, init_db  # noqa: E402
+from src.models.ecowatt import EcoWatt  # noqa: E402
+from src.models.tempo_day import TempoColor, TempoDay  # noqa: E402
+from src.services.energy_values import DEFAULT_INTERVAL_MINUTES, value_to_wh  # noqa: E402
+from src.utils.auth import generate_client_id, generate_client_secret, get_password_hash  # noqa: E402
+
+BENCH_EMAIL = "benchmark@myelectricaldata.local"
+BENCH_PASSWORD = "benchmark"
+# 14-character usage point IDs that no real meter uses
+BENCH_PDL_PREFIX = "0999"
+BENCH_SOURCE = "benchmark"
+DAILY_YEARS = 3
+DETAILED_YEARS = 2
+SLOTS_PER_DAY = 24 * 60 // DEFAULT_INTERVAL_MINUTES
+PRICING_OPTIONS = ("HC/HP", "BASE", "TEMPO")
+TEMPO_RED_DAYS = 22
+TEMPO_WHITE_DAYS = 43
+# asyncpg and SQLite accept at most 32767 / 32766 bind parameters per statement (~11 per energy row)
+INSERT_CHUNK_SIZE = 2000
+PARIS = ZoneInfo("Europe/Paris")
+
+
+@dataclass(frozen=True)
+class SyntheticPDL:
+    """A benchmark PDL and the demo profiles its values are drawn from"""
+
+    usage_point_id: str
+    name: str
+    subscribed_power: int
+    pricing_option: str
+    offpeak_hours: Dict[str, str]
+    consumption_profile: str
+    production_profile: Optional[str]
+
+    @property
+    def has_production(self) -> bool:
+        return self.production_profile is not None
+
+
+def benchmark_pdls(count: int) -> List[SyntheticPDL]:
+    """The first `count` benchmark PDLs (always the same ones for a given index)"""
+    pdls = []
+    for index in range(count):
+        profile = DEMO_PDLS[index % len(DEMO_PDLS)]
+        pdls.append(SyntheticPDL(
+            usage_point_id=f"{BENCH_PDL_PREFIX}{index:010d}",
+            name=f"Benchmark {index + 1} - {profile['name']}",
+            subscribed_power=profile["subscribed_power"],
+            pricing_option=PRICING_OPTIONS[index % len(PRICING_OPTIONS)],
+            offpeak_hours=profile["offpeak_hours"],
+            consumption_profile=profile["consumption_profile"],
+            production_profile=profile.get("production_profile") if profile["has_production"] else None,
+        ))
+    return pdls
+
+
+def date_range(start: date, end: date) -> Iterator[date]:
+    """Days from start (included) to end (excluded)"""
+    day = start
+    while day < end:
+        yield day
+        day += timedelta(days=1)
+
+
+def daily_wh(pdl: SyntheticPDL, day: date, direction: str, seed: int) -> int:
+    """Energy (Wh) of one day, from the demo account generator seeded by (seed, PDL, direction, day)"""
+    # The demo generators draw from the module-level random: seed it for reproducible values
+    random.seed(f"{seed}:{pdl.usage_point_id}:{direction}:{day.isoformat()}")
+    if direction == "production":
+        kwh = generate_production_value(day, pdl.production_profile or "")
+    else:
+        kwh = generate_consumption_value(day, pdl.consumption_profile)
+    return int(round(kwh * 1000))
+
+
+def _consumption_weights(rng: random.Random) -> List[float]:
+    """Household shape: night base, morning and evening peaks, water heater in off-peak hours"""
+    weights = []
+    for slot in range(SLOTS_PER_DAY):
+        hour = slot * DEFAULT_INTERVAL_MINUTES / 60
+        weight = 0.5
+        if 6.5 <= hour < 9:
+            weight += 0.8
+        if 18 <= hour < 22.5:
+            weight += 1.2
+        if hour >= 22.5 or hour < 2:
+            weight += 0.6
+        weights.append(weight * rng.uniform(0.85, 1.15))
+    return weights
+
+
+def _production_weights(day: date, rng: random.Random) -> List[float]:
+    """Solar bell between sunrise and sunset, longer days in summer"""
+    day_length = 12 + 4 * math.cos(2 * math.pi * (day.timetuple().tm_yday - 172) / 365)
+    sunrise = 13.5 - day_length / 2
+    weights = []
+    for slot in range(SLOTS_PER_DAY):
+        hour = (slot + 0.5) * DEFAULT_INTERVAL_MINUTES / 60
+        position = (hour - sunrise) / day_length
+        weight = math.sin(math.pi * position) if 0 < position < 1 else 0.0
+        weights.append(weight * rng.uniform(0.7, 1.0))
+    return weights
+
+
+def load_curve_w(pdl: SyntheticPDL, day: date, direction: str, seed: int) -> List[int]:
+    """Average power (W) of every 30-minute slot of a day, adding up to the daily energy"""
+    total_wh = daily_wh(pdl, day, direction, seed)
+    rng = random.Random(f"{seed}:{pdl.usage_point_id}:{direction}:{day.isoformat()}:curve")
+    weights = _production_weights(day, rng) if direction == "production" else _consumption_weights(rng)
+    total_weight = sum(weights) or 1.0
+    to_w = 60 / DEFAULT_INTERVAL_MINUTES
+    return [int(round(total_wh * weight / total_weight * to_w)) for weight in weights]
+
+
+def daily_readings(pdl: SyntheticPDL, start: date, end: date, direction: str, seed: int) -> List[Dict[str, Any]]:
+    """Enedis-style daily readings ({"date", "value"} in Wh) from start to end (excluded)"""
+    return [
+        {"date": day.isoformat(), "value": str(daily_wh(pdl, day, direction, seed))}
+        for day in date_range(start, end)
+    ]
+
+
+def load_curve_readings(pdl: SyntheticPDL, start: date, end: date, direction: str, seed: int) -> List[Dict[str, Any]]:
+    """Enedis-style load curve readings (average W per 30 minutes, timestamped at the slot start)"""
+    readings = []
+    for day in date_range(start, end):
+        for slot, value in enumerate(load_curve_w(pdl, day, direction, seed)):
+            minutes = slot * DEFAULT_INTERVAL_MINUTES
+            readings.append({
+                "date": f"{day.isoformat()} {minutes // 60:02d}:{minutes % 60:02d}:00",
+                "value": str(value),
+                "interval_length": f"PT{DEFAULT_INTERVAL_MINUTES}M",
+                "measure_type": "B",
+            })
+    return readings
+
+
+def max_power_readings(pdl: SyntheticPDL, start: date, end: date, seed: int) -> List[Dict[str, Any]]:
+    """Enedis-style daily max power readings (VA), at the peak slot of the consumption curve"""
+    readings = []
+    for day in date_range(start, end):
+        curve = load_curve_w(pdl, day, "consumption", seed)
+        peak_slot = max(range(len(curve)), key=curve.__getitem__)
+        minutes = peak_slot * DEFAULT_INTERVAL_MINUTES
+        readings.append({
+            "date": f"{day.isoformat()} {minutes // 60:02d}:{minutes % 60:02d}:00",
+            "value": str(curve[peak_slot]),
+        })
+    return readings
+
+
+def tempo_calendar(start: date, end: date, seed: int) -> Dict[date, TempoColor]:
+    """Tempo colors from start to end (excluded): 22 red and 43 white days per season (Sep-Aug)"""
+    colors: Dict[date, TempoColor] = {}
+    season_year = start.year if start.month >= 9 else start.year - 1
+    while date(season_year, 9, 1) < end:
+        rng = random.Random(f"{seed}:tempo:{season_year}")
+        season = list(date_range(date(season_year, 9, 1), date(season_year + 1, 9, 1)))
+        # Red days: weekdays from November to March; white days: any day but Sunday, October to May
+        red_candidates = [d for d in season if d.month in (11, 12, 1, 2, 3) and d.weekday() < 5]
+        red = set(rng.sample(red_candidates, TEMPO_RED_DAYS))
+        white_candidates = [d for d in season if d.month not in (6, 7, 8, 9) and d.weekday() < 6 and d not in red]
+        white = set(rng.sample(white_candidates, TEMPO_WHITE_DAYS))
+        for day in season:
+            if start <= day < end:
+                colors[day] = TempoColor.RED if day in red else TempoColor.WHITE if day in white else TempoColor.BLUE
+        season_year += 1
+    return colors
+
+
+def ecowatt_signal(day: date, seed: int) -> Dict[str, Any]:
+    """EcoWatt signal of a day, stored the way RTEService does (periode = Paris midnight in naive UTC)"""
+    rng = random.Random(f"{seed}:ecowatt:{day.isoformat()}")
+    values = [1] * 24
+    if day.month in (12, 1, 2) and rng.random() < 0.1:
+        level = 3 if rng.random() < 0.2 else 2
+        for hour in (8, 9, 10, 18, 19, 20):
+            values[hour] = level
+    periode = datetime.combine(day, time.min, tzinfo=PARIS).astimezone(UTC).replace(tzinfo=None)
+    return {
+        "generation_datetime": periode - timedelta(hours=12),
+        "periode": periode,
+        "hdebut": 0,
+        "hfin": 23,
+        "pas": 60,
+        "dvalue": max(values),
+        "message": "",
+        "values": values,
+    }
+
+
+def _energy_records(pdl: SyntheticPDL, start: date, end: date, direction: str, seed: int) -> Dict[DataGranularity, List[Dict[str, Any]]]:
+    """Rows of consumption_data / production_data, as SyncService stores them"""
+    records: Dict[DataGranularity, List[Dict[str, Any]]] = {DataGranularity.DAILY: [], DataGranularity.DETAILED: []}
+    detailed_start = max(start, end - timedelta(days=DETAILED_YEARS * 365))
+
+    for reading in daily_readings(pdl, start, end, direction, seed):
+        value = int(reading["value"])
+        records[DataGranularity.DAILY].append({
+            "usage_point_id": pdl.usage_point_id,
+            "date": date.fromisoformat(reading["date"]),
+            "granularity": DataGranularity.DAILY,
+            "interval_start": None,
+            "value": value,
+            "interval_minutes": None,
+            "value_wh": value_to_wh(value, None),
+            "source": BENCH_SOURCE,
+            "raw_data": reading,
+        })
+
+    for reading in load_curve_readings(pdl, detailed_start, end, direction, seed):
+        value = int(reading["value"])
+        day_str, time_str = reading["date"].split(" ")
+        records[DataGranularity.DETAILED].append({
+            "usage_point_id": pdl.usage_point_id,
+            "date": date.fromisoformat(day_str),
+            "granularity": DataGranularity.DETAILED,
+            "interval_start": time_str[:5],
+            "value": value,
+            "interval_minutes": DEFAULT_INTERVAL_MINUTES,
+            "value_wh": value_to_wh(value, DEFAULT_INTERVAL_MINUTES),
+            "source": BENCH_SOURCE,
+            "raw_data": reading,
+        })
+    return records
+
+
+def _insert(db: AsyncSession, model: Any) -> Any:
+    """INSERT of the session's dialect (both support ON CONFLICT DO NOTHING)"""
+    return sqlite_insert(model) if db.bind.dialect.name == "sqlite" else pg_insert(model)
+
+
+async def _insert_missing(db: AsyncSession, model: Any, rows: List[Dict[str, Any]]) -> None:
+    """Insert rows by chunks, keeping the ones already stored"""
+    for i in range(0, len(rows), INSERT_CHUNK_SIZE):
+        await db.execute(_insert(db, model).values(rows[i:i + INSERT_CHUNK_SIZE]).on_conflict_do_nothing())
+
+
+async def reset_fixtures() -> None:
+    """Delete the benchmark user, its PDLs and all their synced data (Tempo / EcoWatt are kept)"""
+    pattern = f"{BENCH_PDL_PREFIX}%"
+    async with async_session_maker() as db:
+        for model in (ConsumptionData, ProductionData, MaxPowerData, ContractData, AddressData, SyncStatus, PDL):
+            await db.execute(delete(model).where(model.usage_point_id.like(pattern)))
+        await db.execute(delete(User).where(User.email == BENCH_EMAIL))
+        await db.commit()
+
+
+async def get_or_create_benchmark_user(db: AsyncSession) -> User:
+    result = await db.execute(select(User).where(User.email == BENCH_EMAIL))
+    user = result.scalar_one_or_none()
+    if user is None:
+        user = User(
+            email=BENCH_EMAIL,
+            hashed_password=get_password_hash(BENCH_PASSWORD),
+            client_id=generate_client_id(),
+            client_secret=generate_client_secret(),
+            is_active=True,
+            email_verified=True,
+        )
+        db.add(user)
+        await db.flush()
+    return user
+
+
+async def _create_pdl(db: AsyncSession, user: User, pdl: SyntheticPDL, oldest: date) -> None:
+    result = await db.execute(select(PDL.id).where(PDL.usage_point_id == pdl.usage_point_id))
+    if result.scalar_one_or_none() is None:
+        db.add(PDL(
+            usage_point_id=pdl.usage_point_id,
+            user_id=user.id,
+            name=pdl.name,
+            subscribed_power=pdl.subscribed_power,
+            pricing_option=pdl.pricing_option,
+            offpeak_hours=pdl.offpeak_hours,
+            has_consumption=True,
+            has_production=pdl.has_production,
+            is_active=True,
+            oldest_available_data_date=oldest,
+            activation_date=oldest,
+        ))
+    await db.execute(
+        _insert(db, ContractData).values(
+            usage_point_id=pdl.usage_point_id,
+            subscribed_power=pdl.subscribed_power,
+            pricing_option=pdl.pricing_option,
+            offpeak_hours=pdl.offpeak_hours,
+        ).on_conflict_do_nothing()
+    )
+
+
+async def generate_fixtures(pdl_count: int, seed: int, end: Optional[date] = None) -> Dict[str, Any]:
+    """Write the benchmark PDLs with their history up to `end` (excluded, default: today)"""
+    end = end or date.today()
+    start = end - timedelta(days=DAILY_YEARS * 365)
+    pdls = benchmark_pdls(pdl_count)
+    summary: Dict[str, Any] = {"seed": seed, "start": start.isoformat(), "end": end.isoformat(), "pdls": {}}
+
+    async with async_session_maker() as db:
+        user = await get_or_create_benchmark_user(db)
+        for pdl in pdls:
+            await _create_pdl(db, user, pdl, start)
+        await db.commit()
+
+        tempo_rows = [
+            {"id": day.isoformat(), "date": datetime.combine(day, time.min, tzinfo=PARIS), "color": color}
+            for day, color in tempo_calendar(start, end + timedelta(days=2), seed).items()
+        ]
+        await _insert_missing(db, TempoDay, tempo_rows)
+        # RTE publishes EcoWatt up to three days ahead
+        await _insert_missing(db, EcoWatt, [ecowatt_signal(day, seed) for day in date_range(start, end + timedelta(days=4))])
+        await db.commit()
+        summary["tempo_days"] = len(tempo_rows)
+
+    for pdl in pdls:
+        counts: Dict[str, int] = {}
+        directions = [("consumption", ConsumptionData)]
+        if pdl.has_production:
+            directions.append(("production", ProductionData))
+        for direction, model in directions:
+            records = _energy_records(pdl, start, end, direction, seed)
+            async with async_session_maker() as db:
+                for granularity, rows in records.items():
+                    await _insert_missing(db, model, rows)
+                    counts[f"{direction}_{granularity.value}"] = len(rows)
+                await db.commit()
+        summary["pdls"][pdl.usage_point_id] = {"pricing_option": pdl.pricing_option, **counts}
+        print(f"  {pdl.usage_point_id} ({pdl.pricing_option}): {counts}")
+
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic PDLs for the benchmarks")
+    parser.add_argument("--pdls", type=int, default=3, help="Number of benchmark PDLs")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the synthetic values")
+    parser.add_argument("--reset", action="store_true", help="Delete the benchmark PDLs and their data first")
+    parser.add_argument("--json", type=Path, help="Also write the fixture summary to this JSON file")
+    args = parser.parse_args()
+
+    async def run() -> Dict[str, Any]:
+        await init_db()
+        if args.reset:
+            await reset_fixtures()
+        return await generate_fixtures(args.pdls, args.seed)
+
+    summary = asyncio.run(run())
+    print(f"{len(summary['pdls'])} PDLs and {summary['tempo_days']} Tempo days from {summary['start']} to {summary['end']}")
+
+    if args.json:
+        args.json.write_text(json.dumps(summary, indent=2))
+        print(f"Summary written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
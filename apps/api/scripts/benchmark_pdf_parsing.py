@@ -0,0 +1,178 @@
+"""
+Benchmark tariff PDF parsing on stored fixture PDFs
+
+Fixtures are the provider tariff sheets, saved as <provider>[_<variant>].pdf in the fixtures
+directory (default: tests/fixtures/price_pdfs), e.g. edf.pdf, edf_zen.pdf, alpiq_stable.pdf.
+They are not committed (provider documents): download them from the URLs of the scrapers.
+Without fixtures (or with --synthetic), generated tariff-like documents of 2 to 40 pages are
+benchmarked instead: they measure text extraction only, no scraper parses them.
+
+Usage:
+    uv run python scripts/benchmark_pdf_parsing.py [fixtures_dir] [--synthetic] [--runs N] [--json results.json]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pdfminer.high_level import extract_text  # noqa: E402
+
+from src.services.price_scrapers import (  # noqa: E402
+    AlpiqScraper,
+    AlternaScraper,
+    EDFPriceScraper,
+    EnercoopPriceScraper,
+    MintEnergieScraper,
+    PrimeoEnergiePriceScraper,
+    TotalEnergiesPriceScraper,
+    VattenfallScraper,
+)
+from src.services.cpu_executor import cpu_executor  # noqa: E402
+from src.services.price_scrapers.base import extract_pdf_text, extract_pdf_text_parallel  # noqa: E402
+from tests.conftest import make_pdf  # noqa: E402
+
+
+DEFAULT_FIXTURES_DIR = Path(__file__).resolve().parents[1] / "tests" / "fixtures" / "price_pdfs"
+
+
+def _pdfminer_text(content: bytes) -> str:
+    return extract_text(BytesIO(content))
+
+
+# Fixture name (file stem) -> (text extraction, full parse as run by the scraper)
+PARSERS: Dict[str, tuple[Callable[[bytes], str], Callable[[bytes], List[Any]]]] = {
+    "edf": (extract_pdf_text, lambda content: EDFPriceScraper()._parse_pdf(content)),
+    "edf_zen": (extract_pdf_text, lambda content: EDFPriceScraper()._parse_zen_weekend_pdf(content)),
+    "totalenergies": (extract_pdf_text, lambda content: TotalEnergiesPriceScraper()._parse_pdf(content, 0)),
+    "totalenergies_verte_fixe": (extract_pdf_text, lambda content: TotalEnergiesPriceScraper()._parse_pdf(content, 1)),
+    "alpiq": (extract_pdf_text, lambda content: AlpiqScraper()._parse_general_pdf(content)),
+    "alpiq_stable": (extract_pdf_text, lambda content: AlpiqScraper()._parse_stable_21_pdf(content)),
+    "mint": (
+        lambda content: extract_pdf_text(content, max_pages=1),
+        lambda content: MintEnergieScraper()._parse_pdf(content, "ONLINE_GREEN", ""),
+    ),
+    "enercoop": (_pdfminer_text, lambda content: EnercoopPriceScraper()._parse_pdf(_pdfminer_text(content))),
+    "primeo": (_pdfminer_text, lambda content: PrimeoEnergiePriceScraper()._parse_pdf(_pdfminer_text(content))),
+    "vattenfall": (_pdfminer_text, lambda content: VattenfallScraper()._parse_pdf(_pdfminer_text(content))),
+    "alterna": (_pdfminer_text, lambda content: AlternaScraper()._parse_pdf(_pdfminer_text(content), "Alterna")),
+}
+
+
+# Page counts of the generated documents
+SYNTHETIC_PAGES = (2, 10, 40)
+
+
+def _synthetic_documents() -> List[tuple[str, bytes, Optional[tuple]]]:
+    """Tariff-like documents: a table of prices per subscribed power on every page"""
+    documents = []
+    for page_count in SYNTHETIC_PAGES:
+        pages = [
+            [f"Option {page} - Prix TTC"]
+            + [f"{kva} kVA {10 + kva * 1.3:.2f} {0.18 + kva / 1000:.4f} {0.14 + kva / 1000:.4f}" for kva in range(3, 37, 3)] * 4
+            for page in range(page_count)
+        ]
+        documents.append((f"synthetic_{page_count}p.pdf", make_pdf(pages), None))
+    return documents
+
+
+def _fixture_documents(fixtures_dir: Path) -> List[tuple[str, bytes, Optional[tuple]]]:
+    documents = []
+    for path in sorted(fixtures_dir.glob("*.pdf")):
+        if path.stem not in PARSERS:
+            print(f"[SKIP] {path.name}: no parser registered for '{path.stem}'")
+            continue
+        documents.append((path.name, path.read_bytes(), PARSERS[path.stem]))
+    return documents
+
+
+def _timed(func: Callable[[], Any], runs: int) -> tuple[float, Any]:
+    """Median duration (ms) over `runs` calls, and the last result"""
+    durations = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations), result
+
+
+async def _timed_async(func: Callable[[], Any], runs: int) -> float:
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+
+async def benchmark(documents: List[tuple[str, bytes, Optional[tuple]]], runs: int) -> List[Dict[str, Any]]:
+    results = []
+    for name, content, parsers in documents:
+        extract, parse = parsers or (extract_pdf_text, None)
+
+        extract_ms, _ = _timed(lambda: extract(content), runs)
+        # min_pages=0 forces page-level parallelism, to compare it with the single worker path
+        parallel_ms = await _timed_async(lambda: extract_pdf_text_parallel(content, min_pages=0), runs)
+        single_worker_ms = await _timed_async(lambda: extract_pdf_text_parallel(content, min_pages=sys.maxsize), runs)
+        parse_ms, offers = _timed(lambda: parse(content), runs) if parse else (None, None)
+
+        results.append({
+            "fixture": name,
+            "size_kb": round(len(content) / 1024, 1),
+            "extract_ms": round(extract_ms, 1),
+            "pool_single_ms": round(single_worker_ms, 1),
+            "pool_parallel_ms": round(parallel_ms, 1),
+            "parse_ms": round(parse_ms, 1) if parse_ms is not None else None,
+            "offers": len(offers or []) if parse else None,
+        })
+    return results
+
+
+def _cell(value: Any) -> str:
+    return "-" if value is None else str(value)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark tariff PDF parsing")
+    parser.add_argument("fixtures_dir", nargs="?", type=Path, default=DEFAULT_FIXTURES_DIR)
+    parser.add_argument("--synthetic", action="store_true", help="Benchmark generated documents, not the fixtures")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measure (median is reported)")
+    parser.add_argument("--json", type=Path, help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    documents = [] if args.synthetic or not args.fixtures_dir.is_dir() else _fixture_documents(args.fixtures_dir)
+    if not documents:
+        print(f"[SYNTHETIC] No fixtures used from {args.fixtures_dir}: benchmarking generated documents")
+        documents = _synthetic_documents()
+
+    async def run() -> List[Dict[str, Any]]:
+        # Warm the pool first so that worker startup is not counted in the pool extraction times
+        await cpu_executor.start()
+        try:
+            return await benchmark(documents, args.runs)
+        finally:
+            await cpu_executor.shutdown()
+
+    results = asyncio.run(run())
+
+    print(f"{'fixture':<32}{'KB':>8}{'extract':>10}{'pool 1':>10}{'pool N':>10}{'parse':>10}{'offers':>8}")
+    for row in results:
+        print(
+            f"{row['fixture']:<32}{row['size_kb']:>8}{row['extract_ms']:>10}{row['pool_single_ms']:>10}"
+            f"{row['pool_parallel_ms']:>10}{_cell(row['parse_ms']):>10}{_cell(row['offers']):>8}"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Timing and machine-readable reports shared by the benchmark scripts
+
+A report is a JSON document:
+    {
+      "suite": "exporters",
+      "version": "1.22.0",              # application version (pyproject.toml)
+      "git_commit": "16c91d2",
+      "created_at": "2026-10-18T14:00:00+00:00",
+      "python": "3.11.9",
+      "database": "postgresql",         # dialect of DATABASE_URL (timings only compare on the same one)
+      "context": {...},                 # suite parameters (PDLs, fixture sizes, runs...)
+      "results": [
+        {"group": "statistics", "case": "annual_stats.consumption", "runs": 3,
+         "median_ms": 41.2, "min_ms": 39.8, "max_ms": 44.0, "peak_mb": 1.2, "rows": 3}
+      ]
+    }
+
+Comparing it with the report of the previous release (--baseline) adds baseline_ms and
+change_pct to every case found in both, and lists the cases slower than the threshold.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.config import APP_VERSION, settings  # noqa: E402
+
+# Cases slower than the baseline by more than this many percent are reported as regressions
+DEFAULT_REGRESSION_THRESHOLD = 20.0
+
+
+def summarize(durations_ms: List[float], peaks_mb: Optional[List[float]] = None) -> Dict[str, Any]:
+    """Median / min / max of the run durations (and median memory peak) of one case"""
+    result: Dict[str, Any] = {
+        "runs": len(durations_ms),
+        "median_ms": round(statistics.median(durations_ms), 1),
+        "min_ms": round(min(durations_ms), 1),
+        "max_ms": round(max(durations_ms), 1),
+    }
+    if peaks_mb:
+        result["peak_mb"] = round(statistics.median(peaks_mb), 2)
+    return result
+
+
+async def measure(func: Callable[[], Awaitable[Dict[str, int]]], runs: int, trace_memory: bool = True) -> Dict[str, Any]:
+    """Run `func` `runs` times: summarize() of the runs plus the counters returned by the last one"""
+    durations = []
+    peaks = []
+    counters: Dict[str, int] = {}
+    for _ in range(max(1, runs)):
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        counters = await func()
+        durations.append((time.perf_counter() - start) * 1000)
+        if trace_memory:
+            peaks.append(tracemalloc.get_traced_memory()[1] / 1024 / 1024)
+            tracemalloc.stop()
+    return {**summarize(durations, peaks), **counters}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+        return output.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def build_report(suite: str, results: List[Dict[str, Any]], context: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "suite": suite,
+        "version": APP_VERSION,
+        "git_commit": _git_commit(),
+        "created_at": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "database": settings.database_type,
+        "context": context,
+        "results": results,
+    }
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Annotate the results with the baseline timings; return the cases slower than `threshold` %"""
+    previous = {(row["group"], row["case"]): row for row in baseline.get("results", [])}
+    regressions = []
+    for row in report["results"]:
+        before = previous.get((row["group"], row["case"]))
+        if not before or not before.get("median_ms"):
+            continue
+        change = (row["median_ms"] - before["median_ms"]) / before["median_ms"] * 100
+        row["baseline_ms"] = before["median_ms"]
+        row["change_pct"] = round(change, 1)
+        if change > threshold:
+            regressions.append(row)
+    report["baseline"] = {
+        "version": baseline.get("version"),
+        "git_commit": baseline.get("git_commit"),
+        "created_at": baseline.get("created_at"),
+        "threshold_pct": threshold,
+        "regressions": [f"{row['group']}.{row['case']}" for row in regressions],
+    }
+    return regressions
+
+
+def add_report_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--json", type=Path, help="Write the report to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="Report of a previous run to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_REGRESSION_THRESHOLD,
+        help="Slowdown (%%) reported as a regression",
+    )
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    print(f"{'case':<48}{'median ms':>12}{'min ms':>10}{'max ms':>10}{'peak MB':>10}{'change':>10}")
+    for row in results:
+        change = f"{row['change_pct']:+.1f}%" if "change_pct" in row else ""
+        print(
+            f"{row['group'] + '.' + row['case']:<48}{row['median_ms']:>12}{row['min_ms']:>10}"
+            f"{row['max_ms']:>10}{row.get('peak_mb', ''):>10}{change:>10}"
+        )
+
+
+def finish_report(report: Dict[str, Any], args: argparse.Namespace) -> int:
+    """Compare with --baseline, print, write --json; exit status 1 when a case regressed"""
+    regressions: List[Dict[str, Any]] = []
+    if args.baseline:
+        regressions = compare_to_baseline(report, json.loads(args.baseline.read_text()), args.threshold)
+
+    print_results(report["results"])
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2, default=str))
+        print(f"Report written to {args.json}")
+
+    if regressions:
+        print(f"{len(regressions)} case(s) slower than the baseline by more than {args.threshold:g}%:")
+        for row in regressions:
+            print(f"  {row['group']}.{row['case']}: {row['baseline_ms']} ms -> {row['median_ms']} ms ({row['change_pct']:+.1f}%)")
+        return 1
+    return 0
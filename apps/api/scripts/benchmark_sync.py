@@ -0,0 +1,186 @@
+"""
+Benchmark the client-mode sync pipeline against the local MyElectricalData stand-in
+
+Starts fake_gateway.py in-process and points the MyElectricalData adapter at it. It then deletes
+the benchmark PDLs and all their synced data, and times three stages:
+- pdl_list: SyncService.sync_pdl_list (creates the PDLs under the benchmark user)
+- cold_backfill: SyncService.sync_all on an empty history (3 years daily, 2 years detailed, max power)
+- warm_incremental: SyncService.sync_all again, which only fetches what the cold run missed
+  (ranges answered 429, ...)
+
+Each stage reports its wall time and the requests the gateway received (per endpoint, 429s
+included). It also reports the rows written and the sync errors. --runs repeats the whole cycle
+and reports the median. Use a dedicated local database (PostgreSQL, or a SQLite file whose tables
+are created if missing), because the benchmark PDLs are deleted before every cycle.
+
+Usage:
+    uv run python scripts/benchmark_sync.py [--pdls 3] [--runs 1] [--latency-ms 20] [--rate-limit 0.02]
+        [--partial-days 0.01] [--json results.json] [--baseline previous.json] [--threshold 20]
+"""
+import argparse
+import asyncio
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import uvicorn  # noqa: E402
+from sqlalchemy import func, select  # noqa: E402
+
+from benchmark_fixtures import (  # noqa: E402
+    BENCH_PDL_PREFIX,
+    benchmark_pdls,
+    get_or_create_benchmark_user,
+    reset_fixtures,
+)
+from benchmark_report import add_report_arguments, build_report, finish_report, summarize  # noqa: E402
+from fake_gateway import GATEWAY_TOKEN, FakeGateway, GatewayFaults  # noqa: E402
+from src.adapters.myelectricaldata import get_med_adapter  # noqa: E402
+from src.models.client_mode import ConsumptionData, MaxPowerData, ProductionData  # noqa: E402
+from src.models.database import async_session_maker, init_db  # noqa: E402
+from src.services.pdl_cache import pdl_cache  # noqa: E402
+from src.services.sync import SyncService  # noqa: E402
+
+STAGES = ("pdl_list", "cold_backfill", "warm_incremental")
+ROW_TABLES = (("consumption", ConsumptionData), ("production", ProductionData), ("max_power", MaxPowerData))
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+async def count_rows() -> Dict[str, int]:
+    """Stored rows of the benchmark PDLs, per table"""
+    counts = {}
+    async with async_session_maker() as db:
+        for name, model in ROW_TABLES:
+            result = await db.execute(
+                select(func.count()).where(model.usage_point_id.like(f"{BENCH_PDL_PREFIX}%"))
+            )
+            counts[name] = result.scalar() or 0
+    return counts
+
+
+def sync_errors(results: Dict[str, Any]) -> int:
+    """Failed PDLs and failed data types reported by sync_all()"""
+    failed = len(results.get("errors", []))
+    for pdl_result in results.get("pdls", {}).values():
+        failed += sum(1 for value in pdl_result.values() if isinstance(value, str) and value.startswith("error"))
+    return failed
+
+
+async def pdl_list_stage() -> Dict[str, Any]:
+    async with async_session_maker() as db:
+        user = await get_or_create_benchmark_user(db)
+        await db.commit()
+        synced = await SyncService(db).sync_pdl_list(user.id)
+    return {"pdls": len(synced), "errors": 0}
+
+
+async def sync_all_stage() -> Dict[str, Any]:
+    async with async_session_maker() as db:
+        results = await SyncService(db).sync_all()
+    return {"pdls": len(results.get("pdls", {})), "errors": sync_errors(results)}
+
+
+async def run_cycle(gateway: FakeGateway) -> Dict[str, Dict[str, Any]]:
+    """One cold-to-warm cycle from an empty history: counters and duration of every stage"""
+    await reset_fixtures()
+    await pdl_cache.invalidate_all()
+
+    stages: Dict[str, Callable[[], Awaitable[Dict[str, Any]]]] = {
+        "pdl_list": pdl_list_stage,
+        "cold_backfill": sync_all_stage,
+        "warm_incremental": sync_all_stage,
+    }
+    cycle = {}
+    for name, stage in stages.items():
+        gateway.stats.reset()
+        rows_before = await count_rows()
+        start = time.perf_counter()
+        counters = await stage()
+        duration_ms = (time.perf_counter() - start) * 1000
+        rows_after = await count_rows()
+        written = {table: rows_after[table] - rows_before[table] for table in rows_after}
+        cycle[name] = {
+            "duration_ms": duration_ms,
+            **counters,
+            **gateway.stats.to_dict(),
+            "rows_written": sum(written.values()),
+            "rows_written_by_table": written,
+        }
+        print(f"  {name}: {duration_ms / 1000:.1f}s, {cycle[name]['requests']} requests, {cycle[name]['rows_written']} rows")
+    return cycle
+
+
+async def run(pdl_count: int, seed: int, runs: int, faults: GatewayFaults) -> Dict[str, Any]:
+    await init_db()
+    gateway = FakeGateway(benchmark_pdls(pdl_count), seed, faults)
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(gateway.create_app(), host="127.0.0.1", port=port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        if server_task.done():
+            raise SystemExit(f"The gateway stand-in could not start on port {port}")
+        await asyncio.sleep(0.05)
+
+    # SyncService uses the adapter singleton: point it at the stand-in
+    adapter = get_med_adapter()
+    adapter.base_url = f"http://127.0.0.1:{port}"
+    adapter.client_secret = GATEWAY_TOKEN
+
+    durations: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    last_cycle: Dict[str, Dict[str, Any]] = {}
+    try:
+        for run_index in range(max(1, runs)):
+            print(f"Cycle {run_index + 1}/{max(1, runs)}")
+            last_cycle = await run_cycle(gateway)
+            for stage in STAGES:
+                durations[stage].append(last_cycle[stage].pop("duration_ms"))
+    finally:
+        await adapter.close()
+        server.should_exit = True
+        await server_task
+
+    results = [
+        {"group": "sync", "case": stage, **summarize(durations[stage]), **last_cycle.get(stage, {})}
+        for stage in STAGES
+    ]
+    context = {
+        "pdls": list(gateway.pdls),
+        "seed": seed,
+        "runs": max(1, runs),
+        "faults": {
+            "latency_ms": faults.latency_ms,
+            "latency_jitter_ms": faults.latency_jitter_ms,
+            "rate_limit_ratio": faults.rate_limit_ratio,
+            "partial_day_ratio": faults.partial_day_ratio,
+        },
+    }
+    return build_report("sync", results, context)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark sync_all against a local gateway stand-in")
+    parser.add_argument("--pdls", type=int, default=3, help="Number of benchmark PDLs served")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the synthetic values and faults")
+    parser.add_argument("--runs", type=int, default=1, help="Cold-to-warm cycles (median is reported)")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Latency added to every data request")
+    parser.add_argument("--latency-jitter-ms", type=float, default=5.0, help="Random +/- variation of the latency")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Share of data requests answered 429 (0-1)")
+    parser.add_argument("--partial-days", type=float, default=0.0, help="Share of load curve days served incomplete (0-1)")
+    add_report_arguments(parser)
+    args = parser.parse_args()
+
+    faults = GatewayFaults(args.latency_ms, args.latency_jitter_ms, args.rate_limit, args.partial_days)
+    report = asyncio.run(run(args.pdls, args.seed, args.runs, faults))
+    sys.exit(finish_report(report, args))
+
+
+if __name__ == "__main__":
+    main()
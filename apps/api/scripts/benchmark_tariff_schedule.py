@@ -0,0 +1,136 @@
+"""
+Benchmark off-peak classification: per-point "HH:MM" parsing vs compiled TariffSchedule
+
+Classifies one year of synthetic 30-minute intervals (17520 points) with:
+- legacy: the former per-point implementation, re-parsing every "HH:MM" range for each point
+- scalar: TariffSchedule.is_offpeak_time / is_offpeak_at (one lookup per point)
+- vectorized: TariffSchedule.classify and, when NumPy is installed, classify_array
+
+Usage:
+    uv run python scripts/benchmark_tariff_schedule.py [--days N] [--runs N] [--json results.json]
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.services.tariff_schedule import NUMPY_AVAILABLE, TariffSchedule  # noqa: E402
+
+OFFPEAK_HOURS = [{"start": "01:52", "end": "07:52"}, {"start": "13:22", "end": "15:22"}]
+HC_SCHEDULES = {"monday": "22:30-06:30", "saturday": "23:00-07:00", "sunday": "23:00-07:00"}
+
+
+def _legacy_is_offpeak(interval_start: str | None, offpeak_hours: list[dict[str, str]]) -> bool:
+    """Former per-point implementation (StatisticsService._is_offpeak_hour)"""
+    if not interval_start or not offpeak_hours:
+        return False
+    hour, minute = map(int, interval_start.split(":"))
+    time_minutes = hour * 60 + minute
+    for period in offpeak_hours:
+        start_h, start_m = map(int, period["start"].split(":"))
+        end_h, end_m = map(int, period["end"].split(":"))
+        start_minutes = start_h * 60 + start_m
+        end_minutes = end_h * 60 + end_m
+        if start_minutes > end_minutes:
+            if time_minutes >= start_minutes or time_minutes < end_minutes:
+                return True
+        elif start_minutes <= time_minutes < end_minutes:
+            return True
+    return False
+
+
+def _legacy_is_hc(timestamp: datetime, schedules: dict[str, str]) -> bool:
+    """Former per-point offer calculator logic (parse_time_range + is_in_hc_period)"""
+    weekday_name = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"][timestamp.weekday()]
+    start_str, end_str = schedules.get(weekday_name, "22:30-06:30").split("-")
+    start_h, start_m = map(int, start_str.split(":"))
+    end_h, end_m = map(int, end_str.split(":"))
+    hc_start = timestamp.replace(hour=start_h, minute=start_m, second=0).time()
+    hc_end = timestamp.replace(hour=end_h, minute=end_m, second=0).time()
+    point_time = timestamp.time()
+    if hc_start <= hc_end:
+        return hc_start <= point_time < hc_end
+    return point_time >= hc_start or point_time < hc_end
+
+
+def _timed(func: Callable[[], Any], runs: int) -> tuple[float, Any]:
+    """Median duration (ms) over `runs` calls, and the last result"""
+    durations = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations), result
+
+
+def benchmark(days: int, runs: int) -> List[Dict[str, Any]]:
+    start = datetime(2025, 1, 1)
+    timestamps = [start + timedelta(minutes=30 * i) for i in range(days * 48)]
+    interval_starts = [ts.strftime("%H:%M") for ts in timestamps]
+    minutes = [ts.hour * 60 + ts.minute for ts in timestamps]
+    weekdays = [ts.weekday() for ts in timestamps]
+
+    contract = TariffSchedule.from_offpeak_hours(OFFPEAK_HOURS)
+    offer = TariffSchedule.from_hc_schedules(HC_SCHEDULES)
+
+    cases: Dict[str, Callable[[], Any]] = {
+        "contract legacy": lambda: [_legacy_is_offpeak(value, OFFPEAK_HOURS) for value in interval_starts],
+        "contract scalar": lambda: [contract.is_offpeak_time(value) for value in interval_starts],
+        "contract classify": lambda: contract.classify(minutes),
+        "offer legacy": lambda: [_legacy_is_hc(ts, HC_SCHEDULES) for ts in timestamps],
+        "offer scalar": lambda: [offer.is_offpeak_at(ts) for ts in timestamps],
+        "offer classify": lambda: offer.classify(minutes, weekdays),
+    }
+    if NUMPY_AVAILABLE:
+        cases["contract classify_array"] = lambda: contract.classify_array(minutes)
+        cases["offer classify_array"] = lambda: offer.classify_array(minutes, weekdays)
+
+    results = []
+    expected: Dict[str, list[bool]] = {}
+    for name, func in cases.items():
+        duration_ms, flags = _timed(func, runs)
+        flags = [bool(flag) for flag in flags]
+        # Every implementation of a family must classify the points identically
+        family = name.split()[0]
+        if expected.setdefault(family, flags) != flags:
+            raise AssertionError(f"{name} disagrees with {family} legacy")
+        results.append({
+            "case": name,
+            "points": len(flags),
+            "total_ms": round(duration_ms, 2),
+            "ns_per_point": round(duration_ms * 1e6 / len(flags), 1),
+            "offpeak_points": sum(flags),
+        })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark off-peak classification")
+    parser.add_argument("--days", type=int, default=365, help="Days of 30-minute intervals to classify")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measure (median is reported)")
+    parser.add_argument("--json", type=Path, help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = benchmark(args.days, args.runs)
+
+    print(f"{'case':<26}{'points':>8}{'total ms':>10}{'ns/point':>10}{'HC':>8}")
+    for row in results:
+        print(
+            f"{row['case']:<26}{row['points']:>8}{row['total_ms']:>10}"
+            f"{row['ns_per_point']:>10}{row['offpeak_points']:>8}"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
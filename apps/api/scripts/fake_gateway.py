@@ -0,0 +1,341 @@
+"""
+Local stand-in for the MyElectricalData gateway and the Enedis metering APIs
+
+Serves the synthetic benchmark PDLs of benchmark_fixtures.py. It uses the same generator, built
+on the generate_demo_account.py profiles, so with the same --seed the values match the exporter
+fixtures.
+- MyElectricalData routes used by SyncService (client mode): /pdl,
+  /enedis/{consumption,production}/{daily,detail}/{pdl}, /enedis/power/{pdl},
+  /enedis/contract/{pdl}, /enedis/address/{pdl}
+- Enedis routes used by EnedisAdapter: /oauth2/v3/token, /metering_data_dc/v5/daily_consumption,
+  /metering_data_clc/v5/consumption_load_curve, /metering_data_dp/v5/daily_production,
+  /metering_data_plc/v5/production_load_curve, /metering_data_dcmp/v5/daily_consumption_max_power
+
+Faults, reproducible for a given --seed, apply to the data requests (every route above except
+/pdl and the token route):
+- latency: every data request waits latency_ms (± latency_jitter_ms)
+- rate limit: a share of the data requests get 429 Too Many Requests (Retry-After: 1)
+- partial days: a share of the load curve days only hold their first slots
+- range limit: load curve requests over 7 days get 400, as on Enedis
+
+Request counters are served on GET /_stats; POST /_stats/reset clears them.
+
+Usage:
+    uv run python scripts/fake_gateway.py [--port 8765] [--pdls 3] [--seed 42] [--latency-ms 50]
+        [--rate-limit 0.05] [--partial-days 0.02]
+    then set MED_API_URL=http://127.0.0.1:8765 and MED_CLIENT_SECRET=benchmark for the client-mode API
+"""
+import argparse
+import asyncio
+import random
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import uvicorn  # noqa: E402
+from fastapi import Depends, FastAPI, HTTPException, Request  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from starlette.exceptions import HTTPException as StarletteHTTPException  # noqa: E402
+
+from benchmark_fixtures import (  # noqa: E402
+    DAILY_YEARS,
+    DETAILED_YEARS,
+    SyntheticPDL,
+    benchmark_pdls,
+    daily_readings,
+    load_curve_readings,
+    max_power_readings,
+)
+from src.services.energy_values import DEFAULT_INTERVAL_MINUTES  # noqa: E402
+
+# Bearer token accepted by the stand-in (MED_CLIENT_SECRET / Enedis access token)
+GATEWAY_TOKEN = "benchmark"
+# Enedis serves at most 7 days of load curve per request
+MAX_LOAD_CURVE_DAYS = 7
+SLOTS_PER_DAY = 24 * 60 // DEFAULT_INTERVAL_MINUTES
+
+
+@dataclass
+class GatewayFaults:
+    """Faults injected by the stand-in"""
+
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    rate_limit_ratio: float = 0.0  # share of data requests answered 429
+    partial_day_ratio: float = 0.0  # share of load curve days served incomplete
+
+
+@dataclass
+class GatewayStats:
+    """Requests received by the stand-in, by endpoint"""
+
+    requests: Counter = field(default_factory=Counter)
+    rate_limited: int = 0
+    readings: int = 0
+    partial_days: int = 0
+
+    def reset(self) -> None:
+        self.requests.clear()
+        self.rate_limited = 0
+        self.readings = 0
+        self.partial_days = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": sum(self.requests.values()),
+            "requests_by_endpoint": dict(sorted(self.requests.items())),
+            "rate_limited": self.rate_limited,
+            "readings": self.readings,
+            "partial_days": self.partial_days,
+        }
+
+
+class FakeGateway:
+    """Synthetic MyElectricalData / Enedis data with injected latency, 429s and partial days"""
+
+    def __init__(self, pdls: List[SyntheticPDL], seed: int, faults: Optional[GatewayFaults] = None) -> None:
+        self.pdls = {pdl.usage_point_id: pdl for pdl in pdls}
+        self.seed = seed
+        self.faults = faults or GatewayFaults()
+        self.stats = GatewayStats()
+        self._rng = random.Random(f"{seed}:faults")
+
+    async def admit(self, endpoint: str) -> None:
+        """Count the request, wait the injected latency, maybe answer 429"""
+        self.stats.requests[endpoint] += 1
+        faults = self.faults
+        if faults.latency_ms or faults.latency_jitter_ms:
+            jitter = self._rng.uniform(-faults.latency_jitter_ms, faults.latency_jitter_ms)
+            await asyncio.sleep(max(0.0, faults.latency_ms + jitter) / 1000)
+        if faults.rate_limit_ratio and self._rng.random() < faults.rate_limit_ratio:
+            self.stats.rate_limited += 1
+            raise HTTPException(
+                status_code=429,
+                detail={"error": "too_many_requests", "error_description": "Quota exceeded (stand-in)"},
+                headers={"Retry-After": "1"},
+            )
+
+    def endpoint(self, name: str) -> Callable[[], Awaitable[None]]:
+        """Dependency admitting a request to one endpoint"""
+
+        async def dependency() -> None:
+            await self.admit(name)
+
+        return dependency
+
+    def get_pdl(self, usage_point_id: str, direction: str = "consumption") -> SyntheticPDL:
+        pdl = self.pdls.get(usage_point_id)
+        if direction not in ("consumption", "production"):
+            raise HTTPException(status_code=404, detail={"error": "not_found", "error_description": direction})
+        if pdl is None or (direction == "production" and not pdl.has_production):
+            raise HTTPException(status_code=404, detail={"error": "no_data_found", "error_description": usage_point_id})
+        return pdl
+
+    @staticmethod
+    def period(start: str, end: str, max_days: int, history_years: int) -> Tuple[date, date]:
+        """Requested [start, end[ clipped to the published history (up to yesterday)"""
+        try:
+            start_date, end_date = date.fromisoformat(start), date.fromisoformat(end)
+        except ValueError:
+            raise HTTPException(status_code=400, detail={"error": "invalid_request", "error_description": "Bad dates"})
+        if end_date <= start_date or (end_date - start_date).days > max_days:
+            raise HTTPException(
+                status_code=400,
+                detail={"error": "invalid_request", "error_description": f"Period must be 1 to {max_days} days"},
+            )
+        today = date.today()
+        return max(start_date, today - timedelta(days=history_years * 365)), min(end_date, today)
+
+    def _partial_slots(self, pdl: SyntheticPDL, direction: str, day: str) -> Optional[int]:
+        """Slots served for a partial day (None for a complete one)"""
+        rng = random.Random(f"{self.seed}:partial:{pdl.usage_point_id}:{direction}:{day}")
+        if rng.random() >= self.faults.partial_day_ratio:
+            return None
+        return rng.randint(1, SLOTS_PER_DAY - 1)
+
+    @staticmethod
+    def meter_reading(pdl: SyntheticPDL, start: date, end: date, unit: str, readings: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "usage_point_id": pdl.usage_point_id,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "quality": "BRUT",
+            "reading_type": {"unit": unit, "measurement_kind": "energy" if unit == "Wh" else "power"},
+            "interval_reading": readings,
+        }
+
+    def daily(self, usage_point_id: str, start: str, end: str, direction: str) -> Dict[str, Any]:
+        pdl = self.get_pdl(usage_point_id, direction)
+        start_date, end_date = self.period(start, end, DAILY_YEARS * 365, DAILY_YEARS)
+        readings = daily_readings(pdl, start_date, end_date, direction, self.seed)
+        self.stats.readings += len(readings)
+        return self.meter_reading(pdl, start_date, end_date, "Wh", readings)
+
+    def load_curve(self, usage_point_id: str, start: str, end: str, direction: str) -> Dict[str, Any]:
+        pdl = self.get_pdl(usage_point_id, direction)
+        start_date, end_date = self.period(start, end, MAX_LOAD_CURVE_DAYS, DETAILED_YEARS)
+        readings = []
+        by_day: Dict[str, List[Dict[str, Any]]] = {}
+        for reading in load_curve_readings(pdl, start_date, end_date, direction, self.seed):
+            by_day.setdefault(reading["date"][:10], []).append(reading)
+        for day, day_readings in by_day.items():
+            slots = self._partial_slots(pdl, direction, day)
+            if slots is not None:
+                self.stats.partial_days += 1
+                day_readings = day_readings[:slots]
+            readings.extend(day_readings)
+        self.stats.readings += len(readings)
+        return self.meter_reading(pdl, start_date, end_date, "W", readings)
+
+    def max_power(self, usage_point_id: str, start: str, end: str) -> Dict[str, Any]:
+        pdl = self.get_pdl(usage_point_id)
+        start_date, end_date = self.period(start, end, DAILY_YEARS * 365, DAILY_YEARS)
+        readings = max_power_readings(pdl, start_date, end_date, self.seed)
+        self.stats.readings += len(readings)
+        return self.meter_reading(pdl, start_date, end_date, "VA", readings)
+
+    def contract(self, usage_point_id: str) -> Dict[str, Any]:
+        pdl = self.get_pdl(usage_point_id)
+        return {
+            "usage_point_id": pdl.usage_point_id,
+            "subscribed_power": pdl.subscribed_power,
+            "pricing_option": pdl.pricing_option,
+            "offpeak_hours": pdl.offpeak_hours,
+            "segment": "C5",
+            "reading_type": "CLC",
+        }
+
+    def address(self, usage_point_id: str) -> Dict[str, Any]:
+        pdl = self.get_pdl(usage_point_id)
+        return {
+            "usage_point_id": pdl.usage_point_id,
+            "street": "123 Rue de la Démo",
+            "postal_code": "75001",
+            "city": "Paris",
+            "country": "France",
+            "insee_code": "75101",
+            "latitude": 48.8606,
+            "longitude": 2.3376,
+        }
+
+    def create_app(self) -> FastAPI:
+        app = FastAPI(title="MyElectricalData / Enedis stand-in", docs_url=None, redoc_url=None)
+
+        def envelope(data: Any) -> Dict[str, Any]:
+            """MyElectricalData APIResponse wrapper"""
+            return {"success": True, "data": data}
+
+        @app.exception_handler(StarletteHTTPException)
+        async def error_body(request: Request, exc: StarletteHTTPException) -> JSONResponse:
+            """Errors as Enedis sends them: {"error", "error_description"} at the top level"""
+            body = exc.detail if isinstance(exc.detail, dict) else {"error": str(exc.detail)}
+            return JSONResponse(body, status_code=exc.status_code, headers=getattr(exc, "headers", None))
+
+        # --- Stand-in control ---------------------------------------------------------
+
+        @app.get("/_stats")
+        async def get_stats() -> Dict[str, Any]:
+            return self.stats.to_dict()
+
+        @app.post("/_stats/reset")
+        async def reset_stats() -> Dict[str, Any]:
+            self.stats.reset()
+            return self.stats.to_dict()
+
+        # --- MyElectricalData gateway (client mode) -----------------------------------
+
+        @app.get("/pdl")
+        async def get_pdls() -> Dict[str, Any]:
+            # PDL list: counted, but not a data request (no latency, no 429)
+            self.stats.requests["pdl"] += 1
+            return envelope([
+                {
+                    "usage_point_id": pdl.usage_point_id,
+                    "name": pdl.name,
+                    "subscribed_power": pdl.subscribed_power,
+                    "pricing_option": pdl.pricing_option,
+                    "offpeak_hours": pdl.offpeak_hours,
+                    "has_consumption": True,
+                    "has_production": pdl.has_production,
+                    "is_active": True,
+                }
+                for pdl in self.pdls.values()
+            ])
+
+        @app.get("/enedis/{direction}/daily/{usage_point_id}")
+        async def med_daily(direction: str, usage_point_id: str, start: str, end: str) -> Dict[str, Any]:
+            await self.admit(f"{direction}_daily")
+            return envelope({"meter_reading": self.daily(usage_point_id, start, end, direction)})
+
+        @app.get("/enedis/{direction}/detail/{usage_point_id}")
+        async def med_detail(direction: str, usage_point_id: str, start: str, end: str) -> Dict[str, Any]:
+            await self.admit(f"{direction}_detail")
+            return envelope({"meter_reading": self.load_curve(usage_point_id, start, end, direction)})
+
+        @app.get("/enedis/power/{usage_point_id}", dependencies=[Depends(self.endpoint("max_power"))])
+        async def med_max_power(usage_point_id: str, start: str, end: str) -> Dict[str, Any]:
+            return envelope({"meter_reading": self.max_power(usage_point_id, start, end)})
+
+        @app.get("/enedis/contract/{usage_point_id}", dependencies=[Depends(self.endpoint("contract"))])
+        async def med_contract(usage_point_id: str) -> Dict[str, Any]:
+            return self.contract(usage_point_id)
+
+        @app.get("/enedis/address/{usage_point_id}", dependencies=[Depends(self.endpoint("address"))])
+        async def med_address(usage_point_id: str) -> Dict[str, Any]:
+            return self.address(usage_point_id)
+
+        # --- Enedis Data Connect (server mode) ----------------------------------------
+
+        @app.post("/oauth2/v3/token")
+        async def token() -> Dict[str, Any]:
+            self.stats.requests["token"] += 1
+            return {"access_token": GATEWAY_TOKEN, "token_type": "Bearer", "expires_in": 12600, "scope": ""}
+
+        def enedis_route(build: Callable[[str, str, str], Dict[str, Any]]) -> Callable[..., Awaitable[Dict[str, Any]]]:
+            async def enedis_data(usage_point_id: str, start: str, end: str) -> Dict[str, Any]:
+                return {"meter_reading": build(usage_point_id, start, end)}
+
+            return enedis_data
+
+        enedis_routes = {
+            "/metering_data_dc/v5/daily_consumption": (
+                "consumption_daily", lambda pdl, start, end: self.daily(pdl, start, end, "consumption")),
+            "/metering_data_clc/v5/consumption_load_curve": (
+                "consumption_detail", lambda pdl, start, end: self.load_curve(pdl, start, end, "consumption")),
+            "/metering_data_dp/v5/daily_production": (
+                "production_daily", lambda pdl, start, end: self.daily(pdl, start, end, "production")),
+            "/metering_data_plc/v5/production_load_curve": (
+                "production_detail", lambda pdl, start, end: self.load_curve(pdl, start, end, "production")),
+            "/metering_data_dcmp/v5/daily_consumption_max_power": ("max_power", self.max_power),
+        }
+        for path, (name, build) in enedis_routes.items():
+            app.add_api_route(path, enedis_route(build), methods=["GET"], dependencies=[Depends(self.endpoint(name))])
+
+        return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local MyElectricalData / Enedis stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--pdls", type=int, default=3, help="Number of benchmark PDLs served")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the synthetic values and faults")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latency added to every data request")
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0, help="Random +/- variation of the latency")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Share of data requests answered 429 (0-1)")
+    parser.add_argument("--partial-days", type=float, default=0.0, help="Share of load curve days served incomplete (0-1)")
+    args = parser.parse_args()
+
+    faults = GatewayFaults(args.latency_ms, args.latency_jitter_ms, args.rate_limit, args.partial_days)
+    gateway = FakeGateway(benchmark_pdls(args.pdls), args.seed, faults)
+    print(f"Serving {args.pdls} benchmark PDLs on http://{args.host}:{args.port} ({faults})")
+    uvicorn.run(gateway.create_app(), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,41 @@
 import asyncio
 import json
 import logging
+import secrets
 from datetime import UTC, datetime, timedelta
 from typing import Any, Optional, cast
 
 import httpx
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
 from ..config import settings
+from ..models import Token
+from ..models.database import async_session_maker
+from ..services.cache import cache_service
 
 logger = logging.getLogger(__name__)
 
+# Global client credentials token row (user_id NULL)
+GLOBAL_TOKEN_USAGE_POINT = "__global__"
+
+# Cross-worker refresh lock: the holder fetches, the others wait for its token in the database
+TOKEN_LOCK_KEY = "enedis:global_token:lock"
+TOKEN_LOCK_TTL_SECONDS = 30
+TOKEN_LOCK_WAIT_SECONDS = 10.0
+TOKEN_LOCK_POLL_SECONDS = 0.5
+
+# Delete the lock only if it still holds our token: after TOKEN_LOCK_TTL_SECONDS it may belong to another worker
+TOKEN_LOCK_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Minimum delay between two background refreshes (the current token is still served)
+TOKEN_REFRESH_RETRY_SECONDS = 30.0
+
 
 class RateLimiter:
     """Rate limiter for Enedis API calls (5 req/sec)"""
@@ -40,6 +66,168 @@ class RateLimiter:
             self.calls.append(now)
 
 
+class GlobalTokenManager:
+    """
+    In-memory holder of the global client credentials token.
+
+    Requests read the token from memory. Once it is within `refresh_margin_seconds` of its expiry
+    it is refreshed in the background while still being served; only an expired (or missing)
+    token blocks the caller. Refreshes are single-flight within the process (asyncio lock) and
+    across workers (Redis lock): workers that lose the lock wait for the winner's token in the
+    database. The Token row is only used for persistence and cold start.
+    """
+
+    def __init__(self, adapter: "EnedisAdapter", refresh_margin_seconds: int):
+        self._adapter = adapter
+        self.refresh_margin = timedelta(seconds=refresh_margin_seconds)
+        self._access_token: Optional[str] = None
+        self._expires_at: Optional[datetime] = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task[None]] = None
+        self._retry_after = 0.0
+
+    def _remaining(self) -> timedelta:
+        if not self._access_token or self._expires_at is None:
+            return timedelta(0)
+        return self._expires_at - datetime.now(UTC)
+
+    def _adopt(self, access_token: str, expires_at: datetime) -> None:
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=UTC)
+        if self._expires_at is None or expires_at > self._expires_at or not self._access_token:
+            self._access_token = access_token
+            self._expires_at = expires_at
+
+    async def get_token(self) -> str:
+        """Valid access token (raises if Enedis cannot deliver one)"""
+        if self._remaining() <= timedelta(0):
+            async with self._lock:
+                # Another request of this worker may have refreshed it while we waited
+                if self._remaining() <= timedelta(0):
+                    await self._load_persisted()
+                if self._remaining() <= timedelta(0):
+                    await self._refresh()
+
+        if self._remaining() <= self.refresh_margin:
+            self._schedule_refresh()
+        return cast(str, self._access_token)
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        if asyncio.get_running_loop().time() < self._retry_after:
+            return
+        self._refresh_task = asyncio.create_task(self._background_refresh())
+
+    async def _background_refresh(self) -> None:
+        try:
+            async with self._lock:
+                if self._remaining() <= self.refresh_margin:
+                    await self._refresh()
+        except Exception as e:
+            # Keep serving the current token until it expires
+            logger.warning(f"[ENEDIS TOKEN] Background refresh failed: {e}")
+        finally:
+            self._retry_after = asyncio.get_running_loop().time() + TOKEN_REFRESH_RETRY_SECONDS
+
+    async def _refresh(self) -> None:
+        """Get a token valid beyond the refresh margin, from another worker or from Enedis"""
+        redis_client = cache_service.redis_client
+        if redis_client is None:
+            await self._fetch()
+            return
+
+        lock_token = secrets.token_hex(16)
+        try:
+            locked = bool(await redis_client.set(TOKEN_LOCK_KEY, lock_token, nx=True, ex=TOKEN_LOCK_TTL_SECONDS))
+        except Exception as e:
+            logger.warning(f"[ENEDIS TOKEN] Redis lock unavailable, refreshing without it: {e}")
+            await self._fetch()
+            return
+
+        if not locked:
+            # Another worker is refreshing: wait for its token
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + TOKEN_LOCK_WAIT_SECONDS
+            while loop.time() < deadline:
+                await asyncio.sleep(TOKEN_LOCK_POLL_SECONDS)
+                if await self._load_persisted():
+                    return
+            logger.warning("[ENEDIS TOKEN] Timed out waiting for another worker, refreshing the token")
+            await self._fetch()
+            return
+
+        try:
+            # Refreshed by another worker between our last read and the lock
+            if not await self._load_persisted():
+                await self._fetch()
+        finally:
+            try:
+                await redis_client.eval(TOKEN_LOCK_RELEASE_SCRIPT, 1, TOKEN_LOCK_KEY, lock_token)
+            except Exception as e:
+                # The lock expires on its own after TOKEN_LOCK_TTL_SECONDS
+                logger.warning(f"[ENEDIS TOKEN] Failed to release the Redis lock: {e}")
+
+    async def _fetch(self) -> None:
+        token_data = await self._adapter.get_client_credentials_token()
+        expires_at = datetime.now(UTC) + timedelta(seconds=int(token_data.get("expires_in", 3600)))
+        self._adopt(token_data["access_token"], expires_at)
+        logger.info(f"[ENEDIS TOKEN] New client credentials token, expires at {expires_at.isoformat()}")
+
+        try:
+            await self._persist(token_data["access_token"], expires_at, token_data.get("scope"))
+        except Exception as e:
+            # The token stays usable in this worker, the others fetch their own
+            logger.warning(f"[ENEDIS TOKEN] Failed to persist the token: {e}")
+
+    async def _load_persisted(self) -> bool:
+        """Adopt the database token if it is newer. True if it is valid beyond the refresh margin."""
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(Token.access_token, Token.expires_at)
+                .where(Token.user_id.is_(None), Token.usage_point_id == GLOBAL_TOKEN_USAGE_POINT)
+                .limit(1)
+            )
+            row = result.first()
+        if row is None or row.expires_at is None:
+            return False
+
+        self._adopt(row.access_token, row.expires_at)
+        return self._remaining() > self.refresh_margin
+
+    async def _persist(self, access_token: str, expires_at: datetime, scope: Optional[str]) -> None:
+        values = {
+            "access_token": access_token,
+            "refresh_token": None,
+            "token_type": "Bearer",
+            "expires_at": expires_at,
+            "scope": scope,
+        }
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(Token).where(Token.user_id.is_(None), Token.usage_point_id == GLOBAL_TOKEN_USAGE_POINT).limit(1)
+            )
+            token = result.scalar_one_or_none()
+            if token is None:
+                session.add(Token(user_id=None, usage_point_id=GLOBAL_TOKEN_USAGE_POINT, **values))
+            else:
+                for key, value in values.items():
+                    setattr(token, key, value)
+
+            try:
+                await session.commit()
+            except IntegrityError:
+                # Row created concurrently (refresh without the Redis lock): update it instead
+                await session.rollback()
+                result = await session.execute(
+                    select(Token).where(Token.user_id.is_(None), Token.usage_point_id == GLOBAL_TOKEN_USAGE_POINT).limit(1)
+                )
+                token = result.scalar_one()
+                for key, value in values.items():
+                    setattr(token, key, value)
+                await session.commit()
+
+
 class EnedisAdapter:
     """Adapter for Enedis API with rate limiting"""
 
@@ -48,6 +236,7 @@ class EnedisAdapter:
         self.client_id = settings.ENEDIS_CLIENT_ID
         self.client_secret = settings.ENEDIS_CLIENT_SECRET
         self.rate_limiter = RateLimiter(max_calls=settings.ENEDIS_RATE_LIMIT)
+        self.token_manager = GlobalTokenManager(self, settings.ENEDIS_TOKEN_REFRESH_MARGIN_SECONDS)
         self._client: Optional[httpx.AsyncClient] = None
 
     def _parse_iso8601_duration_to_minutes(self, duration: str) -> int:
@@ -22,6 +22,28 @@ class Settings(BaseSettings):
     # Redis Cache
     REDIS_URL: str = "redis://localhost:6379/0"
     CACHE_TTL_SECONDS: int = 86400
+    # Stale-while-revalidate for slow-changing customer data (contract, address, customer, contact)
+    # Past the soft TTL the cached value is still served while a background refresh runs;
+    # past the hard TTL the entry is gone and the request blocks on Enedis.
+    CACHE_CUSTOMER_DATA_SOFT_TTL_SECONDS: int = 86400  # 1 day
+    CACHE_CUSTOMER_DATA_HARD_TTL_SECONDS: int = 2592000  # 30 days
+    CACHE_SWR_JITTER: float = 0.1  # +/- 10% on the soft TTL to spread refreshes
+    # Encrypted values are written as AES-GCM envelopes (zlib-compressed above the threshold).
+    # Legacy Fernet entries stay readable; set False to keep writing Fernet tokens.
+    CACHE_COMPACT_ENVELOPE: bool = True
+    CACHE_COMPRESS_MIN_BYTES: int = 1024
+    # Invalidation also SCANs for PDL keys missing from the per-PDL key registry (entries
+    # written before it existed). Disable once CACHE_CUSTOMER_DATA_HARD_TTL_SECONDS has elapsed.
+    CACHE_INDEX_SCAN_FALLBACK: bool = True
+    # Public reference data (Tempo, EcoWatt) kept in memory by each worker; entries are
+    # invalidated on write and revalidated against Redis once this TTL has elapsed
+    REFERENCE_CACHE_TTL_SECONDS: int = 300
+    # Authenticated principals (user, role, permissions) kept in memory by each worker;
+    # dropped on user/role changes, in the other workers through a Redis generation counter
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    # PDL ownership and metadata (owner, active, pricing, offpeak hours) kept in memory by each
+    # worker; dropped on PDL changes, in the other workers through a Redis generation counter
+    PDL_CACHE_TTL_SECONDS: int = 30
 
     # Enedis API
     ENEDIS_CLIENT_ID: str = ""
@@ -69,11 +91,27 @@ class Settings(BaseSettings):
     SECRET_KEY: str = ""
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 43200
+    # Pepper of the client_secret lookup hash (HMAC-SHA256), defaults to SECRET_KEY
+    # Changing it re-hashes every user at the next startup
+    API_KEY_PEPPER: str = ""
 
     # Rate Limiting
     ENEDIS_RATE_LIMIT: int = 5  # requests per second
+    # Global client credentials token is refreshed in the background this long before it expires
+    ENEDIS_TOKEN_REFRESH_MARGIN_SECONDS: int = 300
     USER_DAILY_LIMIT_NO_CACHE: int = 50
     USER_DAILY_LIMIT_WITH_CACHE: int = 1000
+    RATE_LIMIT_STATS_RETENTION_DAYS: int = 90  # daily usage aggregates kept for admin trends
+
+    # Process pool for CPU-bound work (scraper PDF parsing, ...)
+    CPU_POOL_WORKERS: int = 4
+    CPU_POOL_PREWARM: bool = False  # Spawn and warm the workers at startup instead of on first use
+
+    # Client mode exports: configurations run concurrently, PDLs of a configuration too
+    # (overridable per configuration with "max_workers" / "timeout_seconds" in its JSON config)
+    EXPORT_MAX_CONCURRENT_CONFIGS: int = 4
+    EXPORT_PDL_WORKERS: int = 4
+    EXPORT_TIMEOUT_SECONDS: int = 900
 
     # Application
     API_HOST: str = "0.0.0.0"
@@ -11,7 +11,8 @@ from fastapi.staticfiles import StaticFiles
 from .adapters import enedis_adapter
 from .config import APP_VERSION, settings
 from .logging_config import setup_logging
-from .models.database import init_db
+from .middleware.auth import sync_client_secret_hashes
+from .models.database import async_session_maker, init_db
 from .routers import (
     accounts_router,
     admin_router,
@@ -29,6 +30,7 @@ from .routers import (
 from .routers.admin_rte import router as admin_rte_router
 from .schemas import APIResponse, ErrorDetail, HealthCheckResponse
 from .services import cache_service
+from .services.cpu_executor import cpu_executor
 from .services.scheduler import start_background_tasks
 
 # Client mode imports (only when CLIENT_MODE is enabled)
@@ -39,7 +41,6 @@ if settings.CLIENT_MODE:
     from .routers.enedis_client import router as enedis_client_router
     from .scheduler import scheduler as sync_scheduler
     from .services.client_auth import get_or_create_local_user
-    from .models.database import async_session_maker
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +60,14 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     if not settings.CLIENT_MODE:
         start_background_tasks()
 
+        # API keys are resolved through client_secret_hash: fill it for users missing one
+        async with async_session_maker() as db:
+            await sync_client_secret_hashes(db)
+
+    # Spawn the CPU process pool now rather than on the first PDF parse
+    if settings.CPU_POOL_PREWARM:
+        await cpu_executor.start()
+
     # Start sync scheduler in client mode
     if settings.CLIENT_MODE:
         # Initialize local user for client mode
@@ -103,6 +112,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         sync_scheduler.stop()
     await cache_service.disconnect()
     await enedis_adapter.close()
+    await cpu_executor.shutdown()
 
 
 def get_servers() -> list[dict[str, str]]:
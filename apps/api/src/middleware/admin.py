@@ -1,11 +1,9 @@
 from fastapi import HTTPException, status, Depends
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-from ..models import User, Role
+from ..models import User
 from ..models.database import get_db
 from ..config import settings
-from .auth import get_current_user
+from .auth import get_current_user, get_principal
 
 
 async def require_admin(current_user: User = Depends(get_current_user)) -> User:
@@ -28,33 +26,23 @@ def require_permission(resource: str):  # type: ignore[no-untyped-def]
         if settings.is_admin(current_user.email):
             return current_user
 
-        # Load user with role and permissions
-        result = await db.execute(
-            select(User)
-            .where(User.id == current_user.id)
-            .options(selectinload(User.role).selectinload(Role.permissions))
-        )
-        user = result.scalar_one_or_none()
+        # Role and permissions from the principal cache (loaded on miss)
+        principal = await get_principal(db, current_user.id)
 
-        if not user or not user.role:
+        if not principal or not principal.role_name:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access denied: {resource} permission required"
             )
 
         # Check if user has permission for this resource
-        has_permission = any(
-            perm.resource == resource
-            for perm in user.role.permissions
-        )
-
-        if not has_permission:
+        if resource not in principal.permission_resources:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access denied: {resource} permission required"
             )
 
-        return user
+        return current_user
 
     return permission_checker
 
@@ -69,15 +57,10 @@ def require_action(resource: str, action: str):  # type: ignore[no-untyped-def]
         if settings.is_admin(current_user.email):
             return current_user
 
-        # Load user with role and permissions
-        result = await db.execute(
-            select(User)
-            .where(User.id == current_user.id)
-            .options(selectinload(User.role).selectinload(Role.permissions))
-        )
-        user = result.scalar_one_or_none()
+        # Role and permissions from the principal cache (loaded on miss)
+        principal = await get_principal(db, current_user.id)
 
-        if not user or not user.role:
+        if not principal or not principal.role_name:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access denied: {resource}.{action} permission required"
@@ -85,17 +68,12 @@ def require_action(resource: str, action: str):  # type: ignore[no-untyped-def]
 
         # Check if user has specific action permission for this resource
         permission_name = f"admin.{resource}.{action}"
-        has_action = any(
-            perm.name == permission_name
-            for perm in user.role.permissions
-        )
-
-        if not has_action:
+        if permission_name not in principal.permission_names:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access denied: {resource}.{action} permission required"
             )
 
-        return user
+        return current_user
 
     return action_checker
@@ -9,11 +9,13 @@ try:
     from fastapi.security.oauth2 import OAuthFlowClientCredentials  # type: ignore[attr-defined]
 except ImportError:
     from fastapi.openapi.models import OAuthFlowClientCredentials  # type: ignore[assignment, attr-defined]
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from ..models import User
+from sqlalchemy.orm import selectinload
+from ..models import Role, User
 from ..models.database import get_db
-from ..utils import decode_access_token
+from ..services.principal_cache import LOCAL_USER_ALIAS, Principal, principal_cache
+from ..utils import decode_access_token, hash_client_secret
 from ..config import settings
 import logging
 
@@ -40,6 +42,82 @@ oauth2_scheme = OAuth2(
 bearer_scheme = HTTPBearer(auto_error=False)
 
 
+async def _load_principal(
+    db: AsyncSession, *criteria: ColumnElement[bool], alias: Optional[str] = None
+) -> Optional[tuple[Principal, User]]:
+    """Load a user with its role and permissions, and cache its principal"""
+    result = await db.execute(
+        select(User).where(*criteria).options(selectinload(User.role).selectinload(Role.permissions))
+    )
+    user = result.scalar_one_or_none()
+    if user is None:
+        return None
+    return principal_cache.put(Principal.from_user(user), alias=alias), user
+
+
+async def get_principal(db: AsyncSession, user_id: str) -> Optional[Principal]:
+    """Cached principal (user, role, permissions) of a user, loaded on miss"""
+    principal = await principal_cache.get(user_id)
+    if principal is None:
+        loaded = await _load_principal(db, User.id == user_id)
+        principal = loaded[0] if loaded else None
+    return principal
+
+
+async def get_user(db: AsyncSession, user_id: str) -> Optional[User]:
+    """Session-bound user, rebuilt from the principal cache without a query when possible
+
+    The returned object can be modified and committed like a loaded user.
+    """
+    principal = await principal_cache.get(user_id)
+    if principal is None:
+        loaded = await _load_principal(db, User.id == user_id)
+        return loaded[1] if loaded else None
+    return await db.merge(principal.to_user(), load=False)
+
+
+async def get_user_by_api_key(db: AsyncSession, token: str) -> Optional[User]:
+    """Resolve an API key (client_secret) to its active user
+
+    One query on the unique client_secret_hash index (none when cached), then a constant-time
+    comparison of the secret itself.
+    """
+    digest = hash_client_secret(token)
+    principal = await principal_cache.get_alias(digest)
+    if principal is None:
+        loaded = await _load_principal(db, User.client_secret_hash == digest, alias=digest)
+        if loaded is None:
+            return None
+        principal, user = loaded
+    else:
+        user = None
+
+    if not principal.is_active or not secrets.compare_digest(principal.client_secret, token):
+        return None
+    return user or await db.merge(principal.to_user(), load=False)
+
+
+async def sync_client_secret_hashes(db: AsyncSession) -> int:
+    """Fill or fix client_secret_hash for all users (run at startup)
+
+    Needed for users created before the column existed or after API_KEY_PEPPER changed.
+
+    Returns:
+        Number of users updated
+    """
+    result = await db.execute(select(User.id, User.client_secret, User.client_secret_hash))
+    updated = 0
+    for user_id, client_secret, stored_hash in result.all():
+        expected = hash_client_secret(client_secret)
+        if stored_hash != expected:
+            await db.execute(update(User).where(User.id == user_id).values(client_secret_hash=expected))
+            updated += 1
+    if updated:
+        await db.commit()
+        logger.info(f"[AUTH] Updated client_secret_hash for {updated} users")
+    return updated
+
+
 async def get_current_user(
     request: Request,
     oauth_token: Optional[str] = Security(oauth2_scheme),
@@ -52,10 +130,15 @@ async def get_current_user(
 
     # CLIENT MODE: Auto-authenticate as local user (no token required)
     if settings.CLIENT_MODE:
+        principal = await principal_cache.get_alias(LOCAL_USER_ALIAS)
+        if principal:
+            return await db.merge(principal.to_user(), load=False)
+
         from ..services.client_auth import get_or_create_local_user
         local_user = await get_or_create_local_user(db)
+        loaded = await _load_principal(db, User.id == local_user.id, alias=LOCAL_USER_ALIAS)
         logger.debug(f"[AUTH] Client mode: auto-authenticated as {local_user.email}")
-        return local_user
+        return loaded[1] if loaded else local_user
 
     # 1. Try httpOnly cookie first (most secure for browser clients)
     cookie_token = request.cookies.get("access_token")
@@ -83,8 +166,7 @@ async def get_current_user(
         user_id = payload.get("sub")
         logger.debug(f"[AUTH] JWT token decoded, user_id: {user_id}")
         if user_id:
-            result = await db.execute(select(User).where(User.id == user_id))
-            user = result.scalar_one_or_none()
+            user = await get_user(db, user_id)
             if user:
                 logger.debug(f"[AUTH] User found: {user.email}, is_active: {user.is_active}, email_verified: {user.email_verified}")
                 if user.is_active:
@@ -101,15 +183,9 @@ async def get_current_user(
             else:
                 logger.error("[AUTH] User not found in database")
 
-    # Try API key (client_secret) - iterate to use constant-time comparison
+    # Try API key (client_secret) - indexed lookup by keyed hash
     logger.debug("[AUTH] Trying API key authentication")
-    result = await db.execute(select(User).where(User.is_active == True))  # noqa: E712
-    users = result.scalars().all()
-    user = None
-    for u in users:
-        if secrets.compare_digest(u.client_secret, token):
-            user = u
-            break
+    user = await get_user_by_api_key(db, token)
     if user:
         if settings.REQUIRE_EMAIL_VERIFICATION and not user.email_verified:
             raise HTTPException(
@@ -154,19 +230,12 @@ async def get_current_user_optional(
     if payload:
         user_id = payload.get("sub")
         if user_id:
-            result = await db.execute(select(User).where(User.id == user_id))
-            user = result.scalar_one_or_none()
+            user = await get_user(db, user_id)
             if user and user.is_active:
                 return user
 
-    # Try API key (client_secret) - iterate to use constant-time comparison
-    result = await db.execute(select(User).where(User.is_active == True))  # noqa: E712
-    users = result.scalars().all()
-    for u in users:
-        if secrets.compare_digest(u.client_secret, token):
-            return u
-
-    return None
+    # Try API key (client_secret) - indexed lookup by keyed hash
+    return await get_user_by_api_key(db, token)
 
 
 def is_demo_user(user: User) -> bool:
@@ -211,14 +280,14 @@ async def get_impersonation_context(
         return None
 
     # Check if current user is admin
-    is_admin = current_user.is_admin or (current_user.role and current_user.role.name == "admin")
+    principal = await get_principal(db, current_user.id)
+    is_admin = current_user.is_admin or (principal is not None and principal.role_name == "admin")
     if not is_admin:
         logger.warning(f"[IMPERSONATION] Non-admin user {current_user.email} tried to impersonate {impersonate_user_id}")
         return None
 
     # Get the target user
-    result = await db.execute(select(User).where(User.id == impersonate_user_id))
-    target_user = result.scalar_one_or_none()
+    target_user = await get_user(db, impersonate_user_id)
 
     if not target_user:
         logger.warning(f"[IMPERSONATION] Admin {current_user.email} tried to impersonate non-existent user {impersonate_user_id}")
@@ -23,6 +23,7 @@ from .client_mode import (
 )
 from .consumption_france import ConsumptionFrance
 from .generation_forecast import GenerationForecast
+from .rte_forecast_input import RTEForecastInput
 
 __all__ = [
     "Base",
@@ -56,4 +57,5 @@ __all__ = [
     # RTE national data models
     "ConsumptionFrance",
     "GenerationForecast",
+    "RTEForecastInput",
 ]
@@ -72,6 +72,11 @@ class ConsumptionData(Base, TimestampMixin):
     # Energy value in Wh
     value: Mapped[int] = mapped_column(Integer, nullable=False)
 
+    # Computed at ingestion from raw_data (see services/energy_values.py):
+    # interval length in minutes (NULL for daily data) and value normalized to Wh
+    interval_minutes: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    value_wh: Mapped[float | None] = mapped_column(Float, nullable=True)
+
     # Source metadata
     source: Mapped[str] = mapped_column(String(50), default="myelectricaldata")
     raw_data: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
@@ -107,6 +112,10 @@ class ProductionData(Base, TimestampMixin):
     # Energy value in Wh
     value: Mapped[int] = mapped_column(Integer, nullable=False)
 
+    # Interval length (minutes) and value normalized to Wh, computed at ingestion
+    interval_minutes: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    value_wh: Mapped[float | None] = mapped_column(Float, nullable=True)
+
     # Source metadata
     source: Mapped[str] = mapped_column(String(50), default="myelectricaldata")
     raw_data: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
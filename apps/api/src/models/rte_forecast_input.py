@@ -0,0 +1,46 @@
+"""
+RTE forecast input model: hourly time series of the national forecasts used by the Tempo forecast
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Integer, Float, Index, UniqueConstraint
+
+from .base import Base
+
+
+class RTEForecastInput(Base):
+    """Hourly mean of an RTE forecast series, upserted when RTE publishes a new revision"""
+
+    __tablename__ = "rte_forecast_inputs"
+
+    id = Column(Integer, primary_key=True)
+
+    # Série : CONSUMPTION, SOLAR, WIND_ONSHORE, WIND_OFFSHORE
+    source = Column(String(20), nullable=False)
+
+    # Type de prévision : REALISED, ID, D-1, D-2, D-3, WEEKLY
+    forecast_type = Column(String(20), nullable=False)
+
+    # Début de l'heure (UTC, sans timezone comme les autres tables RTE)
+    hour = Column(DateTime, nullable=False)
+
+    # Moyenne horaire en MW
+    value = Column(Float, nullable=False)
+
+    # Date de mise à jour par RTE (révision)
+    updated_date = Column(DateTime, nullable=True)
+
+    # Dernière récupération depuis RTE (fraîcheur du stock)
+    fetched_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("source", "forecast_type", "hour", name="uq_rte_forecast_inputs"),
+        Index("idx_rte_forecast_inputs_hour", "hour"),
+    )
+
+
+class RTEInputSource:
+    CONSUMPTION = "CONSUMPTION"
+    SOLAR = "SOLAR"
+    WIND_ONSHORE = "WIND_ONSHORE"
+    WIND_OFFSHORE = "WIND_OFFSHORE"
@@ -3,7 +3,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 from sqlalchemy import String, Boolean, ForeignKey, DateTime
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 from .base import Base, TimestampMixin
 
 if TYPE_CHECKING:
@@ -20,6 +20,8 @@ class User(Base, TimestampMixin):
     hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
     client_id: Mapped[str] = mapped_column(String(64), unique=True, nullable=False, index=True)
     client_secret: Mapped[str] = mapped_column(String(128), nullable=False)
+    # HMAC-SHA256 of client_secret, used to resolve API keys with an indexed lookup
+    client_secret_hash: Mapped[str | None] = mapped_column(String(64), unique=True, nullable=True, index=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     is_admin: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)  # Kept for backward compatibility
     email_verified: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
@@ -34,5 +36,13 @@ class User(Base, TimestampMixin):
     pdls: Mapped[list["PDL"]] = relationship("PDL", back_populates="user", cascade="all, delete-orphan")
     tokens: Mapped[list["Token"]] = relationship("Token", back_populates="user", cascade="all, delete-orphan")
 
+    @validates("client_secret")
+    def _update_client_secret_hash(self, key: str, client_secret: str) -> str:
+        """Keep the lookup hash in sync whenever client_secret is set or regenerated"""
+        from ..utils.auth import hash_client_secret
+
+        self.client_secret_hash = hash_client_secret(client_secret)
+        return client_secret
+
     def __repr__(self) -> str:
         return f"<User(id={self.id}, email={self.email})>"
@@ -22,6 +22,8 @@ from ..schemas import (
     ErrorDetail,
 )
 from ..services import cache_service, email_service, rate_limiter
+from ..services.pdl_cache import pdl_cache
+from ..services.principal_cache import principal_cache
 from ..utils import (
     verify_password,
     get_password_hash,
@@ -355,11 +357,13 @@ async def delete_account(
     pdls = result.scalars().all()
 
     for pdl in pdls:
-        await cache_service.delete_pattern(f"{pdl.usage_point_id}:*")
+        await cache_service.delete_indexed(pdl.usage_point_id)
 
     # Delete user (cascades to PDL, Token, and EmailVerificationToken)
     await db.delete(current_user)
     await db.commit()
+    await principal_cache.invalidate(current_user.id)
+    await pdl_cache.invalidate(*(pdl.usage_point_id for pdl in pdls))
 
     return APIResponse(success=True, data={"message": "Account deleted successfully"})
 
@@ -408,6 +412,7 @@ async def verify_email(
     user_obj.email_verified = True
     await db.delete(email_token)
     await db.commit()
+    await principal_cache.invalidate(user_obj.id)
 
     logger.info(f"[EMAIL_VERIFICATION] Email verified for user {user_obj.email}")
 
@@ -481,9 +486,11 @@ async def regenerate_secret(
     pdls = result.scalars().all()
 
     for pdl in pdls:
-        await cache_service.delete_pattern(f"{pdl.usage_point_id}:*")
+        await cache_service.delete_indexed(pdl.usage_point_id)
 
     await db.commit()
+    # The previous secret must stop authenticating right away
+    await principal_cache.invalidate(current_user.id)
 
     logger.info(f"[REGENERATE_SECRET] Client secret regenerated for user {current_user.email}, cache cleared")
 
@@ -613,6 +620,7 @@ async def reset_password(request: Request, db: AsyncSession = Depends(get_db)) -
     # Delete the used reset token
     await db.delete(reset_token)
     await db.commit()
+    await principal_cache.invalidate(user_obj.id)
 
     logger.info(f"[RESET_PASSWORD] Password reset successfully for user: {user_obj.email}")
 
@@ -637,6 +645,7 @@ async def toggle_admin_data_sharing(
         current_user.admin_data_sharing_enabled_at = None
 
     await db.commit()
+    await principal_cache.invalidate(current_user.id)
 
     action = "enabled" if current_user.admin_data_sharing else "disabled"
     logger.info(f"[ADMIN_SHARING] User {current_user.email} {action} admin data sharing")
@@ -680,6 +689,7 @@ async def update_password(
     # Update password
     current_user.hashed_password = get_password_hash(new_password)
     await db.commit()
+    await principal_cache.invalidate(current_user.id)
 
     logger.info(f"[UPDATE_PASSWORD] Password updated successfully for user: {current_user.email}")
 
@@ -12,6 +12,9 @@ from ..models.database import get_db
 from ..middleware import require_admin, require_permission, get_current_user
 from ..schemas import APIResponse, ErrorDetail
 from ..services import rate_limiter, cache_service
+from ..services.cpu_executor import cpu_executor
+from ..services.pdl_cache import pdl_cache
+from ..services.principal_cache import principal_cache
 from ..services.price_update_service import PriceUpdateService
 from ..config import settings
 import redis.asyncio as redis
@@ -187,18 +190,8 @@ async def clear_user_cache(
     deleted_count = 0
     if cache_service.redis_client:
         for pdl in pdls:
-            # Clear ALL cache types for each PDL
-            patterns = [
-                f"consumption:detail:{pdl.usage_point_id}:*",
-                f"consumption:daily:{pdl.usage_point_id}:*",
-                f"consumption:reading_type:{pdl.usage_point_id}",
-                f"production:detail:{pdl.usage_point_id}:*",
-                f"production:daily:{pdl.usage_point_id}:*",
-                f"production:reading_type:{pdl.usage_point_id}",
-            ]
-            for pattern in patterns:
-                count = await cache_service.delete_pattern(pattern)
-                deleted_count += count
+            # Clear ALL cache types for each PDL (consumption, production, daily, reading types)
+            deleted_count += await cache_service.delete_indexed(pdl.usage_point_id)
 
     return APIResponse(
         success=True,
@@ -233,15 +226,11 @@ async def clear_user_blacklist(
     deleted_count = 0
     if cache_service.redis_client:
         for pdl in pdls:
-            # Clear blacklist and fail counters for each PDL
-            # Pattern: enedis:blacklist:{usage_point_id}:* and enedis:fail:{usage_point_id}:*
-            patterns = [
-                f"enedis:blacklist:{pdl.usage_point_id}:*",
-                f"enedis:fail:{pdl.usage_point_id}:*",
-            ]
-            for pattern in patterns:
-                count = await cache_service.delete_pattern(pattern)
-                deleted_count += count
+            # Clear blacklist and fail counters for each PDL (one hash each, see routers/enedis.py)
+            deleted_count += await cache_service.redis_client.delete(
+                f"enedis:blacklist:{pdl.usage_point_id}",
+                f"enedis:fail:{pdl.usage_point_id}",
+            )
 
     return APIResponse(
         success=True,
@@ -267,17 +256,9 @@ async def clear_all_consumption_cache(
 
     deleted_count = 0
     if cache_service.redis_client:
-        # Delete all consumption cache keys
-        patterns = [
-            "consumption:detail:*",
-            "consumption:daily:*",
-            "consumption:yearly:*"
-        ]
-
-        for pattern in patterns:
-            count = await cache_service.delete_pattern(pattern)
-            deleted_count += count
-            logger.info(f"[CACHE] Deleted {count} keys matching pattern {pattern}")
+        # Delete all consumption cache keys registered in the per-PDL cache index
+        deleted_count = await cache_service.delete_indexed_all("consumption:")
+        logger.info(f"[CACHE] Deleted {deleted_count} consumption keys")
 
     return APIResponse(
         success=True,
@@ -302,17 +283,9 @@ async def clear_all_production_cache(
 
     deleted_count = 0
     if cache_service.redis_client:
-        # Delete all production cache keys
-        patterns = [
-            "production:detail:*",
-            "production:daily:*",
-            "production:yearly:*"
-        ]
-
-        for pattern in patterns:
-            count = await cache_service.delete_pattern(pattern)
-            deleted_count += count
-            logger.info(f"[CACHE] Deleted {count} keys matching pattern {pattern}")
+        # Delete all production cache keys registered in the per-PDL cache index
+        deleted_count = await cache_service.delete_indexed_all("production:")
+        logger.info(f"[CACHE] Deleted {deleted_count} production keys")
 
     return APIResponse(
         success=True,
@@ -337,20 +310,11 @@ async def clear_all_cache(
 
     deleted_count = 0
     if cache_service.redis_client:
-        # Delete all cache keys (consumption + production)
-        patterns = [
-            "consumption:detail:*",
-            "consumption:daily:*",
-            "consumption:yearly:*",
-            "production:detail:*",
-            "production:daily:*",
-            "production:yearly:*"
-        ]
-
-        for pattern in patterns:
-            count = await cache_service.delete_pattern(pattern)
+        # Delete all cache keys (consumption + production) registered in the per-PDL cache index
+        for prefix in ("consumption:", "production:"):
+            count = await cache_service.delete_indexed_all(prefix)
             deleted_count += count
-            logger.info(f"[CACHE] Deleted {count} keys matching pattern {pattern}")
+            logger.info(f"[CACHE] Deleted {count} keys for {prefix}*")
 
     return APIResponse(
         success=True,
@@ -483,6 +447,7 @@ async def toggle_user_status(
     # Toggle status
     user.is_active = not user.is_active
     await db.commit()
+    await principal_cache.invalidate(user_id)
 
     return APIResponse(
         success=True,
@@ -512,9 +477,14 @@ async def delete_user(
     if user.id == current_user.id:
         return APIResponse(success=False, error=ErrorDetail(code="CANNOT_DELETE_SELF", message="Cannot delete your own account"))
 
+    pdl_result = await db.execute(select(PDL.usage_point_id).where(PDL.user_id == user_id))
+    usage_point_ids = pdl_result.scalars().all()
+
     # Delete user (cascades will handle PDLs, etc.)
     await db.delete(user)
     await db.commit()
+    await principal_cache.invalidate(user_id)
+    await pdl_cache.invalidate(*usage_point_ids)
 
     return APIResponse(
         success=True,
@@ -568,6 +538,7 @@ async def toggle_user_debug_mode(
     # Toggle debug mode
     user.debug_mode = not user.debug_mode
     await db.commit()
+    await principal_cache.invalidate(user_id)
 
     return APIResponse(
         success=True,
@@ -652,55 +623,14 @@ async def get_global_stats(
         "/roles/",
     ]
 
-    # Calculate total API calls today
-    today = datetime.now(UTC).strftime("%Y-%m-%d")
-    total_cached_calls = 0
-    total_no_cache_calls = 0
-    endpoint_stats = {}
-    user_stats = {}  # Track calls per user
+    # Today's API calls, aggregated by the rate limiter at increment time
+    aggregates = await rate_limiter.get_daily_aggregates()
+    today = aggregates["date"]
+    user_stats = aggregates["users"]
 
     # Initialize all endpoints with 0
-    for endpoint in all_endpoints:
-        endpoint_stats[endpoint] = {"cached": 0, "no_cache": 0, "total": 0}
-
-    if cache_service.redis_client:
-        # Get all rate limit keys for today
-        pattern = f"rate_limit:*:*:*:{today}"
-        async for key in cache_service.redis_client.scan_iter(match=pattern):
-            value = await cache_service.redis_client.get(key)
-            if value:
-                count = int(value)
-                # Extract from key: rate_limit:user_id:endpoint:cache_type:date
-                key_str = key.decode('utf-8') if isinstance(key, bytes) else key
-                parts = key_str.split(':')
-                if len(parts) >= 5:
-                    user_id = parts[1]
-                    endpoint = parts[2]
-                    cache_type = parts[3]  # "cached" or "no_cache"
-
-                    # Track per-endpoint stats
-                    if endpoint not in endpoint_stats:
-                        endpoint_stats[endpoint] = {"cached": 0, "no_cache": 0, "total": 0}
-
-                    if cache_type == "cached":
-                        total_cached_calls += count
-                        endpoint_stats[endpoint]["cached"] += count
-                    else:
-                        total_no_cache_calls += count
-                        endpoint_stats[endpoint]["no_cache"] += count
-
-                    endpoint_stats[endpoint]["total"] += count
-
-                    # Track per-user stats
-                    if user_id not in user_stats:
-                        user_stats[user_id] = {"cached": 0, "no_cache": 0, "total": 0}
-
-                    if cache_type == "cached":
-                        user_stats[user_id]["cached"] += count
-                    else:
-                        user_stats[user_id]["no_cache"] += count
-
-                    user_stats[user_id]["total"] += count
+    endpoint_stats = {endpoint: {"cached": 0, "no_cache": 0, "total": 0} for endpoint in all_endpoints}
+    endpoint_stats.update(aggregates["endpoints"])
 
     # Get top 20 users by total calls
     top_users = []
@@ -708,11 +638,13 @@ async def get_global_stats(
         # Get user details from DB
         sorted_user_ids = sorted(user_stats.items(), key=lambda x: x[1]["total"], reverse=True)[:20]
 
+        user_result = await db.execute(
+            select(User).options(selectinload(User.role)).where(User.id.in_([user_id for user_id, _ in sorted_user_ids]))
+        )
+        users_by_id = {user.id: user for user in user_result.scalars().all()}
+
         for user_id, stats in sorted_user_ids:
-            user_result = await db.execute(
-                select(User).options(selectinload(User.role)).where(User.id == user_id)
-            )
-            user = user_result.scalar_one_or_none()
+            user = users_by_id.get(user_id)
 
             if user:
                 top_users.append({
@@ -733,11 +665,7 @@ async def get_global_stats(
             "total_users": total_users,
             "active_users": active_users,
             "total_pdls": total_pdls,
-            "today_api_calls": {
-                "cached": total_cached_calls,
-                "no_cache": total_no_cache_calls,
-                "total": total_cached_calls + total_no_cache_calls
-            },
+            "today_api_calls": aggregates["totals"],
             "endpoint_stats": endpoint_stats,
             "top_users": top_users,
             "date": today
@@ -745,6 +673,16 @@ async def get_global_stats(
     )
 
 
+@router.get("/stats/history", response_model=APIResponse)
+async def get_stats_history(
+    days: int = Query(30, ge=1, le=365, description="Number of days (today included)"),
+    current_user: User = Depends(require_permission('admin_dashboard')),
+) -> APIResponse:
+    """Get daily API call totals for trend charts (admin only)"""
+    history = await rate_limiter.get_daily_totals_history(min(days, settings.RATE_LIMIT_STATS_RETENTION_DAYS))
+    return APIResponse(success=True, data={"history": history})
+
+
 @router.post("/cache/ecowatt/refresh", response_model=APIResponse)
 async def refresh_ecowatt_cache(
     request: Request,
@@ -1197,14 +1135,16 @@ async def refresh_offers(
                 )
             else:
                 # Update all providers
-                _update_scraper_progress("Mise à jour de tous les fournisseurs", 10)
-                results = await service.update_all_providers()
+                _update_scraper_progress("Mise à jour de tous les fournisseurs", 0)
+                results = await service.update_all_providers(progress_callback=_update_scraper_progress)
 
                 successful = sum(1 for r in results.values() if r.get("success"))
                 failed = len(results) - successful
 
                 total_created = sum(r.get("offers_created", 0) for r in results.values() if r.get("success"))
                 total_updated = sum(r.get("offers_updated", 0) for r in results.values() if r.get("success"))
+                # Providers whose documents changed and had to be parsed again (the others came from the scrape cache)
+                reparsed_providers = [name for name, r in results.items() if r.get("reparsed")]
 
                 return APIResponse(
                     success=True,
@@ -1214,6 +1154,7 @@ async def refresh_offers(
                         "providers_failed": failed,
                         "total_offers_created": total_created,
                         "total_offers_updated": total_updated,
+                        "reparsed_providers": reparsed_providers,
                         "results": results
                     }
                 )
@@ -1772,20 +1713,19 @@ async def get_user_cache_stats(
             "production_detail": 0,
         }
 
-        # Count cache entries
+        # Count cache entries from the per-PDL cache index
         if cache_service.redis_client:
-            patterns = {
-                "consumption_daily": f"consumption:daily:{pdl.usage_point_id}:*",
-                "consumption_detail": f"consumption:detail:{pdl.usage_point_id}:*",
-                "production_daily": f"production:daily:{pdl.usage_point_id}:*",
-                "production_detail": f"production:detail:{pdl.usage_point_id}:*",
+            families = {
+                "consumption_daily": "consumption:daily",
+                "consumption_detail": "consumption:detail",
+                "production_daily": "production:daily",
+                "production_detail": "production:detail",
             }
+            cache_stats = await cache_service.get_pdl_cache_stats(pdl.usage_point_id)
 
-            for key_type, pattern in patterns.items():
-                count = 0
-                async for _ in cache_service.redis_client.scan_iter(match=pattern):
-                    count += 1
-                pdl_stats[key_type] = count
+            for key_type, family in families.items():
+                pdl_stats[key_type] = cache_stats.get(family, {}).get("keys", 0)
+            pdl_stats["estimated_bytes"] = sum(f["estimated_bytes"] for f in cache_stats.values())
 
         stats.append(pdl_stats)
 
@@ -1801,6 +1741,75 @@ async def get_user_cache_stats(
     )
 
 
+@router.get("/cpu-pool/stats", response_model=APIResponse)
+async def get_cpu_pool_stats(
+    current_user: User = Depends(require_admin),
+) -> APIResponse:
+    """
+    Get the state of the CPU process pool and per-task queue/execution times (admin only).
+
+    Returns:
+        APIResponse with the pool size and, per task, count, errors, average and max times in ms
+    """
+    return APIResponse(success=True, data=cpu_executor.get_stats())
+
+
+@router.get("/cache/footprint", response_model=APIResponse)
+async def get_cache_footprint(
+    current_user: User = Depends(require_admin),
+) -> APIResponse:
+    """
+    Get the Redis footprint of cached PDL data (admin only).
+
+    Built on the per-PDL cache index: key counts are exact, memory is estimated
+    from MEMORY USAGE sampled per data type.
+
+    Returns:
+        APIResponse with totals per data type, top PDLs by memory and Redis memory info
+    """
+    if not cache_service.redis_client:
+        return APIResponse(
+            success=False,
+            error=ErrorDetail(code="CACHE_UNAVAILABLE", message="Redis is not connected")
+        )
+
+    by_family: dict[str, dict[str, int]] = {}
+    pdls_footprint: list[dict[str, Any]] = []
+    for usage_point_id in await cache_service.get_indexed_pdls():
+        pdl_stats = await cache_service.get_pdl_cache_stats(usage_point_id)
+        if not pdl_stats:
+            continue
+        for family, family_stats in pdl_stats.items():
+            totals = by_family.setdefault(family, {"keys": 0, "estimated_bytes": 0})
+            totals["keys"] += family_stats["keys"]
+            totals["estimated_bytes"] += family_stats["estimated_bytes"]
+        pdls_footprint.append({
+            "usage_point_id": usage_point_id,
+            "keys": sum(f["keys"] for f in pdl_stats.values()),
+            "estimated_bytes": sum(f["estimated_bytes"] for f in pdl_stats.values()),
+        })
+
+    pdls_footprint.sort(key=lambda p: p["estimated_bytes"], reverse=True)
+
+    memory_info = await cache_service.redis_client.info("memory")
+
+    return APIResponse(
+        success=True,
+        data={
+            "pdl_count": len(pdls_footprint),
+            "total_keys": sum(f["keys"] for f in by_family.values()),
+            "total_estimated_bytes": sum(f["estimated_bytes"] for f in by_family.values()),
+            "by_data_type": by_family,
+            "top_pdls": pdls_footprint[:20],
+            "redis": {
+                "used_memory": memory_info.get("used_memory"),
+                "used_memory_peak": memory_info.get("used_memory_peak"),
+                "maxmemory": memory_info.get("maxmemory"),
+            },
+        }
+    )
+
+
 @router.post("/users/{user_id}/fetch-enedis/{pdl_id}", response_model=APIResponse)
 async def admin_fetch_enedis_data(
     user_id: str = Path(..., description="User ID (UUID)"),
@@ -1828,9 +1837,7 @@ async def admin_fetch_enedis_data(
     Returns:
         APIResponse with fetched data from Enedis
     """
-    from datetime import timedelta
     from ..adapters import enedis_adapter
-    from ..models import Token
 
     # Get user with client_secret for cache encryption
     result = await db.execute(select(User).where(User.id == user_id))
@@ -1897,55 +1904,31 @@ async def admin_fetch_enedis_data(
             )
         )
 
-    # Get global API token
-    token_result = await db.execute(
-        select(Token).where(Token.user_id.is_(None), Token.usage_point_id == "__global__").limit(1)
-    )
-    token = token_result.scalar_one_or_none()
-
-    if not token:
+    # Get global API token (held in memory, refreshed before expiry)
+    try:
+        access_token = await enedis_adapter.token_manager.get_token()
+    except Exception as e:
+        logger.error(f"[ADMIN_FETCH] Failed to get API token: {e}")
         return APIResponse(
             success=False,
             error=ErrorDetail(
-                code="NO_API_TOKEN",
-                message="No global API token available. Please configure Enedis API credentials."
+                code="TOKEN_REFRESH_FAILED",
+                message=f"Failed to refresh API token: {str(e)}"
             )
         )
 
-    # Check if token is expired and refresh if needed
-    now_utc = datetime.now(UTC)
-    token_expires = token.expires_at.replace(tzinfo=UTC) if token.expires_at.tzinfo is None else token.expires_at
-
-    if token_expires <= now_utc:
-        try:
-            token_data = await enedis_adapter.get_client_credentials_token()
-            expires_in = token_data.get("expires_in", 3600)
-            token.access_token = token_data["access_token"]
-            token.expires_at = datetime.now(UTC) + timedelta(seconds=expires_in)
-            await db.commit()
-            await db.refresh(token)
-        except Exception as e:
-            logger.error(f"[ADMIN_FETCH] Failed to refresh token: {e}")
-            return APIResponse(
-                success=False,
-                error=ErrorDetail(
-                    code="TOKEN_REFRESH_FAILED",
-                    message=f"Failed to refresh API token: {str(e)}"
-                )
-            )
-
     # Fetch data from Enedis
     try:
         if data_type == "consumption":
             enedis_data = await enedis_adapter.get_consumption_daily(
-                access_token=token.access_token,
+                access_token=access_token,
                 usage_point_id=pdl.usage_point_id,
                 start=start_date,
                 end=end_date
             )
         else:  # production
             enedis_data = await enedis_adapter.get_production_daily(
-                access_token=token.access_token,
+                access_token=access_token,
                 usage_point_id=pdl.usage_point_id,
                 start=start_date,
                 end=end_date
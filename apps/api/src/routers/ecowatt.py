@@ -4,7 +4,7 @@ EcoWatt API endpoints
 
 from datetime import datetime, date, timedelta, UTC
 from typing import List, Optional, Any
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 import logging
@@ -16,6 +16,14 @@ from ..models import User
 from ..models.ecowatt import EcoWatt, EcoWattResponse
 from ..schemas import APIResponse
 from ..services import rate_limiter, cache_service
+from ..services.reference_cache import (
+    ECOWATT_DATASET,
+    is_not_modified,
+    not_modified_response,
+    reference_cache,
+    set_cache_headers,
+)
+from ..services.reference_stats import count_ecowatt_year
 from ..services.rte import rte_service
 
 logger = logging.getLogger(__name__)
@@ -26,47 +34,58 @@ router = APIRouter(prefix="/ecowatt", tags=["EcoWatt"])
 ECOWATT_REFRESH_COOLDOWN = 900  # 15 minutes in seconds
 
 
+async def _check_rate_limit(request: Request, current_user: User) -> None:
+    """Count the request against the user's daily quota (before any cache or database lookup)"""
+    route = request.scope.get("route")
+    endpoint_path = route.path if route else request.url.path
+    is_allowed, current_count, limit = await rate_limiter.increment_and_check(
+        current_user.id, False, current_user.is_admin, endpoint_path
+    )
+    if not is_allowed:
+        raise HTTPException(status_code=429, detail=f"Rate limit exceeded: {current_count}/{limit} requests today")
+
+
 @router.get("/current", response_model=Optional[EcoWattResponse])
 async def get_current_ecowatt(
     request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> Optional[EcoWattResponse]:
+) -> Optional[EcoWattResponse] | Response:
     """
     Get current EcoWatt signal for today
 
     Public endpoint - requires authentication only
     """
-    # Check rate limit
-    route = request.scope.get("route")
-    endpoint_path = route.path if route else request.url.path
-    is_allowed, current_count, limit = await rate_limiter.increment_and_check(
-        current_user.id, False, current_user.is_admin, endpoint_path
-    )
-    if not is_allowed:
-        raise HTTPException(status_code=429, detail=f"Rate limit exceeded: {current_count}/{limit} requests today")
+    await _check_rate_limit(request, current_user)
 
-    # Query database for today's signal
+    # Query database for today's signal (through the in-memory reference cache)
     today = date.today()
-    query = select(EcoWatt).where(
-        and_(
-            EcoWatt.periode >= today,
-            EcoWatt.periode < today + timedelta(days=1)
-        )
-    ).order_by(EcoWatt.generation_datetime.desc())
 
-    result = await db.execute(query)
-    ecowatt = result.scalar_one_or_none()
+    async def load() -> Optional[EcoWattResponse]:
+        query = select(EcoWatt).where(
+            and_(
+                EcoWatt.periode >= today,
+                EcoWatt.periode < today + timedelta(days=1)
+            )
+        ).order_by(EcoWatt.generation_datetime.desc())
+
+        result = await db.execute(query)
+        ecowatt = result.scalar_one_or_none()
+        return EcoWattResponse.from_orm(ecowatt) if ecowatt else None
 
-    if ecowatt:
-        return EcoWattResponse.from_orm(ecowatt)
+    entry = await reference_cache.get_or_load(ECOWATT_DATASET, f"current:{today}", load)
+    if is_not_modified(request, entry):
+        return not_modified_response(entry, private=True)
 
-    return None
+    set_cache_headers(response, entry, private=True)
+    return entry.value
 
 
 @router.get("/forecast", response_model=APIResponse)
 async def get_ecowatt_forecast(
     request: Request,
+    response: Response,
     days: int = Query(
         default=4,
         ge=1,
@@ -80,43 +99,41 @@ async def get_ecowatt_forecast(
     ),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> APIResponse:
+) -> APIResponse | Response:
     """
     Get EcoWatt forecast for the next N days (max 7)
 
     Public endpoint - requires authentication only
     """
-    # Check rate limit
-    route = request.scope.get("route")
-    endpoint_path = route.path if route else request.url.path
-    is_allowed, current_count, limit = await rate_limiter.increment_and_check(
-        current_user.id, False, current_user.is_admin, endpoint_path
-    )
-    if not is_allowed:
-        raise HTTPException(status_code=429, detail=f"Rate limit exceeded: {current_count}/{limit} requests today")
+    await _check_rate_limit(request, current_user)
 
-    # Query database for forecast
+    # Query database for forecast (through the in-memory reference cache)
     today = date.today()
     end_date = today + timedelta(days=days)
 
-    query = select(EcoWatt).where(
-        and_(
-            EcoWatt.periode >= today,
-            EcoWatt.periode < end_date
-        )
-    ).order_by(EcoWatt.periode)
+    async def load() -> List[EcoWattResponse]:
+        query = select(EcoWatt).where(
+            and_(
+                EcoWatt.periode >= today,
+                EcoWatt.periode < end_date
+            )
+        ).order_by(EcoWatt.periode)
 
-    result = await db.execute(query)
-    ecowatt_data = result.scalars().all()
+        result = await db.execute(query)
+        return [EcoWattResponse.from_orm(item) for item in result.scalars().all()]
 
-    data = [EcoWattResponse.from_orm(item) for item in ecowatt_data] if ecowatt_data else []
+    entry = await reference_cache.get_or_load(ECOWATT_DATASET, f"forecast:{today}:{days}", load)
+    if is_not_modified(request, entry):
+        return not_modified_response(entry, private=True)
 
-    return APIResponse(success=True, data=data)
+    set_cache_headers(response, entry, private=True)
+    return APIResponse(success=True, data=entry.value)
 
 
 @router.get("/history", response_model=List[EcoWattResponse])
 async def get_ecowatt_history(
     request: Request,
+    response: Response,
     start_date: date = Query(
         ...,
         description="Start date for history (YYYY-MM-DD)",
@@ -135,20 +152,13 @@ async def get_ecowatt_history(
     ),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> List[EcoWattResponse]:
+) -> List[EcoWattResponse] | Response:
     """
     Get historical EcoWatt data between two dates
 
     Public endpoint - requires authentication only
     """
-    # Check rate limit
-    route = request.scope.get("route")
-    endpoint_path = route.path if route else request.url.path
-    is_allowed, current_count, limit = await rate_limiter.increment_and_check(
-        current_user.id, False, current_user.is_admin, endpoint_path
-    )
-    if not is_allowed:
-        raise HTTPException(status_code=429, detail=f"Rate limit exceeded: {current_count}/{limit} requests today")
+    await _check_rate_limit(request, current_user)
 
     # Limit the date range to prevent too much data
     if (end_date - start_date).days > 365:
@@ -157,23 +167,30 @@ async def get_ecowatt_history(
             detail="Date range cannot exceed 365 days"
         )
 
-    # Query database
-    query = select(EcoWatt).where(
-        and_(
-            EcoWatt.periode >= start_date,
-            EcoWatt.periode <= end_date
-        )
-    ).order_by(EcoWatt.periode)
+    # Query database (through the in-memory reference cache)
+    async def load() -> List[EcoWattResponse]:
+        query = select(EcoWatt).where(
+            and_(
+                EcoWatt.periode >= start_date,
+                EcoWatt.periode <= end_date
+            )
+        ).order_by(EcoWatt.periode)
+
+        result = await db.execute(query)
+        return [EcoWattResponse.from_orm(item) for item in result.scalars().all()]
 
-    result = await db.execute(query)
-    ecowatt_data = result.scalars().all()
+    entry = await reference_cache.get_or_load(ECOWATT_DATASET, f"history:{start_date}:{end_date}", load)
+    if is_not_modified(request, entry):
+        return not_modified_response(entry, private=True)
 
-    return [EcoWattResponse.from_orm(item) for item in ecowatt_data]
+    set_cache_headers(response, entry, private=True)
+    return list(entry.value)
 
 
-@router.get("/statistics")
+@router.get("/statistics", response_model=None)
 async def get_ecowatt_statistics(
     request: Request,
+    response: Response,
     year: int = Query(
         default=datetime.now().year,
         description="Year for statistics",
@@ -185,65 +202,24 @@ async def get_ecowatt_statistics(
     ),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
-) -> dict[str, Any]:
+) -> dict[str, Any] | Response:
     """
     Get EcoWatt statistics for a given year
 
     Public endpoint - requires authentication only
     """
-    # Check rate limit
-    route = request.scope.get("route")
-    endpoint_path = route.path if route else request.url.path
-    is_allowed, current_count, limit = await rate_limiter.increment_and_check(
-        current_user.id, False, current_user.is_admin, endpoint_path
-    )
-    if not is_allowed:
-        raise HTTPException(status_code=429, detail=f"Rate limit exceeded: {current_count}/{limit} requests today")
-
-    # Query database for the year's data
-    start_date = date(year, 1, 1)
-    end_date = date(year, 12, 31)
+    await _check_rate_limit(request, current_user)
 
-    query = select(EcoWatt).where(
-        and_(
-            EcoWatt.periode >= start_date,
-            EcoWatt.periode <= end_date
-        )
-    )
+    # Count signal levels in SQL (through the in-memory reference cache)
+    async def load() -> dict[str, Any]:
+        return await count_ecowatt_year(db, year)
 
-    result = await db.execute(query)
-    ecowatt_data = result.scalars().all()
-
-    if not ecowatt_data:
-        return {
-            "year": year,
-            "total_days": 0,
-            "green_days": 0,
-            "orange_days": 0,
-            "red_days": 0,
-            "percentage_green": 0,
-            "percentage_orange": 0,
-            "percentage_red": 0,
-        }
+    entry = await reference_cache.get_or_load(ECOWATT_DATASET, f"statistics:{year}", load)
+    if is_not_modified(request, entry):
+        return not_modified_response(entry, private=True)
 
-    # Calculate statistics
-    total_days = len(ecowatt_data)
-    green_days = sum(1 for d in ecowatt_data if d.dvalue == 1)
-    orange_days = sum(1 for d in ecowatt_data if d.dvalue == 2)
-    red_days = sum(1 for d in ecowatt_data if d.dvalue == 3)
-
-    statistics = {
-        "year": year,
-        "total_days": total_days,
-        "green_days": green_days,
-        "orange_days": orange_days,
-        "red_days": red_days,
-        "percentage_green": round((green_days / total_days) * 100, 2) if total_days > 0 else 0,
-        "percentage_orange": round((orange_days / total_days) * 100, 2) if total_days > 0 else 0,
-        "percentage_red": round((red_days / total_days) * 100, 2) if total_days > 0 else 0,
-    }
-
-    return statistics
+    set_cache_headers(response, entry, private=True)
+    return dict(entry.value)
 
 
 @router.get("/refresh/status")
@@ -3,13 +3,15 @@ from typing import cast, Optional
 from fastapi import APIRouter, Depends, Query, Request, Path
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from ..models import User, Token, PDL
+from ..models import User, PDL
 from ..models.database import get_db
 from ..schemas import APIResponse, ErrorDetail, CacheDeleteResponse
 from ..middleware import get_current_user, get_impersonation_context, get_encryption_key
 from ..adapters import enedis_adapter
 from ..adapters.demo_adapter import demo_adapter
 from ..services import cache_service, rate_limiter
+from ..services.cache import SWR_POLICIES
+from ..services.pdl_cache import pdl_cache
 import logging
 
 
@@ -38,51 +40,127 @@ def log_with_pdl(level: str, pdl: str, message: str) -> None:
         logger.debug(prefixed_message)
 
 # Blacklist helpers for failed dates
+# One hash per PDL so that a whole batch of dates is checked/updated in one round trip:
+# - enedis:blacklist:{usage_point_id}  date -> blacklist expiry (unix timestamp)
+# - enedis:fail:{usage_point_id}       date -> fail count
+BLACKLIST_TTL_SECONDS = 86400  # 24 hours
+
+
+def _blacklist_key(usage_point_id: str) -> str:
+    return f"enedis:blacklist:{usage_point_id}"
+
+
+def _fail_key(usage_point_id: str) -> str:
+    return f"enedis:fail:{usage_point_id}"
+
+
+def date_range(start: str, end: str) -> list[str]:
+    """Dates (YYYY-MM-DD) from start included to end excluded"""
+    current_date = datetime.strptime(start, "%Y-%m-%d")
+    end_date = datetime.strptime(end, "%Y-%m-%d")
+    dates = []
+    while current_date < end_date:
+        dates.append(current_date.strftime("%Y-%m-%d"))
+        current_date += timedelta(days=1)
+    return dates
+
+
+async def increment_date_fail_counts(usage_point_id: str, dates: list[str]) -> dict[str, int]:
+    """
+    Increment fail counters for several dates in one pipeline.
+    Returns the new fail count per date.
+    """
+    redis_client = cache_service.redis_client
+
+    if not redis_client or not dates:
+        return {date: 0 for date in dates}
+
+    key = _fail_key(usage_point_id)
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for date in dates:
+            pipe.hincrby(key, date, 1)
+        # Counters are reset 24 hours after the first failure of the PDL
+        pipe.expire(key, BLACKLIST_TTL_SECONDS, nx=True)
+        results = await pipe.execute()
+
+    return {date: int(count) for date, count in zip(dates, results)}
+
+
 async def increment_date_fail_count(usage_point_id: str, date: str) -> int:
     """
     Increment fail counter for a specific date.
     Returns the new fail count.
     """
-    key = f"enedis:fail:{usage_point_id}:{date}"
+    counts = await increment_date_fail_counts(usage_point_id, [date])
+    return counts[date]
+
+
+async def filter_blacklisted_dates(usage_point_id: str, dates: list[str]) -> tuple[list[str], list[str]]:
+    """
+    Split dates into (allowed, blacklisted) with a single HMGET.
+    Expired entries are removed from the hash on the way.
+    """
     redis_client = cache_service.redis_client
 
-    if not redis_client:
-        return 0
+    if not redis_client or not dates:
+        return list(dates), []
+
+    key = _blacklist_key(usage_point_id)
+    expiries = await redis_client.hmget(key, dates)
+    now = datetime.now(UTC).timestamp()
+
+    allowed, blacklisted, expired = [], [], []
+    for date, expiry in zip(dates, expiries):
+        if expiry is None:
+            allowed.append(date)
+        elif float(expiry) > now:
+            blacklisted.append(date)
+        else:
+            allowed.append(date)
+            expired.append(date)
 
-    # Increment counter
-    count = await redis_client.incr(key)
+    if expired:
+        await redis_client.hdel(key, *expired)
 
-    # Set expiry to 24 hours on first increment
-    if count == 1:
-        await redis_client.expire(key, 86400)  # 24 hours
+    return allowed, blacklisted
 
-    return cast(int, count)
 
 async def is_date_blacklisted(usage_point_id: str, date: str) -> bool:
     """
     Check if a date is blacklisted (> 5 fails).
     """
-    key = f"enedis:blacklist:{usage_point_id}:{date}"
-    redis_client = cache_service.redis_client
-
-    if not redis_client:
-        return False
+    _, blacklisted = await filter_blacklisted_dates(usage_point_id, [date])
+    return bool(blacklisted)
 
-    result = await redis_client.get(key)
-    return result is not None
 
-async def blacklist_date(usage_point_id: str, date: str) -> None:
+async def blacklist_dates(usage_point_id: str, dates: list[str]) -> None:
     """
-    Blacklist a date for 24 hours.
+    Blacklist several dates for 24 hours in one round trip.
     """
-    key = f"enedis:blacklist:{usage_point_id}:{date}"
     redis_client = cache_service.redis_client
 
-    if not redis_client:
+    if not redis_client or not dates:
         return
 
-    await redis_client.setex(key, 86400, "1")  # 24 hours
-    log_with_pdl("warning", usage_point_id, f"[BLACKLIST] Date {date} blacklisted after 5+ failures")
+    key = _blacklist_key(usage_point_id)
+    expiry = int(datetime.now(UTC).timestamp()) + BLACKLIST_TTL_SECONDS
+    async with redis_client.pipeline(transaction=False) as pipe:
+        pipe.hset(key, mapping={date: expiry for date in dates})
+        # The hash lives as long as its most recent entry
+        pipe.expire(key, BLACKLIST_TTL_SECONDS)
+        await pipe.execute()
+
+    if len(dates) == 1:
+        log_with_pdl("warning", usage_point_id, f"[BLACKLIST] Date {dates[0]} blacklisted after 5+ failures")
+    else:
+        log_with_pdl("warning", usage_point_id, f"[BLACKLIST] {len(dates)} dates blacklisted ({dates[0]} → {dates[-1]})")
+
+
+async def blacklist_date(usage_point_id: str, date: str) -> None:
+    """
+    Blacklist a date for 24 hours.
+    """
+    await blacklist_dates(usage_point_id, [date])
 
 router = APIRouter(
     prefix="/enedis",
@@ -107,17 +185,23 @@ async def get_adapter_for_user(user: User) -> tuple:
     return enedis_adapter, False
 
 
+async def fetch_customer_data(
+    kind: str, usage_point_id: str, user_email: str, access_token: str, encryption_key: str
+) -> dict:
+    """Fetch contract/address/customer/contact data with the adapter matching the user.
+
+    Only plain values are passed (no ORM object) so it can also run as a background
+    cache refresh after the request and its DB session are gone.
+    """
+    if await demo_adapter.is_demo_user(user_email):
+        return cast(dict, await getattr(demo_adapter, f"get_{kind}")(usage_point_id, encryption_key))
+    return cast(dict, await getattr(enedis_adapter, f"get_{kind}")(usage_point_id, access_token))
+
+
 async def verify_pdl_ownership(usage_point_id: str, user: User, db: AsyncSession) -> bool:
     """Verify that the PDL belongs to the current user and is active"""
-    result = await db.execute(
-        select(PDL).where(
-            PDL.user_id == user.id,
-            PDL.usage_point_id == usage_point_id,
-            PDL.is_active == True  # noqa: E712
-        )
-    )
-    pdl = result.scalar_one_or_none()
-    return pdl is not None
+    metadata = await pdl_cache.get(db, usage_point_id)
+    return metadata is not None and metadata.is_owned_by(user.id, active_only=True)
 
 
 async def get_pdl_with_owner(
@@ -137,23 +221,18 @@ async def get_pdl_with_owner(
     1. PDL belongs to current_user, OR
     2. PDL belongs to impersonated_user (admin impersonation with data sharing enabled)
     """
-    # First, try current user's PDL
-    result = await db.execute(
-        select(PDL).where(PDL.user_id == current_user.id, PDL.usage_point_id == usage_point_id)
-    )
-    pdl = result.scalar_one_or_none()
-    if pdl:
-        return pdl, current_user
+    # Resolve the owner from the cached metadata, then load the PDL itself by primary key
+    metadata = await pdl_cache.get(db, usage_point_id)
+    if metadata is None:
+        return None, None
+
+    if metadata.is_owned_by(current_user.id):
+        return await db.get(PDL, metadata.id), current_user
 
     # If impersonating, try impersonated user's PDL
-    if impersonated_user:
-        result = await db.execute(
-            select(PDL).where(PDL.user_id == impersonated_user.id, PDL.usage_point_id == usage_point_id)
-        )
-        pdl = result.scalar_one_or_none()
-        if pdl:
-            logger.info(f"[IMPERSONATION] Admin {current_user.email} accessing PDL {usage_point_id} of user {impersonated_user.email}")
-            return pdl, impersonated_user
+    if impersonated_user and metadata.is_owned_by(impersonated_user.id):
+        logger.info(f"[IMPERSONATION] Admin {current_user.email} accessing PDL {usage_point_id} of user {impersonated_user.email}")
+        return await db.get(PDL, metadata.id), impersonated_user
 
     return None, None
 
@@ -305,87 +384,21 @@ def make_token_error_response(error: TokenError) -> APIResponse:
 
 async def get_valid_token(usage_point_id: str, user: User, db: AsyncSession) -> str | TokenError:
     """Get valid Client Credentials token for Enedis API. Returns access_token string or TokenError."""
+    # Verify PDL ownership (cached), also for demo users
+    if not await verify_pdl_ownership(usage_point_id, user, db):
+        return TokenError(TokenError.PDL_NOT_FOUND)
+
     # Skip token validation for demo users
     if await demo_adapter.is_demo_user(user.email):
         logger.info(f"[DEMO MODE] Skipping token validation for demo user {user.email}")
-        # Still verify PDL ownership
-        if not await verify_pdl_ownership(usage_point_id, user, db):
-            return TokenError(TokenError.PDL_NOT_FOUND)
         return "demo_token"  # Return dummy token for demo users
 
-    # First, verify PDL ownership
-    if not await verify_pdl_ownership(usage_point_id, user, db):
-        return TokenError(TokenError.PDL_NOT_FOUND)
-
-    # Get global client credentials token (stored with user_id=None, usage_point_id='__global__')
-    result = await db.execute(
-        select(Token).where(Token.user_id.is_(None), Token.usage_point_id == "__global__").limit(1)
-    )
-    token = result.scalar_one_or_none()
-
-    # Check if token exists and is expired
-    now_utc = datetime.now(UTC)
-    token_expired = False
-
-    if token:
-        token_expires = token.expires_at.replace(tzinfo=UTC) if token.expires_at.tzinfo is None else token.expires_at
-        token_expired = token_expires <= now_utc
-
-    # If no token exists or token is expired, get new client credentials token
-    if not token or token_expired:
-        try:
-            from datetime import timedelta
-            from sqlalchemy.exc import IntegrityError
-
-            # Get new client credentials token
-            token_data = await enedis_adapter.get_client_credentials_token()
-            expires_in = token_data.get("expires_in", 3600)
-            access_token = token_data["access_token"]
-            expires_at = datetime.now(UTC) + timedelta(seconds=expires_in)
-
-            if token:
-                # Update existing token
-                token.access_token = access_token
-                token.refresh_token = None
-                token.token_type = "Bearer"
-                token.expires_at = expires_at
-                token.scope = token_data.get("scope")
-                await db.commit()
-                await db.refresh(token)
-            else:
-                # Create new global token
-                token = Token(
-                    user_id=None,  # Global token, not user-specific
-                    usage_point_id="__global__",
-                    access_token=access_token,
-                    refresh_token=None,
-                    token_type="Bearer",
-                    expires_at=expires_at,
-                    scope=token_data.get("scope"),
-                )
-                db.add(token)
-
-                try:
-                    await db.commit()
-                    await db.refresh(token)
-                except IntegrityError:
-                    # Race condition: another request created the token
-                    await db.rollback()
-                    # Re-fetch the token that was just created by the other request
-                    result = await db.execute(
-                        select(Token).where(Token.user_id.is_(None), Token.usage_point_id == "__global__").limit(1)
-                    )
-                    token = result.scalar_one_or_none()
-                    if not token:
-                        logger.error("[TOKEN ERROR] Failed to fetch token after race condition")
-                        return TokenError(TokenError.ENEDIS_UNAVAILABLE)
-        except Exception as e:
-            logger.error(f"[TOKEN ERROR] Failed to get client credentials token: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return TokenError(TokenError.ENEDIS_UNAVAILABLE)
-
-    return token.access_token
+    # Global client credentials token, held in memory and refreshed before expiry
+    try:
+        return await enedis_adapter.token_manager.get_token()
+    except Exception as e:
+        logger.error(f"[TOKEN ERROR] Failed to get client credentials token: {str(e)}")
+        return TokenError(TokenError.ENEDIS_UNAVAILABLE)
 
 
 # Metering endpoints
@@ -1071,16 +1084,7 @@ async def get_consumption_detail_batch(
         log_with_pdl("warning", usage_point_id, f"[BATCH] Filtered out {original_missing_count - len(missing_dates)} dates that are too old (> 2 years from yesterday: {oldest_allowed.strftime('%Y-%m-%d')})")
 
     # Filter out blacklisted dates (dates that have failed > 5 times)
-    blacklisted_dates = []
-    if missing_dates:
-        non_blacklisted_dates = []
-        for date in missing_dates:
-            if await is_date_blacklisted(usage_point_id, date):
-                blacklisted_dates.append(date)
-            else:
-                non_blacklisted_dates.append(date)
-
-        missing_dates = non_blacklisted_dates
+    missing_dates, blacklisted_dates = await filter_blacklisted_dates(usage_point_id, missing_dates)
 
     # Log cache summary report with clear formatting
     log_if_debug(effective_user, "info", "[BATCH CACHE REPORT] ═══════════════════════════════════════════════════════════", pdl=usage_point_id)
@@ -1177,6 +1181,7 @@ async def get_consumption_detail_batch(
             retry_count = 0
             max_retries = 7
             chunk_data = None
+            failed_dates: list[str] = []
 
             while current_start <= chunk_end_date and retry_count < max_retries:
                 current_start_str = current_start.strftime("%Y-%m-%d")
@@ -1222,12 +1227,7 @@ async def get_consumption_detail_batch(
                             log_with_pdl("warning", usage_point_id, f"[BATCH BLACKLIST] no_data_found for {current_start_str} to {fetch_end}, blacklisting entire period")
 
                             # Blacklist all dates in the requested range
-                            current_date = datetime.strptime(current_start_str, "%Y-%m-%d")
-                            end_date = datetime.strptime(fetch_end, "%Y-%m-%d")
-                            while current_date < end_date:
-                                date_str = current_date.strftime("%Y-%m-%d")
-                                await blacklist_date(usage_point_id, date_str)
-                                current_date += timedelta(days=1)
+                            await blacklist_dates(usage_point_id, date_range(current_start_str, fetch_end))
 
                             # Skip this entire chunk
                             break
@@ -1236,13 +1236,8 @@ async def get_consumption_detail_batch(
                         elif error_code == "ADAM-ERR0123":
                             log_with_pdl("warning", usage_point_id, f"[BATCH RETRY] ADAM-ERR0123 for {current_start_str}, trying next day...")
 
-                            # Increment fail counter for this date
-                            fail_count = await increment_date_fail_count(usage_point_id, current_start_str)
-                            log_if_debug(effective_user, "debug", f"[BATCH FAIL COUNT] {current_start_str} now has {fail_count} failures", pdl=usage_point_id)
-
-                            # Blacklist if > 5 failures
-                            if fail_count > 5:
-                                await blacklist_date(usage_point_id, current_start_str)
+                            # Fail counters are incremented once the chunk is done
+                            failed_dates.append(current_start_str)
 
                             current_start += timedelta(days=1)
                             retry_count += 1
@@ -1260,28 +1255,24 @@ async def get_consumption_detail_batch(
                         log_with_pdl("warning", usage_point_id, f"[BATCH BLACKLIST] no_data_found for {current_start_str} to {fetch_end}, blacklisting entire period")
 
                         # Blacklist all dates in the requested range
-                        current_date = datetime.strptime(current_start_str, "%Y-%m-%d")
-                        end_date = datetime.strptime(fetch_end, "%Y-%m-%d")
-                        while current_date < end_date:
-                            date_str = current_date.strftime("%Y-%m-%d")
-                            await blacklist_date(usage_point_id, date_str)
-                            current_date += timedelta(days=1)
+                        await blacklist_dates(usage_point_id, date_range(current_start_str, fetch_end))
 
                         # Skip this entire chunk
                         break
 
-                    # For other errors: increment fail counter and retry
-                    fail_count = await increment_date_fail_count(usage_point_id, current_start_str)
-                    log_if_debug(effective_user, "debug", f"[BATCH FAIL COUNT] {current_start_str} now has {fail_count} failures", pdl=usage_point_id)
-
-                    # Blacklist if > 5 failures
-                    if fail_count > 5:
-                        await blacklist_date(usage_point_id, current_start_str)
+                    # For other errors: record the failure and retry
+                    failed_dates.append(current_start_str)
 
                     # Try next day
                     current_start += timedelta(days=1)
                     retry_count += 1
 
+            # Increment the fail counters of the chunk in one round trip, blacklist if > 5 failures
+            if failed_dates:
+                fail_counts = await increment_date_fail_counts(usage_point_id, failed_dates)
+                log_if_debug(effective_user, "debug", f"[BATCH FAIL COUNT] {', '.join(f'{date}: {count}' for date, count in fail_counts.items())}", pdl=usage_point_id)
+                await blacklist_dates(usage_point_id, [date for date, count in fail_counts.items() if count > 5])
+
             # If we exhausted all retries, log and continue to next chunk
             if retry_count >= max_retries:
                 log_with_pdl("warning", usage_point_id, f"[BATCH SKIP] Skipped chunk {chunk_start} to {chunk_end} after {retry_count} retries")
@@ -1713,16 +1704,7 @@ async def get_production_detail_batch(
         log_with_pdl("warning", usage_point_id, f"[BATCH PRODUCTION] Filtered out {original_missing_count - len(missing_dates)} dates that are too old (> 2 years from yesterday: {oldest_allowed.strftime('%Y-%m-%d')})")
 
     # Filter out blacklisted dates (dates that have failed > 5 times)
-    blacklisted_dates = []
-    if missing_dates:
-        non_blacklisted_dates = []
-        for date in missing_dates:
-            if await is_date_blacklisted(usage_point_id, date):
-                blacklisted_dates.append(date)
-            else:
-                non_blacklisted_dates.append(date)
-
-        missing_dates = non_blacklisted_dates
+    missing_dates, blacklisted_dates = await filter_blacklisted_dates(usage_point_id, missing_dates)
 
     # Log cache summary report with clear formatting
     log_if_debug(effective_user, "info", "[BATCH PRODUCTION CACHE REPORT] ═══════════════════════════════════════════════════════════", pdl=usage_point_id)
@@ -1815,6 +1797,7 @@ async def get_production_detail_batch(
             retry_count = 0
             max_retries = 7
             chunk_data = None
+            failed_dates: list[str] = []
 
             while current_start <= chunk_end_date and retry_count < max_retries:
                 current_start_str = current_start.strftime("%Y-%m-%d")
@@ -1860,12 +1843,7 @@ async def get_production_detail_batch(
                             log_with_pdl("warning", usage_point_id, f"[BATCH PRODUCTION BLACKLIST] no_data_found for {current_start_str} to {fetch_end}, blacklisting entire period")
 
                             # Blacklist all dates in the requested range
-                            current_date = datetime.strptime(current_start_str, "%Y-%m-%d")
-                            end_date = datetime.strptime(fetch_end, "%Y-%m-%d")
-                            while current_date < end_date:
-                                date_str = current_date.strftime("%Y-%m-%d")
-                                await blacklist_date(usage_point_id, date_str)
-                                current_date += timedelta(days=1)
+                            await blacklist_dates(usage_point_id, date_range(current_start_str, fetch_end))
 
                             # Skip this entire chunk
                             break
@@ -1874,13 +1852,8 @@ async def get_production_detail_batch(
                         elif error_code == "ADAM-ERR0123":
                             log_with_pdl("warning", usage_point_id, f"[BATCH PRODUCTION RETRY] ADAM-ERR0123 for {current_start_str}, trying next day...")
 
-                            # Increment fail counter for this date
-                            fail_count = await increment_date_fail_count(usage_point_id, current_start_str)
-                            log_if_debug(effective_user, "debug", f"[BATCH PRODUCTION FAIL COUNT] {current_start_str} now has {fail_count} failures", pdl=usage_point_id)
-
-                            # Blacklist if > 5 failures
-                            if fail_count > 5:
-                                await blacklist_date(usage_point_id, current_start_str)
+                            # Fail counters are incremented once the chunk is done
+                            failed_dates.append(current_start_str)
 
                             current_start += timedelta(days=1)
                             retry_count += 1
@@ -1898,28 +1871,24 @@ async def get_production_detail_batch(
                         log_with_pdl("warning", usage_point_id, f"[BATCH PRODUCTION BLACKLIST] no_data_found for {current_start_str} to {fetch_end}, blacklisting entire period")
 
                         # Blacklist all dates in the requested range
-                        current_date = datetime.strptime(current_start_str, "%Y-%m-%d")
-                        end_date = datetime.strptime(fetch_end, "%Y-%m-%d")
-                        while current_date < end_date:
-                            date_str = current_date.strftime("%Y-%m-%d")
-                            await blacklist_date(usage_point_id, date_str)
-                            current_date += timedelta(days=1)
+                        await blacklist_dates(usage_point_id, date_range(current_start_str, fetch_end))
 
                         # Skip this entire chunk
                         break
 
-                    # For other errors: increment fail counter and retry
-                    fail_count = await increment_date_fail_count(usage_point_id, current_start_str)
-                    log_if_debug(effective_user, "debug", f"[BATCH PRODUCTION FAIL COUNT] {current_start_str} now has {fail_count} failures", pdl=usage_point_id)
-
-                    # Blacklist if > 5 failures
-                    if fail_count > 5:
-                        await blacklist_date(usage_point_id, current_start_str)
+                    # For other errors: record the failure and retry
+                    failed_dates.append(current_start_str)
 
                     # Try next day
                     current_start += timedelta(days=1)
                     retry_count += 1
 
+            # Increment the fail counters of the chunk in one round trip, blacklist if > 5 failures
+            if failed_dates:
+                fail_counts = await increment_date_fail_counts(usage_point_id, failed_dates)
+                log_if_debug(effective_user, "debug", f"[BATCH PRODUCTION FAIL COUNT] {', '.join(f'{date}: {count}' for date, count in fail_counts.items())}", pdl=usage_point_id)
+                await blacklist_dates(usage_point_id, [date for date, count in fail_counts.items() if count > 5])
+
             # If we exhausted all retries, log and continue to next chunk
             if retry_count >= max_retries:
                 log_with_pdl("warning", usage_point_id, f"[BATCH PRODUCTION SKIP] Skipped chunk {chunk_start} to {chunk_end} after {retry_count} retries")
@@ -2047,28 +2016,29 @@ async def get_contract(
         assert error_response is not None
         return error_response
 
-    # Check cache
+    # Check cache (stale-while-revalidate: a stale entry is served and refreshed in background)
+    user_email = effective_user.email
     if use_cache:
         cache_key = cache_service.make_cache_key(usage_point_id, "contract")
-        cached_data = await cache_service.get(cache_key, encryption_key)
+        cached_data = await cache_service.get_swr(
+            cache_key,
+            encryption_key,
+            lambda: fetch_customer_data("contract", usage_point_id, user_email, access_token, encryption_key),
+            SWR_POLICIES["contract"],
+        )
         if cached_data:
             return APIResponse(success=True, data=cached_data)
 
     try:
         log_with_pdl("info", usage_point_id, f"[ENEDIS CONTRACT] Fetching contract (use_cache={use_cache})")
 
-        # Use appropriate adapter based on user type
-        adapter, is_demo = await get_adapter_for_user(effective_user)
-        if is_demo:
-            data = await adapter.get_contract(usage_point_id, encryption_key)
-        else:
-            data = await adapter.get_contract(usage_point_id, access_token)
+        data = await fetch_customer_data("contract", usage_point_id, user_email, access_token, encryption_key)
 
         log_with_pdl("info", usage_point_id, "[ENEDIS CONTRACT] Successfully fetched contract data")
 
         # Cache result
         if use_cache:
-            await cache_service.set(cache_key, data, encryption_key)
+            await cache_service.set_swr(cache_key, data, encryption_key, SWR_POLICIES["contract"])
 
         return APIResponse(success=True, data=data)
     except Exception as e:
@@ -2106,24 +2076,25 @@ async def get_address(
         assert error_response is not None
         return error_response
 
-    # Check cache
+    # Check cache (stale-while-revalidate: a stale entry is served and refreshed in background)
+    user_email = effective_user.email
     if use_cache:
         cache_key = cache_service.make_cache_key(usage_point_id, "address")
-        cached_data = await cache_service.get(cache_key, encryption_key)
+        cached_data = await cache_service.get_swr(
+            cache_key,
+            encryption_key,
+            lambda: fetch_customer_data("address", usage_point_id, user_email, access_token, encryption_key),
+            SWR_POLICIES["address"],
+        )
         if cached_data:
             return APIResponse(success=True, data=cached_data)
 
     try:
-        # Use appropriate adapter based on user type
-        adapter, is_demo = await get_adapter_for_user(effective_user)
-        if is_demo:
-            data = await adapter.get_address(usage_point_id, encryption_key)
-        else:
-            data = await adapter.get_address(usage_point_id, access_token)
+        data = await fetch_customer_data("address", usage_point_id, user_email, access_token, encryption_key)
 
         # Cache result
         if use_cache:
-            await cache_service.set(cache_key, data, encryption_key)
+            await cache_service.set_swr(cache_key, data, encryption_key, SWR_POLICIES["address"])
 
         return APIResponse(success=True, data=data)
     except Exception as e:
@@ -2158,24 +2129,25 @@ async def get_customer(
         assert error_response is not None
         return error_response
 
-    # Check cache
+    # Check cache (stale-while-revalidate: a stale entry is served and refreshed in background)
+    user_email = effective_user.email
     if use_cache:
         cache_key = cache_service.make_cache_key(usage_point_id, "customer")
-        cached_data = await cache_service.get(cache_key, encryption_key)
+        cached_data = await cache_service.get_swr(
+            cache_key,
+            encryption_key,
+            lambda: fetch_customer_data("customer", usage_point_id, user_email, access_token, encryption_key),
+            SWR_POLICIES["customer"],
+        )
         if cached_data:
             return APIResponse(success=True, data=cached_data)
 
     try:
-        # Use appropriate adapter based on user type
-        adapter, is_demo = await get_adapter_for_user(effective_user)
-        if is_demo:
-            data = await adapter.get_customer(usage_point_id, encryption_key)
-        else:
-            data = await adapter.get_customer(usage_point_id, access_token)
+        data = await fetch_customer_data("customer", usage_point_id, user_email, access_token, encryption_key)
 
         # Cache result
         if use_cache:
-            await cache_service.set(cache_key, data, encryption_key)
+            await cache_service.set_swr(cache_key, data, encryption_key, SWR_POLICIES["customer"])
 
         return APIResponse(success=True, data=data)
     except Exception as e:
@@ -2210,24 +2182,25 @@ async def get_contact(
         assert error_response is not None
         return error_response
 
-    # Check cache
+    # Check cache (stale-while-revalidate: a stale entry is served and refreshed in background)
+    user_email = effective_user.email
     if use_cache:
         cache_key = cache_service.make_cache_key(usage_point_id, "contact")
-        cached_data = await cache_service.get(cache_key, encryption_key)
+        cached_data = await cache_service.get_swr(
+            cache_key,
+            encryption_key,
+            lambda: fetch_customer_data("contact", usage_point_id, user_email, access_token, encryption_key),
+            SWR_POLICIES["contact"],
+        )
         if cached_data:
             return APIResponse(success=True, data=cached_data)
 
     try:
-        # Use appropriate adapter based on user type
-        adapter, is_demo = await get_adapter_for_user(effective_user)
-        if is_demo:
-            data = await adapter.get_contact(usage_point_id, encryption_key)
-        else:
-            data = await adapter.get_contact(usage_point_id, access_token)
+        data = await fetch_customer_data("contact", usage_point_id, user_email, access_token, encryption_key)
 
         # Cache result
         if use_cache:
-            await cache_service.set(cache_key, data, encryption_key)
+            await cache_service.set_swr(cache_key, data, encryption_key, SWR_POLICIES["contact"])
 
         return APIResponse(success=True, data=data)
     except Exception as e:
@@ -2252,10 +2225,9 @@ async def delete_cache(
             )
         )
 
-    # Delete all consumption cache keys for this PDL
+    # Delete all consumption cache keys for this PDL (from the per-PDL cache index)
     # Cache keys format: consumption:detail:{usage_point_id}:{date}
-    pattern = f"consumption:*:{usage_point_id}:*"
-    deleted_keys = await cache_service.delete_pattern(pattern)
+    deleted_keys = await cache_service.delete_indexed(usage_point_id, "consumption:")
 
     response = CacheDeleteResponse(
         success=True, deleted_keys=deleted_keys, message=f"Deleted {deleted_keys} cached entries"
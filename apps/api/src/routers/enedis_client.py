@@ -15,12 +15,11 @@ import logging
 from datetime import date, datetime, timedelta
 
 from fastapi import APIRouter, Depends, Path, Query
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..adapters.myelectricaldata import get_med_adapter
 from ..middleware import get_current_user
-from ..models import PDL, User
+from ..models import User
 from ..models.database import get_db
 from ..schemas import APIResponse, ErrorDetail
 from ..services.local_data import (
@@ -28,6 +27,7 @@ from ..services.local_data import (
     format_daily_response,
     format_detail_response,
 )
+from ..services.pdl_cache import pdl_cache
 
 logger = logging.getLogger(__name__)
 
@@ -49,15 +49,8 @@ router = APIRouter(
 
 async def verify_pdl_ownership(usage_point_id: str, user: User, db: AsyncSession) -> bool:
     """Verify that the PDL belongs to the current user and is active"""
-    result = await db.execute(
-        select(PDL).where(
-            PDL.user_id == user.id,
-            PDL.usage_point_id == usage_point_id,
-            PDL.is_active == True  # noqa: E712
-        )
-    )
-    pdl = result.scalar_one_or_none()
-    return pdl is not None
+    metadata = await pdl_cache.get(db, usage_point_id)
+    return metadata is not None and metadata.is_owned_by(user.id, active_only=True)
 
 
 def extract_gateway_data(response: dict) -> dict:
@@ -17,6 +17,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.client_mode import ExportConfig, ExportType
 from ..models.database import get_db
+from ..services.exporters.executor import ExportRun, count_points, export_ledger, recorded_run
 
 logger = logging.getLogger(__name__)
 
@@ -514,6 +515,32 @@ async def read_export_metrics(
         }
 
 
+@router.get("/configs/{config_id}/runs")
+async def list_export_runs(
+    config_id: str,
+    limit: int = 20,
+) -> dict[str, Any]:
+    """List the recent runs of an export configuration (this worker's run ledger)
+
+    Scheduled, post-sync and manual runs (POST /configs/{config_id}/run) are all recorded.
+
+    Args:
+        config_id: Export configuration ID
+        limit: Maximum number of runs returned (most recent first)
+
+    Returns:
+        Runs with their status, duration, PDL count, points and bytes exported
+    """
+    runs = export_ledger.recent(config_id, limit=max(1, min(limit, 200)))
+    return {
+        "success": True,
+        "data": {
+            "runs": [run.to_dict() for run in runs],
+            "count": len(runs),
+        },
+    }
+
+
 @router.post("/configs/{config_id}/run")
 async def run_export(
     config_id: str,
@@ -532,6 +559,8 @@ async def run_export(
     - EcoWatt signals
     - Tempo data and consumption by color
 
+    The run is recorded in the run ledger (GET /configs/{config_id}/runs).
+
     Args:
         config_id: Export configuration ID
 
@@ -572,24 +601,29 @@ async def run_export(
 
     usage_point_ids = [pdl.usage_point_id for pdl in pdls]
 
-    # Each export type has its own full export method with comprehensive data
-    if config.export_type == ExportType.HOME_ASSISTANT:
-        return await _run_home_assistant_full_export(config, db, usage_point_ids)
+    async with recorded_run(config) as run:
+        run.pdl_count = len(usage_point_ids)
 
-    if config.export_type == ExportType.MQTT:
-        return await _run_mqtt_full_export(config, db, usage_point_ids)
+        # Each export type has its own full export method with comprehensive data
+        if config.export_type == ExportType.HOME_ASSISTANT:
+            return await _run_home_assistant_full_export(config, db, usage_point_ids, run)
 
-    if config.export_type == ExportType.VICTORIAMETRICS:
-        return await _run_victoriametrics_full_export(config, db, usage_point_ids)
+        if config.export_type == ExportType.MQTT:
+            return await _run_mqtt_full_export(config, db, usage_point_ids, run)
 
-    # Fallback for unknown types
-    return {
-        "success": False,
-        "data": {
-            "message": f"Unknown export type: {config.export_type}",
-            "status": "failed",
-        },
-    }
+        if config.export_type == ExportType.VICTORIAMETRICS:
+            return await _run_victoriametrics_full_export(config, db, usage_point_ids, run)
+
+        # Fallback for unknown types
+        run.status = "failed"
+        run.errors.append(f"Unknown export type: {config.export_type}")
+        return {
+            "success": False,
+            "data": {
+                "message": f"Unknown export type: {config.export_type}",
+                "status": "failed",
+            },
+        }
 
 
 # =============================================================================
@@ -601,6 +635,7 @@ async def _run_home_assistant_full_export(
     config: ExportConfig,
     db: AsyncSession,
     usage_point_ids: list[str],
+    run: ExportRun,
 ) -> dict[str, Any]:
     """Run full Home Assistant export with comprehensive data
 
@@ -633,6 +668,11 @@ async def _run_home_assistant_full_export(
 
         await db.commit()
 
+        run.points = count_points(export_results)
+        run.bytes_sent = exporter.bytes_sent
+        run.errors.extend(export_results.get("errors") or [])
+        run.status = config.last_export_status
+
         logger.info(f"[EXPORT] Completed Home Assistant full export '{config.name}': {export_results}")
 
         return {
@@ -657,6 +697,9 @@ async def _run_home_assistant_full_export(
         config.last_export_error = str(e)
         await db.commit()
 
+        run.status = "failed"
+        run.errors.append(str(e))
+
         return {
             "success": False,
             "data": {
@@ -670,6 +713,7 @@ async def _run_mqtt_full_export(
     config: ExportConfig,
     db: AsyncSession,
     usage_point_ids: list[str],
+    run: ExportRun,
 ) -> dict[str, Any]:
     """Run full MQTT export with comprehensive data
 
@@ -702,6 +746,11 @@ async def _run_mqtt_full_export(
 
         await db.commit()
 
+        run.points = count_points(export_results)
+        run.bytes_sent = exporter.bytes_sent
+        run.errors.extend(export_results.get("errors") or [])
+        run.status = config.last_export_status
+
         logger.info(f"[EXPORT] Completed MQTT full export '{config.name}': {export_results}")
 
         return {
@@ -726,6 +775,9 @@ async def _run_mqtt_full_export(
         config.last_export_error = str(e)
         await db.commit()
 
+        run.status = "failed"
+        run.errors.append(str(e))
+
         return {
             "success": False,
             "data": {
@@ -739,6 +791,7 @@ async def _run_victoriametrics_full_export(
     config: ExportConfig,
     db: AsyncSession,
     usage_point_ids: list[str],
+    run: ExportRun,
 ) -> dict[str, Any]:
     """Run full VictoriaMetrics export with comprehensive data
 
@@ -772,6 +825,11 @@ async def _run_victoriametrics_full_export(
 
         await db.commit()
 
+        run.points = count_points(export_results)
+        run.bytes_sent = exporter.bytes_sent
+        run.errors.extend(export_results.get("errors") or [])
+        run.status = config.last_export_status
+
         logger.info(f"[EXPORT] Completed VictoriaMetrics full export '{config.name}': {export_results}")
 
         return {
@@ -797,6 +855,9 @@ async def _run_victoriametrics_full_export(
         config.last_export_error = str(e)
         await db.commit()
 
+        run.status = "failed"
+        run.errors.append(str(e))
+
         return {
             "success": False,
             "data": {
@@ -1031,8 +1092,8 @@ async def import_ha_statistics_stream(
     Args:
         config_id: Export configuration ID (must be HOME_ASSISTANT type)
         clear_first: Clear existing statistics before import (default: True)
-        sync_delay_ms: Delay in ms between imports to let HA ingest data (default: 10s)
-        chunk_size: Number of statistics records per WebSocket message (default: 500)
+        sync_delay_ms: Maximum back-off delay in ms when HA is slow or fails (default: 10s)
+        chunk_size: Initial number of statistics records per WebSocket message (default: 500)
         incremental: If True, only import new data since last import (faster, default: False)
     """
     stmt = select(ExportConfig).where(ExportConfig.id == config_id)
@@ -16,6 +16,7 @@ from ..models import PDL, Token, User
 from ..models.database import get_db
 from ..schemas import APIResponse, ErrorDetail
 from ..services.cache import cache_service
+from ..services.pdl_cache import pdl_cache
 
 logger = logging.getLogger(__name__)
 
@@ -218,6 +219,8 @@ async def oauth_callback(
                 logger.warning(f"[OAUTH CALLBACK] Impossible de recuperer les infos du contrat: {e}")
 
         await db.commit()
+        # Les PDL crees ont pu etre mis en cache (verification de propriete) avant le contrat
+        await pdl_cache.invalidate(*pdl_ids)
         logger.info("[OAUTH CALLBACK] Commit effectue en base de donnees")
 
         # Redirect to frontend dashboard with success message
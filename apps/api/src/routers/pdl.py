@@ -10,6 +10,7 @@ from ..schemas.requests import AdminPDLCreate
 from ..middleware import get_current_user, require_permission, require_not_demo
 from ..routers.enedis import get_valid_token
 from ..adapters import enedis_adapter
+from ..services.pdl_cache import pdl_cache
 import logging
 
 
@@ -296,6 +297,7 @@ async def create_pdl(
                 logger.warning("[CREATE PDL] Could not detect PDL type, defaulting to CONSUMPTION")
 
             await db.commit()
+            await pdl_cache.invalidate(pdl.usage_point_id)
             await db.refresh(pdl)
     except Exception as e:
         # Don't fail PDL creation if contract fetch fails
@@ -376,6 +378,7 @@ async def delete_pdl(
 
     await db.delete(pdl)
     await db.commit()
+    await pdl_cache.invalidate(pdl.usage_point_id)
 
     return APIResponse(success=True, data={"message": "PDL deleted successfully"})
 
@@ -431,6 +434,7 @@ async def update_pdl_type(
     pdl.has_production = type_data.has_production
 
     await db.commit()
+    await pdl_cache.invalidate(pdl.usage_point_id)
     await db.refresh(pdl)
 
     return APIResponse(
@@ -464,6 +468,7 @@ async def toggle_pdl_active(
     pdl.is_active = active_data.is_active
 
     await db.commit()
+    await pdl_cache.invalidate(pdl.usage_point_id)
     await db.refresh(pdl)
 
     return APIResponse(
@@ -520,6 +525,7 @@ async def update_pdl_pricing_option(
     pdl.pricing_option = pricing_data.pricing_option
 
     await db.commit()
+    await pdl_cache.invalidate(pdl.usage_point_id)
     await db.refresh(pdl)
 
     return APIResponse(
@@ -561,6 +567,7 @@ async def update_pdl_selected_offer(
     if offer_data.selected_offer_id is None:
         pdl.selected_offer_id = None
         await db.commit()
+        await pdl_cache.invalidate(pdl.usage_point_id)
         await db.refresh(pdl)
 
         return APIResponse(
@@ -588,6 +595,7 @@ async def update_pdl_selected_offer(
     pdl.pricing_option = offer.offer_type  # type: ignore[assignment]
 
     await db.commit()
+    await pdl_cache.invalidate(pdl.usage_point_id)
     await db.refresh(pdl)
 
     return APIResponse(
@@ -644,6 +652,7 @@ async def link_production_pdl(
     if link_data.linked_production_pdl_id is None:
         consumption_pdl.linked_production_pdl_id = None
         await db.commit()
+        await pdl_cache.invalidate(consumption_pdl.usage_point_id)
         await db.refresh(consumption_pdl)
 
         return APIResponse(
@@ -689,6 +698,7 @@ async def link_production_pdl(
     consumption_pdl.linked_production_pdl_id = production_pdl.id
 
     await db.commit()
+    await pdl_cache.invalidate(consumption_pdl.usage_point_id)
     await db.refresh(consumption_pdl)
 
     return APIResponse(
@@ -740,6 +750,7 @@ async def update_pdl_contract(
         pdl.offpeak_hours = contract_data.offpeak_hours  # type: ignore
 
     await db.commit()
+    await pdl_cache.invalidate(pdl.usage_point_id)
     await db.refresh(pdl)
 
     return APIResponse(
@@ -832,6 +843,7 @@ async def admin_add_pdl(
 
     db.add(pdl)
     await db.commit()
+    await pdl_cache.invalidate(pdl.usage_point_id)
     await db.refresh(pdl)
 
     pdl_response = PDLResponse(
@@ -1031,6 +1043,7 @@ async def fetch_contract_from_enedis(
             logger.warning("[FETCH CONTRACT] Could not detect PDL type, defaulting to CONSUMPTION")
 
         await db.commit()
+        await pdl_cache.invalidate(pdl.usage_point_id)
         await db.refresh(pdl)
 
         return APIResponse(
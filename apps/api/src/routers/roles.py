@@ -6,6 +6,7 @@ from ..models import User, Role, Permission
 from ..models.database import get_db
 from ..schemas import APIResponse, ErrorDetail, RoleCreate, RoleUpdate
 from ..middleware import get_current_user
+from ..services.principal_cache import principal_cache
 import logging
 
 
@@ -219,6 +220,7 @@ async def update_user_role(
         user.is_admin = (role.name == "admin")
 
         await db.commit()
+        await principal_cache.invalidate(user.id)
         await db.refresh(user)
 
         return APIResponse(
@@ -326,6 +328,7 @@ async def update_role(
             role.permissions = permissions  # type: ignore[assignment]
 
         await db.commit()
+        await principal_cache.invalidate_all()
         await db.refresh(role)
 
         # Reload with permissions for serialization
@@ -402,6 +405,7 @@ async def delete_role(
         role_name = role.name
         await db.delete(role)
         await db.commit()
+        await principal_cache.invalidate_all()
 
         logger.info(f"[ROLE DELETED] {role_name} by {current_user.email}")
 
@@ -461,6 +465,7 @@ async def update_role_permissions(
         # Update role permissions
         role.permissions = permissions_list  # type: ignore[assignment]
         await db.commit()
+        await principal_cache.invalidate_all()
 
         return APIResponse(
             success=True,
@@ -3,7 +3,7 @@
 import logging
 from datetime import UTC, datetime, timedelta
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..config import settings
@@ -11,6 +11,14 @@ from ..middleware import require_action
 from ..models import User
 from ..models.database import get_db
 from ..schemas import APIResponse, ErrorDetail
+from ..services.reference_cache import (
+    TEMPO_DATASET,
+    is_not_modified,
+    not_modified_response,
+    reference_cache,
+    set_cache_headers,
+)
+from ..services.reference_stats import get_tempo_season_counts, get_tempo_season_start, tempo_today
 from ..services.rte import rte_service
 
 logger = logging.getLogger(__name__)
@@ -18,9 +26,27 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/tempo", tags=["Tempo Calendar"])
 
 
+def _serialize_tempo_days(tempo_days: list, with_rte_date: bool = True) -> list[dict]:
+    return [
+        {
+            "date": day.id,  # Use id (YYYY-MM-DD format) instead of date timestamp
+            "color": day.color.value,
+            "updated_at": day.updated_at.isoformat() if day.updated_at else None,
+            **(
+                {"rte_updated_date": day.rte_updated_date.isoformat() if day.rte_updated_date else None}
+                if with_rte_date
+                else {}
+            ),
+        }
+        for day in tempo_days
+    ]
+
+
 @router.get("", response_model=APIResponse)
 @router.get("/", response_model=APIResponse, include_in_schema=False)
 async def get_tempo_calendar(
+    request: Request,
+    response: Response,
     start: str | None = Query(
         None,
         description="Start date (YYYY-MM-DD)",
@@ -36,7 +62,7 @@ async def get_tempo_calendar(
         },
     ),
     db: AsyncSession = Depends(get_db),
-) -> APIResponse:
+) -> APIResponse | Response:
     """
     Get Tempo Calendar (public endpoint for client mode sync)
 
@@ -53,20 +79,16 @@ async def get_tempo_calendar(
         if end:
             end_dt = datetime.fromisoformat(end).replace(tzinfo=UTC)
 
-        # Get data from cache
-        tempo_days = await rte_service.get_tempo_days(db, start_dt, end_dt)
+        # Get data from the in-memory reference cache (database on miss)
+        async def load() -> list[dict]:
+            return _serialize_tempo_days(await rte_service.get_tempo_days(db, start_dt, end_dt), with_rte_date=False)
 
-        return APIResponse(
-            success=True,
-            data=[
-                {
-                    "date": day.id,
-                    "color": day.color.value,
-                    "updated_at": day.updated_at.isoformat() if day.updated_at else None,
-                }
-                for day in tempo_days
-            ],
-        )
+        entry = await reference_cache.get_or_load(TEMPO_DATASET, f"calendar:{start}:{end}", load)
+        if is_not_modified(request, entry):
+            return not_modified_response(entry)
+        set_cache_headers(response, entry)
+
+        return APIResponse(success=True, data=entry.value)
 
     except ValueError as e:
         return APIResponse(success=False, error=ErrorDetail(code="INVALID_DATE", message=f"Invalid date format: {e}"))
@@ -77,6 +99,8 @@ async def get_tempo_calendar(
 
 @router.get("/days", response_model=APIResponse)
 async def get_tempo_days(
+    request: Request,
+    response: Response,
     start_date: str | None = Query(
         None,
         description="Start date (YYYY-MM-DD)",
@@ -94,7 +118,7 @@ async def get_tempo_days(
         },
     ),
     db: AsyncSession = Depends(get_db),
-) -> APIResponse:
+) -> APIResponse | Response:
     """
     Get Tempo Calendar days from cache (public endpoint)
 
@@ -112,21 +136,16 @@ async def get_tempo_days(
         if end_date:
             end_dt = datetime.fromisoformat(end_date).replace(tzinfo=UTC)
 
-        # Get data from cache
-        tempo_days = await rte_service.get_tempo_days(db, start_dt, end_dt)
+        # Get data from the in-memory reference cache (database on miss)
+        async def load() -> list[dict]:
+            return _serialize_tempo_days(await rte_service.get_tempo_days(db, start_dt, end_dt))
 
-        return APIResponse(
-            success=True,
-            data=[
-                {
-                    "date": day.id,  # Use id (YYYY-MM-DD format) instead of date timestamp
-                    "color": day.color.value,
-                    "updated_at": day.updated_at.isoformat() if day.updated_at else None,
-                    "rte_updated_date": day.rte_updated_date.isoformat() if day.rte_updated_date else None,
-                }
-                for day in tempo_days
-            ],
-        )
+        entry = await reference_cache.get_or_load(TEMPO_DATASET, f"days:{start_date}:{end_date}", load)
+        if is_not_modified(request, entry):
+            return not_modified_response(entry)
+        set_cache_headers(response, entry)
+
+        return APIResponse(success=True, data=entry.value)
 
     except ValueError as e:
         return APIResponse(success=False, error=ErrorDetail(code="INVALID_DATE", message=f"Invalid date format: {e}"))
@@ -136,26 +155,27 @@ async def get_tempo_days(
 
 
 @router.get("/today", response_model=APIResponse)
-async def get_today_tempo(db: AsyncSession = Depends(get_db)) -> APIResponse:
+async def get_today_tempo(
+    request: Request, response: Response, db: AsyncSession = Depends(get_db)
+) -> APIResponse | Response:
     """Get today's TEMPO color (public endpoint)"""
     try:
         today = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
-        tempo_day = await rte_service.get_tempo_day(db, today)
 
-        if not tempo_day:
+        async def load() -> dict | None:
+            tempo_day = await rte_service.get_tempo_day(db, today)
+            return _serialize_tempo_days([tempo_day])[0] if tempo_day else None
+
+        entry = await reference_cache.get_or_load(TEMPO_DATASET, f"today:{today.date()}", load)
+        if entry.value is None:
             return APIResponse(
                 success=False, error=ErrorDetail(code="NOT_FOUND", message="TEMPO data not available for today")
             )
+        if is_not_modified(request, entry):
+            return not_modified_response(entry)
+        set_cache_headers(response, entry)
 
-        return APIResponse(
-            success=True,
-            data={
-                "date": tempo_day.id,  # Use id (YYYY-MM-DD format) instead of date timestamp
-                "color": tempo_day.color.value,
-                "updated_at": tempo_day.updated_at.isoformat() if tempo_day.updated_at else None,
-                "rte_updated_date": tempo_day.rte_updated_date.isoformat() if tempo_day.rte_updated_date else None,
-            },
-        )
+        return APIResponse(success=True, data=entry.value)
 
     except Exception as e:
         logger.error(f"[TEMPO ERROR] {str(e)}")
@@ -163,7 +183,9 @@ async def get_today_tempo(db: AsyncSession = Depends(get_db)) -> APIResponse:
 
 
 @router.get("/week", response_model=APIResponse)
-async def get_week_tempo(db: AsyncSession = Depends(get_db)) -> APIResponse:
+async def get_week_tempo(
+    request: Request, response: Response, db: AsyncSession = Depends(get_db)
+) -> APIResponse | Response:
     """Get last 7 days + tomorrow TEMPO colors from cache (public endpoint)"""
     try:
         # Get last 7 days + tomorrow (including today and historical data)
@@ -171,20 +193,15 @@ async def get_week_tempo(db: AsyncSession = Depends(get_db)) -> APIResponse:
         start_date = today - timedelta(days=6)  # 6 days ago + today = 7 days
         end_date = today + timedelta(days=1)  # Include tomorrow if available
 
-        tempo_days = await rte_service.get_tempo_days(db, start_date, end_date)
+        async def load() -> list[dict]:
+            return _serialize_tempo_days(await rte_service.get_tempo_days(db, start_date, end_date))
 
-        return APIResponse(
-            success=True,
-            data=[
-                {
-                    "date": day.id,  # Use id (YYYY-MM-DD format) instead of date timestamp
-                    "color": day.color.value,
-                    "updated_at": day.updated_at.isoformat() if day.updated_at else None,
-                    "rte_updated_date": day.rte_updated_date.isoformat() if day.rte_updated_date else None,
-                }
-                for day in tempo_days
-            ],
-        )
+        entry = await reference_cache.get_or_load(TEMPO_DATASET, f"week:{today.date()}", load)
+        if is_not_modified(request, entry):
+            return not_modified_response(entry)
+        set_cache_headers(response, entry)
+
+        return APIResponse(success=True, data=entry.value)
 
     except Exception as e:
         logger.error(f"[TEMPO ERROR] {str(e)}")
@@ -259,6 +276,7 @@ async def clear_all_tempo_data(
         result = await db.execute(delete(TempoDay))
         deleted_count = result.rowcount
         await db.commit()
+        await reference_cache.invalidate(TEMPO_DATASET)
 
         return APIResponse(
             success=True,
@@ -301,7 +319,10 @@ async def get_tempo_forecast(
     - Seuil_Blanc+Rouge = 4 - 0.015 × JourTempo - 0.026 × StockRestant(Blanc+Rouge)
     - Seuil_Rouge = 3.15 - 0.01 × JourTempo - 0.031 × StockRestant(Rouge)
 
-    Note: Results are cached for 4 hours to minimize RTE API calls.
+    Note: Forecasts are computed once per RTE data revision over the full 6-day horizon
+    and any `days` window is sliced from it. The latest computation is reused for 4 hours
+    without calling RTE; with force_refresh, RTE data is fetched again but the forecasts
+    are only recomputed if RTE published a new revision.
 
     In client mode, forecasts are fetched from the MyElectricalData gateway
     which has access to RTE APIs.
@@ -310,48 +331,50 @@ async def get_tempo_forecast(
         days: Number of days to forecast (1-6, default: 6)
         force_refresh: If True, bypass cache and fetch fresh data from RTE
     """
-    from datetime import date
-
-    # Durée du cache : 4 heures (RTE met à jour les prévisions vers 11h et 19h30)
-    CACHE_TTL_SECONDS = 4 * 3600  # 4 heures
+    from ..services.tempo_forecast import FORECAST_HORIZON_DAYS, FORECAST_LATEST_TTL_SECONDS
 
     try:
         import json
         from ..services.cache import cache_service
 
-        # Clé de cache basée sur le nombre de jours et la date
-        current_date = date.today()
-        cache_key = f"tempo:forecast:{current_date.isoformat()}:{days}"
-
-        # Vérifier le cache local (sauf si force_refresh)
-        if not force_refresh:
-            cached_data = await cache_service.get_raw(cache_key)
-            if cached_data:
-                logger.info(f"[TEMPO FORECAST] Returning cached data for {days} days")
-                return APIResponse(success=True, data=json.loads(cached_data))
+        current_date = tempo_today()
 
         # ══════════════════════════════════════════════════════════════════════
         # MODE CLIENT : Récupérer les prévisions depuis la passerelle
         # La passerelle a accès aux APIs RTE et calcule les prévisions
         # ══════════════════════════════════════════════════════════════════════
         if settings.CLIENT_MODE:
+            # Horizon complet mis en cache une fois par jour, découpé selon `days`
+            cache_key = f"tempo:forecast:{current_date.isoformat()}:gateway"
+
+            if not force_refresh:
+                cached_data = await cache_service.get_raw(cache_key)
+                if cached_data:
+                    logger.info(f"[TEMPO FORECAST] Returning cached gateway data for {days} days")
+                    response_data = json.loads(cached_data)
+                    return APIResponse(
+                        success=True, data={**response_data, "forecasts": response_data.get("forecasts", [])[:days]}
+                    )
+
             logger.info(f"[TEMPO FORECAST] Client mode - fetching from gateway (force={force_refresh})")
 
             from ..adapters.myelectricaldata import get_med_adapter
             adapter = get_med_adapter()
 
             try:
-                response = await adapter.get_tempo_forecast(days=days, force_refresh=force_refresh)
+                response = await adapter.get_tempo_forecast(days=FORECAST_HORIZON_DAYS, force_refresh=force_refresh)
 
                 # La passerelle retourne directement les données au format APIResponse
                 if response.get("success") and response.get("data"):
                     response_data = response["data"]
 
                     # Mettre en cache local pour éviter des appels répétés à la passerelle
-                    await cache_service.set_raw(cache_key, json.dumps(response_data), ttl=CACHE_TTL_SECONDS)
-                    logger.info(f"[TEMPO FORECAST] Cached gateway forecast for {days} days")
+                    await cache_service.set_raw(cache_key, json.dumps(response_data), ttl=FORECAST_LATEST_TTL_SECONDS)
+                    logger.info("[TEMPO FORECAST] Cached gateway forecast")
 
-                    return APIResponse(success=True, data=response_data)
+                    return APIResponse(
+                        success=True, data={**response_data, "forecasts": response_data.get("forecasts", [])[:days]}
+                    )
                 else:
                     error_msg = response.get("error", {}).get("message", "Erreur inconnue de la passerelle")
                     return APIResponse(
@@ -374,38 +397,27 @@ async def get_tempo_forecast(
         # ══════════════════════════════════════════════════════════════════════
         from ..services.tempo_forecast import tempo_forecast_service
 
-        logger.info(f"[TEMPO FORECAST] Server mode - fetching from RTE API (force={force_refresh})")
-
-        # Récupérer les statistiques de la saison en cours
-        today = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
-
-        # Déterminer la saison en cours
-        if current_date.month >= 9:
-            season_start = datetime(current_date.year, 9, 1, tzinfo=UTC)
-        else:
-            season_start = datetime(current_date.year - 1, 9, 1, tzinfo=UTC)
-
-        # Récupérer les jours Tempo de la saison
-        tempo_days = await rte_service.get_tempo_days(db, season_start, today)
-
-        # Compter les jours par couleur
-        blue_used = sum(1 for d in tempo_days if d.color.value == "BLUE")
-        white_used = sum(1 for d in tempo_days if d.color.value == "WHITE")
-        red_used = sum(1 for d in tempo_days if d.color.value == "RED")
+        # Compter les jours par couleur depuis le début de la saison (COUNT ... GROUP BY, mémorisé)
+        season_start = get_tempo_season_start(current_date)
+        color_counts = await get_tempo_season_counts(db, season_start, current_date)
+        blue_used = color_counts["BLUE"]
+        white_used = color_counts["WHITE"]
+        red_used = color_counts["RED"]
 
         logger.info(
             f"[TEMPO FORECAST] Season stats - Blue: {blue_used}/300, "
             f"White: {white_used}/43, Red: {red_used}/22"
         )
 
-        # Générer les prévisions
-        forecasts = await tempo_forecast_service.get_forecasts(
-            days_ahead=days,
+        # Prévisions calculées une fois par révision RTE sur tout l'horizon, découpées selon `days`
+        run = await tempo_forecast_service.get_forecast_run(
             blue_used=blue_used,
             white_used=white_used,
             red_used=red_used,
             reference_date=current_date,
+            force_refresh=force_refresh,
         )
+        forecasts = run.window(days)
 
         # Construire les données de réponse
         response_data = {
@@ -442,14 +454,11 @@ async def get_tempo_forecast(
                 "formula_blanc_rouge": "Seuil = A - B × JourTempo - C × StockRestant(Blanc+Rouge)",
                 "formula_rouge": "Seuil = A' - B' × JourTempo - C' × StockRestant(Rouge)",
             },
-            "cached_at": datetime.now(UTC).isoformat(),
-            "cache_ttl_hours": CACHE_TTL_SECONDS // 3600,
+            "rte_revision": run.revision,
+            "cached_at": run.computed_at,
+            "cache_ttl_hours": FORECAST_LATEST_TTL_SECONDS // 3600,
         }
 
-        # Sauvegarder dans le cache
-        await cache_service.set_raw(cache_key, json.dumps(response_data), ttl=CACHE_TTL_SECONDS)
-        logger.info(f"[TEMPO FORECAST] Cached forecast for {days} days (TTL: {CACHE_TTL_SECONDS // 3600}h)")
-
         return APIResponse(success=True, data=response_data)
 
     except Exception as e:
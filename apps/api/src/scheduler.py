@@ -11,6 +11,7 @@ Uses APScheduler for task scheduling.
 
 import logging
 from datetime import datetime, UTC, timedelta
+from functools import partial
 from typing import Optional, TYPE_CHECKING
 
 from .config import settings
@@ -18,6 +19,7 @@ from .config import settings
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
     from .models.client_mode import ExportConfig
+    from .services.exporters.executor import ExportExecutor, ExportRun
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +44,7 @@ class SyncScheduler:
     def __init__(self) -> None:
         self._scheduler: Optional["AsyncIOScheduler"] = None
         self._running = False
+        self._export_executor: Optional["ExportExecutor"] = None
 
     def start(self) -> None:
         """Start the scheduler
@@ -198,38 +201,42 @@ class SyncScheduler:
         except Exception as e:
             logger.error(f"[SCHEDULER] Post-sync exports failed: {e}")
 
+    def _get_export_executor(self) -> "ExportExecutor":
+        """Executor shared by the export jobs: one concurrency limit, one run per config at a time"""
+        if self._export_executor is None:
+            from .services.exporters.executor import ExportExecutor
+
+            self._export_executor = ExportExecutor()
+        return self._export_executor
+
     async def _run_all_exports(self) -> None:
-        """Run all enabled exports unconditionally (called after sync)."""
+        """Start all enabled exports unconditionally (called after sync)."""
         from sqlalchemy import select
         from .models.client_mode import ExportConfig
         from .models.database import async_session_maker
 
         async with async_session_maker() as db:
-            stmt = select(ExportConfig).where(ExportConfig.is_enabled.is_(True))
+            stmt = select(ExportConfig.id).where(ExportConfig.is_enabled.is_(True))
             result = await db.execute(stmt)
-            configs = result.scalars().all()
+            config_ids = list(result.scalars().all())
 
-            for config in configs:
-                try:
-                    await self._run_export(db, config)
-                    config.next_export_at = datetime.now(UTC) + timedelta(
-                        minutes=config.export_interval_minutes or 60
-                    )
-                    await db.commit()
-                except Exception as e:
-                    logger.error(f"[SCHEDULER] Export failed for {config.name}: {e}")
-                    config.last_export_status = "failed"
-                    config.last_export_error = str(e)[:500]
-                    await db.commit()
+        # Each config runs in its own task, on its own session and with its own timeout
+        self._get_export_executor().dispatch(
+            config_ids,
+            self._run_export_and_reschedule,
+            on_failure=partial(self._mark_export_failed, reschedule=False),
+        )
 
     async def _run_scheduled_exports(self) -> None:
-        """Check for exports that are due and run them
+        """Check for exports that are due and start them
 
         Each export config has its own interval (export_interval_minutes).
-        This job runs every minute to check which exports are due.
+        This job runs every minute to check which exports are due. It only dispatches them:
+        a slow export keeps running in its own task while the next checks go on, and is not
+        started again until it has finished.
         """
         try:
-            from sqlalchemy import select
+            from sqlalchemy import or_, select
 
             from .models.client_mode import ExportConfig
             from .models.database import async_session_maker
@@ -237,55 +244,75 @@ class SyncScheduler:
             now = datetime.now(UTC)
 
             async with async_session_maker() as db:
-                # Get enabled exports that have a schedule and are due
-                stmt = select(ExportConfig).where(
+                # Get enabled exports that have a schedule and are due (or never run)
+                stmt = select(ExportConfig.id, ExportConfig.name).where(
                     ExportConfig.is_enabled.is_(True),
                     ExportConfig.export_interval_minutes.isnot(None),
                     ExportConfig.export_interval_minutes > 0,
+                    or_(ExportConfig.next_export_at.is_(None), ExportConfig.next_export_at <= now),
                 )
                 result = await db.execute(stmt)
-                configs = result.scalars().all()
-
-                for config in configs:
-                    # Check if export is due
-                    if config.next_export_at and config.next_export_at > now:
-                        continue  # Not yet due
-
-                    # Export is due (or first run)
-                    logger.info(f"[SCHEDULER] Running scheduled export: {config.name}")
+                due = result.all()
+
+            if not due:
+                return
+
+            # Due configs run concurrently: a slow export does not delay the others
+            started = self._get_export_executor().dispatch(
+                [config_id for config_id, _ in due],
+                self._run_export_and_reschedule,
+                # Still schedule next run to avoid being stuck
+                on_failure=partial(self._mark_export_failed, reschedule=True),
+            )
+            if started:
+                names = dict(due)
+                logger.info(f"[SCHEDULER] Started scheduled exports: {', '.join(names[config_id] for config_id in started)}")
 
-                    # export_interval_minutes is guaranteed non-None by the query filter
-                    interval = config.export_interval_minutes or 60  # Fallback should never be used
-
-                    try:
-                        # Run export
-                        await self._run_export(db, config)
+        except Exception as e:
+            logger.error(f"[SCHEDULER] Scheduled exports check failed: {e}")
 
-                        # Schedule next run
-                        config.next_export_at = now + timedelta(minutes=interval)
-                        await db.commit()
+    async def _run_export_and_reschedule(
+        self,
+        db: "AsyncSession",
+        config: "ExportConfig",
+        run: "ExportRun",
+    ) -> None:
+        """Run one export configuration, then schedule its next run"""
+        from .services.exporters.executor import next_run_at
 
-                    except Exception as e:
-                        logger.error(f"[SCHEDULER] Export failed for {config.name}: {e}")
-                        config.last_export_status = "failed"
-                        config.last_export_error = str(e)[:500]
-                        # Still schedule next run to avoid being stuck
-                        config.next_export_at = now + timedelta(minutes=interval)
-                        await db.commit()
+        await self._run_export(db, config, run)
 
-        except Exception as e:
-            logger.error(f"[SCHEDULER] Scheduled exports check failed: {e}")
+        config.next_export_at = next_run_at(config.next_export_at, config.export_interval_minutes)
+        await db.commit()
 
-    async def _run_export(self, db: "AsyncSession", config: "ExportConfig") -> None:
+    @staticmethod
+    def _mark_export_failed(config: "ExportConfig", run: "ExportRun", reschedule: bool) -> None:
+        """Record a failed (or timed out) export on its configuration"""
+        config.last_export_status = "failed"
+        config.last_export_error = "; ".join(run.errors[:3])[:500] or None
+        if reschedule:
+            from .services.exporters.executor import next_run_at
+
+            config.next_export_at = next_run_at(config.next_export_at, config.export_interval_minutes)
+
+    async def _run_export(
+        self,
+        db: "AsyncSession",
+        config: "ExportConfig",
+        run: Optional["ExportRun"] = None,
+    ) -> None:
         """Run a single export configuration
 
         For Home Assistant:
         - MQTT Discovery: Exports sensors (Tempo, EcoWatt, Linky stats) via run_full_export()
         - WebSocket API: Imports statistics for Energy Dashboard via import_statistics()
 
+        PDLs are exported concurrently, each on its own session (BaseExporter.map_pdls_concurrently).
+
         Args:
             db: Database session (AsyncSession)
             config: Export configuration (ExportConfig)
+            run: Ledger entry filled with the PDLs, points and bytes exported (optional)
         """
         from sqlalchemy import select
 
@@ -296,9 +323,12 @@ class SyncScheduler:
             ExportType,
         )
         from .services.exporters import (
+            BaseExporter,
             HomeAssistantExporter,
+            MQTTExporter,
             VictoriaMetricsExporter,
         )
+        from .services.exporters.executor import count_points
 
         logger.info(f"[SCHEDULER] Running export: {config.name} ({config.export_type.value})")
 
@@ -312,6 +342,7 @@ class SyncScheduler:
 
         total_exported = 0
         errors: list[str] = []
+        exporter: BaseExporter
 
         # Home Assistant specific handling
         if config.export_type == ExportType.HOME_ASSISTANT:
@@ -354,79 +385,71 @@ class SyncScheduler:
                     logger.error(f"[SCHEDULER] HA Statistics import failed: {e}")
                     errors.append(f"HA Statistics: {str(e)}")
 
+        # Generic MQTT handling
+        elif config.export_type == ExportType.MQTT:
+            exporter = MQTTExporter(config.config)
+            mqtt_result = await exporter.run_full_export(db, usage_point_ids)
+            total_exported += count_points(mqtt_result)
+            errors.extend(mqtt_result.get("errors", []))
+
         # VictoriaMetrics handling
         elif config.export_type == ExportType.VICTORIAMETRICS:
-            vm_exporter = VictoriaMetricsExporter(config.config)
-
-            for pdl in usage_point_ids:
-                # Export consumption daily
-                if config.export_consumption:
-                    cons_daily_stmt = select(ConsumptionData).where(
-                        ConsumptionData.usage_point_id == pdl,
-                        ConsumptionData.granularity == DataGranularity.DAILY,
-                    )
-                    cons_daily_result = await db.execute(cons_daily_stmt)
-                    data = [
-                        {"date": r.date.isoformat(), "value": r.value}
-                        for r in cons_daily_result.scalars().all()
-                    ]
-                    if data:
-                        count = await vm_exporter.export_consumption(pdl, data, "daily")
-                        total_exported += count
-
-                # Export consumption detailed (if enabled)
-                if config.export_consumption and config.export_detailed:
-                    cons_detail_stmt = select(ConsumptionData).where(
-                        ConsumptionData.usage_point_id == pdl,
-                        ConsumptionData.granularity == DataGranularity.DETAILED,
+            exporter = vm_exporter = VictoriaMetricsExporter(config.config)
+
+            # (model, direction, granularity) exported for each PDL
+            series: list[tuple[type[ConsumptionData | ProductionData], str, DataGranularity]] = []
+            if config.export_consumption:
+                series.append((ConsumptionData, "consumption", DataGranularity.DAILY))
+                if config.export_detailed:
+                    series.append((ConsumptionData, "consumption", DataGranularity.DETAILED))
+            if config.export_production:
+                series.append((ProductionData, "production", DataGranularity.DAILY))
+                if config.export_detailed:
+                    series.append((ProductionData, "production", DataGranularity.DETAILED))
+
+            async def export_pdl(pdl_db: "AsyncSession", pdl: str) -> int:
+                exported = 0
+                for model, direction, granularity in series:
+                    result = await pdl_db.execute(
+                        select(model.date, model.interval_start, model.value).where(
+                            model.usage_point_id == pdl,
+                            model.granularity == granularity,
+                        )
                     )
-                    cons_detail_result = await db.execute(cons_detail_stmt)
-                    data = [
-                        {
-                            "date": f"{r.date.isoformat()}T{r.interval_start}:00" if r.interval_start else r.date.isoformat(),
-                            "value": r.value,
-                        }
-                        for r in cons_detail_result.scalars().all()
-                    ]
-                    if data:
-                        count = await vm_exporter.export_consumption(pdl, data, "detailed")
-                        total_exported += count
-
-                # Export production daily
-                if config.export_production:
-                    prod_daily_stmt = select(ProductionData).where(
-                        ProductionData.usage_point_id == pdl,
-                        ProductionData.granularity == DataGranularity.DAILY,
-                    )
-                    prod_daily_result = await db.execute(prod_daily_stmt)
-                    data = [
-                        {"date": r.date.isoformat(), "value": r.value}
-                        for r in prod_daily_result.scalars().all()
-                    ]
-                    if data:
-                        count = await vm_exporter.export_production(pdl, data, "daily")
-                        total_exported += count
-
-                # Export production detailed (if enabled)
-                if config.export_production and config.export_detailed:
-                    prod_detail_stmt = select(ProductionData).where(
-                        ProductionData.usage_point_id == pdl,
-                        ProductionData.granularity == DataGranularity.DETAILED,
-                    )
-                    prod_detail_result = await db.execute(prod_detail_stmt)
-                    data = [
-                        {
-                            "date": f"{r.date.isoformat()}T{r.interval_start}:00" if r.interval_start else r.date.isoformat(),
-                            "value": r.value,
-                        }
-                        for r in prod_detail_result.scalars().all()
-                    ]
-                    if data:
-                        count = await vm_exporter.export_production(pdl, data, "detailed")
-                        total_exported += count
+                    if granularity == DataGranularity.DAILY:
+                        data = [{"date": r.date.isoformat(), "value": r.value} for r in result.all()]
+                    else:
+                        data = [
+                            {
+                                "date": f"{r.date.isoformat()}T{r.interval_start}:00" if r.interval_start else r.date.isoformat(),
+                                "value": r.value,
+                            }
+                            for r in result.all()
+                        ]
+                    if not data:
+                        continue
+                    if direction == "consumption":
+                        exported += await vm_exporter.export_consumption(pdl, data, granularity.value)
+                    else:
+                        exported += await vm_exporter.export_production(pdl, data, granularity.value)
+                return exported
+
+            pdl_results = await vm_exporter.map_pdls_concurrently(usage_point_ids, export_pdl)
+            for pdl, pdl_result in zip(usage_point_ids, pdl_results):
+                if isinstance(pdl_result, BaseException):
+                    logger.error(f"[SCHEDULER] VictoriaMetrics export failed for PDL {pdl}: {pdl_result}")
+                    errors.append(f"{pdl}: {str(pdl_result)}")
+                else:
+                    total_exported += pdl_result
         else:
             raise ValueError(f"Unknown export type: {config.export_type}")
 
+        if run is not None:
+            run.pdl_count = len(usage_point_ids)
+            run.points = total_exported
+            run.bytes_sent = exporter.bytes_sent
+            run.errors.extend(errors)
+
         # Update config status
         config.last_export_at = datetime.now(UTC)
         config.last_export_status = "success" if not errors else "partial"
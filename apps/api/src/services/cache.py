@@ -1,17 +1,146 @@
+import asyncio
 import json
 import logging
+import os
+import random
+import re
+import time
+import zlib
 import redis.asyncio as redis
-from typing import Any, Optional, cast
+from base64 import urlsafe_b64encode
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import sha256
+from typing import Any, Awaitable, Callable, Optional, cast
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+# orjson is optional: faster serialization of large payloads, stdlib json otherwise
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Cache value envelopes
+# - legacy: raw Fernet token (base64 text, always starts with b"gAAAAA"), JSON payload
+# - v2: ENVELOPE_V2 | flags | 12-byte nonce | AES-GCM(payload), header authenticated as AAD
+ENVELOPE_V2 = 0x02
+ENVELOPE_FLAG_ZLIB = 0x01
+ENVELOPE_HEADER_SIZE = 2
+ENVELOPE_NONCE_SIZE = 12
+
+# Number of per-user ciphers kept in memory
+CIPHER_CACHE_SIZE = 1024
+
+
+def _dumps(value: Any) -> bytes:
+    if ORJSON_AVAILABLE:
+        return cast(bytes, orjson.dumps(value))
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def _loads(data: bytes) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@dataclass(frozen=True)
+class SWRPolicy:
+    """Soft/hard TTLs for a stale-while-revalidate key family.
+
+    - soft_ttl: age after which the value is served stale and refreshed in background
+    - hard_ttl: Redis expiry of the value itself (after that, a request blocks on upstream)
+    - jitter: relative randomisation of soft_ttl so that keys written together don't refresh together
+    """
+
+    soft_ttl: int
+    hard_ttl: int
+    jitter: float = 0.0
+
+    def fresh_until(self, now: float) -> float:
+        """Timestamp until which a value written at `now` is considered fresh"""
+        spread = self.soft_ttl * self.jitter
+        return now + self.soft_ttl + random.uniform(-spread, spread)
+
+
+def _customer_data_policy() -> SWRPolicy:
+    return SWRPolicy(
+        soft_ttl=settings.CACHE_CUSTOMER_DATA_SOFT_TTL_SECONDS,
+        hard_ttl=settings.CACHE_CUSTOMER_DATA_HARD_TTL_SECONDS,
+        jitter=settings.CACHE_SWR_JITTER,
+    )
+
+
+# Key families served with stale-while-revalidate (payloads that almost never change)
+SWR_POLICIES: dict[str, SWRPolicy] = {
+    "contract": _customer_data_policy(),
+    "address": _customer_data_policy(),
+    "customer": _customer_data_policy(),
+    "contact": _customer_data_policy(),
+}
+
+# Per-PDL key registry: every cache entry that belongs to a PDL is added to
+# cache_index:{pdl}:{family}, the families of a PDL are listed in cache_index:{pdl}
+# and indexed PDLs in cache_index:pdls. Stats and invalidation then cost O(PDL keys)
+# instead of a SCAN over the whole keyspace.
+CACHE_INDEX_PREFIX = "cache_index"
+CACHE_INDEX_PDLS_KEY = f"{CACHE_INDEX_PREFIX}:pdls"
+CACHE_INDEX_BATCH_SIZE = 500
+
+# Known layouts of PDL cache keys -> (family, usage_point_id)
+_PDL_KEY_PATTERNS = (
+    # consumption:daily:{pdl}:{date}, production:detail:daily:{pdl}:{date}, consumption:reading_type:{pdl}
+    re.compile(r"^(?P<family>(?:consumption|production):(?:detail:daily|detail|daily|reading_type)):(?P<pdl>\d{14})(?::|$)"),
+    # {pdl}:contract, {pdl}:power:end:...:start:... (make_cache_key)
+    re.compile(r"^(?P<pdl>\d{14}):(?P<family>[a-z_]+)(?::|$)"),
+)
+
+
+# Glob matching any usage point id in SCAN patterns
+_PDL_GLOB = "[0-9]" * 14
+
+
+def _legacy_patterns(usage_point_id: str, family_prefix: str = "") -> list[str]:
+    """SCAN patterns of the `_PDL_KEY_PATTERNS` layouts for a PDL (or `_PDL_GLOB`) and family prefix"""
+    patterns = [f"{usage_point_id}:{family_prefix}*"]
+    for kind in ("consumption:", "production:"):
+        if kind.startswith(family_prefix) or family_prefix.startswith(kind):
+            patterns.append(f"{family_prefix or kind}*:{usage_point_id}*")
+    return patterns
+
+
+def index_for_key(key: str) -> Optional[tuple[str, str]]:
+    """Return (usage_point_id, family) for a PDL cache key, None for other keys"""
+    for pattern in _PDL_KEY_PATTERNS:
+        match = pattern.match(key)
+        if match:
+            return match.group("pdl"), match.group("family")
+    return None
+
+
+# Lock held by the worker refreshing a key, so other workers keep serving the stale value
+SWR_LOCK_TTL_SECONDS = 60
+
 
 class CacheService:
     def __init__(self) -> None:
         self.redis_client: Optional[redis.Redis] = None
         self.ttl = settings.CACHE_TTL_SECONDS
+        # Keys currently being refreshed by this process (single-flight)
+        self._refreshing: set[str] = set()
+        # Strong references to background refresh tasks (asyncio only keeps weak ones)
+        self._refresh_tasks: set[asyncio.Task] = set()
+        # LRU of derived ciphers keyed by the SHA-256 of the encryption key
+        self._ciphers: OrderedDict[bytes, tuple[Fernet, AESGCM]] = OrderedDict()
+        self.compact_envelope = settings.CACHE_COMPACT_ENVELOPE
+        self.compress_min_bytes = settings.CACHE_COMPRESS_MIN_BYTES
 
     async def connect(self) -> None:
         """Connect to Redis (graceful failure in client mode without Redis)"""
@@ -35,14 +164,54 @@ class CacheService:
         if self.redis_client:
             await self.redis_client.close()
 
-    def _get_cipher(self, encryption_key: str) -> Fernet:
-        """Get Fernet cipher with user's client_secret as key"""
-        # Derive a valid Fernet key from client_secret
-        from base64 import urlsafe_b64encode
-        from hashlib import sha256
+    def _get_ciphers(self, encryption_key: str) -> tuple[Fernet, AESGCM]:
+        """Get (Fernet, AES-GCM) ciphers derived from the user's client_secret.
+
+        Both use the SHA-256 of the secret as key material; instances are kept in a
+        bounded LRU so hot users don't pay the derivation on every get/set.
+        """
+        digest = sha256(encryption_key.encode()).digest()
+        ciphers = self._ciphers.get(digest)
+        if ciphers is not None:
+            self._ciphers.move_to_end(digest)
+            return ciphers
+
+        ciphers = (Fernet(urlsafe_b64encode(digest)), AESGCM(digest))
+        self._ciphers[digest] = ciphers
+        if len(self._ciphers) > CIPHER_CACHE_SIZE:
+            self._ciphers.popitem(last=False)
+        return ciphers
+
+    def encrypt_value(self, value: Any, encryption_key: str) -> bytes:
+        """Serialize and encrypt a value into a cache envelope"""
+        fernet, aesgcm = self._get_ciphers(encryption_key)
+        payload = _dumps(value)
+
+        if not self.compact_envelope:
+            return fernet.encrypt(payload)
 
-        key = urlsafe_b64encode(sha256(encryption_key.encode()).digest())
-        return Fernet(key)
+        flags = 0
+        if len(payload) >= self.compress_min_bytes:
+            payload = zlib.compress(payload, 6)
+            flags |= ENVELOPE_FLAG_ZLIB
+
+        header = bytes((ENVELOPE_V2, flags))
+        nonce = os.urandom(ENVELOPE_NONCE_SIZE)
+        return header + nonce + aesgcm.encrypt(nonce, payload, header)
+
+    def decrypt_value(self, data: bytes, encryption_key: str) -> Any:
+        """Decrypt a cache envelope (v2 or legacy Fernet) and deserialize it"""
+        fernet, aesgcm = self._get_ciphers(encryption_key)
+
+        if data[0] != ENVELOPE_V2:
+            return _loads(fernet.decrypt(data))
+
+        header = data[:ENVELOPE_HEADER_SIZE]
+        nonce = data[ENVELOPE_HEADER_SIZE:ENVELOPE_HEADER_SIZE + ENVELOPE_NONCE_SIZE]
+        payload = aesgcm.decrypt(nonce, data[ENVELOPE_HEADER_SIZE + ENVELOPE_NONCE_SIZE:], header)
+        if header[1] & ENVELOPE_FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+        return _loads(payload)
 
     async def get(self, key: str, encryption_key: str) -> Optional[dict[str, Any]]:
         """Get cached value and decrypt it"""
@@ -54,9 +223,7 @@ class CacheService:
             if not encrypted_data:
                 return None
 
-            cipher = self._get_cipher(encryption_key)
-            decrypted_data = cipher.decrypt(encrypted_data)
-            return cast(dict[str, Any], json.loads(decrypted_data.decode()))
+            return cast(dict[str, Any], self.decrypt_value(encrypted_data, encryption_key))
         except Exception:
             return None
 
@@ -66,23 +233,211 @@ class CacheService:
             return False
 
         try:
-            cipher = self._get_cipher(encryption_key)
-            json_data = json.dumps(value).encode()
-            encrypted_data = cipher.encrypt(json_data)
+            encrypted_data = self.encrypt_value(value, encryption_key)
 
             cache_ttl = ttl if ttl is not None else self.ttl
-            await self.redis_client.setex(key, cache_ttl, encrypted_data)
+            await self._setex_indexed(key, cache_ttl, encrypted_data)
             return True
         except Exception:
             return False
 
+    async def _setex_indexed(self, key: str, ttl: int, value: bytes | str) -> None:
+        """SETEX a value and register it in the per-PDL key registry (one round trip)"""
+        assert self.redis_client is not None
+        index = index_for_key(key)
+        if index is None:
+            await self.redis_client.setex(key, ttl, value)
+            return
+
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.setex(key, ttl, value)
+            self._register_in_index(pipe, key, ttl, *index)
+            await pipe.execute()
+
+    @staticmethod
+    def _index_key(usage_point_id: str, family: str) -> str:
+        return f"{CACHE_INDEX_PREFIX}:{usage_point_id}:{family}"
+
+    @staticmethod
+    def _families_key(usage_point_id: str) -> str:
+        return f"{CACHE_INDEX_PREFIX}:{usage_point_id}"
+
+    def _register_in_index(self, pipe: Any, key: str, ttl: int, usage_point_id: str, family: str) -> None:
+        """Queue the registry updates for `key` on a pipeline.
+
+        Index and families sets expire with their longest-lived member (EXPIRE NX
+        sets a first expiry, EXPIRE GT only ever extends it). Members, families and
+        PDLs that expired before their set are pruned when the registry is read.
+        """
+        index_key = self._index_key(usage_point_id, family)
+        families_key = self._families_key(usage_point_id)
+        pipe.sadd(index_key, key)
+        pipe.expire(index_key, ttl, nx=True)
+        pipe.expire(index_key, ttl, gt=True)
+        pipe.sadd(families_key, family)
+        pipe.expire(families_key, ttl, nx=True)
+        pipe.expire(families_key, ttl, gt=True)
+        pipe.sadd(CACHE_INDEX_PDLS_KEY, usage_point_id)
+
+    async def get_indexed_pdls(self) -> list[str]:
+        """List PDLs that have at least one registered cache entry"""
+        if not self.redis_client:
+            return []
+
+        try:
+            members = await self.redis_client.smembers(CACHE_INDEX_PDLS_KEY)
+            return sorted(m.decode() if isinstance(m, bytes) else m for m in members)
+        except Exception:
+            return []
+
+    async def _get_index_members(self, usage_point_id: str) -> dict[str, list[str]]:
+        """Registered keys of a PDL grouped by family.
+
+        Families whose index set has expired are removed from the families set,
+        and the PDL is removed from the indexed PDLs once it has no family left.
+        """
+        assert self.redis_client is not None
+        families = sorted(
+            f.decode() if isinstance(f, bytes) else f
+            for f in await self.redis_client.smembers(self._families_key(usage_point_id))
+        )
+        results: list[Any] = []
+        if families:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for family in families:
+                    pipe.smembers(self._index_key(usage_point_id, family))
+                results = await pipe.execute()
+
+        members_by_family = {
+            family: [m.decode() if isinstance(m, bytes) else m for m in members]
+            for family, members in zip(families, results)
+            if members
+        }
+        expired = [family for family in families if family not in members_by_family]
+        if expired:
+            await self.redis_client.srem(self._families_key(usage_point_id), *expired)
+        if not members_by_family:
+            await self.redis_client.srem(CACHE_INDEX_PDLS_KEY, usage_point_id)
+        return members_by_family
+
+    async def get_pdl_cache_stats(self, usage_point_id: str, sample_size: int = 20) -> dict[str, dict[str, int]]:
+        """Key count and estimated memory per family for a PDL.
+
+        Expired members are pruned from the registry on the way. Memory is
+        estimated from MEMORY USAGE of up to `sample_size` keys per family.
+        """
+        if not self.redis_client:
+            return {}
+
+        try:
+            stats: dict[str, dict[str, int]] = {}
+            members_by_family = await self._get_index_members(usage_point_id)
+            for family, members in members_by_family.items():
+                index_key = self._index_key(usage_point_id, family)
+                live: list[str] = []
+                for i in range(0, len(members), CACHE_INDEX_BATCH_SIZE):
+                    batch = members[i:i + CACHE_INDEX_BATCH_SIZE]
+                    async with self.redis_client.pipeline(transaction=False) as pipe:
+                        for member in batch:
+                            pipe.exists(member)
+                        exists = await pipe.execute()
+                    dead = [m for m, e in zip(batch, exists) if not e]
+                    live.extend(m for m, e in zip(batch, exists) if e)
+                    if dead:
+                        await self.redis_client.srem(index_key, *dead)
+
+                if not live:
+                    await self.redis_client.srem(self._families_key(usage_point_id), family)
+                    continue
+
+                sample = random.sample(live, min(sample_size, len(live)))
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for member in sample:
+                        pipe.memory_usage(member)
+                    sizes = [size or 0 for size in await pipe.execute()]
+
+                stats[family] = {
+                    "keys": len(live),
+                    "estimated_bytes": sum(sizes) * len(live) // len(sample),
+                }
+            if members_by_family and not stats:
+                await self.redis_client.srem(CACHE_INDEX_PDLS_KEY, usage_point_id)
+            return stats
+        except Exception as e:
+            logger.warning(f"[CACHE] Failed to compute cache stats for {usage_point_id}: {e}")
+            return {}
+
+    async def delete_indexed(self, usage_point_id: str, family_prefix: str = "") -> int:
+        """Delete cache entries of a PDL whose family starts with `family_prefix`.
+
+        Registered entries are deleted from the registry; with CACHE_INDEX_SCAN_FALLBACK,
+        entries written before the registry existed are then found with SCAN.
+        Returns the number of deleted cache entries.
+        """
+        deleted = await self._delete_registered(usage_point_id, family_prefix)
+        if settings.CACHE_INDEX_SCAN_FALLBACK:
+            for pattern in _legacy_patterns(usage_point_id, family_prefix):
+                deleted += await self.delete_pattern(pattern)
+        return deleted
+
+    async def _delete_registered(self, usage_point_id: str, family_prefix: str) -> int:
+        """Delete the registered cache entries of a PDL (see `delete_indexed`)"""
+        if not self.redis_client:
+            return 0
+
+        try:
+            members_by_family = {
+                family: members
+                for family, members in (await self._get_index_members(usage_point_id)).items()
+                if family.startswith(family_prefix)
+            }
+            deleted = 0
+            members = [m for family_members in members_by_family.values() for m in family_members]
+            for i in range(0, len(members), CACHE_INDEX_BATCH_SIZE):
+                batch = members[i:i + CACHE_INDEX_BATCH_SIZE]
+                deleted += cast(int, await self.redis_client.delete(*batch))
+                # Stale-while-revalidate metadata lives next to the value
+                await self.redis_client.delete(*(self._swr_meta_key(m) for m in batch))
+
+            if members_by_family:
+                families = list(members_by_family)
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    pipe.delete(*(self._index_key(usage_point_id, f) for f in families))
+                    pipe.srem(self._families_key(usage_point_id), *families)
+                    await pipe.execute()
+                if not await self.redis_client.exists(self._families_key(usage_point_id)):
+                    await self.redis_client.srem(CACHE_INDEX_PDLS_KEY, usage_point_id)
+
+            return deleted
+        except Exception as e:
+            logger.warning(f"[CACHE] Failed to delete indexed cache for {usage_point_id}: {e}")
+            return 0
+
+    async def delete_indexed_all(self, family_prefix: str = "") -> int:
+        """Delete cache entries of every PDL (see `delete_indexed`)"""
+        deleted = 0
+        for usage_point_id in await self.get_indexed_pdls():
+            deleted += await self._delete_registered(usage_point_id, family_prefix)
+        if settings.CACHE_INDEX_SCAN_FALLBACK:
+            for pattern in _legacy_patterns(_PDL_GLOB, family_prefix):
+                deleted += await self.delete_pattern(pattern)
+        return deleted
+
     async def delete(self, key: str) -> bool:
         """Delete cached value"""
         if not self.redis_client:
             return False
 
         try:
-            await self.redis_client.delete(key)
+            index = index_for_key(key)
+            if index is None:
+                await self.redis_client.delete(key)
+                return True
+
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.delete(key, self._swr_meta_key(key))
+                pipe.srem(self._index_key(*index), key)
+                await pipe.execute()
             return True
         except Exception:
             return False
@@ -107,7 +462,7 @@ class CacheService:
 
         try:
             cache_ttl = ttl if ttl is not None else self.ttl
-            await self.redis_client.setex(key, cache_ttl, value)
+            await self._setex_indexed(key, cache_ttl, value)
             return True
         except Exception:
             return False
@@ -128,6 +483,107 @@ class CacheService:
         except Exception:
             return 0
 
+    @staticmethod
+    def _swr_meta_key(key: str) -> str:
+        return f"{key}:swr"
+
+    async def set_swr(self, key: str, value: dict[str, Any], encryption_key: str, policy: SWRPolicy) -> bool:
+        """Encrypt and cache value with stale-while-revalidate metadata.
+
+        The value itself lives under `key` (readable with `get`) for hard_ttl seconds,
+        the freshness deadline is stored next to it under `key:swr`.
+        """
+        if not self.redis_client:
+            return False
+
+        try:
+            encrypted_data = self.encrypt_value(value, encryption_key)
+            fresh_until = policy.fresh_until(time.time())
+
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.setex(key, policy.hard_ttl, encrypted_data)
+                pipe.setex(self._swr_meta_key(key), policy.hard_ttl, str(fresh_until))
+                index = index_for_key(key)
+                if index is not None:
+                    self._register_in_index(pipe, key, policy.hard_ttl, *index)
+                await pipe.execute()
+            return True
+        except Exception:
+            return False
+
+    async def get_swr(
+        self,
+        key: str,
+        encryption_key: str,
+        refresh: Callable[[], Awaitable[dict[str, Any]]],
+        policy: SWRPolicy,
+    ) -> Optional[dict[str, Any]]:
+        """Get cached value, refreshing it in background once it is stale.
+
+        Returns None on a miss (the caller fetches synchronously and stores with `set_swr`).
+        A stale hit is returned immediately and `refresh` is scheduled at most once per key:
+        single-flight inside this process, and a short Redis lock across workers.
+        """
+        if not self.redis_client:
+            return None
+
+        try:
+            encrypted_data, meta = await self.redis_client.mget(key, self._swr_meta_key(key))
+            if not encrypted_data:
+                return None
+
+            value = cast(dict[str, Any], self.decrypt_value(encrypted_data, encryption_key))
+        except Exception:
+            return None
+
+        # Entries written with plain `set` have no metadata: treat them as stale
+        fresh_until = float(meta) if meta else 0.0
+        if time.time() >= fresh_until:
+            self._schedule_refresh(key, encryption_key, refresh, policy)
+
+        return value
+
+    def _schedule_refresh(
+        self,
+        key: str,
+        encryption_key: str,
+        refresh: Callable[[], Awaitable[dict[str, Any]]],
+        policy: SWRPolicy,
+    ) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        task = asyncio.create_task(self._refresh_swr(key, encryption_key, refresh, policy))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh_swr(
+        self,
+        key: str,
+        encryption_key: str,
+        refresh: Callable[[], Awaitable[dict[str, Any]]],
+        policy: SWRPolicy,
+    ) -> None:
+        lock_key = f"{key}:swr:lock"
+        try:
+            if not self.redis_client:
+                return
+            # Another worker is already refreshing this key
+            if not await self.redis_client.set(lock_key, "1", nx=True, ex=SWR_LOCK_TTL_SECONDS):
+                return
+            try:
+                value = await refresh()
+                if value:
+                    await self.set_swr(key, value, encryption_key, policy)
+                    logger.debug(f"[CACHE] Background refresh done for {key}")
+            finally:
+                await self.redis_client.delete(lock_key)
+        except Exception as e:
+            # Keep serving the stale value, the next request past soft TTL retries
+            logger.warning(f"[CACHE] Background refresh failed for {key}: {e}")
+        finally:
+            self._refreshing.discard(key)
+
     def make_cache_key(self, usage_point_id: str, endpoint: str, **kwargs: Any) -> str:
         """Generate cache key"""
         parts = [usage_point_id, endpoint]
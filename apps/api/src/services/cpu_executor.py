@@ -0,0 +1,137 @@
+"""Managed process pool for CPU-bound work (PDF parsing, heavy computations)"""
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Sequence, TypeVar
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Modules imported by each worker when it starts, so that the first task does not pay for them
+WARM_MODULES = ("pdfplumber", "pdfminer.high_level", f"{__package__}.price_scrapers")
+
+
+def _warm_worker(modules: Sequence[str]) -> None:
+    """Worker initializer: pre-import the modules used by the tasks"""
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except Exception:  # pragma: no cover - warming is best effort
+            pass
+
+
+def _noop() -> None:
+    """Task used to force the workers to start"""
+
+
+def _timed_call(func: Callable[..., T], args: tuple, submitted_at: float) -> tuple[T, float, float]:
+    """Run `func` in the worker, returning its result with the queue and execution times (seconds)"""
+    started_at = time.time()
+    result = func(*args)
+    return result, started_at - submitted_at, time.time() - started_at
+
+
+class CPUExecutorService:
+    """
+    Process pool shared by CPU-bound jobs (scraper PDF parsing, simulations, statistics building).
+
+    The pool is created on first use (or by `start()` at startup, which also spawns and warms
+    every worker) and shut down with the application. Functions and arguments submitted with
+    `run()` must be picklable (module-level functions, plain data).
+    """
+
+    def __init__(self, max_workers: int, warm_modules: Sequence[str] = WARM_MODULES):
+        self.max_workers = max_workers
+        self.warm_modules = tuple(warm_modules)
+        self._executor: ProcessPoolExecutor | None = None
+        # label -> {"count", "errors", "queue_ms_total", "queue_ms_max", "exec_ms_total", "exec_ms_max"}
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # IMPORTANT: Use "spawn" instead of "fork" to avoid deadlocks with asyncio/uvicorn
+            # Fork copies the entire process state including event loops
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker,
+                initargs=(self.warm_modules,),
+            )
+            logger.info(f"[CPU-POOL] Process pool created ({self.max_workers} workers)")
+        return self._executor
+
+    async def start(self) -> None:
+        """Create the pool and wait for every worker to be spawned and warmed"""
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        await asyncio.gather(*(loop.run_in_executor(executor, _noop) for _ in range(self.max_workers)))
+        logger.info(f"[CPU-POOL] {self.max_workers} workers warmed in {time.perf_counter() - start:.1f}s")
+
+    async def run(self, func: Callable[..., T], *args: Any, label: str | None = None) -> T:
+        """
+        Run a synchronous function in the process pool.
+
+        Args:
+            func: The synchronous function to run (must be picklable - defined at module level)
+            *args: Arguments to pass to the function (must be picklable)
+            label: Name under which queue/execution times are recorded (defaults to the function name)
+
+        Returns:
+            The result of the function
+        """
+        label = label or getattr(func, "__qualname__", repr(func))
+        stats = self._stats.setdefault(label, {
+            "count": 0, "errors": 0,
+            "queue_ms_total": 0.0, "queue_ms_max": 0.0,
+            "exec_ms_total": 0.0, "exec_ms_max": 0.0,
+        })
+        loop = asyncio.get_running_loop()
+        try:
+            result, queued, executed = await loop.run_in_executor(
+                self._get_executor(), _timed_call, func, args, time.time()
+            )
+        except Exception:
+            stats["errors"] += 1
+            raise
+
+        queue_ms, exec_ms = queued * 1000, executed * 1000
+        stats["count"] += 1
+        stats["queue_ms_total"] += queue_ms
+        stats["queue_ms_max"] = max(stats["queue_ms_max"], queue_ms)
+        stats["exec_ms_total"] += exec_ms
+        stats["exec_ms_max"] = max(stats["exec_ms_max"], exec_ms)
+        logger.debug(f"[CPU-POOL] {label}: queued {queue_ms:.0f}ms, executed {exec_ms:.0f}ms")
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool state and per-task timings (averages and maxima in milliseconds)"""
+        tasks = {}
+        for label, stats in self._stats.items():
+            count = stats["count"] or 1
+            tasks[label] = {
+                "count": int(stats["count"]),
+                "errors": int(stats["errors"]),
+                "queue_ms_avg": round(stats["queue_ms_total"] / count, 1),
+                "queue_ms_max": round(stats["queue_ms_max"], 1),
+                "exec_ms_avg": round(stats["exec_ms_total"] / count, 1),
+                "exec_ms_max": round(stats["exec_ms_max"], 1),
+            }
+        return {"started": self._executor is not None, "max_workers": self.max_workers, "tasks": tasks}
+
+    async def shutdown(self) -> None:
+        """Stop the workers (pending tasks are cancelled)"""
+        if self._executor is None:
+            return
+        executor, self._executor = self._executor, None
+        await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+        logger.info("[CPU-POOL] Process pool shut down")
+
+
+cpu_executor = CPUExecutorService(max_workers=settings.CPU_POOL_WORKERS)
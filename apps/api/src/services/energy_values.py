@@ -0,0 +1,43 @@
+"""
+Normalization of stored energy values
+
+Detailed readings hold the average power (W) over their interval, daily readings hold energy (Wh).
+The interval length and the Wh value are computed once when the readings are stored
+(`interval_minutes` and `value_wh` columns of consumption_data / production_data), so readers
+never have to decode `raw_data` nor parse "PT30M" durations again.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Optional
+
+# Enedis detailed data default (load curve): 30-minute intervals
+DEFAULT_INTERVAL_MINUTES = 30
+
+_DURATION_PATTERN = re.compile(r"PT(\d+)([HM])")
+
+
+@lru_cache(maxsize=64)
+def parse_interval_minutes(interval_length: str) -> Optional[int]:
+    """Minutes of an ISO 8601 duration like "PT30M" or "PT1H", None for other durations ("P1D")"""
+    match = _DURATION_PATTERN.match(interval_length)
+    if not match:
+        return None
+    value = int(match.group(1))
+    return value * 60 if match.group(2) == "H" else value
+
+
+def detailed_interval_minutes(raw_data: Optional[dict[str, Any]]) -> Optional[int]:
+    """Interval length (minutes) of a detailed reading, 30 when the reading does not tell"""
+    if not raw_data:
+        return DEFAULT_INTERVAL_MINUTES
+    return parse_interval_minutes(str(raw_data.get("interval_length", "PT30M")))
+
+
+def value_to_wh(value: Optional[int | float], interval_minutes: Optional[int]) -> float:
+    """Energy (Wh) of a stored value: W over `interval_minutes`, or already Wh when it is None"""
+    if value is None:
+        return 0.0
+    if not interval_minutes or interval_minutes <= 0:
+        return float(value)
+    return float(value) * interval_minutes / 60
@@ -5,10 +5,45 @@ Abstract base class for all exporters.
 
 import logging
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Awaitable, Callable, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+def payload_size(payload: Any) -> int:
+    """Size in bytes of a published payload (str, bytes or scalar)"""
+    if payload is None:
+        return 0
+    if isinstance(payload, (bytes, bytearray)):
+        return len(payload)
+    return len(str(payload).encode("utf-8"))
+
+
+class PublishCounter:
+    """MQTT client wrapper adding the size of every published payload to the exporter's bytes_sent"""
+
+    def __init__(self, client: Any, exporter: "BaseExporter") -> None:
+        self._client = client
+        self._exporter = exporter
+
+    async def __aenter__(self) -> "PublishCounter":
+        await self._client.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> Any:
+        return await self._client.__aexit__(*exc_info)
+
+    async def publish(self, topic: str, payload: Any = None, *args: Any, **kwargs: Any) -> Any:
+        self._exporter.bytes_sent += payload_size(payload)
+        return await self._client.publish(topic, payload, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
 
 class BaseExporter(ABC):
     """Abstract base class for data exporters
@@ -26,6 +61,8 @@ class BaseExporter(ABC):
             config: Type-specific configuration dict
         """
         self.config = config
+        # Payload bytes sent to the target since the exporter was created (run ledger)
+        self.bytes_sent = 0
         self._validate_config()
 
     @abstractmethod
@@ -87,6 +124,20 @@ class BaseExporter(ABC):
         """
         pass
 
+    async def map_pdls_concurrently(
+        self,
+        usage_point_ids: list[str],
+        step: Callable[[AsyncSession, str], Awaitable[T]],
+    ) -> list[T | BaseException]:
+        """Run a per-PDL step concurrently, each PDL on its own session
+
+        At most "max_workers" (configuration) or EXPORT_PDL_WORKERS PDLs at a time. Results are
+        in the order of `usage_point_ids`; a failing PDL gives its exception instead.
+        """
+        from .executor import export_workers, map_pdls
+
+        return await map_pdls(usage_point_ids, step, export_workers(self.config))
+
     async def close(self) -> None:
         """Close any open connections"""
         pass
@@ -0,0 +1,97 @@
+"""Lightweight energy data reads for exporters
+
+Exporters walk the whole consumption/production history of a PDL (2 years of 30-minute data is
+~35000 rows). Loading it as ORM objects materializes the id, timestamps, source and raw_data JSON
+of every row; these helpers only select the columns the statistics need and stream them.
+
+- find_energy_history: granularity to export (detailed, else daily) and its date range
+- stream_energy_rows: (date, interval_start, value, value_wh) rows in date order, by batches
+- load_tempo_colors: Tempo colors of a date range only
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, AsyncIterator
+
+from sqlalchemy import Row, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...models.client_mode import ConsumptionData, DataGranularity, ProductionData
+from ...models.tempo_day import TempoColor, TempoDay
+
+# Lignes récupérées par aller-retour avec la base pendant le parcours de l'historique
+ENERGY_STREAM_BATCH_SIZE = 2000
+
+EnergyModel = type[ConsumptionData] | type[ProductionData]
+
+
+@dataclass(frozen=True)
+class EnergyHistory:
+    """Stored history of one PDL for one granularity, since an optional date"""
+
+    pdl: str
+    granularity: DataGranularity
+    since: date | None
+    first_date: date
+    last_date: date
+    row_count: int
+
+    @property
+    def is_detailed(self) -> bool:
+        return self.granularity == DataGranularity.DETAILED
+
+
+def _history_filter(model: EnergyModel, pdl: str, granularity: DataGranularity, since: date | None) -> list[Any]:
+    conditions = [model.usage_point_id == pdl, model.granularity == granularity]
+    if since:
+        conditions.append(model.date >= since)
+    return conditions
+
+
+async def find_energy_history(
+    db: AsyncSession,
+    model: EnergyModel,
+    pdl: str,
+    since: date | None = None,
+) -> EnergyHistory | None:
+    """Detailed history if there is any since `since`, else daily history, else None"""
+    for granularity in (DataGranularity.DETAILED, DataGranularity.DAILY):
+        result = await db.execute(
+            select(func.min(model.date), func.max(model.date), func.count())
+            .where(*_history_filter(model, pdl, granularity, since))
+        )
+        first_date, last_date, row_count = result.one()
+        if row_count:
+            return EnergyHistory(pdl, granularity, since, first_date, last_date, row_count)
+    return None
+
+
+async def stream_energy_rows(
+    db: AsyncSession,
+    model: EnergyModel,
+    history: EnergyHistory,
+    batch_size: int = ENERGY_STREAM_BATCH_SIZE,
+) -> AsyncIterator[Row]:
+    """Rows (date, interval_start, value, value_wh) of a history, in date and interval order"""
+    query = (
+        select(model.date, model.interval_start, model.value, model.value_wh)
+        .where(*_history_filter(model, history.pdl, history.granularity, history.since))
+        .order_by(model.date, model.interval_start)
+        .execution_options(yield_per=batch_size)
+    )
+    result = await db.stream(query)
+    async for partition in result.partitions():
+        for row in partition:
+            yield row
+
+
+async def load_tempo_colors(db: AsyncSession, start: date, end: date) -> dict[str, TempoColor]:
+    """Tempo colors by "YYYY-MM-DD" between two dates (included)"""
+    result = await db.execute(
+        select(TempoDay.id, TempoDay.color)
+        .where(TempoDay.id >= start.isoformat())
+        .where(TempoDay.id <= end.isoformat())
+    )
+    return {day_id: color for day_id, color in result.all()}
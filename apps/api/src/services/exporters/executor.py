@@ -0,0 +1,275 @@
+"""Concurrent export execution
+
+- map_pdls: runs a per-PDL export step on its own database session, a bounded number at a time
+- ExportExecutor: runs export configurations concurrently, each on its own session and with its
+  own timeout, so a slow target (e.g. a Home Assistant statistics import) does not hold back the
+  exports queued behind it; `dispatch` starts them in background tasks, never twice at a time
+- next_run_at: next scheduled run, on the grid of the previous one (no drift by the run duration)
+- ExportLedger: recent runs of this worker (duration, points and bytes exported, status)
+- recorded_run: ledger entry of a run started outside the executor (manual run from the API)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional, Sequence, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...config import settings
+from ...models.client_mode import ExportConfig
+from ...models.database import async_session_maker
+
+logger = logging.getLogger(__name__)
+
+# Nombre d'exécutions conservées en mémoire par le ledger
+EXPORT_LEDGER_SIZE = 200
+
+T = TypeVar("T")
+
+
+@dataclass
+class ExportRun:
+    """One run of an export configuration"""
+
+    config_id: str
+    config_name: str = ""
+    export_type: str = ""
+    started_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    duration_seconds: float = 0.0
+    pdl_count: int = 0
+    points: int = 0
+    bytes_sent: int = 0
+    status: str = "running"  # success, partial, failed, timeout
+    errors: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["started_at"] = self.started_at.isoformat()
+        data["duration_seconds"] = round(self.duration_seconds, 3)
+        return data
+
+
+class ExportLedger:
+    """Recent export runs of this worker, newest last"""
+
+    def __init__(self, max_runs: int = EXPORT_LEDGER_SIZE):
+        self._runs: deque[ExportRun] = deque(maxlen=max_runs)
+
+    def record(self, run: ExportRun) -> None:
+        self._runs.append(run)
+
+    def recent(self, config_id: Optional[str] = None, limit: int = 50) -> list[ExportRun]:
+        """Most recent runs first, optionally for one configuration"""
+        runs = [run for run in reversed(self._runs) if config_id is None or run.config_id == config_id]
+        return runs[:limit]
+
+
+export_ledger = ExportLedger()
+
+
+def count_points(results: dict[str, Any]) -> int:
+    """Points exported according to a run_full_export() result (sum of its counters)"""
+    return sum(value for value in results.values() if isinstance(value, int) and not isinstance(value, bool))
+
+
+def export_workers(config: dict[str, Any]) -> int:
+    """PDLs exported at the same time for a configuration"""
+    return max(1, int(config.get("max_workers") or settings.EXPORT_PDL_WORKERS))
+
+
+def export_timeout(config: dict[str, Any]) -> float:
+    """Time allowed to a whole configuration run, in seconds"""
+    return float(config.get("timeout_seconds") or settings.EXPORT_TIMEOUT_SECONDS)
+
+
+def next_run_at(previous: Optional[datetime], interval_minutes: Optional[int], now: Optional[datetime] = None) -> datetime:
+    """First slot after `now` on the grid previous + k * interval
+
+    Slots missed while the export was running (or the app stopped) are skipped. A schedule
+    that is not due yet is kept, so an extra run (after a sync) does not move it.
+    """
+    now = now or datetime.now(UTC)
+    interval = timedelta(minutes=interval_minutes or 60)
+    if previous is None:
+        return now + interval
+    if previous.tzinfo is None:  # SQLite returns naive datetimes
+        previous = previous.replace(tzinfo=UTC)
+    if previous > now:
+        return previous
+    return previous + ((now - previous) // interval + 1) * interval
+
+
+async def map_pdls(
+    usage_point_ids: Iterable[str],
+    step: Callable[[AsyncSession, str], Awaitable[T]],
+    max_workers: int,
+) -> list[T | BaseException]:
+    """Run `step(db, pdl)` for every PDL, each on its own session, at most `max_workers` at a time
+
+    Results are in the order of `usage_point_ids`; a failing PDL gives its exception instead.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_workers))
+
+    async def run_one(pdl: str) -> T:
+        async with semaphore:
+            async with async_session_maker() as db:
+                return await step(db, pdl)
+
+    return await asyncio.gather(*(run_one(pdl) for pdl in usage_point_ids), return_exceptions=True)
+
+
+# runner(db, config, run): runs the export and fills run.points / run.bytes_sent / run.errors
+ExportRunner = Callable[[AsyncSession, ExportConfig, ExportRun], Awaitable[None]]
+# on_failure(config, run): updates the configuration after a failed or timed out run
+FailureHandler = Callable[[ExportConfig, ExportRun], None]
+
+
+class ExportExecutor:
+    """Runs export configurations concurrently, each with its own session and timeout
+
+    The concurrency limit applies to every run of the executor, whether awaited (`run`) or
+    started in the background (`dispatch`).
+    """
+
+    def __init__(
+        self,
+        max_concurrent_configs: int | None = None,
+        ledger: ExportLedger = export_ledger,
+    ):
+        self.max_concurrent_configs = max(1, max_concurrent_configs or settings.EXPORT_MAX_CONCURRENT_CONFIGS)
+        self.ledger = ledger
+        self._semaphore = asyncio.Semaphore(self.max_concurrent_configs)
+        # Configurations queued or running, and the background tasks running them
+        self._active: set[str] = set()
+        self._tasks: set[asyncio.Task[ExportRun]] = set()
+
+    async def run(
+        self,
+        config_ids: Sequence[str],
+        runner: ExportRunner,
+        on_failure: FailureHandler | None = None,
+    ) -> list[ExportRun]:
+        """Run the configurations and return their ledger entries (in the order of `config_ids`)"""
+        return list(await asyncio.gather(
+            *(self._run_bounded(config_id, runner, on_failure) for config_id in config_ids)
+        ))
+
+    def dispatch(
+        self,
+        config_ids: Sequence[str],
+        runner: ExportRunner,
+        on_failure: FailureHandler | None = None,
+    ) -> list[str]:
+        """Start each configuration in its own background task and return the ids started
+
+        A configuration still queued or running from a previous dispatch is skipped, so a slow
+        export is never run twice at the same time and never delays the dispatching job.
+        """
+        started = []
+        for config_id in config_ids:
+            if config_id in self._active:
+                logger.info(f"[EXPORT] {config_id} is still running, not started again")
+                continue
+            self._active.add(config_id)
+            task = asyncio.create_task(self._run_dispatched(config_id, runner, on_failure))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            started.append(config_id)
+        return started
+
+    async def _run_dispatched(self, config_id: str, runner: ExportRunner, on_failure: FailureHandler | None) -> ExportRun:
+        try:
+            return await self._run_bounded(config_id, runner, on_failure)
+        finally:
+            self._active.discard(config_id)
+
+    async def _run_bounded(self, config_id: str, runner: ExportRunner, on_failure: FailureHandler | None) -> ExportRun:
+        async with self._semaphore:
+            return await self._run_config(config_id, runner, on_failure)
+
+    async def _run_config(
+        self,
+        config_id: str,
+        runner: ExportRunner,
+        on_failure: FailureHandler | None,
+    ) -> ExportRun:
+        run = ExportRun(config_id=config_id)
+        started = time.monotonic()
+        try:
+            async with async_session_maker() as db:
+                config = await db.get(ExportConfig, config_id)
+                if config is None:
+                    run.status = "failed"
+                    run.errors.append("Export configuration not found")
+                    return run
+
+                run.config_name = config.name
+                run.export_type = config.export_type.value
+                timeout = export_timeout(config.config or {})
+                try:
+                    await asyncio.wait_for(runner(db, config, run), timeout=timeout)
+                    if run.status == "running":
+                        run.status = "partial" if run.errors else "success"
+                except asyncio.TimeoutError:
+                    run.status = "timeout"
+                    run.errors.append(f"Timed out after {timeout:g}s")
+                except Exception as e:
+                    run.status = "failed"
+                    run.errors.append(str(e))
+
+            if run.status in ("failed", "timeout") and on_failure is not None:
+                await self._record_failure(config_id, run, on_failure)
+            return run
+        finally:
+            _finish_run(run, started, self.ledger)
+
+    async def _record_failure(self, config_id: str, run: ExportRun, on_failure: FailureHandler) -> None:
+        """Update the configuration on a fresh session (the run's session may be unusable)"""
+        try:
+            async with async_session_maker() as db:
+                config = await db.get(ExportConfig, config_id)
+                if config is not None:
+                    on_failure(config, run)
+                    await db.commit()
+        except Exception as e:
+            logger.error(f"[EXPORT] Could not record the failure of {run.config_name or config_id}: {e}")
+
+
+def _finish_run(run: ExportRun, started: float, ledger: ExportLedger) -> None:
+    """Set the run duration, record it in the ledger and log it"""
+    run.duration_seconds = time.monotonic() - started
+    ledger.record(run)
+    log = logger.info if run.status in ("success", "partial") else logger.error
+    log(
+        f"[EXPORT] {run.config_name or run.config_id}: {run.status} in {run.duration_seconds:.1f}s "
+        f"({run.points} points, {run.bytes_sent} bytes)"
+        + (f" - {'; '.join(run.errors[:3])}" if run.errors else "")
+    )
+
+
+@asynccontextmanager
+async def recorded_run(config: ExportConfig, ledger: ExportLedger = export_ledger) -> AsyncIterator[ExportRun]:
+    """Ledger entry of a run executed outside ExportExecutor
+
+    The caller fills the PDLs, points, bytes and errors. The status is set like in ExportExecutor
+    when the caller leaves it "running"; an exception marks the run failed and is re-raised.
+    """
+    run = ExportRun(config_id=config.id, config_name=config.name, export_type=config.export_type.value)
+    started = time.monotonic()
+    try:
+        yield run
+        if run.status == "running":
+            run.status = "partial" if run.errors else "success"
+    except Exception as e:
+        run.status = "failed"
+        run.errors.append(str(e))
+        raise
+    finally:
+        _finish_run(run, started, ledger)
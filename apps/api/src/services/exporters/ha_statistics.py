@@ -0,0 +1,128 @@
+"""Home Assistant statistics import helpers
+
+Flow control for recorder/import_statistics and incremental resume of hourly statistics.
+
+- ImportFlowControl: pipelines chunks with a bounded number of in-flight messages and only
+  backs off (smaller window, smaller chunks, delay) when HA answers slowly or with errors
+- resume_statistics: keeps the hours after the last imported one and continues its sum
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+from zoneinfo import ZoneInfo
+
+# Messages recorder/import_statistics envoyés sans attendre leur réponse
+IMPORT_MAX_IN_FLIGHT = 4
+
+# Temps de réponse au-delà duquel HA est considéré comme surchargé
+SLOW_RESPONSE_SECONDS = 5.0
+
+# Temps de réponse en dessous duquel on peut accélérer
+FAST_RESPONSE_SECONDS = 1.0
+
+# Premier délai appliqué quand HA ralentit (doublé à chaque nouveau ralentissement)
+BACKOFF_INITIAL_SECONDS = 0.5
+
+# Bornes de la taille des chunks (relatives à la taille demandée)
+MIN_CHUNK_SIZE = 50
+CHUNK_GROWTH_LIMIT = 4
+
+TZ_PARIS = ZoneInfo("Europe/Paris")
+
+# (start de la dernière heure importée, sum à cette heure)
+ResumePoint = tuple[datetime, float]
+
+
+@dataclass
+class ImportFlowControl:
+    """Adaptive window, chunk size and delay for pipelined statistics imports
+
+    Args:
+        chunk_size: Initial number of records per message
+        max_delay: Maximum back-off delay in seconds between messages (0 = never wait)
+        max_in_flight: Maximum number of messages awaiting a response
+    """
+
+    chunk_size: int
+    max_delay: float
+    max_in_flight: int = IMPORT_MAX_IN_FLIGHT
+    window: int = field(init=False)
+    delay: float = field(init=False, default=0.0)
+    min_chunk_size: int = field(init=False)
+    max_chunk_size: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.chunk_size = max(1, self.chunk_size)
+        self.max_in_flight = max(1, self.max_in_flight)
+        self.min_chunk_size = min(MIN_CHUNK_SIZE, self.chunk_size)
+        self.max_chunk_size = self.chunk_size * CHUNK_GROWTH_LIMIT
+        self.window = self.max_in_flight
+
+    def record(self, latency: float, success: bool) -> None:
+        """Adapt to the response time (seconds) and outcome of one message"""
+        if not success or latency >= SLOW_RESPONSE_SECONDS:
+            # Erreur : un seul message à la fois ; lenteur : fenêtre divisée par deux
+            self.window = 1 if not success else max(1, self.window // 2)
+            self.chunk_size = max(self.min_chunk_size, self.chunk_size // 2)
+            self.delay = min(self.max_delay, max(self.delay * 2, BACKOFF_INITIAL_SECONDS))
+        elif latency <= FAST_RESPONSE_SECONDS:
+            self.window = min(self.max_in_flight, self.window + 1)
+            self.chunk_size = min(self.max_chunk_size, self.chunk_size * 2)
+            self.delay = self.delay / 2 if self.delay > BACKOFF_INITIAL_SECONDS else 0.0
+
+
+def parse_statistic_time(value: Any) -> datetime | None:
+    """Parse a statistic timestamp returned by HA (milliseconds, seconds or ISO string)"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        # HA renvoie des millisecondes depuis 2022.12, des secondes avant
+        seconds = value / 1000 if value > 1e11 else value
+        return datetime.fromtimestamp(seconds, tz=TZ_PARIS)
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=TZ_PARIS)
+
+
+def resume_statistics(
+    stats: list[dict[str, Any]],
+    resume_point: ResumePoint | None,
+    digits: int = 3,
+) -> list[dict[str, Any]]:
+    """Keep the records after the last imported hour, continuing its cumulative sum
+
+    Args:
+        stats: Hourly records [{start, state, sum}, ...] sorted by start
+        resume_point: Last imported (start, sum) for this statistic, None for a full import
+        digits: Rounding of the recomputed sums
+
+    Returns:
+        Records to import
+    """
+    if resume_point is None:
+        return stats
+
+    last_start, total = resume_point
+    resumed = []
+    for stat in stats:
+        if datetime.fromisoformat(stat["start"]) <= last_start:
+            continue
+        total += stat["state"]
+        resumed.append({**stat, "sum": round(total, digits)})
+    return resumed
+
+
+def resume_since(resume_points: dict[str, ResumePoint], *prefixes: str) -> datetime | None:
+    """First hour (Paris time) to recompute for the statistics whose id starts with one of the prefixes
+
+    Returns None (full history) when none of them has been imported yet.
+    """
+    starts = [start for statistic_id, (start, _) in resume_points.items() if statistic_id.startswith(prefixes)]
+    if not starts:
+        return None
+    return (min(starts) + timedelta(hours=1)).astimezone(TZ_PARIS)
@@ -30,8 +30,8 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-import re
 import ssl
+import time
 from datetime import date, datetime, timedelta
 from typing import Any
 
@@ -40,7 +40,18 @@ import websockets
 from sqlalchemy import String, cast, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .base import BaseExporter
+from .base import BaseExporter, PublishCounter
+from .energy_reader import find_energy_history, load_tempo_colors, stream_energy_rows
+from .ha_statistics import (
+    IMPORT_MAX_IN_FLIGHT,
+    ImportFlowControl,
+    ResumePoint,
+    parse_statistic_time,
+    resume_since,
+    resume_statistics,
+)
+from ..energy_values import DEFAULT_INTERVAL_MINUTES, value_to_wh
+from ..tariff_schedule import DEFAULT_OFFPEAK_RANGES, TEMPO_SCHEDULE, TariffSchedule, normalize_offpeak_hours
 
 logger = logging.getLogger(__name__)
 
@@ -180,22 +191,25 @@ class HomeAssistantExporter(BaseExporter):
             # Default to RTE Tempo for global sensors
             return self._get_device_rte_tempo()
 
-    async def _get_mqtt_client(self) -> aiomqtt.Client:
+    async def _get_mqtt_client(self) -> PublishCounter:
         """Create and return an MQTT client
 
         Returns:
-            Configured aiomqtt.Client instance
+            Configured aiomqtt.Client instance, counting the published bytes
         """
         tls_context = None
         if self.use_tls:
             tls_context = ssl.create_default_context()
 
-        return aiomqtt.Client(
-            hostname=self.broker,
-            port=self.port,
-            username=self.username,
-            password=self.password,
-            tls_context=tls_context,
+        return PublishCounter(
+            aiomqtt.Client(
+                hostname=self.broker,
+                port=self.port,
+                username=self.username,
+                password=self.password,
+                tls_context=tls_context,
+            ),
+            self,
         )
 
     async def test_connection(self) -> bool:
@@ -369,7 +383,6 @@ class HomeAssistantExporter(BaseExporter):
             Export results summary
         """
         from ..statistics import StatisticsService
-        stats = StatisticsService(db)
 
         results = {
             "consumption": 0,
@@ -402,18 +415,21 @@ class HomeAssistantExporter(BaseExporter):
                 logger.error(f"[HA-MQTT] EcoWatt export failed: {e}")
                 results["errors"].append(f"ecowatt: {str(e)}")
 
-            # Per-PDL exports
-            for pdl in usage_point_ids:
-                try:
-                    count = await self._export_consumption_stats(client, stats, pdl)
-                    results["consumption"] += count
-
-                    count = await self._export_production_stats(client, stats, pdl)
-                    results["production"] += count
-
-                except Exception as e:
-                    logger.error(f"[HA-MQTT] Export failed for PDL {pdl}: {e}")
-                    results["errors"].append(f"{pdl}: {str(e)}")
+            # Per-PDL exports (concurrently, one session per PDL)
+            async def export_pdl(pdl_db: AsyncSession, pdl: str) -> tuple[int, int]:
+                pdl_stats = StatisticsService(pdl_db)
+                consumption = await self._export_consumption_stats(client, pdl_stats, pdl)
+                production = await self._export_production_stats(client, pdl_stats, pdl)
+                return consumption, production
+
+            pdl_results = await self.map_pdls_concurrently(usage_point_ids, export_pdl)
+            for pdl, pdl_result in zip(usage_point_ids, pdl_results):
+                if isinstance(pdl_result, BaseException):
+                    logger.error(f"[HA-MQTT] Export failed for PDL {pdl}: {pdl_result}")
+                    results["errors"].append(f"{pdl}: {str(pdl_result)}")
+                    continue
+                results["consumption"] += pdl_result[0]
+                results["production"] += pdl_result[1]
 
         logger.info(f"[HA-MQTT] Full export completed: {results}")
         return results
@@ -634,111 +650,18 @@ class HomeAssistantExporter(BaseExporter):
     @staticmethod
     def _normalize_offpeak_hours(offpeak_raw: Any) -> list[dict[str, str]]:
         """Normalize off-peak configuration to [{'start': 'HH:MM', 'end': 'HH:MM'}]."""
-        normalized: list[dict[str, str]] = []
-
-        def add_range(start: str, end: str) -> None:
-            normalized.append({"start": start, "end": end})
-
-        def parse_range_string(range_str: str) -> None:
-            match = re.search(r"(\d{1,2})[h:](\d{2})\s*-\s*(\d{1,2})[h:](\d{2})", range_str)
-            if not match:
-                return
-            add_range(
-                f"{match.group(1).zfill(2)}:{match.group(2)}",
-                f"{match.group(3).zfill(2)}:{match.group(4)}",
-            )
-
-        if isinstance(offpeak_raw, list):
-            for item in offpeak_raw:
-                if isinstance(item, dict):
-                    start = item.get("start")
-                    end = item.get("end")
-                    if isinstance(start, str) and isinstance(end, str):
-                        add_range(start, end)
-                elif isinstance(item, str):
-                    parse_range_string(item)
-            return normalized
-
-        if isinstance(offpeak_raw, dict):
-            ranges = offpeak_raw.get("ranges")
-            if isinstance(ranges, list):
-                for item in ranges:
-                    if isinstance(item, str):
-                        parse_range_string(item)
-                    elif isinstance(item, dict):
-                        start = item.get("start")
-                        end = item.get("end")
-                        if isinstance(start, str) and isinstance(end, str):
-                            add_range(start, end)
-            for value in offpeak_raw.values():
-                if isinstance(value, str):
-                    parse_range_string(value)
-                elif isinstance(value, list):
-                    for sub_item in value:
-                        if isinstance(sub_item, str):
-                            parse_range_string(sub_item)
-            return normalized
-
-        return normalized
-
-    def _is_offpeak_interval(self, interval_start: str | None, offpeak_hours: list[dict[str, str]]) -> bool:
-        """Check if an interval start time is in off-peak period."""
-        if not interval_start:
-            return False
-
-        # Default HC range when no contract schedule is available.
-        periods = offpeak_hours or [{"start": "22:00", "end": "06:00"}]
-
-        try:
-            hour, minute = map(int, interval_start.split(":"))
-            current_minutes = hour * 60 + minute
-        except ValueError:
-            return False
-
-        for period in periods:
-            try:
-                start_h, start_m = map(int, period["start"].split(":"))
-                end_h, end_m = map(int, period["end"].split(":"))
-            except (KeyError, ValueError):
-                continue
-
-            start_minutes = start_h * 60 + start_m
-            end_minutes = end_h * 60 + end_m
-
-            # Overnight range (e.g. 22:00 -> 06:00)
-            if start_minutes > end_minutes:
-                if current_minutes >= start_minutes or current_minutes < end_minutes:
-                    return True
-            elif start_minutes <= current_minutes < end_minutes:
-                return True
-
-        return False
+        return normalize_offpeak_hours(offpeak_raw)
 
     @staticmethod
-    def _detailed_value_to_wh(value: int, raw_data: dict[str, Any] | None) -> float:
-        """Convert a detailed record value to Wh.
+    def _stored_value_wh(value: int | None, value_wh: float | None, detailed: bool = True) -> float:
+        """Energy (Wh) of a consumption/production row.
 
-        Some MED payloads expose interval power values (W), others already provide Wh.
-        We use interval_length when available to normalize.
+        `value_wh` is normalized at ingestion from the reading interval length (detailed values
+        are W). Rows without it use the historical 30-minute default; daily values are already Wh.
         """
-        if value is None:
-            return 0.0
-
-        if not raw_data:
-            # Historical default used by the existing code path.
-            return float(value) / 2
-
-        interval_length = str(raw_data.get("interval_length", "PT30M"))
-        match = re.match(r"PT(\d+)M", interval_length)
-        if not match:
-            # Daily/unknown payloads are already in Wh.
-            return float(value)
-
-        interval_minutes = int(match.group(1))
-        if interval_minutes <= 0:
-            return float(value)
-
-        return float(value) / (60 / interval_minutes)
+        if value_wh is not None:
+            return float(value_wh)
+        return value_to_wh(value, DEFAULT_INTERVAL_MINUTES if detailed else None)
 
     async def _resolve_linky_pricing_context(
         self,
@@ -748,7 +671,7 @@ class HomeAssistantExporter(BaseExporter):
         """Resolve pricing option, offpeak hours, prices and subscribed power for one PDL."""
         from ...models.client_mode import ContractData
         from ...models.energy_provider import EnergyOffer
-        from ...models.pdl import PDL
+        from ..pdl_cache import pdl_cache
 
         pricing_option = "BASE"
         offpeak_hours: list[dict[str, str]] = []
@@ -762,10 +685,7 @@ class HomeAssistantExporter(BaseExporter):
             **TEMPO_PRICES,
         }
 
-        pdl_result = await db.execute(
-            select(PDL).where(PDL.usage_point_id == pdl)
-        )
-        pdl_record = pdl_result.scalar_one_or_none()
+        pdl_record = await pdl_cache.get(db, pdl)
         selected_offer_id = pdl_record.selected_offer_id if pdl_record else None
 
         if pdl_record and pdl_record.pricing_option:
@@ -826,19 +746,22 @@ class HomeAssistantExporter(BaseExporter):
         from ...models.client_mode import ConsumptionData, DataGranularity
 
         result = await db.execute(
-            select(ConsumptionData.interval_start, ConsumptionData.value, ConsumptionData.raw_data)
+            select(ConsumptionData.interval_start, ConsumptionData.value, ConsumptionData.value_wh)
             .where(ConsumptionData.usage_point_id == pdl)
             .where(ConsumptionData.granularity == DataGranularity.DETAILED)
             .where(ConsumptionData.date == target_day)
         )
 
+        # Default HC range when no contract schedule is available.
+        schedule = TariffSchedule.from_offpeak_hours(offpeak_hours, default=DEFAULT_OFFPEAK_RANGES)
+
         hc_wh = 0.0
         hp_wh = 0.0
         interval_count = 0
-        for interval_start, value, raw_data in result.all():
+        for interval_start, value, stored_wh in result.all():
             interval_count += 1
-            value_wh = self._detailed_value_to_wh(int(value or 0), raw_data)
-            if self._is_offpeak_interval(interval_start, offpeak_hours):
+            value_wh = self._stored_value_wh(value, stored_wh)
+            if schedule.is_offpeak_time(interval_start):
                 hc_wh += value_wh
             else:
                 hp_wh += value_wh
@@ -1216,13 +1139,10 @@ class HomeAssistantExporter(BaseExporter):
         device = self._get_device_linky(pdl)
 
         # Check if PDL has production data
-        from ...models.pdl import PDL
-        result = await stats.db.execute(
-            select(PDL.has_production).where(PDL.usage_point_id == pdl)
-        )
-        has_production = result.scalar_one_or_none()
+        from ..pdl_cache import pdl_cache
+        pdl_record = await pdl_cache.get(stats.db, pdl)
 
-        if not has_production:
+        if not pdl_record or not pdl_record.has_production:
             logger.debug(f"[HA-MQTT] PDL {pdl} has no production, skipping")
             return 0
 
@@ -1310,15 +1230,12 @@ class HomeAssistantExporter(BaseExporter):
         2. Built-in fallback constants (TEMPO_PRICES).
         """
         from ...models.energy_provider import EnergyOffer
-        from ...models.pdl import PDL
+        from ..pdl_cache import pdl_cache
 
         if not usage_point_ids:
             return dict(TEMPO_PRICES), {"source": "fallback_defaults", "reason": "no_usage_point_ids"}
 
-        pdl_result = await db.execute(
-            select(PDL).where(PDL.usage_point_id.in_(usage_point_ids))
-        )
-        pdls = pdl_result.scalars().all()
+        pdls = list((await pdl_cache.get_many(db, usage_point_ids)).values())
 
         for pdl in pdls:
             if not pdl.selected_offer_id:
@@ -2171,7 +2088,9 @@ class HomeAssistantExporter(BaseExporter):
             Response message
         """
         message["id"] = msg_id
-        await ws.send(json.dumps(message))
+        payload = json.dumps(message)
+        self.bytes_sent += len(payload.encode("utf-8"))
+        await ws.send(payload)
 
         # Wait for response with matching ID
         while True:
@@ -2187,20 +2106,27 @@ class HomeAssistantExporter(BaseExporter):
         msg_id_start: int,
         chunk_size: int = 500,
         sync_delay_ms: int = 10000,
+        max_in_flight: int = IMPORT_MAX_IN_FLIGHT,
     ) -> tuple[int, int, list[str]]:
-        """Import statistics in chunks to avoid WebSocket timeouts
+        """Import statistics in pipelined chunks with adaptive flow control
+
+        Up to max_in_flight messages are sent before waiting for their responses. The window,
+        the chunk size and the delay between messages adapt to HA response times: HA is only
+        left time to ingest data when it answers slowly or with errors.
 
         Args:
             ws: WebSocket connection
             stats: List of statistics to import (can be empty to just create the entity)
             metadata: Metadata for the statistic (has_mean, has_sum, statistic_id, name, source, unit)
             msg_id_start: Starting message ID
-            chunk_size: Number of records per chunk (default 500 = ~20 days of hourly data)
-            sync_delay_ms: Delay in milliseconds between chunks to let HA ingest data (default 10s)
+            chunk_size: Initial number of records per chunk (default 500 = ~20 days of hourly data)
+            sync_delay_ms: Maximum back-off delay in milliseconds when HA is slow (default 10s)
+            max_in_flight: Maximum number of messages awaiting a response
 
         Returns:
             Tuple of (total_imported, next_msg_id, errors)
         """
+        statistic_id = metadata.get("statistic_id")
         total_imported = 0
         errors: list[str] = []
         msg_id = msg_id_start
@@ -2219,50 +2145,130 @@ class HomeAssistantExporter(BaseExporter):
             msg_id += 1
 
             if response.get("success", True):
-                logger.debug(f"[HA-WS] Created empty statistic for {metadata.get('statistic_id')}")
+                logger.debug(f"[HA-WS] Created empty statistic for {statistic_id}")
             else:
                 error = response.get("error", {}).get("message", "Unknown error")
-                errors.append(f"{metadata.get('statistic_id')} (empty): {error}")
+                errors.append(f"{statistic_id} (empty): {error}")
                 logger.warning(f"[HA-WS] Failed to create empty statistic: {error}")
 
-            # Délai même pour les stats vides si demandé
-            if sync_delay_ms > 0:
-                await asyncio.sleep(sync_delay_ms / 1000)
-
             return 0, msg_id, errors
 
-        # Split stats into chunks
-        for i in range(0, len(stats), chunk_size):
-            chunk = stats[i:i + chunk_size]
-
-            response = await self._ws_send_and_receive(
-                ws,
-                {
+        flow = ImportFlowControl(chunk_size=chunk_size, max_delay=sync_delay_ms / 1000, max_in_flight=max_in_flight)
+        # msg_id -> (index of the first record, number of records, send time)
+        pending: dict[int, tuple[int, int, float]] = {}
+        position = 0
+        last_response_at = 0.0
+
+        while position < len(stats) or pending:
+            # Remplir la fenêtre ; en cas de back-off, un seul message à la fois après le délai
+            while position < len(stats) and len(pending) < flow.window:
+                if flow.delay:
+                    if pending:
+                        break
+                    await asyncio.sleep(flow.delay)
+
+                chunk = stats[position:position + flow.chunk_size]
+                payload = json.dumps({
+                    "id": msg_id,
                     "type": "recorder/import_statistics",
                     "metadata": metadata,
                     "stats": chunk,
-                },
-                msg_id=msg_id,
-            )
-            msg_id += 1
+                })
+                self.bytes_sent += len(payload.encode("utf-8"))
+                await ws.send(payload)
+                pending[msg_id] = (position, len(chunk), time.monotonic())
+                msg_id += 1
+                position += len(chunk)
 
-            if response.get("success", True):
-                total_imported += len(chunk)
+            response = json.loads(await ws.recv())
+            sent = pending.pop(response.get("id"), None)
+            if sent is None:
+                continue
+
+            first, count, sent_at = sent
+            now = time.monotonic()
+            # Temps de traitement de ce message, sans l'attente derrière les messages précédents
+            latency = now - max(sent_at, last_response_at)
+            last_response_at = now
+
+            success = response.get("success", True)
+            flow.record(latency, success)
+
+            if success:
+                total_imported += count
                 logger.debug(
-                    f"[HA-WS] Imported chunk {i//chunk_size + 1}: "
-                    f"{len(chunk)} stats for {metadata.get('statistic_id')}"
+                    f"[HA-WS] Imported records {first}-{first + count - 1} for {statistic_id} "
+                    f"in {latency * 1000:.0f}ms (next chunk {flow.chunk_size}, window {flow.window})"
                 )
             else:
                 error = response.get("error", {}).get("message", "Unknown error")
-                errors.append(f"{metadata.get('statistic_id')} chunk {i//chunk_size + 1}: {error}")
-                logger.warning(f"[HA-WS] Chunk import failed: {error}")
-
-            # Délai entre les chunks pour laisser HA ingérer les données
-            if sync_delay_ms > 0:
-                await asyncio.sleep(sync_delay_ms / 1000)
+                errors.append(f"{statistic_id} records {first}-{first + count - 1}: {error}")
+                logger.warning(f"[HA-WS] Chunk import failed for {statistic_id}: {error}")
 
         return total_imported, msg_id, errors
 
+    async def _import_statistic(
+        self,
+        ws: websockets.WebSocketClientProtocol,
+        stats: list[dict[str, Any]],
+        metadata: dict[str, Any],
+        msg_id: int,
+        results: dict[str, Any],
+        kind: str,
+        resume_points: dict[str, ResumePoint],
+        chunk_size: int,
+        sync_delay_ms: int,
+        sum_digits: int = 3,
+    ) -> int:
+        """Import one statistic, resuming after its last imported hour, and record its timing
+
+        Args:
+            stats: Full records built since the PDL resume date
+            kind: Results counter to increment (consumption, cost, production)
+            resume_points: Last imported (start, sum) per statistic_id (incremental mode)
+            sum_digits: Rounding of the resumed sums
+
+        Returns:
+            Next message ID
+        """
+        statistic_id = metadata["statistic_id"]
+        resume_point = resume_points.get(statistic_id)
+        stats = resume_statistics(stats, resume_point, sum_digits)
+
+        # L'entité existe déjà dans HA : rien à envoyer s'il n'y a pas de nouvelle heure
+        if resume_point is not None and not stats:
+            results["timings"][statistic_id] = {"records": 0, "duration_ms": 0}
+            return msg_id
+
+        started = time.perf_counter()
+        imported, msg_id, chunk_errors = await self._import_stats_in_chunks(
+            ws,
+            stats,
+            metadata,
+            msg_id_start=msg_id,
+            chunk_size=chunk_size,
+            sync_delay_ms=sync_delay_ms,
+        )
+        duration_ms = round((time.perf_counter() - started) * 1000)
+
+        results[kind] += imported
+        results["errors"].extend(chunk_errors)
+        results["timings"][statistic_id] = {"records": imported, "duration_ms": duration_ms}
+        if imported > 0:
+            logger.info(f"[HA-WS] Imported {imported} {kind} stats for {statistic_id} in {duration_ms}ms")
+        return msg_id
+
+    @staticmethod
+    def _parse_resume_points(last_dates_result: dict[str, Any]) -> dict[str, ResumePoint]:
+        """Build resume points from get_last_statistic_dates() output"""
+        last_sums = last_dates_result.get("last_sums", {})
+        resume_points: dict[str, ResumePoint] = {}
+        for statistic_id, last_date in last_dates_result.get("last_dates", {}).items():
+            start_dt = parse_statistic_time(last_date)
+            if start_dt is not None and statistic_id in last_sums:
+                resume_points[statistic_id] = (start_dt, float(last_sums[statistic_id]))
+        return resume_points
+
     async def list_statistics(self, prefix: str = "myelectricaldata") -> dict[str, Any]:
         """List all statistics IDs in Home Assistant matching prefix
 
@@ -2351,6 +2357,7 @@ class HomeAssistantExporter(BaseExporter):
             - success: bool
             - message: str
             - last_dates: Dict[statistic_id, datetime] - Last recorded date per stat
+            - last_sums: Dict[statistic_id, float] - Cumulative sum at that date (incremental resume)
             - oldest_date: datetime | None - The oldest "last date" (for incremental sync)
         """
         from datetime import datetime, timedelta
@@ -2419,6 +2426,7 @@ class HomeAssistantExporter(BaseExporter):
                         "start_time": start_time,
                         "statistic_ids": statistic_ids,
                         "period": "hour",  # Get hourly data for precision
+                        "types": ["sum"],
                     },
                     msg_id=1,
                 )
@@ -2431,27 +2439,42 @@ class HomeAssistantExporter(BaseExporter):
                         "oldest_date": None,
                     }
 
-                # Extract last date for each statistic
-                result_data = response.get("result", {})
+                # Extract last date and sum for each statistic
+                # Entries are sorted by time, last entry is most recent
                 last_dates: dict[str, datetime] = {}
+                last_sums: dict[str, float] = {}
 
-                for stat_id, entries in result_data.items():
+                for stat_id, entries in response.get("result", {}).items():
                     if entries and isinstance(entries, list):
-                        # Entries are sorted by time, last entry is most recent
                         last_entry = entries[-1]
-                        # The "start" field contains the timestamp
-                        start_ts = last_entry.get("start")
-                        if start_ts:
-                            # Parse ISO format timestamp
-                            if isinstance(start_ts, (int, float)):
-                                # Unix timestamp in seconds
-                                last_dates[stat_id] = datetime.fromtimestamp(start_ts, tz=tz_paris)
-                            else:
-                                # ISO format string
-                                try:
-                                    last_dates[stat_id] = datetime.fromisoformat(str(start_ts).replace("Z", "+00:00"))
-                                except ValueError:
-                                    logger.warning(f"[HA-WS] Could not parse timestamp for {stat_id}: {start_ts}")
+                        start_dt = parse_statistic_time(last_entry.get("start"))
+                        if start_dt is None:
+                            logger.warning(f"[HA-WS] Could not parse timestamp for {stat_id}: {last_entry.get('start')}")
+                            continue
+                        last_dates[stat_id] = start_dt
+                        last_sums[stat_id] = float(last_entry.get("sum") or 0.0)
+
+                # Statistics without data in the last 30 days (e.g. a TEMPO red bucket in summer):
+                # the monthly aggregate gives their last sum, its end bounds their last hour
+                missing_ids = [stat_id for stat_id in statistic_ids if stat_id not in last_dates]
+                if missing_ids:
+                    monthly = await self._ws_send_and_receive(
+                        ws,
+                        {
+                            "type": "recorder/statistics_during_period",
+                            "start_time": (now - timedelta(days=365 * 10)).isoformat(),
+                            "statistic_ids": missing_ids,
+                            "period": "month",
+                            "types": ["sum"],
+                        },
+                        msg_id=2,
+                    )
+                    for stat_id, entries in (monthly.get("result") or {}).items():
+                        if entries and isinstance(entries, list):
+                            end_dt = parse_statistic_time(entries[-1].get("end"))
+                            if end_dt is not None:
+                                last_dates[stat_id] = end_dt - timedelta(hours=1)
+                                last_sums[stat_id] = float(entries[-1].get("sum") or 0.0)
 
                 # Find the oldest "last date" - this is where we need to start the incremental import
                 oldest_date = min(last_dates.values()) if last_dates else None
@@ -2465,6 +2488,7 @@ class HomeAssistantExporter(BaseExporter):
                     "success": True,
                     "message": f"Dernières dates récupérées pour {len(last_dates)} statistiques",
                     "last_dates": {k: v.isoformat() for k, v in last_dates.items()},
+                    "last_sums": last_sums,
                     "oldest_date": oldest_date.isoformat() if oldest_date else None,
                 }
 
@@ -2578,8 +2602,8 @@ class HomeAssistantExporter(BaseExporter):
             db: Database session
             usage_point_ids: List of PDL numbers
             clear_first: Clear existing statistics before import (ignored if incremental=True)
-            sync_delay_ms: Delay in ms between imports to let HA ingest data (default 10s)
-            chunk_size: Number of records per chunk (default 500)
+            sync_delay_ms: Maximum back-off delay in ms when HA is slow or fails (default 10s)
+            chunk_size: Initial number of records per chunk, adapted to HA response times (default 500)
             incremental: If True, only import new data since last import (faster)
 
         Returns:
@@ -2593,15 +2617,15 @@ class HomeAssistantExporter(BaseExporter):
 
         prefix = self.config.get("statistic_id_prefix", "myelectricaldata")
 
-        # For incremental mode, get the last imported date
+        # For incremental mode, get the last imported hour and sum of each statistic
+        resume_points: dict[str, ResumePoint] = {}
         since_date: datetime | None = None
         if incremental:
             last_dates_result = await self.get_last_statistic_dates()
             if last_dates_result.get("success") and last_dates_result.get("oldest_date"):
-                from datetime import datetime
-                oldest_date_str = last_dates_result["oldest_date"]
-                since_date = datetime.fromisoformat(oldest_date_str)
-                logger.info(f"[HA-WS] Incremental mode: importing data since {since_date}")
+                resume_points = self._parse_resume_points(last_dates_result)
+                since_date = datetime.fromisoformat(last_dates_result["oldest_date"])
+                logger.info(f"[HA-WS] Incremental mode: resuming {len(resume_points)} statistics (oldest {since_date})")
             else:
                 # No existing data, fall back to full import
                 logger.info("[HA-WS] No existing statistics found, performing full import")
@@ -2616,11 +2640,12 @@ class HomeAssistantExporter(BaseExporter):
         ws_url = self._get_ws_url()
         token = self.config.get("ha_token")
 
-        results = {
+        results: dict[str, Any] = {
             "consumption": 0,
             "production": 0,
             "cost": 0,
             "errors": [],
+            "timings": {},
         }
 
         try:
@@ -2659,37 +2684,36 @@ class HomeAssistantExporter(BaseExporter):
                 mode_str = "incremental" if incremental else "full"
                 logger.info(f"[HA-WS] Processing {len(usage_point_ids)} PDLs ({mode_str} mode): {usage_point_ids}")
                 for pdl in usage_point_ids:
+                    # Incremental: only rebuild the hours after the last import of this PDL's statistics
+                    pdl_since = resume_since(resume_points, f"{prefix}:consumption_{pdl}_", f"{prefix}:cost_{pdl}_")
+
                     # Get consumption data by tariff
-                    logger.info(f"[HA-WS] Getting consumption data for PDL {pdl}" + (f" (since {since_date})" if since_date else ""))
-                    consumption_by_tariff = await self._get_consumption_statistics_by_tariff(db, pdl, since_date)
+                    logger.info(f"[HA-WS] Getting consumption data for PDL {pdl}" + (f" (since {pdl_since})" if pdl_since else ""))
+                    consumption_by_tariff = await self._get_consumption_statistics_by_tariff(db, pdl, pdl_since)
                     logger.info(f"[HA-WS] Got {len(consumption_by_tariff)} tariff buckets for {pdl}: {list(consumption_by_tariff.keys())}")
 
                     for tariff_tag, stats in consumption_by_tariff.items():
                         # Import même si stats est vide pour créer l'entité dans HA
                         # Build statistic_id: myelectricaldata:consumption_{pdl}_{tariff}
-                        statistic_id = f"{prefix}:consumption_{pdl}_{tariff_tag}"
                         tariff_name = tariff_names.get(tariff_tag, tariff_tag.upper())
-
-                        # Import in chunks to avoid WebSocket timeout
-                        imported, msg_id, chunk_errors = await self._import_stats_in_chunks(
+                        msg_id = await self._import_statistic(
                             ws,
                             stats,
                             {
                                 "has_mean": False,
                                 "has_sum": True,
-                                "statistic_id": statistic_id,
+                                "statistic_id": f"{prefix}:consumption_{pdl}_{tariff_tag}",
                                 "name": f"Consommation {pdl} {tariff_name}",
                                 "source": prefix,
                                 "unit_of_measurement": "kWh",
                             },
-                            msg_id_start=msg_id,
-                            chunk_size=chunk_size,
-                            sync_delay_ms=sync_delay_ms,
+                            msg_id,
+                            results,
+                            "consumption",
+                            resume_points,
+                            chunk_size,
+                            sync_delay_ms,
                         )
-                        results["consumption"] += imported
-                        results["errors"].extend(chunk_errors)
-                        if imported > 0:
-                            logger.debug(f"[HA-WS] Imported {imported} consumption stats for {pdl} {tariff_tag}")
 
                     # Get cost data from consumption and energy offer prices
                     logger.info(f"[HA-WS] Calculating costs for PDL {pdl}")
@@ -2698,55 +2722,49 @@ class HomeAssistantExporter(BaseExporter):
                     for tariff_tag, cost_stats in cost_by_tariff.items():
                         # Import même si cost_stats est vide pour créer l'entité dans HA
                         # Build statistic_id: myelectricaldata:cost_{pdl}_{tariff}
-                        statistic_id = f"{prefix}:cost_{pdl}_{tariff_tag}"
                         tariff_name = tariff_names.get(tariff_tag, tariff_tag.upper())
-
-                        # Import in chunks to avoid WebSocket timeout
-                        imported, msg_id, chunk_errors = await self._import_stats_in_chunks(
+                        msg_id = await self._import_statistic(
                             ws,
                             cost_stats,
                             {
                                 "has_mean": False,
                                 "has_sum": True,
-                                "statistic_id": statistic_id,
+                                "statistic_id": f"{prefix}:cost_{pdl}_{tariff_tag}",
                                 "name": f"Coût {pdl} {tariff_name}",
                                 "source": prefix,
                                 "unit_of_measurement": "EUR",
                             },
-                            msg_id_start=msg_id,
-                            chunk_size=chunk_size,
-                            sync_delay_ms=sync_delay_ms,
+                            msg_id,
+                            results,
+                            "cost",
+                            resume_points,
+                            chunk_size,
+                            sync_delay_ms,
+                            sum_digits=4,
                         )
-                        results["cost"] += imported
-                        results["errors"].extend(chunk_errors)
-                        if imported > 0:
-                            logger.debug(f"[HA-WS] Imported {imported} cost stats for {pdl} {tariff_tag}")
 
                     # Get production data (production has no tariff distinction)
                     # Import même si vide pour créer l'entité dans HA
-                    production_stats = await self._get_production_statistics(db, pdl, since_date)
-                    statistic_id = f"{prefix}:production_{pdl}"
-
-                    # Import in chunks to avoid WebSocket timeout
-                    imported, msg_id, chunk_errors = await self._import_stats_in_chunks(
+                    production_since = resume_since(resume_points, f"{prefix}:production_{pdl}")
+                    production_stats = await self._get_production_statistics(db, pdl, production_since)
+                    msg_id = await self._import_statistic(
                         ws,
                         production_stats,
                         {
                             "has_mean": False,
                             "has_sum": True,
-                            "statistic_id": statistic_id,
+                            "statistic_id": f"{prefix}:production_{pdl}",
                             "name": f"Production {pdl}",
                             "source": prefix,
                             "unit_of_measurement": "kWh",
                         },
-                        msg_id_start=msg_id,
-                        chunk_size=chunk_size,
-                        sync_delay_ms=sync_delay_ms,
+                        msg_id,
+                        results,
+                        "production",
+                        resume_points,
+                        chunk_size,
+                        sync_delay_ms,
                     )
-                    results["production"] += imported
-                    results["errors"].extend(chunk_errors)
-                    if imported > 0:
-                        logger.debug(f"[HA-WS] Imported {imported} production stats for {pdl}")
 
                 logger.info(f"[HA-WS] Import completed: {results['consumption']} consumption, {results['cost']} cost, {results['production']} production")
 
@@ -2783,8 +2801,8 @@ class HomeAssistantExporter(BaseExporter):
             usage_point_ids: List of PDL numbers
             clear_first: Clear existing statistics before import (ignored if incremental=True)
             progress_callback: Async callback(event_dict) called at each step
-            sync_delay_ms: Delay in ms between imports to let HA ingest data (default 10s)
-            chunk_size: Number of statistics records per WebSocket message (default 500)
+            sync_delay_ms: Maximum back-off delay in ms when HA is slow or fails (default 10s)
+            chunk_size: Initial number of statistics records per WebSocket message (default 500)
             incremental: If True, only import new data since last import (faster)
 
         Returns:
@@ -2819,15 +2837,15 @@ class HomeAssistantExporter(BaseExporter):
                     "production": production,
                 })
 
-        # For incremental mode, get the last imported date
+        # For incremental mode, get the last imported hour and sum of each statistic
+        resume_points: dict[str, ResumePoint] = {}
         since_date: datetime | None = None
         if incremental:
             last_dates_result = await self.get_last_statistic_dates()
             if last_dates_result.get("success") and last_dates_result.get("oldest_date"):
-                from datetime import datetime as dt
-                oldest_date_str = last_dates_result["oldest_date"]
-                since_date = dt.fromisoformat(oldest_date_str)
-                logger.info(f"[HA-WS] Incremental mode: importing data since {since_date}")
+                resume_points = self._parse_resume_points(last_dates_result)
+                since_date = datetime.fromisoformat(last_dates_result["oldest_date"])
+                logger.info(f"[HA-WS] Incremental mode: resuming {len(resume_points)} statistics (oldest {since_date})")
             else:
                 # No existing data, fall back to full import
                 logger.info("[HA-WS] No existing statistics found, performing full import")
@@ -2858,6 +2876,7 @@ class HomeAssistantExporter(BaseExporter):
             "production": 0,
             "cost": 0,
             "errors": [],
+            "timings": {},
         }
 
         try:
@@ -2901,7 +2920,8 @@ class HomeAssistantExporter(BaseExporter):
                         f"PDL {pdl_idx + 1}/{num_pdls}: Lecture consommation...",
                         results["consumption"], results["cost"], results["production"]
                     )
-                    consumption_by_tariff = await self._get_consumption_statistics_by_tariff(db, pdl, since_date)
+                    pdl_since = resume_since(resume_points, f"{prefix}:consumption_{pdl}_", f"{prefix}:cost_{pdl}_")
+                    consumption_by_tariff = await self._get_consumption_statistics_by_tariff(db, pdl, pdl_since)
                     current_step += 1
 
                     # Import consommation par tarif
@@ -2913,24 +2933,24 @@ class HomeAssistantExporter(BaseExporter):
                             results["consumption"], results["cost"], results["production"]
                         )
 
-                        statistic_id = f"{prefix}:consumption_{pdl}_{tariff_tag}"
-                        imported, msg_id, chunk_errors = await self._import_stats_in_chunks(
+                        msg_id = await self._import_statistic(
                             ws,
                             stats,
                             {
                                 "has_mean": False,
                                 "has_sum": True,
-                                "statistic_id": statistic_id,
+                                "statistic_id": f"{prefix}:consumption_{pdl}_{tariff_tag}",
                                 "name": f"Consommation {pdl} {tariff_name}",
                                 "source": prefix,
                                 "unit_of_measurement": "kWh",
                             },
-                            msg_id_start=msg_id,
-                            chunk_size=chunk_size,
-                            sync_delay_ms=sync_delay_ms,
+                            msg_id,
+                            results,
+                            "consumption",
+                            resume_points,
+                            chunk_size,
+                            sync_delay_ms,
                         )
-                        results["consumption"] += imported
-                        results["errors"].extend(chunk_errors)
                         current_step += 1
 
                     # Calcul et import des coûts
@@ -2950,24 +2970,25 @@ class HomeAssistantExporter(BaseExporter):
                             results["consumption"], results["cost"], results["production"]
                         )
 
-                        statistic_id = f"{prefix}:cost_{pdl}_{tariff_tag}"
-                        imported, msg_id, chunk_errors = await self._import_stats_in_chunks(
+                        msg_id = await self._import_statistic(
                             ws,
                             cost_stats,
                             {
                                 "has_mean": False,
                                 "has_sum": True,
-                                "statistic_id": statistic_id,
+                                "statistic_id": f"{prefix}:cost_{pdl}_{tariff_tag}",
                                 "name": f"Coût {pdl} {tariff_name}",
                                 "source": prefix,
                                 "unit_of_measurement": "EUR",
                             },
-                            msg_id_start=msg_id,
-                            chunk_size=chunk_size,
-                            sync_delay_ms=sync_delay_ms,
+                            msg_id,
+                            results,
+                            "cost",
+                            resume_points,
+                            chunk_size,
+                            sync_delay_ms,
+                            sum_digits=4,
                         )
-                        results["cost"] += imported
-                        results["errors"].extend(chunk_errors)
                         current_step += 1
 
                     # Production
@@ -2976,25 +2997,26 @@ class HomeAssistantExporter(BaseExporter):
                         f"PDL {pdl_idx + 1}/{num_pdls}: Import production...",
                         results["consumption"], results["cost"], results["production"]
                     )
-                    production_stats = await self._get_production_statistics(db, pdl, since_date)
-                    statistic_id = f"{prefix}:production_{pdl}"
-                    imported, msg_id, chunk_errors = await self._import_stats_in_chunks(
+                    production_since = resume_since(resume_points, f"{prefix}:production_{pdl}")
+                    production_stats = await self._get_production_statistics(db, pdl, production_since)
+                    msg_id = await self._import_statistic(
                         ws,
                         production_stats,
                         {
                             "has_mean": False,
                             "has_sum": True,
-                            "statistic_id": statistic_id,
+                            "statistic_id": f"{prefix}:production_{pdl}",
                             "name": f"Production {pdl}",
                             "source": prefix,
                             "unit_of_measurement": "kWh",
                         },
-                        msg_id_start=msg_id,
-                        chunk_size=chunk_size,
-                        sync_delay_ms=sync_delay_ms,
+                        msg_id,
+                        results,
+                        "production",
+                        resume_points,
+                        chunk_size,
+                        sync_delay_ms,
                     )
-                    results["production"] += imported
-                    results["errors"].extend(chunk_errors)
                     current_step += 1
 
                 logger.info(f"[HA-WS] Import completed: {results['consumption']} consumption, {results['cost']} cost, {results['production']} production")
@@ -3040,9 +3062,9 @@ class HomeAssistantExporter(BaseExporter):
         from datetime import timedelta
         from zoneinfo import ZoneInfo
 
-        from ...models.client_mode import ConsumptionData, ContractData, DataGranularity
-        from ...models.pdl import PDL
-        from ...models.tempo_day import TempoColor, TempoDay
+        from ...models.client_mode import ConsumptionData, ContractData
+        from ...models.tempo_day import TempoColor
+        from ..pdl_cache import pdl_cache
 
         tz_paris = ZoneInfo("Europe/Paris")
 
@@ -3062,62 +3084,31 @@ class HomeAssistantExporter(BaseExporter):
             offpeak_hours = contract.offpeak_hours or []
         else:
             # Fallback: get pricing_option from PDL record
-            pdl_result = await db.execute(
-                select(PDL).where(PDL.usage_point_id == pdl)
-            )
-            pdl_record = pdl_result.scalar_one_or_none()
+            pdl_record = await pdl_cache.get(db, pdl)
             if pdl_record and pdl_record.pricing_option:
                 pricing_option = pdl_record.pricing_option.upper()
                 offpeak_hours = pdl_record.offpeak_hours or []
 
         logger.info(f"[HA-WS] PDL {pdl}: pricing_option={pricing_option}, offpeak_hours={offpeak_hours}, since_date={since_date}")
 
-        # 2. Try to get detailed data (30-min) first, fallback to daily
+        # 2. Detailed data (30-min) if any, fallback to daily
         # Apply since_date filter if provided (for incremental import)
-        detailed_query = (
-            select(ConsumptionData)
-            .where(ConsumptionData.usage_point_id == pdl)
-            .where(ConsumptionData.granularity == DataGranularity.DETAILED)
-        )
-        if since_date:
-            detailed_query = detailed_query.where(ConsumptionData.date >= since_date.date())
-        detailed_query = detailed_query.order_by(ConsumptionData.date, ConsumptionData.interval_start)
-
-        detailed_result = await db.execute(detailed_query)
-        detailed_records = detailed_result.scalars().all()
-
-        if detailed_records:
-            records = detailed_records
-            use_detailed = True
-            logger.info(f"[HA-WS] Using {len(records)} detailed records for {pdl}" + (f" (since {since_date.date()})" if since_date else ""))
-        else:
-            # Fallback to daily
-            daily_query = (
-                select(ConsumptionData)
-                .where(ConsumptionData.usage_point_id == pdl)
-                .where(ConsumptionData.granularity == DataGranularity.DAILY)
-            )
-            if since_date:
-                daily_query = daily_query.where(ConsumptionData.date >= since_date.date())
-            daily_query = daily_query.order_by(ConsumptionData.date)
-
-            daily_result = await db.execute(daily_query)
-            records = daily_result.scalars().all()
-            use_detailed = False
-            logger.info(f"[HA-WS] Using {len(records)} daily records for {pdl}" + (f" (since {since_date.date()})" if since_date else ""))
-
-        if not records:
+        since = since_date.date() if since_date else None
+        history = await find_energy_history(db, ConsumptionData, pdl, since)
+        if history is None:
             logger.info(f"[HA-WS] No records found for {pdl}")
             return {}
 
-        # 3. For TEMPO, load the color calendar
+        use_detailed = history.is_detailed
+        logger.info(
+            f"[HA-WS] Using {history.row_count} {history.granularity.value} records for {pdl}"
+            + (f" (since {since})" if since else "")
+        )
+
+        # 3. For TEMPO, load the colors of the exported range (HC before 6h uses the previous day)
         tempo_colors: dict[str, TempoColor] = {}
         if "TEMPO" in pricing_option:
-            tempo_result = await db.execute(select(TempoDay))
-            for day in tempo_result.scalars().all():
-                # Store by date string YYYY-MM-DD
-                day_str = day.date.strftime("%Y-%m-%d") if hasattr(day.date, 'strftime') else str(day.date)[:10]
-                tempo_colors[day_str] = day.color
+            tempo_colors = await load_tempo_colors(db, history.first_date - timedelta(days=1), history.last_date)
 
         # 4. Initialize stats buckets based on pricing option
         stats_by_tariff: dict[str, list[dict[str, Any]]] = {}
@@ -3141,67 +3132,18 @@ class HomeAssistantExporter(BaseExporter):
             stats_by_tariff["base"] = []
             cumulative_by_tariff["base"] = 0.0
 
-        # 5. Helper to determine if an hour is in off-peak period
-        def is_offpeak_hour(hour: int, minute: int = 0) -> bool:
-            """Check if given time is in off-peak hours"""
-            if not offpeak_hours:
-                # Default: 22h-6h = heures creuses
-                return hour < 6 or hour >= 22
-
-            time_minutes = hour * 60 + minute
-            for period in offpeak_hours:
-                start_parts = period.get("start", "22:00").split(":")
-                end_parts = period.get("end", "06:00").split(":")
-                start_minutes = int(start_parts[0]) * 60 + int(start_parts[1]) if len(start_parts) >= 2 else 22 * 60
-                end_minutes = int(end_parts[0]) * 60 + int(end_parts[1]) if len(end_parts) >= 2 else 6 * 60
-
-                # Handle overnight periods (e.g., 22:00 -> 06:00)
-                if start_minutes > end_minutes:
-                    if time_minutes >= start_minutes or time_minutes < end_minutes:
-                        return True
-                else:
-                    if start_minutes <= time_minutes < end_minutes:
-                        return True
-            return False
-
-        # 6. Helper to convert W → Wh based on interval_length
-        def convert_w_to_wh(value_w: int, raw_data: dict | None) -> float:
-            """Convert Watts to Watt-hours based on interval_length
-
-            For detailed data, values are in W (average power over interval).
-            Formula: Wh = W / (60 / interval_minutes)
-            - PT10M → Wh = W / 6
-            - PT15M → Wh = W / 4
-            - PT30M → Wh = W / 2 (default)
-            - PT60M → Wh = W / 1
-
-            For daily data, values are already in Wh.
-            """
-            if not raw_data:
-                # Default to PT30M for detailed data without raw_data
-                return value_w / 2 if use_detailed else float(value_w)
-
-            interval_length = raw_data.get("interval_length", "PT30M")
-
-            # Parse interval_length (e.g., "PT30M" → 30)
-            match = re.match(r"PT(\d+)M", interval_length)
-            if match:
-                interval_minutes = int(match.group(1))
-                # Wh = W / (60 / interval_minutes)
-                return value_w / (60 / interval_minutes)
-
-            # For daily data (PT1D or unknown), value is already in Wh
-            return float(value_w)
-
-        # 7. Process each record
+        # 5. Off-peak slots compiled once (default: 22h-6h = heures creuses)
+        schedule = TariffSchedule.from_offpeak_hours(offpeak_hours, default=DEFAULT_OFFPEAK_RANGES)
+
+        # 6. Process each record
         # Home Assistant requires hourly data (timestamps at XX:00:00)
         # For detailed (30-min) data, we aggregate by hour
         # Key: (tariff_tag, date, hour) -> value_kwh
         hourly_aggregation: dict[tuple[str, Any, int], float] = {}
 
-        for record in records:
-            # Convert W → Wh using interval_length from raw_data
-            value_wh = convert_w_to_wh(record.value, record.raw_data) if record.value else 0
+        async for record in stream_energy_rows(db, ConsumptionData, history):
+            # Wh normalized at ingestion from the reading interval length
+            value_wh = self._stored_value_wh(record.value, record.value_wh, use_detailed) if record.value else 0
             value_kwh = value_wh / 1000
 
             # Parse time
@@ -3217,7 +3159,7 @@ class HomeAssistantExporter(BaseExporter):
             if "TEMPO" in pricing_option:
                 # TEMPO logic: 6h-22h = HP, 22h-6h = HC
                 # For data between 00:00 and 06:00, the color is from the previous day
-                if 6 <= hour < 22:
+                if not TEMPO_SCHEDULE.is_offpeak(hour * 60):
                     period = "hp"
                     tempo_date = record.date
                 else:
@@ -3236,7 +3178,7 @@ class HomeAssistantExporter(BaseExporter):
             elif pricing_option in ("HC/HP", "HCHP", "EJP"):
                 # HC/HP: use off-peak hours from contract
                 # Use start of hour for tariff determination
-                if is_offpeak_hour(hour, 0):
+                if schedule.is_offpeak(hour * 60):
                     tariff_tag = "hc"
                 else:
                     tariff_tag = "hp"
@@ -3256,7 +3198,7 @@ class HomeAssistantExporter(BaseExporter):
                 for h in range(24):
                     # Re-determine tariff for each hour
                     if "TEMPO" in pricing_option:
-                        if 6 <= h < 22:
+                        if not TEMPO_SCHEDULE.is_offpeak(h * 60):
                             h_period = "hp"
                             h_tempo_date = record.date
                         else:
@@ -3270,7 +3212,7 @@ class HomeAssistantExporter(BaseExporter):
                         h_color_name = h_color.value.lower() if hasattr(h_color, 'value') else str(h_color).lower()
                         h_tariff_tag = f"{h_color_name}_{h_period}"
                     elif pricing_option in ("HC/HP", "HCHP", "EJP"):
-                        h_tariff_tag = "hc" if is_offpeak_hour(h, 0) else "hp"
+                        h_tariff_tag = "hc" if schedule.is_offpeak(h * 60) else "hp"
                     else:
                         h_tariff_tag = "base"
 
@@ -3331,13 +3273,10 @@ class HomeAssistantExporter(BaseExporter):
         """
 
         from ...models.energy_provider import EnergyOffer
-        from ...models.pdl import PDL
+        from ..pdl_cache import pdl_cache
 
         # Get PDL with selected offer
-        pdl_result = await db.execute(
-            select(PDL).where(PDL.usage_point_id == pdl)
-        )
-        pdl_record = pdl_result.scalar_one_or_none()
+        pdl_record = await pdl_cache.get(db, pdl)
 
         if not pdl_record or not pdl_record.selected_offer_id:
             logger.warning(f"[HA-WS] PDL {pdl} has no selected_offer_id, cannot calculate costs")
@@ -3438,77 +3377,25 @@ class HomeAssistantExporter(BaseExporter):
         """
         from zoneinfo import ZoneInfo
 
-        from ...models.client_mode import ProductionData, DataGranularity
+        from ...models.client_mode import ProductionData
 
         tz_paris = ZoneInfo("Europe/Paris")
 
-        # Try detailed data first
+        # Detailed data first, fallback to daily
+        since = since_date.date() if since_date else None
         try:
-            detailed_query = (
-                select(ProductionData)
-                .where(ProductionData.usage_point_id == pdl)
-                .where(ProductionData.granularity == DataGranularity.DETAILED)
-            )
-            if since_date:
-                detailed_query = detailed_query.where(ProductionData.date >= since_date.date())
-            detailed_query = detailed_query.order_by(ProductionData.date, ProductionData.interval_start)
-
-            detailed_result = await db.execute(detailed_query)
-            detailed_records = detailed_result.scalars().all()
-
-            if detailed_records:
-                records = detailed_records
-                use_detailed = True
-                logger.debug(f"[HA-WS] Using {len(records)} detailed production records for {pdl}" + (f" (since {since_date.date()})" if since_date else ""))
-            else:
-                # Fallback to daily
-                daily_query = (
-                    select(ProductionData)
-                    .where(ProductionData.usage_point_id == pdl)
-                    .where(ProductionData.granularity == DataGranularity.DAILY)
-                )
-                if since_date:
-                    daily_query = daily_query.where(ProductionData.date >= since_date.date())
-                daily_query = daily_query.order_by(ProductionData.date)
-
-                daily_result = await db.execute(daily_query)
-                records = daily_result.scalars().all()
-                use_detailed = False
-                logger.debug(f"[HA-WS] Using {len(records)} daily production records for {pdl}" + (f" (since {since_date.date()})" if since_date else ""))
+            history = await find_energy_history(db, ProductionData, pdl, since)
         except Exception:
             return []
 
-        if not records:
+        if history is None:
             return []
 
-        # Helper to convert W → Wh based on interval_length
-        def convert_w_to_wh(value_w: int, raw_data: dict | None) -> float:
-            """Convert Watts to Watt-hours based on interval_length
-
-            For detailed data, values are in W (average power over interval).
-            Formula: Wh = W / (60 / interval_minutes)
-            - PT10M → Wh = W / 6
-            - PT15M → Wh = W / 4
-            - PT30M → Wh = W / 2 (default)
-            - PT60M → Wh = W / 1
-
-            For daily data, values are already in Wh.
-            """
-            if not raw_data:
-                # Default to PT30M for detailed data without raw_data
-                return value_w / 2 if use_detailed else float(value_w)
-
-            interval_length = raw_data.get("interval_length", "PT30M")
-
-            # Parse interval_length (e.g., "PT30M" → 30)
-            match = re.match(r"PT(\d+)M", interval_length)
-            if match:
-                interval_minutes = int(match.group(1))
-                # Wh = W / (60 / interval_minutes)
-                return value_w / (60 / interval_minutes)
-
-            # For daily data (PT1D or unknown), value is already in Wh
-            return float(value_w)
+        use_detailed = history.is_detailed
+        logger.debug(
+            f"[HA-WS] Using {history.row_count} {history.granularity.value} production records for {pdl}"
+            + (f" (since {since})" if since else "")
+        )
 
         # Build statistics with cumulative sum
         # Home Assistant requires hourly data (timestamps at XX:00:00)
@@ -3516,21 +3403,25 @@ class HomeAssistantExporter(BaseExporter):
         # Key: (date, hour) -> value_kwh
         hourly_aggregation: dict[tuple[Any, int], float] = {}
 
-        for record in records:
-            # Convert W → Wh using interval_length from raw_data
-            value_wh = convert_w_to_wh(record.value, record.raw_data) if record.value else 0
-            value_kwh = value_wh / 1000
-
-            if use_detailed and record.interval_start:
-                hour, _ = map(int, record.interval_start.split(":"))
-                key = (record.date, hour)
-                hourly_aggregation[key] = hourly_aggregation.get(key, 0) + value_kwh
-            else:
-                # Daily data: split into 24 hourly entries
-                hourly_value = value_kwh / 24
-                for h in range(24):
-                    key = (record.date, h)
-                    hourly_aggregation[key] = hourly_aggregation.get(key, 0) + hourly_value
+        # The rows are read while streaming: a query failure surfaces here
+        try:
+            async for record in stream_energy_rows(db, ProductionData, history):
+                # Wh normalized at ingestion from the reading interval length
+                value_wh = self._stored_value_wh(record.value, record.value_wh, use_detailed) if record.value else 0
+                value_kwh = value_wh / 1000
+
+                if use_detailed and record.interval_start:
+                    hour, _ = map(int, record.interval_start.split(":"))
+                    key = (record.date, hour)
+                    hourly_aggregation[key] = hourly_aggregation.get(key, 0) + value_kwh
+                else:
+                    # Daily data: split into 24 hourly entries
+                    hourly_value = value_kwh / 24
+                    for h in range(24):
+                        key = (record.date, h)
+                        hourly_aggregation[key] = hourly_aggregation.get(key, 0) + hourly_value
+        except Exception:
+            return []
 
         # Build final statistics sorted by time
         stats = []
@@ -25,7 +25,7 @@ import aiomqtt
 from sqlalchemy import String, cast, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .base import BaseExporter
+from .base import BaseExporter, PublishCounter
 
 logger = logging.getLogger(__name__)
 
@@ -65,18 +65,21 @@ class MQTTExporter(BaseExporter):
         self.qos = self.config.get("qos", 0)
         self.retain = self.config.get("retain", True)
 
-    async def _get_mqtt_client(self) -> aiomqtt.Client:
-        """Create and return an MQTT client"""
+    async def _get_mqtt_client(self) -> PublishCounter:
+        """Create and return an MQTT client (counting the published bytes)"""
         tls_context = None
         if self.use_tls:
             tls_context = ssl.create_default_context()
 
-        return aiomqtt.Client(
-            hostname=self.broker,
-            port=self.port,
-            username=self.username,
-            password=self.password,
-            tls_context=tls_context,
+        return PublishCounter(
+            aiomqtt.Client(
+                hostname=self.broker,
+                port=self.port,
+                username=self.username,
+                password=self.password,
+                tls_context=tls_context,
+            ),
+            self,
         )
 
     async def test_connection(self) -> bool:
@@ -196,36 +199,44 @@ class MQTTExporter(BaseExporter):
         }
 
         async with await self._get_mqtt_client() as client:
-            # Export consumption/production for each PDL
-            for pdl in usage_point_ids:
-                try:
-                    # Export consumption stats
-                    stats = await self._get_consumption_stats(db, pdl)
-                    if stats:
-                        topic = f"{self.topic_prefix}/{pdl}/consumption/stats"
-                        await client.publish(
-                            topic,
-                            payload=json.dumps(stats),
-                            qos=self.qos,
-                            retain=self.retain,
-                        )
-                        results["consumption"] += 1
-
-                    # Export production stats
-                    prod_stats = await self._get_production_stats(db, pdl)
-                    if prod_stats:
-                        topic = f"{self.topic_prefix}/{pdl}/production/stats"
-                        await client.publish(
-                            topic,
-                            payload=json.dumps(prod_stats),
-                            qos=self.qos,
-                            retain=self.retain,
-                        )
-                        results["production"] += 1
-
-                except Exception as e:
-                    logger.error(f"[MQTT] Error exporting PDL {pdl}: {e}")
-                    results["errors"].append(f"PDL {pdl}: {str(e)}")
+            # Export consumption/production for each PDL (concurrently, one session per PDL)
+            async def export_pdl(pdl_db: AsyncSession, pdl: str) -> tuple[int, int]:
+                consumption = production = 0
+
+                # Export consumption stats
+                stats = await self._get_consumption_stats(pdl_db, pdl)
+                if stats:
+                    topic = f"{self.topic_prefix}/{pdl}/consumption/stats"
+                    await client.publish(
+                        topic,
+                        payload=json.dumps(stats),
+                        qos=self.qos,
+                        retain=self.retain,
+                    )
+                    consumption = 1
+
+                # Export production stats
+                prod_stats = await self._get_production_stats(pdl_db, pdl)
+                if prod_stats:
+                    topic = f"{self.topic_prefix}/{pdl}/production/stats"
+                    await client.publish(
+                        topic,
+                        payload=json.dumps(prod_stats),
+                        qos=self.qos,
+                        retain=self.retain,
+                    )
+                    production = 1
+
+                return consumption, production
+
+            pdl_results = await self.map_pdls_concurrently(usage_point_ids, export_pdl)
+            for pdl, pdl_result in zip(usage_point_ids, pdl_results):
+                if isinstance(pdl_result, BaseException):
+                    logger.error(f"[MQTT] Error exporting PDL {pdl}: {pdl_result}")
+                    results["errors"].append(f"PDL {pdl}: {str(pdl_result)}")
+                    continue
+                results["consumption"] += pdl_result[0]
+                results["production"] += pdl_result[1]
 
             # Export Tempo data
             try:
@@ -197,6 +197,7 @@ class VictoriaMetricsExporter(BaseExporter):
                 auth=self._get_auth(),
             )
             response.raise_for_status()
+        self.bytes_sent += len(payload.encode("utf-8"))
 
         logger.info(f"[VM] Exported consumption for {usage_point_id}: {len(lines)} records")
         return len(lines)
@@ -264,6 +265,7 @@ class VictoriaMetricsExporter(BaseExporter):
                 auth=self._get_auth(),
             )
             response.raise_for_status()
+        self.bytes_sent += len(payload.encode("utf-8"))
 
         logger.info(f"[VM] Exported production for {usage_point_id}: {len(lines)} records")
         return len(lines)
@@ -290,7 +292,6 @@ class VictoriaMetricsExporter(BaseExporter):
         """
         from ..statistics import StatisticsService
 
-        stats = StatisticsService(db)
         results = {
             "consumption": 0,
             "production": 0,
@@ -322,36 +323,38 @@ class VictoriaMetricsExporter(BaseExporter):
                 logger.error(f"[VM] Tempo global export failed: {e}")
                 results["errors"].append(f"tempo_global: {str(e)}")
 
-        # Per-PDL exports
-        for pdl in usage_point_ids:
-            try:
-                # Consumption data
-                if self.export_consumption_enabled:
-                    consumption_lines = await self._build_data_lines(db, pdl, "consumption", now_ns)
-                    lines.extend(consumption_lines)
-                    results["consumption"] += len(consumption_lines)
-
-                # Production data
-                if self.export_production_enabled:
-                    production_lines = await self._build_data_lines(db, pdl, "production", now_ns)
-                    lines.extend(production_lines)
-                    results["production"] += len(production_lines)
-
-                # Aggregated statistics
-                if self.export_stats_enabled:
-                    stats_lines = await self._build_stats_lines(stats, pdl, now_ns)
-                    lines.extend(stats_lines)
-                    results["stats"] += len(stats_lines)
-
-                # Tempo consumption by color
-                if self.export_tempo_enabled:
-                    tempo_consumption_lines = await self._build_tempo_consumption_lines(stats, pdl, now_ns)
-                    lines.extend(tempo_consumption_lines)
-                    results["tempo"] += len(tempo_consumption_lines)
+        # Per-PDL exports (concurrently, one session per PDL)
+        async def build_pdl_lines(pdl_db: AsyncSession, pdl: str) -> dict[str, list[str]]:
+            pdl_stats = StatisticsService(pdl_db)
+            pdl_lines: dict[str, list[str]] = {}
 
-            except Exception as e:
-                logger.error(f"[VM] Export failed for PDL {pdl}: {e}")
-                results["errors"].append(f"{pdl}: {str(e)}")
+            # Consumption data
+            if self.export_consumption_enabled:
+                pdl_lines["consumption"] = await self._build_data_lines(pdl_db, pdl, "consumption", now_ns)
+
+            # Production data
+            if self.export_production_enabled:
+                pdl_lines["production"] = await self._build_data_lines(pdl_db, pdl, "production", now_ns)
+
+            # Aggregated statistics
+            if self.export_stats_enabled:
+                pdl_lines["stats"] = await self._build_stats_lines(pdl_stats, pdl, now_ns)
+
+            # Tempo consumption by color
+            if self.export_tempo_enabled:
+                pdl_lines["tempo"] = await self._build_tempo_consumption_lines(pdl_stats, pdl, now_ns)
+
+            return pdl_lines
+
+        pdl_results = await self.map_pdls_concurrently(usage_point_ids, build_pdl_lines)
+        for pdl, pdl_result in zip(usage_point_ids, pdl_results):
+            if isinstance(pdl_result, BaseException):
+                logger.error(f"[VM] Export failed for PDL {pdl}: {pdl_result}")
+                results["errors"].append(f"{pdl}: {str(pdl_result)}")
+                continue
+            for key, key_lines in pdl_result.items():
+                lines.extend(key_lines)
+                results[key] += len(key_lines)
 
         # Send all data to VictoriaMetrics
         if lines:
@@ -381,6 +384,7 @@ class VictoriaMetricsExporter(BaseExporter):
                     auth=self._get_auth(),
                 )
                 response.raise_for_status()
+            self.bytes_sent += len(payload.encode("utf-8"))
 
     # =========================================================================
     # DATA LINES BUILDERS
@@ -8,7 +8,6 @@ Deux tarifs selon l'heure :
 Les plages horaires HC varient selon les contrats (généralement 8h réparties sur 24h).
 """
 
-from datetime import time
 from decimal import Decimal
 from typing import ClassVar
 
@@ -18,6 +17,7 @@ from .base import (
     CalculationResult,
     PeriodDetail,
 )
+from ..tariff_schedule import TariffSchedule
 
 
 # Horaires HC par défaut (EDF standard)
@@ -31,34 +31,6 @@ DEFAULT_HC_SCHEDULES = {
     "sunday": "22:30-06:30",
 }
 
-WEEKDAY_NAMES = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
-
-
-def parse_time_range(time_range: str) -> tuple[time, time]:
-    """
-    Parse une plage horaire "HH:MM-HH:MM" en tuple (start, end).
-
-    Ex: "22:30-06:30" -> (time(22, 30), time(6, 30))
-    """
-    start_str, end_str = time_range.split("-")
-    start_h, start_m = map(int, start_str.split(":"))
-    end_h, end_m = map(int, end_str.split(":"))
-    return time(start_h, start_m), time(end_h, end_m)
-
-
-def is_in_hc_period(timestamp_time: time, hc_start: time, hc_end: time) -> bool:
-    """
-    Vérifie si une heure est dans la période HC.
-
-    Gère le cas où la période traverse minuit (ex: 22:30 -> 06:30).
-    """
-    if hc_start <= hc_end:
-        # Période simple (ex: 02:00-08:00)
-        return hc_start <= timestamp_time < hc_end
-    else:
-        # Période traversant minuit (ex: 22:30-06:30)
-        return timestamp_time >= hc_start or timestamp_time < hc_end
-
 
 class HcHpCalculator(BaseOfferCalculator):
     """Calculateur pour l'offre Heures Creuses / Heures Pleines."""
@@ -102,6 +74,7 @@ class HcHpCalculator(BaseOfferCalculator):
 
         # Utiliser les horaires personnalisés ou ceux de la consommation ou défaut
         schedules = hc_schedules or consumption.hc_schedules or DEFAULT_HC_SCHEDULES
+        hc_schedule = TariffSchedule.from_hc_schedules(schedules)
 
         # Tarifs week-end (optionnels)
         hc_price_weekend = prices.get("hc_price_weekend")
@@ -119,16 +92,10 @@ class HcHpCalculator(BaseOfferCalculator):
         hp_cost_weekend = Decimal(0)
 
         for point in consumption.points:
-            weekday_name = WEEKDAY_NAMES[point.timestamp.weekday()]
             is_weekend = point.timestamp.weekday() >= 5
 
-            # Récupérer la plage HC pour ce jour
-            day_schedule = schedules.get(weekday_name, "22:30-06:30")
-            hc_start, hc_end = parse_time_range(day_schedule)
-
-            # Déterminer si c'est HC ou HP
-            point_time = point.timestamp.time()
-            is_hc = is_in_hc_period(point_time, hc_start, hc_end)
+            # Déterminer si c'est HC ou HP (plage HC du jour)
+            is_hc = hc_schedule.is_offpeak_at(point.timestamp)
 
             kwh = point.value_kwh
 
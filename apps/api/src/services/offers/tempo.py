@@ -19,7 +19,8 @@ from .base import (
     CalculationResult,
     PeriodDetail,
 )
-from .hc_hp import parse_time_range, is_in_hc_period, WEEKDAY_NAMES, DEFAULT_HC_SCHEDULES
+from .hc_hp import DEFAULT_HC_SCHEDULES
+from ..tariff_schedule import TariffSchedule
 
 
 # Couleurs Tempo pour l'affichage
@@ -92,6 +93,7 @@ class TempoCalculator(BaseOfferCalculator):
 
         # Horaires HC
         schedules = hc_schedules or consumption.hc_schedules or DEFAULT_HC_SCHEDULES
+        hc_schedule = TariffSchedule.from_hc_schedules(schedules)
 
         # Accumulateurs pour les 6 périodes
         totals = {
@@ -105,15 +107,12 @@ class TempoCalculator(BaseOfferCalculator):
 
         for point in consumption.points:
             point_date = point.timestamp.date()
-            weekday_name = WEEKDAY_NAMES[point.timestamp.weekday()]
 
             # Déterminer la couleur du jour
             day_color = self._get_day_color(point_date)
 
             # Déterminer HC ou HP
-            day_schedule = schedules.get(weekday_name, "22:30-06:30")
-            hc_start, hc_end = parse_time_range(day_schedule)
-            is_hc = is_in_hc_period(point.timestamp.time(), hc_start, hc_end)
+            is_hc = hc_schedule.is_offpeak_at(point.timestamp)
 
             # Clé de période
             period_key = f"{day_color}_{'hc' if is_hc else 'hp'}"
@@ -0,0 +1,94 @@
+"""Process-local cache of PDL ownership and metadata"""
+import logging
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..models import PDL
+from .ttl_cache import GENERATION_CHECK_INTERVAL_SECONDS, GenerationTTLCache
+
+logger = logging.getLogger(__name__)
+
+PDL_CACHE_MAX_ENTRIES = 10000
+
+
+@dataclass(frozen=True)
+class PDLMetadata:
+    """Snapshot of the PDL columns read on the request, sync and export paths
+
+    `offpeak_hours` is the stored JSON value, shared between readers: do not modify it.
+    """
+
+    id: str
+    usage_point_id: str
+    user_id: str
+    is_active: bool
+    has_consumption: bool
+    has_production: bool
+    subscribed_power: Optional[int]
+    pricing_option: Optional[str]
+    offpeak_hours: Optional[Any]
+    linked_production_pdl_id: Optional[str]
+    selected_offer_id: Optional[str]
+
+    def is_owned_by(self, user_id: str, active_only: bool = False) -> bool:
+        return self.user_id == user_id and (self.is_active or not active_only)
+
+
+_METADATA_COLUMNS = tuple(getattr(PDL, field.name) for field in fields(PDLMetadata))
+
+
+class PDLCache(GenerationTTLCache[PDLMetadata]):
+    """
+    In-memory TTL cache of PDL metadata, keyed by usage_point_id.
+
+    Only existing PDLs are cached. `invalidate()` must be awaited whenever a PDL is created,
+    modified, transferred or deleted.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        max_entries: int = PDL_CACHE_MAX_ENTRIES,
+        check_interval: float = GENERATION_CHECK_INTERVAL_SECONDS,
+    ):
+        super().__init__("pdl", ttl_seconds, max_entries, check_interval)
+
+    def _put(self, metadata: PDLMetadata) -> PDLMetadata:
+        return self.store(metadata.usage_point_id, metadata)
+
+    async def get(self, db: AsyncSession, usage_point_id: str) -> Optional[PDLMetadata]:
+        """Metadata of a PDL (whatever its owner), loaded on miss. None if the PDL does not exist."""
+        await self.sync_generation()
+        metadata = self.get_cached(usage_point_id)
+        if metadata is not None:
+            return metadata
+
+        result = await db.execute(select(*_METADATA_COLUMNS).where(PDL.usage_point_id == usage_point_id))
+        row = result.first()
+        return self._put(PDLMetadata(*row)) if row else None
+
+    async def get_many(self, db: AsyncSession, usage_point_ids: Iterable[str]) -> Dict[str, PDLMetadata]:
+        """Metadata of several PDLs in one query for the misses, keyed by usage_point_id"""
+        await self.sync_generation()
+        found: Dict[str, PDLMetadata] = {}
+        missing = []
+        for usage_point_id in dict.fromkeys(usage_point_ids):
+            metadata = self.get_cached(usage_point_id)
+            if metadata is None:
+                missing.append(usage_point_id)
+            else:
+                found[usage_point_id] = metadata
+
+        if missing:
+            result = await db.execute(select(*_METADATA_COLUMNS).where(PDL.usage_point_id.in_(missing)))
+            for row in result.all():
+                metadata = self._put(PDLMetadata(*row))
+                found[metadata.usage_point_id] = metadata
+        return found
+
+
+pdl_cache = PDLCache(ttl_seconds=settings.PDL_CACHE_TTL_SECONDS)
@@ -1,12 +1,11 @@
 """AlpIQ price scraper - Fetches tariffs from official PDFs"""
 from typing import List
 import re
-import httpx
 import pdfplumber
 import io
 from datetime import datetime, UTC
 
-from .base import BasePriceScraper, OfferData, run_sync_in_thread
+from .base import BasePriceScraper, OfferData, extract_pdf_text, scraper_http_client
 
 
 class AlpiqScraper(BasePriceScraper):
@@ -64,26 +63,28 @@ class AlpiqScraper(BasePriceScraper):
         errors = []
         all_offers = []
 
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+        async with scraper_http_client(follow_redirects=True) as client:
             for url in self.scraper_urls:
                 try:
                     if not url.lower().endswith('.pdf'):
                         continue
 
-                    response = await client.get(url)
-                    if response.status_code != 200:
-                        error_msg = f"Échec du téléchargement du PDF Alpiq (HTTP {response.status_code}): {url}"
-                        self.logger.warning(error_msg)
-                        errors.append(error_msg)
-                        continue
-
                     # Determine which parser to use based on URL
                     if "PRIX_STABLE" in url.upper():
                         # PDF with only Électricité Stable -21,5%
-                        offers = await run_sync_in_thread(self._parse_stable_21_pdf, response.content)
+                        parser = self._parse_stable_21_pdf
                     else:
                         # General PDF with Stable -8% and Référence -4%
-                        offers = await run_sync_in_thread(self._parse_general_pdf, response.content)
+                        parser = self._parse_general_pdf
+
+                    document = await self.fetch_and_parse(client, url, parser)
+                    if document.status_code != 200:
+                        error_msg = f"Échec du téléchargement du PDF Alpiq (HTTP {document.status_code}): {url}"
+                        self.logger.warning(error_msg)
+                        errors.append(error_msg)
+                        continue
+
+                    offers = document.value
 
                     if offers:
                         # Set offer_url for each offer
@@ -132,10 +133,7 @@ class AlpiqScraper(BasePriceScraper):
         try:
             offers = []
 
-            with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    text += page.extract_text() or ""
+            text = extract_pdf_text(pdf_content)
 
             # Extract validity date
             valid_from = self._extract_validity_date(text) or datetime(2025, 11, 4, tzinfo=UTC)
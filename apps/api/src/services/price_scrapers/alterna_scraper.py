@@ -1,12 +1,11 @@
 """Alterna price scraper - Fetches tariffs from Alterna market offers"""
 from typing import List
 import re
-import httpx
 from io import BytesIO
 from pdfminer.high_level import extract_text
 from datetime import datetime, UTC
 
-from .base import BasePriceScraper, OfferData, run_sync_in_thread
+from .base import BasePriceScraper, OfferData, scraper_http_client
 
 
 def _extract_pdf_text(content: bytes) -> str:
@@ -103,16 +102,16 @@ class AlternaScraper(BasePriceScraper):
 
             for pdf_url, offer_name in pdf_configs:
                 try:
-                    async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-                        response = await client.get(pdf_url)
-                        if response.status_code != 200:
-                            error_msg = f"Échec du téléchargement du PDF Alterna {offer_name} (HTTP {response.status_code})"
+                    async with scraper_http_client(follow_redirects=True) as client:
+                        document = await self.fetch_and_parse(client, pdf_url, _extract_pdf_text)
+                        if document.status_code != 200:
+                            error_msg = f"Échec du téléchargement du PDF Alterna {offer_name} (HTTP {document.status_code})"
                             self.logger.warning(error_msg)
                             errors.append(error_msg)
                             continue
 
                         # Parse PDF in thread pool to avoid blocking event loop
-                        text = await run_sync_in_thread(_extract_pdf_text, response.content)
+                        text = document.value
                         parsed_offers = self._parse_pdf(text, offer_name)
 
                         if parsed_offers:
@@ -1,30 +1,27 @@
 """Base class for energy provider price scrapers"""
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Callable, TypeVar
+from typing import List, Dict, Any, Callable, Sequence, TypeVar
 from datetime import datetime, UTC
-from concurrent.futures import ProcessPoolExecutor
-import multiprocessing
+from hashlib import sha256
 import asyncio
+import io
+import json
 import logging
+import re
+import httpx
+import pdfplumber
 
-logger = logging.getLogger(__name__)
-
-# IMPORTANT: Use "spawn" instead of "fork" to avoid deadlocks with asyncio/uvicorn
-# Fork copies the entire process state including event loops, causing issues
-# Spawn creates a fresh Python interpreter, which is safer with async code
-_mp_context = multiprocessing.get_context("spawn")
+from ..cache import cache_service
+from ..cpu_executor import cpu_executor
 
-# Shared process pool for CPU-intensive PDF parsing
-# ProcessPoolExecutor bypasses Python's GIL, allowing true parallel CPU usage
-# This enables pdfminer to use multiple cores for faster parsing
-pdf_executor = ProcessPoolExecutor(max_workers=4, mp_context=_mp_context)
+logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
 
 async def run_sync_in_process(func: Callable[..., T], *args: Any) -> T:
     """
-    Run a synchronous function in a process pool to bypass Python's GIL.
+    Run a synchronous function in the shared CPU process pool to bypass Python's GIL.
     Use this for CPU-intensive operations like PDF parsing.
 
     Args:
@@ -34,14 +31,156 @@ async def run_sync_in_process(func: Callable[..., T], *args: Any) -> T:
     Returns:
         The result of the function
     """
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(pdf_executor, func, *args)
+    return await cpu_executor.run(func, *args)
 
 
 # Alias for backward compatibility
 run_sync_in_thread = run_sync_in_process
 
 
+# Compiled regex registry shared by the PDF parsers: patterns are compiled once per process
+# (workers of the spawn pool import the scraper modules once) instead of on every line scanned
+PDF_PATTERNS: Dict[str, re.Pattern[str]] = {}
+
+
+def register_pattern(name: str, pattern: str, flags: int = 0) -> re.Pattern[str]:
+    """Compile and register a parsing pattern under `name` (e.g. "edf.tempo_row")"""
+    compiled = PDF_PATTERNS.get(name)
+    if compiled is None or compiled.pattern != pattern:
+        compiled = re.compile(pattern, flags)
+        PDF_PATTERNS[name] = compiled
+    return compiled
+
+
+def _find_markers(text: str, markers: Sequence[str], found: int = 0) -> tuple[int, int]:
+    """
+    Match `markers[found:]` in order in `text`.
+
+    Returns the number of markers matched so far and the end position of the last match.
+    """
+    position = 0
+    while found < len(markers):
+        index = text.find(markers[found], position)
+        if index == -1:
+            break
+        position = index + len(markers[found])
+        found += 1
+    return found, position
+
+
+def extract_pdf_text(
+    content: bytes,
+    stop_after: Sequence[str] | None = None,
+    max_pages: int | None = None,
+) -> str:
+    """
+    Extract the text of a PDF page by page (synchronous, call it from the process pool).
+
+    Pages are collected in a list and joined once, the same way the scrapers used to
+    concatenate them. Extraction stops early once every marker of `stop_after` has been
+    seen (in order), so the pages after the needed tables are never laid out. Only the new
+    page (plus the end of the previous one, for a marker split across pages) is searched.
+
+    Args:
+        content: PDF binary content
+        stop_after: Ordered markers; stop after the page on which the last one is found
+        max_pages: Only extract the first `max_pages` pages
+
+    Returns:
+        Extracted text
+    """
+    pages: List[str] = []
+    found = 0
+    carry = ""
+    overlap = max(len(marker) for marker in stop_after) - 1 if stop_after else 0
+    with pdfplumber.open(io.BytesIO(content)) as pdf:
+        for page in pdf.pages[:max_pages]:
+            text = page.extract_text() or ""
+            pages.append(text)
+            if not stop_after:
+                continue
+            window = carry + text
+            found, end = _find_markers(window, stop_after, found)
+            if found == len(stop_after):
+                break
+            carry = window[end:][-overlap:] if overlap else ""
+    return "".join(pages)
+
+
+# Below this many pages a document is extracted by a single worker: each worker of a parallel
+# extraction re-opens the whole PDF, which costs more than laying out a few pages in sequence
+PARALLEL_EXTRACTION_MIN_PAGES = 8
+
+
+def pdf_page_count(content: bytes) -> int:
+    """Number of pages of a PDF (synchronous)"""
+    with pdfplumber.open(io.BytesIO(content)) as pdf:
+        return len(pdf.pages)
+
+
+def extract_pdf_page(content: bytes, page_number: int) -> str:
+    """Extract the text of a single PDF page (synchronous, picklable for the process pool)"""
+    with pdfplumber.open(io.BytesIO(content)) as pdf:
+        return pdf.pages[page_number].extract_text() or ""
+
+
+async def extract_pdf_text_parallel(
+    content: bytes,
+    max_pages: int | None = None,
+    min_pages: int = PARALLEL_EXTRACTION_MIN_PAGES,
+) -> str:
+    """
+    Extract the pages of a PDF in parallel on the process pool.
+
+    Documents shorter than `min_pages` (the usual one or two page tariff sheets) are
+    extracted by `extract_pdf_text` in a single worker, which is cheaper for them.
+    Returns the same text as `extract_pdf_text(content, max_pages=max_pages)`.
+    """
+    page_count = await run_sync_in_process(pdf_page_count, content)
+    if max_pages is not None:
+        page_count = min(page_count, max_pages)
+    if page_count < min_pages:
+        return await run_sync_in_process(extract_pdf_text, content, None, page_count)
+    pages = await asyncio.gather(
+        *(run_sync_in_process(extract_pdf_page, content, number) for number in range(page_count))
+    )
+    return "".join(pages)
+
+
+# Scrapers run concurrently during a full refresh: cap simultaneous requests per host
+# so that providers sharing a CDN (or a single provider with several documents) are not hammered
+MAX_CONCURRENT_REQUESTS_PER_HOST = 2
+_host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def _get_host_semaphore(host: str) -> asyncio.Semaphore:
+    semaphore = _host_semaphores.get(host)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS_PER_HOST)
+        _host_semaphores[host] = semaphore
+    return semaphore
+
+
+class HostLimitedTransport(httpx.AsyncHTTPTransport):
+    """HTTP transport that limits concurrent requests per host across all scrapers"""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        async with _get_host_semaphore(request.url.host):
+            response = await super().handle_async_request(request)
+            # Read the body while holding the slot so the download itself is limited
+            await response.aread()
+            return response
+
+
+def scraper_http_client(timeout: float = 30.0, verify: bool = True, follow_redirects: bool = False) -> httpx.AsyncClient:
+    """HTTP client for scrapers, sharing the per-host concurrency limit"""
+    return httpx.AsyncClient(
+        timeout=timeout,
+        follow_redirects=follow_redirects,
+        transport=HostLimitedTransport(verify=verify),
+    )
+
+
 class OfferData:
     """Data class for energy offer information"""
 
@@ -155,16 +294,172 @@ class OfferData:
 
         return result
 
+    @classmethod
+    def from_dict(cls, offer_dict: Dict[str, Any]) -> "OfferData":
+        """Rebuild an offer from `to_dict(for_json=True)` output, parsing ISO date strings"""
+        dates: Dict[str, datetime | None] = {}
+        for field in ("valid_from", "valid_to"):
+            value = offer_dict.get(field)
+            dates[field] = None
+            if isinstance(value, datetime):
+                dates[field] = value
+            elif value:
+                try:
+                    dates[field] = datetime.fromisoformat(value)
+                except (ValueError, TypeError):
+                    pass
+
+        return cls(
+            name=offer_dict["name"],
+            offer_type=offer_dict["offer_type"],
+            description=offer_dict.get("description"),
+            subscription_price=offer_dict.get("subscription_price", 0.0),
+            base_price=offer_dict.get("base_price"),
+            hc_price=offer_dict.get("hc_price"),
+            hp_price=offer_dict.get("hp_price"),
+            base_price_weekend=offer_dict.get("base_price_weekend"),
+            hp_price_weekend=offer_dict.get("hp_price_weekend"),
+            hc_price_weekend=offer_dict.get("hc_price_weekend"),
+            tempo_blue_hc=offer_dict.get("tempo_blue_hc"),
+            tempo_blue_hp=offer_dict.get("tempo_blue_hp"),
+            tempo_white_hc=offer_dict.get("tempo_white_hc"),
+            tempo_white_hp=offer_dict.get("tempo_white_hp"),
+            tempo_red_hc=offer_dict.get("tempo_red_hc"),
+            tempo_red_hp=offer_dict.get("tempo_red_hp"),
+            ejp_normal=offer_dict.get("ejp_normal"),
+            ejp_peak=offer_dict.get("ejp_peak"),
+            hc_price_winter=offer_dict.get("hc_price_winter"),
+            hp_price_winter=offer_dict.get("hp_price_winter"),
+            hc_price_summer=offer_dict.get("hc_price_summer"),
+            hp_price_summer=offer_dict.get("hp_price_summer"),
+            peak_day_price=offer_dict.get("peak_day_price"),
+            hc_schedules=offer_dict.get("hc_schedules"),
+            power_kva=offer_dict.get("power_kva"),
+            valid_from=dates["valid_from"],
+            valid_to=dates["valid_to"],
+            offer_url=offer_dict.get("offer_url"),
+        )
+
+
+# Scrape artifact cache (Redis, content-addressed)
+# - scrape:http:{url}                           -> {"etag", "last_modified", "sha256"} of the last download
+# - scrape:parsed:{parser}:v{version}:{sha256}  -> parser output for that exact document
+# Unchanged documents are answered with 304 (or hash to a known digest) and are not parsed again.
+SCRAPE_CACHE_TTL = 30 * 86400  # 30 days
+
+
+class ParsedDocument:
+    """Result of `BasePriceScraper.fetch_and_parse`"""
+
+    def __init__(self, status_code: int, value: Any = None, from_cache: bool = False):
+        self.status_code = status_code
+        self.value = value
+        self.from_cache = from_cache
+
+
+def _serialize_parsed(value: Any) -> str:
+    if isinstance(value, list) and all(isinstance(item, OfferData) for item in value):
+        return json.dumps({"offers": [offer.to_dict(for_json=True) for offer in value]})
+    return json.dumps({"value": value})
+
+
+def _deserialize_parsed(data: str) -> Any:
+    payload = json.loads(data)
+    if "offers" in payload:
+        return [OfferData.from_dict(offer) for offer in payload["offers"]]
+    return payload["value"]
+
 
 class BasePriceScraper(ABC):
     """Abstract base class for price scrapers"""
 
+    # Bump when the shared PDF extraction changes (or in a scraper when its parsing logic changes)
+    # to invalidate the cached parse results
+    PARSER_VERSION = 2
+
     def __init__(self, provider_name: str):
         self.provider_name = provider_name
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         # Flag to indicate if fallback data was used (scraping failed)
         self.used_fallback = False
         self.fallback_reason: str | None = None
+        # Documents actually parsed vs served from the scrape artifact cache
+        self.reparsed_documents: List[str] = []
+        self.cached_documents: List[str] = []
+
+    @property
+    def reparsed(self) -> bool:
+        """True if at least one document had to be parsed during this scrape"""
+        return bool(self.reparsed_documents)
+
+    def _parser_key(self, parser: Callable[..., Any], args: tuple) -> str:
+        name = f"{self.__class__.__name__}.{getattr(parser, '__name__', 'parse')}"
+        if args:
+            name += ":" + sha256(repr(args).encode()).hexdigest()[:16]
+        return f"{name}:v{self.PARSER_VERSION}"
+
+    async def fetch_and_parse(
+        self, client: httpx.AsyncClient, url: str, parser: Callable[..., T], *args: Any
+    ) -> ParsedDocument:
+        """
+        Download a document and parse it in the process pool, skipping both when possible.
+
+        A conditional GET (ETag / Last-Modified from the previous download) is sent; on 304,
+        or when the downloaded content hashes to an already parsed document, the cached
+        parser output is returned. `parser(content, *args)` must be picklable and its
+        output JSON-serializable (or a list of OfferData).
+
+        Returns:
+            ParsedDocument with the HTTP status (200 on success, even when served from cache)
+        """
+        parser_key = self._parser_key(parser, args)
+        meta_key = f"scrape:http:{url}"
+        meta: Dict[str, Any] = {}
+        raw_meta = await cache_service.get_raw(meta_key)
+        if raw_meta:
+            meta = json.loads(raw_meta)
+
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = await client.get(url, headers=headers)
+
+        if response.status_code == 304:
+            cached = await cache_service.get_raw(f"scrape:parsed:{parser_key}:{meta.get('sha256')}")
+            if cached is not None:
+                self.cached_documents.append(url)
+                self.logger.info(f"Document not modified, using cached parse result: {url}")
+                return ParsedDocument(200, _deserialize_parsed(cached), from_cache=True)
+            # Parse result evicted: download the document again
+            response = await client.get(url)
+
+        if response.status_code != 200:
+            return ParsedDocument(response.status_code)
+
+        digest = sha256(response.content).hexdigest()
+        parsed_key = f"scrape:parsed:{parser_key}:{digest}"
+        new_meta = {
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "sha256": digest,
+        }
+        await cache_service.set_raw(meta_key, json.dumps(new_meta), ttl=SCRAPE_CACHE_TTL)
+
+        cached = await cache_service.get_raw(parsed_key)
+        if cached is not None:
+            self.cached_documents.append(url)
+            self.logger.info(f"Document content unchanged, using cached parse result: {url}")
+            return ParsedDocument(200, _deserialize_parsed(cached), from_cache=True)
+
+        value = await run_sync_in_process(parser, response.content, *args)
+        self.reparsed_documents.append(url)
+        # Empty results are not cached so that a parsing failure is retried next time
+        if value:
+            await cache_service.set_raw(parsed_key, _serialize_parsed(value), ttl=SCRAPE_CACHE_TTL)
+        return ParsedDocument(200, value)
 
     @abstractmethod
     async def fetch_offers(self) -> List[OfferData]:
@@ -1,12 +1,29 @@
 """EDF price scraper - Fetches tariffs from EDF (Tarif Bleu réglementé)"""
-from typing import List
-import httpx
-import pdfplumber
-import io
-import re
+from typing import Any, Callable, List, cast
+import asyncio
 from datetime import datetime, UTC
 
-from .base import BasePriceScraper, OfferData, run_sync_in_thread
+from .base import BasePriceScraper, OfferData, extract_pdf_text, register_pattern, scraper_http_client
+
+
+# Tarif Bleu sections, in document order: the Tempo table ends with the "Majoration" notes
+TARIF_BLEU_SECTIONS = ("Option Base", "Option Heures Creuses", "Option Tempo", "Majoration")
+
+# Table rows: "power subscription price..." (prices in c€/kWh)
+BASE_ROW_PATTERN = register_pattern("edf.base_row", r'^\s*(\d+)\s+([\d,\.]+)\s+([\d,\.]+)')
+TEMPO_ROW_PATTERN = register_pattern(
+    "edf.tempo_row",
+    r'^\s*(\d+)\s+([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)',
+)
+ZEN_WEEKEND_ROW_PATTERN = register_pattern("edf.zen_weekend_row", r'^\s*(\d+)\s+([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)')
+ZEN_FLEX_ROW_PATTERN = register_pattern(
+    "edf.zen_flex_row",
+    r'^\s*(\d+)\s+([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)\s*$',
+)
+
+
+class PDFDownloadError(Exception):
+    """Raised when a tariff PDF cannot be downloaded"""
 
 
 class EDFPriceScraper(BasePriceScraper):
@@ -139,58 +156,52 @@ class EDFPriceScraper(BasePriceScraper):
         all_offers = []
         errors = []
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # Fetch Tarif Bleu (regulated tariffs) - use first URL from database
-            try:
-                tarif_bleu_url = self.scraper_urls[0] if len(self.scraper_urls) > 0 else self.TARIFF_BLEU_URL
-                response = await client.get(tarif_bleu_url)
-                if response.status_code != 200:
-                    error_msg = f"Échec du téléchargement du PDF Tarif Bleu (HTTP {response.status_code})"
-                    self.logger.error(error_msg)
-                    errors.append(error_msg)
-                else:
-                    # Run PDF parsing in thread pool to avoid blocking event loop
-                    tarif_bleu_offers = await run_sync_in_thread(self._parse_pdf, response.content)
-                    if not tarif_bleu_offers:
-                        error_msg = "Échec du parsing du PDF Tarif Bleu - aucune offre extraite"
-                        self.logger.error(error_msg)
-                        errors.append(error_msg)
-                    else:
-                        # Set offer_url for each offer
-                        for offer in tarif_bleu_offers:
-                            offer.offer_url = tarif_bleu_url
-                        self.logger.info(f"Successfully scraped {len(tarif_bleu_offers)} Tarif Bleu offers from PDF")
-                        all_offers.extend(tarif_bleu_offers)
-            except Exception as e:
-                error_msg = f"Erreur lors du scraping du Tarif Bleu : {str(e)}"
-                self.logger.error(error_msg, exc_info=True)
-                errors.append(error_msg)
+        # Tarif Bleu (regulated tariffs) uses the first URL from database, Zen Week-End the second
+        tarif_bleu_url = self.scraper_urls[0] if len(self.scraper_urls) > 0 else self.TARIFF_BLEU_URL
+        zen_weekend_url = self.scraper_urls[1] if len(self.scraper_urls) > 1 else self.ZEN_WEEKEND_URL
+        documents = [
+            # (label, url, parser, missing document is an error or only a warning)
+            ("Tarif Bleu", tarif_bleu_url, self._parse_pdf, True),
+            ("Zen Week-End", zen_weekend_url, self._parse_zen_weekend_pdf, False),
+        ]
+
+        async def fetch_document(
+            client: Any, label: str, url: str, parser: Callable[[bytes], List[OfferData]]
+        ) -> List[OfferData]:
+            # PDF parsing runs in the process pool - both documents are parsed in parallel,
+            # and not at all if they are unchanged since the last scrape
+            document = await self.fetch_and_parse(client, url, parser)
+            if document.status_code != 200:
+                raise PDFDownloadError(f"Échec du téléchargement du PDF {label} (HTTP {document.status_code})")
+            return cast(List[OfferData], document.value)
+
+        # Download and parse both PDFs concurrently
+        async with scraper_http_client() as client:
+            results = await asyncio.gather(
+                *(fetch_document(client, label, url, parser) for label, url, parser, _ in documents),
+                return_exceptions=True,
+            )
 
-            # Fetch Zen Week-End (market offer) - use second URL from database
-            try:
-                zen_weekend_url = self.scraper_urls[1] if len(self.scraper_urls) > 1 else self.ZEN_WEEKEND_URL
-                response = await client.get(zen_weekend_url)
-                if response.status_code != 200:
-                    error_msg = f"Échec du téléchargement du PDF Zen Week-End (HTTP {response.status_code})"
-                    self.logger.warning(error_msg)
-                    errors.append(error_msg)
-                else:
-                    # Run PDF parsing in thread pool to avoid blocking event loop
-                    zen_offers = await run_sync_in_thread(self._parse_zen_weekend_pdf, response.content)
-                    if not zen_offers:
-                        error_msg = "Échec du parsing du PDF Zen Week-End - aucune offre extraite"
-                        self.logger.warning(error_msg)
-                        errors.append(error_msg)
-                    else:
-                        # Set offer_url for each offer
-                        for offer in zen_offers:
-                            offer.offer_url = zen_weekend_url
-                        self.logger.info(f"Successfully scraped {len(zen_offers)} Zen Week-End offers from PDF")
-                        all_offers.extend(zen_offers)
-            except Exception as e:
-                error_msg = f"Erreur lors du scraping de Zen Week-End : {str(e)}"
-                self.logger.warning(error_msg, exc_info=True)
+        for (label, url, _, is_required), result in zip(documents, results):
+            log = self.logger.error if is_required else self.logger.warning
+            if isinstance(result, PDFDownloadError):
+                error_msg = str(result)
+                log(error_msg)
                 errors.append(error_msg)
+            elif isinstance(result, BaseException):
+                error_msg = f"Erreur lors du scraping {'du' if is_required else 'de'} {label} : {str(result)}"
+                log(error_msg, exc_info=result)
+                errors.append(error_msg)
+            elif not result:
+                error_msg = f"Échec du parsing du PDF {label} - aucune offre extraite"
+                log(error_msg)
+                errors.append(error_msg)
+            else:
+                # Set offer_url for each offer
+                for offer in result:
+                    offer.offer_url = url
+                self.logger.info(f"Successfully scraped {len(result)} {label} offers from PDF")
+                all_offers.extend(result)
 
         # If we have errors and no offers were scraped, raise an exception
         if errors and not all_offers:
@@ -216,64 +227,62 @@ class EDFPriceScraper(BasePriceScraper):
             offers = []
             valid_from = datetime.now(UTC).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
-            with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    text += page.extract_text() or ""
-
-                # Extract BASE prices (Option Base)
-                base_prices = self._extract_base_prices(text)
-                if base_prices:
-                    for power, prices in base_prices.items():
-                        offers.append(
-                            OfferData(
-                                name="Tarif Bleu",
-                                offer_type="BASE",
-                                description=f"Tarif réglementé EDF option base - {power} kVA",
-                                subscription_price=prices["subscription"],
-                                base_price=prices["kwh"],
-                                power_kva=power,
-                                valid_from=valid_from,
-                            )
+            # The Tempo table (last one needed) ends with the "Majoration" notes: skip the pages after it
+            text = extract_pdf_text(pdf_content, stop_after=TARIF_BLEU_SECTIONS)
+
+            # Extract BASE prices (Option Base)
+            base_prices = self._extract_base_prices(text)
+            if base_prices:
+                for power, prices in base_prices.items():
+                    offers.append(
+                        OfferData(
+                            name="Tarif Bleu",
+                            offer_type="BASE",
+                            description=f"Tarif réglementé EDF option base - {power} kVA",
+                            subscription_price=prices["subscription"],
+                            base_price=prices["kwh"],
+                            power_kva=power,
+                            valid_from=valid_from,
                         )
+                    )
 
-                # Extract HC/HP prices (Option Heures Creuses)
-                hc_hp_prices = self._extract_hc_hp_prices(text)
-                if hc_hp_prices:
-                    for power, prices in hc_hp_prices.items():
-                        offers.append(
-                            OfferData(
-                                name="Tarif Bleu",
-                                offer_type="HC_HP",
-                                description=f"Tarif réglementé EDF option heures creuses - {power} kVA",
-                                subscription_price=prices["subscription"],
-                                hp_price=prices["hp"],
-                                hc_price=prices["hc"],
-                                power_kva=power,
-                                valid_from=valid_from,
-                            )
+            # Extract HC/HP prices (Option Heures Creuses)
+            hc_hp_prices = self._extract_hc_hp_prices(text)
+            if hc_hp_prices:
+                for power, prices in hc_hp_prices.items():
+                    offers.append(
+                        OfferData(
+                            name="Tarif Bleu",
+                            offer_type="HC_HP",
+                            description=f"Tarif réglementé EDF option heures creuses - {power} kVA",
+                            subscription_price=prices["subscription"],
+                            hp_price=prices["hp"],
+                            hc_price=prices["hc"],
+                            power_kva=power,
+                            valid_from=valid_from,
                         )
+                    )
 
-                # Extract TEMPO prices
-                tempo_prices = self._extract_tempo_prices(text)
-                if tempo_prices:
-                    for power, prices in tempo_prices.items():
-                        offers.append(
-                            OfferData(
-                                name="Tarif Bleu",
-                                offer_type="TEMPO",
-                                description=f"Tarif réglementé EDF option Tempo - {power} kVA",
-                                subscription_price=prices["subscription"],
-                                tempo_blue_hc=prices["blue_hc"],
-                                tempo_blue_hp=prices["blue_hp"],
-                                tempo_white_hc=prices["white_hc"],
-                                tempo_white_hp=prices["white_hp"],
-                                tempo_red_hc=prices["red_hc"],
-                                tempo_red_hp=prices["red_hp"],
-                                power_kva=power,
-                                valid_from=valid_from,
-                            )
+            # Extract TEMPO prices
+            tempo_prices = self._extract_tempo_prices(text)
+            if tempo_prices:
+                for power, prices in tempo_prices.items():
+                    offers.append(
+                        OfferData(
+                            name="Tarif Bleu",
+                            offer_type="TEMPO",
+                            description=f"Tarif réglementé EDF option Tempo - {power} kVA",
+                            subscription_price=prices["subscription"],
+                            tempo_blue_hc=prices["blue_hc"],
+                            tempo_blue_hp=prices["blue_hp"],
+                            tempo_white_hc=prices["white_hc"],
+                            tempo_white_hp=prices["white_hp"],
+                            tempo_red_hc=prices["red_hc"],
+                            tempo_red_hp=prices["red_hp"],
+                            power_kva=power,
+                            valid_from=valid_from,
                         )
+                    )
 
             return offers if offers else []
 
@@ -302,7 +311,7 @@ class EDFPriceScraper(BasePriceScraper):
                 if in_base_section:
                     # Match lines like: "3 11,73 19,52"
                     # Format: power subscription price_centimes
-                    match = re.match(r'^\s*(\d+)\s+([\d,\.]+)\s+([\d,\.]+)', line)
+                    match = BASE_ROW_PATTERN.match(line)
                     if match:
                         power = int(match.group(1))
                         if power in [3, 6, 9, 12, 15, 18, 24, 30, 36]:
@@ -386,10 +395,7 @@ class EDFPriceScraper(BasePriceScraper):
                 if in_tempo_section:
                     # Match lines like: "6 15,50 12,32 14,94 13,91 17,30 14,60 64,68"
                     # Format: power subscription bleu_hc bleu_hp blanc_hc blanc_hp rouge_hc rouge_hp
-                    match = re.match(
-                        r'^\s*(\d+)\s+([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)',
-                        line
-                    )
+                    match = TEMPO_ROW_PATTERN.match(line)
                     if match:
                         power = int(match.group(1))
                         if power in [6, 9, 12, 15, 18, 24, 30, 36]:
@@ -432,10 +438,7 @@ class EDFPriceScraper(BasePriceScraper):
             valid_from = datetime.now(UTC).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
             # Extract text from PDF
-            with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    text += page.extract_text() or ""
+            text = extract_pdf_text(pdf_content)
 
             # Extract prices for each option
             weekend_prices = self._extract_zen_weekend_prices(text)
@@ -514,7 +517,7 @@ class EDFPriceScraper(BasePriceScraper):
             for line in lines:
                 # Match lines with at least 4 numbers at the start
                 # Format: "power subscription heures_semaine weekend ..."
-                match = re.match(r'^\s*(\d+)\s+([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)', line)
+                match = ZEN_WEEKEND_ROW_PATTERN.match(line)
                 if match:
                     power = int(match.group(1))
                     if power in [3, 6, 9, 12, 15, 18, 24, 30, 36]:
@@ -590,10 +593,7 @@ class EDFPriceScraper(BasePriceScraper):
             # Example: "6 15,74 15,08 20,81 20,81 72,43"
             # Note: The last price (HP Sobriété) is very high (~72 cts)
             for line in lines:
-                match = re.match(
-                    r'^\s*(\d+)\s+([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)\s+([\d,\.]+)\s*$',
-                    line
-                )
+                match = ZEN_FLEX_ROW_PATTERN.match(line)
                 if match:
                     power = int(match.group(1))
                     subscription = float(match.group(2).replace(',', '.'))
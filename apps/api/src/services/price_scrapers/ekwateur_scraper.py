@@ -1,11 +1,10 @@
 """Ekwateur price scraper - Fetches tariffs from Ekwateur website"""
 import re
 from typing import List
-import httpx
 from datetime import datetime, UTC
 from bs4 import BeautifulSoup
 
-from .base import BasePriceScraper, OfferData
+from .base import BasePriceScraper, OfferData, scraper_http_client
 
 
 class EkwateurScraper(BasePriceScraper):
@@ -50,7 +49,7 @@ class EkwateurScraper(BasePriceScraper):
         # Try to scrape from website
         try:
             url = self.scraper_urls[0] if self.scraper_urls else self.PRICING_URL
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+            async with scraper_http_client(follow_redirects=True) as client:
                 response = await client.get(url)
                 if response.status_code != 200:
                     error_msg = f"Échec du téléchargement de la page Ekwateur (HTTP {response.status_code})"
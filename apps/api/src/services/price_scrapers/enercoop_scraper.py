@@ -1,12 +1,11 @@
 """Enercoop price scraper - Fetches tariffs from Enercoop (100% renewable energy)"""
 from typing import List
-import httpx
 from io import BytesIO
 from pdfminer.high_level import extract_text
 import re
 from datetime import datetime, UTC
 
-from .base import BasePriceScraper, OfferData, run_sync_in_thread
+from .base import BasePriceScraper, OfferData, scraper_http_client
 
 
 def _extract_pdf_text(content: bytes) -> str:
@@ -90,15 +89,15 @@ class EnercoopPriceScraper(BasePriceScraper):
         try:
             # Download PDF (use first URL from database)
             pdf_url = self.scraper_urls[0] if self.scraper_urls else self.TARIFF_PDF_URL
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-                response = await client.get(pdf_url)
-                if response.status_code != 200:
-                    error_msg = f"Échec du téléchargement du PDF Enercoop (HTTP {response.status_code})"
+            async with scraper_http_client(follow_redirects=True) as client:
+                document = await self.fetch_and_parse(client, pdf_url, _extract_pdf_text)
+                if document.status_code != 200:
+                    error_msg = f"Échec du téléchargement du PDF Enercoop (HTTP {document.status_code})"
                     self.logger.warning(error_msg)
                     errors.append(error_msg)
                 else:
                     # Parse PDF in thread pool to avoid blocking event loop
-                    text = await run_sync_in_thread(_extract_pdf_text, response.content)
+                    text = document.value
                     offers = self._parse_pdf(text)
 
                     if not offers:
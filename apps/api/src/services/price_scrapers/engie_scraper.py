@@ -1,11 +1,10 @@
 """Engie price scraper - Fetches tariffs from HelloWatt comparison site"""
 import re
 from typing import List, Any
-import httpx
 from datetime import datetime, UTC
 from bs4 import BeautifulSoup
 
-from .base import BasePriceScraper, OfferData
+from .base import BasePriceScraper, OfferData, scraper_http_client
 
 
 class EngieScraper(BasePriceScraper):
@@ -83,7 +82,7 @@ class EngieScraper(BasePriceScraper):
 
         try:
             url = self.scraper_urls[0] if self.scraper_urls else self.HELLOWATT_URL
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+            async with scraper_http_client(follow_redirects=True) as client:
                 response = await client.get(url)
                 if response.status_code != 200:
                     error_msg = f"Échec du téléchargement de la page HelloWatt Engie (HTTP {response.status_code})"
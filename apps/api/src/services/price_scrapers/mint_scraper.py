@@ -1,12 +1,11 @@
 """Mint Énergie price scraper - Fetches tariffs from official PDF price sheets"""
 import re
 from typing import List, Dict
-import httpx
 import pdfplumber
 import io
 from datetime import datetime, UTC
 
-from .base import BasePriceScraper, OfferData, run_sync_in_thread
+from .base import BasePriceScraper, OfferData, scraper_http_client
 
 
 class MintEnergieScraper(BasePriceScraper):
@@ -124,22 +123,20 @@ class MintEnergieScraper(BasePriceScraper):
         all_offers = []
         errors = []
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with scraper_http_client() as client:
             # Process each PDF
             for i, url in enumerate(self.scraper_urls):
                 offer_key = self._get_offer_key_from_url(url)
                 try:
-                    response = await client.get(url)
-                    if response.status_code != 200:
-                        error_msg = f"Échec du téléchargement du PDF {offer_key} (HTTP {response.status_code})"
+                    # Parse PDF in process pool (skipped if the document is unchanged)
+                    document = await self.fetch_and_parse(client, url, self._parse_pdf, offer_key, url)
+                    if document.status_code != 200:
+                        error_msg = f"Échec du téléchargement du PDF {offer_key} (HTTP {document.status_code})"
                         self.logger.error(error_msg)
                         errors.append(error_msg)
                         continue
 
-                    # Parse PDF in thread pool
-                    offers = await run_sync_in_thread(
-                        self._parse_pdf, response.content, offer_key, url
-                    )
+                    offers = document.value
 
                     if not offers:
                         error_msg = f"Échec du parsing du PDF {offer_key} - aucune offre extraite"
@@ -1,11 +1,10 @@
 """Octopus Energy price scraper - Fetches tariffs from HelloWatt comparison pages"""
 import re
 from typing import List
-import httpx
 from datetime import datetime, UTC
 from bs4 import BeautifulSoup
 
-from .base import BasePriceScraper, OfferData
+from .base import BasePriceScraper, OfferData, scraper_http_client
 
 
 class OctopusScraper(BasePriceScraper):
@@ -98,7 +97,7 @@ class OctopusScraper(BasePriceScraper):
         }
 
         # Try to scrape from HelloWatt pages
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+        async with scraper_http_client(follow_redirects=True) as client:
             for url in self.scraper_urls:
                 try:
                     response = await client.get(url, headers=headers)
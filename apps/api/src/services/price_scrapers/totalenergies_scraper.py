@@ -1,12 +1,9 @@
 """TotalEnergies price scraper - Fetches tariffs from TotalEnergies market offers"""
 from typing import List
-import httpx
-import pdfplumber
-import io
 import re
 from datetime import datetime, UTC
 
-from .base import BasePriceScraper, OfferData, run_sync_in_thread
+from .base import BasePriceScraper, OfferData, extract_pdf_text, scraper_http_client
 
 
 class TotalEnergiesPriceScraper(BasePriceScraper):
@@ -85,18 +82,17 @@ class TotalEnergiesPriceScraper(BasePriceScraper):
         all_offers = []
 
         try:
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
+            async with scraper_http_client(follow_redirects=True) as client:
                 # Try to parse PDFs
                 for idx, pdf_url in enumerate(self.scraper_urls):
                     try:
-                        response = await client.get(pdf_url)
-                        if response.status_code != 200:
-                            error_msg = f"Échec du téléchargement du PDF #{idx+1} (HTTP {response.status_code})"
+                        document = await self.fetch_and_parse(client, pdf_url, self._parse_pdf, idx)
+                        if document.status_code != 200:
+                            error_msg = f"Échec du téléchargement du PDF #{idx+1} (HTTP {document.status_code})"
                             self.logger.warning(error_msg)
                             errors.append(error_msg)
                         else:
-                            # Parse PDF in thread pool to avoid blocking event loop
-                            offers = await run_sync_in_thread(self._parse_pdf, response.content, idx)
+                            offers = document.value
 
                             if offers:
                                 # Set offer_url for each offer
@@ -151,52 +147,49 @@ class TotalEnergiesPriceScraper(BasePriceScraper):
             offers = []
             valid_from = datetime.now(UTC).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
-            with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    text += page.extract_text() or ""
-
-                # Detect PDF type by content
-                is_essentielle = "Offre Essentielle" in text
-                is_verte_fixe = "Verte Fixe" in text
-
-                if is_essentielle:
-                    # Essentielle PDF has mixed BASE and HC/HP tables side by side
-                    offers.extend(self._parse_essentielle_pdf(text, valid_from))
-                elif is_verte_fixe:
-                    # Verte Fixe PDF has cleaner format with separate tables
-                    offers.extend(self._parse_verte_fixe_pdf(text, valid_from))
-                else:
-                    # Unknown format, try generic parsing
-                    base_prices = self._extract_base_prices(text)
-                    hc_hp_prices = self._extract_hc_hp_prices(text)
-                    offer_prefix = "Online" if pdf_index == 0 else "Verte Fixe"
-
-                    for power, prices in base_prices.items():
-                        offers.append(
-                            OfferData(
-                                name=offer_prefix,
-                                offer_type="BASE",
-                                description=f"Offre TotalEnergies - Option Base - {power} kVA",
-                                subscription_price=prices["subscription"],
-                                base_price=prices["kwh"],
-                                power_kva=power,
-                                valid_from=valid_from,
-                            )
+            text = extract_pdf_text(pdf_content)
+
+            # Detect PDF type by content
+            is_essentielle = "Offre Essentielle" in text
+            is_verte_fixe = "Verte Fixe" in text
+
+            if is_essentielle:
+                # Essentielle PDF has mixed BASE and HC/HP tables side by side
+                offers.extend(self._parse_essentielle_pdf(text, valid_from))
+            elif is_verte_fixe:
+                # Verte Fixe PDF has cleaner format with separate tables
+                offers.extend(self._parse_verte_fixe_pdf(text, valid_from))
+            else:
+                # Unknown format, try generic parsing
+                base_prices = self._extract_base_prices(text)
+                hc_hp_prices = self._extract_hc_hp_prices(text)
+                offer_prefix = "Online" if pdf_index == 0 else "Verte Fixe"
+
+                for power, prices in base_prices.items():
+                    offers.append(
+                        OfferData(
+                            name=offer_prefix,
+                            offer_type="BASE",
+                            description=f"Offre TotalEnergies - Option Base - {power} kVA",
+                            subscription_price=prices["subscription"],
+                            base_price=prices["kwh"],
+                            power_kva=power,
+                            valid_from=valid_from,
                         )
-                    for power, prices in hc_hp_prices.items():
-                        offers.append(
-                            OfferData(
-                                name=offer_prefix,
-                                offer_type="HC_HP",
-                                description=f"Offre TotalEnergies - Heures Creuses - {power} kVA",
-                                subscription_price=prices["subscription"],
-                                hp_price=prices["hp"],
-                                hc_price=prices["hc"],
-                                power_kva=power,
-                                valid_from=valid_from,
-                            )
+                    )
+                for power, prices in hc_hp_prices.items():
+                    offers.append(
+                        OfferData(
+                            name=offer_prefix,
+                            offer_type="HC_HP",
+                            description=f"Offre TotalEnergies - Heures Creuses - {power} kVA",
+                            subscription_price=prices["subscription"],
+                            hp_price=prices["hp"],
+                            hc_price=prices["hc"],
+                            power_kva=power,
+                            valid_from=valid_from,
                         )
+                    )
 
             return offers if offers else []
 
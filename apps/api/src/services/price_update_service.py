@@ -1,6 +1,7 @@
 """Service for updating energy provider prices"""
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any
 from datetime import datetime, UTC
+import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 import uuid
@@ -60,24 +61,78 @@ class PriceUpdateService:
         scraper = scraper_class(scraper_urls=None)  # type: ignore
         return scraper.scraper_urls if hasattr(scraper, 'scraper_urls') else None
 
-    async def update_all_providers(self) -> Dict[str, Any]:
+    async def update_all_providers(
+        self,
+        progress_callback: Callable[[str, int], None] | None = None,
+    ) -> Dict[str, Any]:
         """
         Update prices for all providers
 
+        The refresh runs as a pipeline:
+        1. every scraper runs concurrently (downloads are limited per host by the
+           scrapers' HTTP client, PDF parsing runs on the shared process pool)
+        2. offers are written to the database one provider at a time, on this
+           service's session, once scraping is over
+
+        Args:
+            progress_callback: Optional callback(step, progress_percent) called as
+                each provider finishes scraping and saving
+
         Returns:
             Dict with update results for each provider
         """
-        results = {}
+        results: Dict[str, Any] = {}
+        provider_names = list(self.SCRAPERS.keys())
+        total = len(provider_names)
+
+        def report(step: str, progress: int) -> None:
+            if progress_callback:
+                progress_callback(step, progress)
+
+        # Providers (and their scraper URLs) are loaded sequentially: the session is not concurrency-safe
+        providers: Dict[str, EnergyProvider] = {}
+        for provider_name in provider_names:
+            try:
+                providers[provider_name] = await self._get_or_create_provider(provider_name)
+            except Exception as e:
+                await self.db.rollback()
+                logger.error(f"Error loading provider {provider_name}: {str(e)}", exc_info=True)
+                results[provider_name] = {"success": False, "error": str(e)}
+        await self.db.commit()
+
+        # Stage 1: scrape every provider concurrently (0-70%)
+        scraped: Dict[str, List[OfferData]] = {}
+        reparsed: Dict[str, bool] = {}
+        done = 0
 
-        for provider_name in self.SCRAPERS.keys():
+        async def scrape(provider_name: str) -> None:
+            nonlocal done
             try:
-                result = await self.update_provider(provider_name)
-                results[provider_name] = result
+                scraper_class = self.SCRAPERS[provider_name]
+                scraper = scraper_class(scraper_urls=providers[provider_name].scraper_urls)  # type: ignore
+                scraped[provider_name] = await scraper.scrape()
+                reparsed[provider_name] = scraper.reparsed
             except Exception as e:
-                logger.error(f"Error updating {provider_name}: {str(e)}", exc_info=True)
+                logger.error(f"Error scraping {provider_name}: {str(e)}", exc_info=True)
                 results[provider_name] = {"success": False, "error": str(e)}
+            finally:
+                done += 1
+                report(f"Scraping {provider_name} terminé ({done}/{len(providers)})", done * 70 // max(len(providers), 1))
 
-        return results
+        await asyncio.gather(*(scrape(name) for name in providers))
+
+        # Stage 2: serialized DB writes (70-100%)
+        for index, provider_name in enumerate(provider_names, start=1):
+            if provider_name not in scraped:
+                continue
+            report(f"Enregistrement des offres {provider_name}", 70 + (index - 1) * 30 // total)
+            results[provider_name] = await self._save_provider_offers(
+                providers[provider_name], scraped[provider_name]
+            )
+            results[provider_name]["reparsed"] = reparsed[provider_name]
+
+        report("Terminé", 100)
+        return {name: results[name] for name in provider_names if name in results}
 
     async def update_provider(
         self,
@@ -104,6 +159,7 @@ class PriceUpdateService:
             provider = await self._get_or_create_provider(provider_name)
 
             # Use cached offers if provided, otherwise scrape
+            reparsed = False
             if cached_offers:
                 logger.info(f"Using {len(cached_offers)} cached offers for {provider_name}")
                 offers = [self._offer_from_cache(offer) for offer in cached_offers]
@@ -112,10 +168,34 @@ class PriceUpdateService:
                 scraper_class = self.SCRAPERS[provider_name]
                 scraper = scraper_class(scraper_urls=provider.scraper_urls)  # type: ignore
                 offers = await scraper.scrape()
+                reparsed = scraper.reparsed
+
+            result = await self._save_provider_offers(provider, offers)
+            result["reparsed"] = reparsed
+            return result
+
+        except Exception as e:
+            await self.db.rollback()
+            logger.error(f"Error updating {provider_name}: {str(e)}", exc_info=True)
+            return {"success": False, "error": str(e)}
+
+    async def _save_provider_offers(self, provider: EnergyProvider, offers: List[OfferData]) -> Dict[str, Any]:
+        """
+        Replace the active offers of a provider with freshly scraped ones
+
+        Args:
+            provider: Provider the offers belong to
+            offers: Scraped offers
+
+        Returns:
+            Dict with update results
+        """
+        provider_name = provider.name
 
-            if not offers:
-                return {"success": False, "error": "No offers found", "offers_updated": 0}
+        if not offers:
+            return {"success": False, "error": "No offers found", "offers_updated": 0}
 
+        try:
             # Deactivate old offers
             await self._deactivate_old_offers(provider.id)
 
@@ -153,53 +233,7 @@ class PriceUpdateService:
 
     def _offer_from_cache(self, offer_dict: Dict[str, Any]) -> OfferData:
         """Convert cached offer dict back to OfferData, parsing ISO date strings"""
-        # Parse ISO date strings back to datetime objects
-        valid_from = None
-        valid_to = None
-
-        if offer_dict.get("valid_from"):
-            try:
-                # Use datetime.fromisoformat() - built-in since Python 3.7
-                valid_from = datetime.fromisoformat(offer_dict["valid_from"])
-            except (ValueError, TypeError):
-                pass
-
-        if offer_dict.get("valid_to"):
-            try:
-                valid_to = datetime.fromisoformat(offer_dict["valid_to"])
-            except (ValueError, TypeError):
-                pass
-
-        return OfferData(
-            name=offer_dict["name"],
-            offer_type=offer_dict["offer_type"],
-            description=offer_dict.get("description"),
-            subscription_price=offer_dict.get("subscription_price", 0.0),
-            base_price=offer_dict.get("base_price"),
-            hc_price=offer_dict.get("hc_price"),
-            hp_price=offer_dict.get("hp_price"),
-            base_price_weekend=offer_dict.get("base_price_weekend"),
-            hp_price_weekend=offer_dict.get("hp_price_weekend"),
-            hc_price_weekend=offer_dict.get("hc_price_weekend"),
-            tempo_blue_hc=offer_dict.get("tempo_blue_hc"),
-            tempo_blue_hp=offer_dict.get("tempo_blue_hp"),
-            tempo_white_hc=offer_dict.get("tempo_white_hc"),
-            tempo_white_hp=offer_dict.get("tempo_white_hp"),
-            tempo_red_hc=offer_dict.get("tempo_red_hc"),
-            tempo_red_hp=offer_dict.get("tempo_red_hp"),
-            ejp_normal=offer_dict.get("ejp_normal"),
-            ejp_peak=offer_dict.get("ejp_peak"),
-            hc_price_winter=offer_dict.get("hc_price_winter"),
-            hp_price_winter=offer_dict.get("hp_price_winter"),
-            hc_price_summer=offer_dict.get("hc_price_summer"),
-            hp_price_summer=offer_dict.get("hp_price_summer"),
-            peak_day_price=offer_dict.get("peak_day_price"),
-            hc_schedules=offer_dict.get("hc_schedules"),
-            power_kva=offer_dict.get("power_kva"),
-            valid_from=valid_from,
-            valid_to=valid_to,
-            offer_url=offer_dict.get("offer_url"),
-        )
+        return OfferData.from_dict(offer_dict)
 
     async def _get_or_create_provider(self, name: str) -> EnergyProvider:
         """Get existing provider or create new one with default values"""
@@ -442,6 +476,7 @@ class PriceUpdateService:
                 "offers_to_deactivate": offers_to_deactivate,
                 "scraped_offers": all_scraped_offers,  # All scraped offers for caching
                 "used_fallback": scraper.used_fallback,
+                "reparsed": scraper.reparsed,
                 "fallback_reason": scraper.fallback_reason,
                 "summary": {
                     "total_current": len(current_offers),
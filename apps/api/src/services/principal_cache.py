@@ -0,0 +1,120 @@
+"""Process-local cache of authenticated principals (user, role, permissions)"""
+import logging
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Set
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from ..config import settings
+from ..models import User
+from .ttl_cache import GENERATION_CHECK_INTERVAL_SECONDS, GenerationTTLCache
+
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_CACHE_MAX_ENTRIES = 10000
+
+# Alias of the client-mode local user (looked up by email, not by id)
+LOCAL_USER_ALIAS = "local"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Immutable snapshot of a user with its role and permissions"""
+
+    columns: Mapping[str, Any]
+    role_name: Optional[str]
+    permission_names: frozenset[str]
+    permission_resources: frozenset[str]
+
+    @property
+    def user_id(self) -> str:
+        return self.columns["id"]
+
+    @property
+    def email(self) -> str:
+        return self.columns["email"]
+
+    @property
+    def is_active(self) -> bool:
+        return bool(self.columns["is_active"])
+
+    @property
+    def email_verified(self) -> bool:
+        return bool(self.columns["email_verified"])
+
+    @property
+    def client_secret(self) -> str:
+        return self.columns["client_secret"]
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        """Snapshot a user whose role and permissions are loaded (or who has no role)"""
+        columns = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+        role = user.role if user.role_id else None
+        permissions = list(role.permissions) if role else []
+        return cls(
+            columns=MappingProxyType(columns),
+            role_name=role.name if role else None,
+            permission_names=frozenset(p.name for p in permissions),
+            permission_resources=frozenset(p.resource for p in permissions),
+        )
+
+    def to_user(self) -> User:
+        """Detached User rebuilt from the snapshot, to be merged into a session without a query"""
+        user = User(**self.columns)
+        make_transient_to_detached(user)
+        return user
+
+
+class PrincipalCache(GenerationTTLCache[Principal]):
+    """
+    In-memory TTL cache of principals, keyed by user id.
+
+    Aliases (API key hash, client-mode local user) point to a user id. `invalidate()` must be
+    awaited whenever a user, its secret or its role is modified.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int,
+        max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES,
+        check_interval: float = GENERATION_CHECK_INTERVAL_SECONDS,
+    ):
+        super().__init__("principal", ttl_seconds, max_entries, check_interval)
+        self._aliases: Dict[str, str] = {}
+        self._aliases_by_user: Dict[str, Set[str]] = {}
+
+    async def get(self, user_id: str) -> Optional[Principal]:
+        await self.sync_generation()
+        return self.get_cached(user_id)
+
+    async def get_alias(self, alias: str) -> Optional[Principal]:
+        await self.sync_generation()
+        user_id = self._aliases.get(alias)
+        return self.get_cached(user_id) if user_id else None
+
+    def put(self, principal: Principal, alias: Optional[str] = None) -> Principal:
+        if self.ttl_seconds <= 0:
+            return principal
+
+        user_id = principal.user_id
+        self.store(user_id, principal)
+        if alias and user_id in self._entries:
+            self._aliases[alias] = user_id
+            self._aliases_by_user.setdefault(user_id, set()).add(alias)
+        return principal
+
+    def _drop(self, user_id: str) -> None:
+        super()._drop(user_id)
+        for alias in self._aliases_by_user.pop(user_id, set()):
+            self._aliases.pop(alias, None)
+
+    def _clear(self) -> None:
+        super()._clear()
+        self._aliases.clear()
+        self._aliases_by_user.clear()
+
+
+principal_cache = PrincipalCache(ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS)
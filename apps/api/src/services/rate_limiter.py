@@ -1,13 +1,27 @@
 """Rate limiter service for tracking user API usage"""
 from datetime import datetime, timedelta, UTC
-from typing import Tuple
+from typing import Any, Tuple
 from .cache import cache_service
 from ..config import settings
 
+# Daily usage aggregates, maintained at increment time so that admin stats don't
+# have to SCAN every rate_limit:* key:
+# - rate_limit_stats:{date}:total      hash {cached, no_cache}
+# - rate_limit_stats:{date}:endpoints  hash {"{endpoint}|{cache_type}": count}
+# - rate_limit_stats:{date}:users      hash {"{user_id}|{cache_type}": count}
+# They are kept RATE_LIMIT_STATS_RETENTION_DAYS days as daily snapshots for trends.
+STATS_KEY_PREFIX = "rate_limit_stats"
+STATS_FIELD_SEPARATOR = "|"
+
 
 class RateLimiterService:
     """Service to track and limit user API calls per day"""
 
+    @staticmethod
+    def _get_stats_key(date: str, kind: str) -> str:
+        """Generate Redis key for a daily aggregate hash"""
+        return f"{STATS_KEY_PREFIX}:{date}:{kind}"
+
     def _get_daily_key(self, user_id: str, cache_used: bool, endpoint: str | None = None) -> str:
         """Generate Redis key for daily counter"""
         today = datetime.now(UTC).strftime("%Y-%m-%d")
@@ -43,23 +57,100 @@ class RateLimiterService:
             return False, current_count, limit
 
         # Increment counter (including for admins now, for statistics)
-        new_count = current_count + 1
-
         # Set with TTL until end of day
         now = datetime.now(UTC)
+        today = now.strftime("%Y-%m-%d")
         end_of_day = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=UTC)
         ttl_seconds = int((end_of_day - now).total_seconds())
+        stats_ttl_seconds = ttl_seconds + settings.RATE_LIMIT_STATS_RETENTION_DAYS * 86400
+
+        async with cache_service.redis_client.pipeline(transaction=False) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, ttl_seconds)
+
+            # Also track per-endpoint stats and daily aggregates if endpoint is provided
+            if endpoint:
+                cache_type = "cached" if cache_used else "no_cache"
+                endpoint_key = self._get_daily_key(user_id, cache_used, endpoint)
+                pipe.incr(endpoint_key)
+                pipe.expire(endpoint_key, ttl_seconds)
+
+                aggregates = {
+                    self._get_stats_key(today, "total"): cache_type,
+                    self._get_stats_key(today, "endpoints"): f"{endpoint}{STATS_FIELD_SEPARATOR}{cache_type}",
+                    self._get_stats_key(today, "users"): f"{user_id}{STATS_FIELD_SEPARATOR}{cache_type}",
+                }
+                for stats_key, field in aggregates.items():
+                    pipe.hincrby(stats_key, field, 1)
+                    pipe.expire(stats_key, stats_ttl_seconds)
+
+            results = await pipe.execute()
+
+        new_count = int(results[0])
+        return True, new_count, limit
 
-        await cache_service.redis_client.setex(key, ttl_seconds, str(new_count))
+    async def get_daily_aggregates(self, date: str | None = None) -> dict[str, Any]:
+        """
+        Get aggregated API usage for a day (defaults to today) in one round trip.
 
-        # Also track per-endpoint stats if endpoint is provided
-        if endpoint:
-            endpoint_key = self._get_daily_key(user_id, cache_used, endpoint)
-            endpoint_current = await cache_service.redis_client.get(endpoint_key)
-            endpoint_count = int(endpoint_current) if endpoint_current else 0
-            await cache_service.redis_client.setex(endpoint_key, ttl_seconds, str(endpoint_count + 1))
+        Returns:
+            {"date", "totals": {cached, no_cache, total},
+             "endpoints": {endpoint: {cached, no_cache, total}},
+             "users": {user_id: {cached, no_cache, total}}}
+        """
+        day = date or datetime.now(UTC).strftime("%Y-%m-%d")
+        result: dict[str, Any] = {
+            "date": day,
+            "totals": {"cached": 0, "no_cache": 0, "total": 0},
+            "endpoints": {},
+            "users": {},
+        }
 
-        return True, new_count, limit
+        if not cache_service.redis_client:
+            return result
+
+        async with cache_service.redis_client.pipeline(transaction=False) as pipe:
+            for kind in ("total", "endpoints", "users"):
+                pipe.hgetall(self._get_stats_key(day, kind))
+            totals, endpoints, users = await pipe.execute()
+
+        for field, value in totals.items():
+            cache_type = field.decode() if isinstance(field, bytes) else field
+            result["totals"][cache_type] = int(value)
+        result["totals"]["total"] = result["totals"]["cached"] + result["totals"]["no_cache"]
+
+        for target, raw in ((result["endpoints"], endpoints), (result["users"], users)):
+            for field, value in raw.items():
+                field_str = field.decode() if isinstance(field, bytes) else field
+                name, _, cache_type = field_str.rpartition(STATS_FIELD_SEPARATOR)
+                entry = target.setdefault(name, {"cached": 0, "no_cache": 0, "total": 0})
+                entry[cache_type] += int(value)
+                entry["total"] += int(value)
+
+        return result
+
+    async def get_daily_totals_history(self, days: int) -> list[dict[str, Any]]:
+        """Get daily API call totals for the last `days` days (oldest first), for trend charts"""
+        today = datetime.now(UTC).date()
+        dates = [(today - timedelta(days=offset)).strftime("%Y-%m-%d") for offset in range(days - 1, -1, -1)]
+
+        if not cache_service.redis_client:
+            return [{"date": day, "cached": 0, "no_cache": 0, "total": 0} for day in dates]
+
+        async with cache_service.redis_client.pipeline(transaction=False) as pipe:
+            for day in dates:
+                pipe.hgetall(self._get_stats_key(day, "total"))
+            snapshots = await pipe.execute()
+
+        history = []
+        for day, snapshot in zip(dates, snapshots):
+            counts = {
+                (k.decode() if isinstance(k, bytes) else k): int(v) for k, v in snapshot.items()
+            }
+            cached = counts.get("cached", 0)
+            no_cache = counts.get("no_cache", 0)
+            history.append({"date": day, "cached": cached, "no_cache": no_cache, "total": cached + no_cache})
+        return history
 
     async def get_usage_stats(self, user_id: str) -> dict:
         """Get current usage statistics for a user"""
@@ -0,0 +1,162 @@
+"""Process-local cache for public reference datasets (Tempo calendar, EcoWatt signals)"""
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from hashlib import sha256
+from typing import Any, Awaitable, Callable, Dict
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from ..config import settings
+from .cache import cache_service
+
+logger = logging.getLogger(__name__)
+
+# Datasets (invalidated as a whole when the underlying table is written)
+TEMPO_DATASET = "tempo"
+ECOWATT_DATASET = "ecowatt"
+
+# Redis counter bumped on invalidation, so that the other workers drop their copies
+REFERENCE_GENERATION_PREFIX = "reference_cache:generation"
+REFERENCE_CACHE_MAX_ENTRIES = 256
+
+
+@dataclass
+class ReferenceEntry:
+    """Cached dataset slice with its HTTP validators"""
+
+    value: Any
+    etag: str
+    last_modified: datetime
+    generation: int
+    expires_at: float
+
+
+def _compute_etag(value: Any) -> str:
+    payload = json.dumps(jsonable_encoder(value), sort_keys=True, separators=(",", ":"))
+    return f'"{sha256(payload.encode()).hexdigest()[:32]}"'
+
+
+class ReferenceDataCache:
+    """
+    In-memory TTL cache in front of the Tempo/EcoWatt tables.
+
+    Entries are loaded once per worker and per key (single-flight), dropped locally by
+    `invalidate()` when RTEService/SyncService write the table, and checked against a
+    Redis generation counter when their TTL expires: if no other worker wrote meanwhile,
+    the entry is kept (same ETag) without querying PostgreSQL again.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int = REFERENCE_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], ReferenceEntry] = OrderedDict()
+        self._locks: Dict[tuple[str, str], asyncio.Lock] = {}
+        self._local_generations: Dict[str, int] = {}
+
+    async def _get_generation(self, dataset: str) -> int:
+        if cache_service.redis_client:
+            try:
+                value = await cache_service.redis_client.get(f"{REFERENCE_GENERATION_PREFIX}:{dataset}")
+                return int(value or 0)
+            except Exception as e:
+                logger.warning(f"[REFERENCE CACHE] Could not read generation of {dataset}: {e}")
+        return self._local_generations.get(dataset, 0)
+
+    async def get_or_load(self, dataset: str, key: str, loader: Callable[[], Awaitable[Any]]) -> ReferenceEntry:
+        """
+        Get a cached dataset slice, loading it with `loader` on miss or after invalidation.
+
+        `loader` must return plain data (dicts, lists, Pydantic models), not ORM objects.
+        """
+        cache_key = (dataset, key)
+        entry = self._entries.get(cache_key)
+        if entry and entry.expires_at > time.monotonic():
+            self._entries.move_to_end(cache_key)
+            return entry
+
+        lock = self._locks.setdefault(cache_key, asyncio.Lock())
+        async with lock:
+            # Another request may have reloaded the entry while we were waiting
+            entry = self._entries.get(cache_key)
+            now = time.monotonic()
+            if entry and entry.expires_at > now:
+                return entry
+
+            generation = await self._get_generation(dataset)
+            if entry and entry.generation == generation:
+                entry.expires_at = now + self.ttl_seconds
+                return entry
+
+            value = await loader()
+            etag = _compute_etag(value)
+            # Unchanged content keeps its Last-Modified date so that If-Modified-Since still matches
+            last_modified = entry.last_modified if entry and entry.etag == etag else datetime.now(UTC)
+            entry = ReferenceEntry(value, etag, last_modified, generation, now + self.ttl_seconds)
+
+            self._entries[cache_key] = entry
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._locks.pop(evicted, None)
+            return entry
+
+    async def invalidate(self, dataset: str) -> None:
+        """Drop the cached entries of a dataset in this worker and signal the other workers"""
+        for cache_key in [k for k in self._entries if k[0] == dataset]:
+            del self._entries[cache_key]
+        self._local_generations[dataset] = self._local_generations.get(dataset, 0) + 1
+
+        if cache_service.redis_client:
+            try:
+                await cache_service.redis_client.incr(f"{REFERENCE_GENERATION_PREFIX}:{dataset}")
+            except Exception as e:
+                logger.warning(f"[REFERENCE CACHE] Could not publish invalidation of {dataset}: {e}")
+        logger.debug(f"[REFERENCE CACHE] Invalidated {dataset}")
+
+
+def is_not_modified(request: Request, entry: ReferenceEntry) -> bool:
+    """True if the client's conditional headers (If-None-Match / If-Modified-Since) match the entry"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or entry.etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=UTC)
+        return entry.last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def cache_headers(entry: ReferenceEntry, private: bool = False) -> Dict[str, str]:
+    """HTTP validators for a cached entry"""
+    return {
+        "ETag": entry.etag,
+        "Last-Modified": format_datetime(entry.last_modified, usegmt=True),
+        "Cache-Control": f"{'private' if private else 'public'}, max-age=0, must-revalidate",
+    }
+
+
+def not_modified_response(entry: ReferenceEntry, private: bool = False) -> Response:
+    """Empty 304 response carrying the entry's validators"""
+    return Response(status_code=304, headers=cache_headers(entry, private))
+
+
+def set_cache_headers(response: Response, entry: ReferenceEntry, private: bool = False) -> None:
+    """Add the entry's validators to a 200 response"""
+    response.headers.update(cache_headers(entry, private))
+
+
+reference_cache = ReferenceDataCache(ttl_seconds=settings.REFERENCE_CACHE_TTL_SECONDS)
@@ -0,0 +1,153 @@
+"""SQL aggregations over reference data (Tempo calendar, EcoWatt signals)
+
+Counts are computed in PostgreSQL (COUNT ... GROUP BY, joins on the day) instead of
+loading rows into Python. Tempo season counters are memoized in the in-memory
+reference cache, which is invalidated whenever new Tempo days land.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import func, select
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.client_mode import ConsumptionData, DataGranularity, ProductionData
+from ..models.ecowatt import EcoWatt
+from ..models.tempo_day import TempoDay
+from .reference_cache import TEMPO_DATASET, reference_cache
+
+TEMPO_COLORS = ("BLUE", "WHITE", "RED")
+
+# Tempo days are French calendar days
+TEMPO_TIMEZONE = ZoneInfo("Europe/Paris")
+
+# EcoWatt dvalue -> statistics key
+ECOWATT_LEVELS = {1: "green", 2: "orange", 3: "red"}
+
+
+def tempo_today() -> date:
+    """Current Tempo day (Europe/Paris), shared by the forecast route and its scheduler refresh"""
+    return datetime.now(TEMPO_TIMEZONE).date()
+
+
+def get_tempo_season_start(target_date: date) -> date:
+    """A Tempo season runs from September 1st to August 31st"""
+    return date(target_date.year if target_date.month >= 9 else target_date.year - 1, 9, 1)
+
+
+def _color_key(color: Any) -> str:
+    return str(color.value if hasattr(color, "value") else color)
+
+
+async def get_tempo_season_counts(db: AsyncSession, season_start: date, until: date | None = None) -> dict[str, int]:
+    """
+    Count Tempo days per color in a season (memoized until new Tempo days are stored).
+
+    Args:
+        db: Database session
+        season_start: First day of the season (September 1st)
+        until: Last day counted (inclusive), defaults to the end of the season
+
+    Returns:
+        Dict mapping color (BLUE, WHITE, RED) to number of days
+    """
+    last_day = until or date(season_start.year + 1, 8, 31)
+
+    async def load() -> dict[str, int]:
+        result = await db.execute(
+            select(TempoDay.color, func.count(TempoDay.id))
+            .where(TempoDay.id >= season_start.isoformat())
+            .where(TempoDay.id <= last_day.isoformat())
+            .group_by(TempoDay.color)
+        )
+        counts = {color: 0 for color in TEMPO_COLORS}
+        for color, count in result.all():
+            counts[_color_key(color)] = count
+        return counts
+
+    entry = await reference_cache.get_or_load(TEMPO_DATASET, f"season_counts:{season_start}:{last_day}", load)
+    return dict(entry.value)
+
+
+async def count_ecowatt_year(db: AsyncSession, year: int) -> dict[str, Any]:
+    """
+    Count EcoWatt days per signal level for a year.
+
+    Returns:
+        Dict with total/green/orange/red day counts and percentages
+    """
+    result = await db.execute(
+        select(EcoWatt.dvalue, func.count(EcoWatt.id))
+        .where(EcoWatt.periode >= date(year, 1, 1))
+        .where(EcoWatt.periode <= date(year, 12, 31))
+        .group_by(EcoWatt.dvalue)
+    )
+    counts = dict(result.all())
+    total_days = sum(counts.values())
+
+    statistics: dict[str, Any] = {"year": year, "total_days": total_days}
+    for dvalue, level in ECOWATT_LEVELS.items():
+        statistics[f"{level}_days"] = counts.get(dvalue, 0)
+    for dvalue, level in ECOWATT_LEVELS.items():
+        statistics[f"percentage_{level}"] = round((counts.get(dvalue, 0) / total_days) * 100, 2) if total_days > 0 else 0
+    return statistics
+
+
+def day_key(column: Any, dialect: str) -> ColumnElement[str]:
+    """A DATE column formatted as YYYY-MM-DD, the format of tempo_days.id
+
+    A plain cast to text depends on the server settings (PostgreSQL DateStyle), so the
+    format is spelled out for each dialect.
+    """
+    if dialect == "postgresql":
+        return func.to_char(column, "YYYY-MM-DD")
+    return func.strftime("%Y-%m-%d", column)
+
+
+async def get_tempo_consumption_totals(
+    db: AsyncSession,
+    usage_point_id: str,
+    start_date: date,
+    end_date: date,
+    direction: str = "consumption",
+) -> dict[str, int]:
+    """
+    Sum daily Wh per Tempo color, joining daily data with tempo_days on the day in SQL.
+
+    Args:
+        db: Database session
+        usage_point_id: PDL number
+        start_date: First day (inclusive)
+        end_date: Last day (inclusive)
+        direction: 'consumption' or 'production'
+
+    Returns:
+        Dict mapping color (BLUE, WHITE, RED) to Wh total
+    """
+    model = ProductionData if direction == "production" else ConsumptionData
+
+    result = await db.execute(
+        select(TempoDay.color, func.sum(model.value))
+        .select_from(model)
+        .join(TempoDay, TempoDay.id == day_key(model.date, db.bind.dialect.name))
+        .where(model.usage_point_id == usage_point_id)
+        .where(model.granularity == DataGranularity.DAILY)
+        .where(model.date >= start_date)
+        .where(model.date <= end_date)
+        .group_by(TempoDay.color)
+    )
+
+    totals = {color: 0 for color in TEMPO_COLORS}
+    for color, total in result.all():
+        totals[_color_key(color)] = int(total or 0)
+    return totals
+
+
+def month_bounds(year: int, month: int) -> tuple[date, date]:
+    """First and last day of a month"""
+    start_date = date(year, month, 1)
+    if month == 12:
+        return start_date, date(year + 1, 1, 1) - timedelta(days=1)
+    return start_date, date(year, month + 1, 1) - timedelta(days=1)
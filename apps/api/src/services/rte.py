@@ -14,6 +14,8 @@ from ..models import TempoColor, TempoDay
 from ..models.ecowatt import EcoWatt
 from ..models.consumption_france import ConsumptionFrance
 from ..models.generation_forecast import GenerationForecast
+from .reference_cache import ECOWATT_DATASET, TEMPO_DATASET, reference_cache
+from .rte_inputs import consumption_rows, hourly_rows, upsert_inputs
 
 logger = logging.getLogger(__name__)
 
@@ -251,6 +253,10 @@ class RTEService:
                     import traceback
                     traceback.print_exc()
 
+        # Today/tomorrow values are not committed by the chunk loop above
+        await db.commit()
+        await reference_cache.invalidate(TEMPO_DATASET)
+
         logger.info(f"[RTE] Total updated: {updated_count} days")
         return updated_count
 
@@ -354,6 +360,7 @@ class RTEService:
         cutoff_date = datetime.now(UTC) - timedelta(days=days_to_keep)
         result = await db.execute(delete(TempoDay).where(TempoDay.date < cutoff_date))
         await db.commit()
+        await reference_cache.invalidate(TEMPO_DATASET)
         return result.rowcount
 
     # ========== EcoWatt Methods ==========
@@ -478,6 +485,7 @@ class RTEService:
                     continue
 
             await db.commit()
+            await reference_cache.invalidate(ECOWATT_DATASET)
             logger.info(f"[RTE] Updated {updated_count} EcoWatt signals")
             return updated_count
 
@@ -666,6 +674,9 @@ class RTEService:
                         logger.error(f"Error processing consumption value: {e}")
                         continue
 
+            # Stock horaire partagé avec la prévision Tempo (évite qu'elle rappelle RTE)
+            await upsert_inputs(db, consumption_rows(consumption_data["short_term"]))
+
             await db.commit()
             logger.info(f"[RTE] Updated {updated_count} consumption records")
             return updated_count
@@ -803,6 +814,7 @@ class RTEService:
             )
 
             updated_count = 0
+            input_rows: list[dict[str, Any]] = []
 
             # Stratégie de récupération :
             # - ID (intraday) : aujourd'hui et demain (mis à jour chaque heure)
@@ -854,6 +866,9 @@ class RTEService:
                             for forecast in forecasts:
                                 forecast_prod_type = forecast.get("production_type", prod_type)
                                 forecast_type = forecast.get("type", fc_type)
+                                input_rows.extend(
+                                    hourly_rows(forecast_prod_type, forecast_type, forecast.get("values", []))
+                                )
 
                                 for value in forecast.get("values", []):
                                     try:
@@ -922,6 +937,9 @@ class RTEService:
                         logger.warning(f"[RTE] Could not fetch forecast for {prod_type} ({fc_type}): {e}")
                         continue
 
+            # Stock horaire partagé avec la prévision Tempo (séries non agrégées ONSHORE/OFFSHORE)
+            await upsert_inputs(db, input_rows)
+
             await db.commit()
             logger.info(f"[RTE] Updated {updated_count} generation forecast records")
             return updated_count
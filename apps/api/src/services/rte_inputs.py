@@ -0,0 +1,192 @@
+"""
+Stock local des prévisions RTE utilisées par la prévision Tempo
+
+Les valeurs RTE (consommation court terme et hebdomadaire, production solaire et éolienne)
+sont ramenées à une moyenne horaire et stockées à raison d'une ligne par (série, type, heure).
+Une nouvelle récupération ne remplace la valeur d'une ligne que si sa révision RTE
+(`updated_date`) n'est pas plus ancienne ; elle rafraîchit toujours `fetched_at`, qui sert à
+décider si le stock peut être relu sans rappeler RTE.
+"""
+
+import logging
+from datetime import UTC, datetime, timedelta
+from typing import Any, Iterable
+
+from sqlalchemy import case, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.rte_forecast_input import RTEForecastInput, RTEInputSource
+
+logger = logging.getLogger(__name__)
+
+# Âge maximal d'une série relue sans rappeler RTE (RTE publie ses révisions quelques fois par jour)
+RTE_INPUT_MAX_AGE_SECONDS = 3600
+
+# Nombre de lignes par requête d'upsert
+UPSERT_BATCH_SIZE = 500
+
+
+def _utc_naive(value: str) -> datetime:
+    return datetime.fromisoformat(value).astimezone(UTC).replace(tzinfo=None)
+
+
+def hourly_rows(source: str, forecast_type: str, values: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Ramène des valeurs RTE (pas de 15 min, 30 min ou 1 h) à une ligne par heure
+
+    Returns:
+        Lignes {source, forecast_type, hour, value (moyenne MW), updated_date (la plus récente)}
+    """
+    buckets: dict[datetime, tuple[list[float], datetime | None]] = {}
+    for value in values:
+        if value.get("value") is None:
+            continue
+        hour = _utc_naive(value["start_date"]).replace(minute=0, second=0, microsecond=0)
+        updated_date = _utc_naive(value["updated_date"]) if value.get("updated_date") else None
+        samples, latest = buckets.get(hour, ([], None))
+        samples.append(float(value["value"]))
+        if updated_date and (latest is None or updated_date > latest):
+            latest = updated_date
+        buckets[hour] = (samples, latest)
+
+    return [
+        {
+            "source": source,
+            "forecast_type": forecast_type,
+            "hour": hour,
+            "value": sum(samples) / len(samples),
+            "updated_date": latest,
+        }
+        for hour, (samples, latest) in sorted(buckets.items())
+    ]
+
+
+def consumption_rows(short_term: Iterable[dict[str, Any]], forecast_type: str | None = None) -> list[dict[str, Any]]:
+    """Lignes horaires d'une réponse RTE Consumption (short_term ou weekly_forecasts)"""
+    rows: list[dict[str, Any]] = []
+    for entry in short_term:
+        rows.extend(
+            hourly_rows(
+                RTEInputSource.CONSUMPTION,
+                forecast_type or entry.get("type", "UNKNOWN"),
+                entry.get("values", []),
+            )
+        )
+    return rows
+
+
+def generation_rows(forecasts: Iterable[dict[str, Any]], forecast_type: str | None = None) -> list[dict[str, Any]]:
+    """Lignes horaires d'une réponse RTE Generation Forecast (une série par type de production)"""
+    rows: list[dict[str, Any]] = []
+    for forecast in forecasts:
+        rows.extend(
+            hourly_rows(
+                forecast.get("production_type", "UNKNOWN"),
+                forecast_type or forecast.get("type", "UNKNOWN"),
+                forecast.get("values", []),
+            )
+        )
+    return rows
+
+
+async def upsert_inputs(db: AsyncSession, rows: list[dict[str, Any]]) -> int:
+    """
+    Enregistre des lignes horaires (sans commit)
+
+    Une révision plus ancienne que celle stockée ne remplace pas la valeur, mais `fetched_at`
+    est toujours mis à jour : la série vient d'être récupérée.
+
+    Returns:
+        Nombre de lignes envoyées
+    """
+    if not rows:
+        return 0
+
+    insert = pg_insert if db.bind.dialect.name == "postgresql" else sqlite_insert
+    fetched_at = datetime.now(UTC).replace(tzinfo=None)
+    table = RTEForecastInput.__table__
+
+    # Plusieurs valeurs pour la même clé dans un lot feraient échouer l'upsert
+    unique_rows = {(r["source"], r["forecast_type"], r["hour"]): r for r in rows}
+    rows = [{**row, "fetched_at": fetched_at} for row in unique_rows.values()]
+
+    for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+        stmt = insert(RTEForecastInput).values(rows[i : i + UPSERT_BATCH_SIZE])
+        not_older = or_(
+            stmt.excluded.updated_date.is_(None),
+            table.c.updated_date.is_(None),
+            stmt.excluded.updated_date >= table.c.updated_date,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["source", "forecast_type", "hour"],
+            set_={
+                "value": case((not_older, stmt.excluded.value), else_=table.c.value),
+                "updated_date": case(
+                    (not_older, func.coalesce(stmt.excluded.updated_date, table.c.updated_date)),
+                    else_=table.c.updated_date,
+                ),
+                "fetched_at": stmt.excluded.fetched_at,
+            },
+        )
+        await db.execute(stmt)
+
+    logger.debug(f"[RTE INPUTS] Upserted {len(rows)} hourly rows")
+    return len(rows)
+
+
+async def load_inputs(
+    db: AsyncSession,
+    series: Iterable[tuple[str, str]],
+    start: datetime,
+    end: datetime,
+) -> list[RTEForecastInput]:
+    """Lignes des séries (source, type) dont l'heure est dans [start, end[ (UTC sans timezone)"""
+    conditions = [
+        (RTEForecastInput.source == source) & (RTEForecastInput.forecast_type == forecast_type)
+        for source, forecast_type in series
+    ]
+    result = await db.execute(
+        select(RTEForecastInput)
+        .where(or_(*conditions))
+        .where(RTEForecastInput.hour >= start)
+        .where(RTEForecastInput.hour < end)
+        .order_by(RTEForecastInput.source, RTEForecastInput.forecast_type, RTEForecastInput.hour)
+    )
+    return list(result.scalars().all())
+
+
+async def load_fresh_inputs(
+    db: AsyncSession,
+    series: Iterable[tuple[str, str]],
+    start: datetime,
+    end: datetime,
+    max_age_seconds: int = RTE_INPUT_MAX_AGE_SECONDS,
+    covered: tuple[datetime, datetime] | None = None,
+) -> list[RTEForecastInput] | None:
+    """
+    Lignes stockées des séries demandées, si elles ont été récupérées récemment sur toute la période
+
+    Chaque série doit avoir des lignes, toutes récentes, et chaque heure de la période publiée par
+    RTE pour ce groupe de séries (`covered`, par défaut [start, end[) doit avoir une ligne.
+
+    Returns:
+        Les lignes, ou None s'il faut interroger RTE
+    """
+    series = list(series)
+    rows = await load_inputs(db, series, start, end)
+    cutoff = datetime.now(UTC).replace(tzinfo=None) - timedelta(seconds=max_age_seconds)
+    if any(row.fetched_at < cutoff for row in rows):
+        return None
+    if {(row.source, row.forecast_type) for row in rows} != set(series):
+        return None
+
+    hours = {row.hour for row in rows}
+    hour = max(start, covered[0]) if covered else start
+    covered_end = min(end, covered[1]) if covered else end
+    while hour < covered_end:
+        if hour not in hours:
+            return None
+        hour += timedelta(hours=1)
+    return rows
@@ -102,13 +102,7 @@ async def refresh_tempo_forecast_cache_task() -> None:
     Les prévisions Tempo utilisent les API RTE Consumption et Generation Forecast.
     On rafraîchit le cache toutes les 4 heures (RTE met à jour les prévisions vers 11h et 19h30).
     """
-    import json
-    from datetime import date
-
-    from sqlalchemy import func
-
-    from ..models import TempoDay
-    from .cache import cache_service
+    from .reference_stats import get_tempo_season_counts, get_tempo_season_start, tempo_today
     from .tempo_forecast import tempo_forecast_service
 
     while True:
@@ -118,77 +112,28 @@ async def refresh_tempo_forecast_cache_task() -> None:
                 if await should_refresh(db, 'tempo_forecast', 240):
                     logger.info(f"[SCHEDULER] {datetime.now(UTC).isoformat()} - Starting TEMPO forecast refresh...")
 
-                    # Récupérer les statistiques de la saison
-                    current_date = date.today()
-                    if current_date.month >= 9:
-                        season_start = datetime(current_date.year, 9, 1, tzinfo=UTC)
-                    else:
-                        season_start = datetime(current_date.year - 1, 9, 1, tzinfo=UTC)
-
-                    # Compter les jours Tempo de la saison
-                    result = await db.execute(
-                        select(TempoDay.color, func.count(TempoDay.id))
-                        .where(TempoDay.date >= season_start.date())
-                        .group_by(TempoDay.color)
-                    )
-                    color_counts = {row[0]: row[1] for row in result.fetchall()}
-                    blue_used = color_counts.get("BLUE", 0)
-                    white_used = color_counts.get("WHITE", 0)
-                    red_used = color_counts.get("RED", 0)
-
-                    # Générer les prévisions pour 8 jours
-                    forecasts = await tempo_forecast_service.get_forecasts(
-                        days_ahead=8,
+                    # Compter les jours Tempo de la saison jusqu'à aujourd'hui (jour Tempo, heure de Paris),
+                    # comme /tempo/forecast, pour que le calcul rafraîchi soit celui que la route relit
+                    current_date = tempo_today()
+                    color_counts = await get_tempo_season_counts(db, get_tempo_season_start(current_date), current_date)
+                    blue_used = color_counts["BLUE"]
+                    white_used = color_counts["WHITE"]
+                    red_used = color_counts["RED"]
+
+                    # Récupérer les données RTE : les prévisions ne sont recalculées que si
+                    # RTE a publié une nouvelle révision, puis servies par /tempo/forecast
+                    run = await tempo_forecast_service.get_forecast_run(
                         blue_used=blue_used,
                         white_used=white_used,
                         red_used=red_used,
                         reference_date=current_date,
+                        force_refresh=True,
                     )
 
-                    # Construire les données de cache
-                    response_data = {
-                        "season": f"{season_start.year}/{season_start.year + 1}",
-                        "season_stats": {
-                            "blue_used": blue_used,
-                            "blue_remaining": 300 - blue_used,
-                            "white_used": white_used,
-                            "white_remaining": 43 - white_used,
-                            "red_used": red_used,
-                            "red_remaining": 22 - red_used,
-                        },
-                        "forecasts": [
-                            {
-                                "date": f.date,
-                                "day_in_season": f.day_in_season,
-                                "probability_blue": f.probability_blue,
-                                "probability_white": f.probability_white,
-                                "probability_red": f.probability_red,
-                                "most_likely": f.most_likely,
-                                "confidence": f.confidence,
-                                "threshold_white_red": f.threshold_white_red,
-                                "threshold_red": f.threshold_red,
-                                "normalized_consumption": f.normalized_consumption,
-                                "forecast_type": f.forecast_type,
-                                "factors": f.factors,
-                            }
-                            for f in forecasts
-                        ],
-                        "algorithm_info": {
-                            "description": "Algorithme basé sur les seuils RTE officiels",
-                            "params_blanc_rouge": {"A": 4.0, "B": 0.015, "C": 0.026},
-                            "params_rouge": {"A": 3.15, "B": 0.01, "C": 0.031},
-                            "formula_blanc_rouge": "Seuil = A - B × JourTempo - C × StockRestant(Blanc+Rouge)",
-                            "formula_rouge": "Seuil = A' - B' × JourTempo - C' × StockRestant(Rouge)",
-                        },
-                        "cached_at": datetime.now(UTC).isoformat(),
-                        "cache_ttl_hours": 4,
-                    }
-
-                    # Sauvegarder dans le cache (clé pour 8 jours)
-                    cache_key = f"tempo:forecast:{current_date.isoformat()}:8"
-                    await cache_service.set_raw(cache_key, json.dumps(response_data), ttl=4 * 3600)
-
-                    logger.info(f"[SCHEDULER] Successfully refreshed TEMPO forecast cache ({len(forecasts)} days)")
+                    logger.info(
+                        f"[SCHEDULER] Successfully refreshed TEMPO forecast cache "
+                        f"({len(run.forecasts)} days, RTE revision {run.revision})"
+                    )
 
                     # Update last refresh time
                     await update_refresh_time(db, 'tempo_forecast')
@@ -20,7 +20,8 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.client_mode import ConsumptionData, DataGranularity, ProductionData
-from ..models.tempo_day import TempoDay
+from .reference_stats import get_tempo_consumption_totals, month_bounds
+from .tariff_schedule import TariffSchedule
 
 logger = logging.getLogger(__name__)
 
@@ -283,40 +284,28 @@ class StatisticsService:
     # HP/HC STATISTICS (Peak/Off-peak based on detailed data)
     # =========================================================================
 
-    def _is_offpeak_hour(self, interval_start: str | None, offpeak_hours: list[dict[str, str]]) -> bool:
-        """Check if an interval is during off-peak hours
+    @staticmethod
+    def _split_hp_hc(rows: Any, offpeak_hours: list[dict[str, str]]) -> tuple[int, int]:
+        """Sum detailed rows (interval_start, value) into HP and HC totals
 
         Args:
-            interval_start: Time string like "00:00", "00:30", etc.
+            rows: Rows with interval_start ("00:00", "00:30", ...) and value
             offpeak_hours: List of offpeak periods like [{"start": "22:00", "end": "06:00"}]
 
         Returns:
-            True if the interval is during off-peak hours
+            Tuple of (HP Wh, HC Wh)
         """
-        if not interval_start or not offpeak_hours:
-            return False
-
-        try:
-            hour, minute = map(int, interval_start.split(":"))
-            time_minutes = hour * 60 + minute
-
-            for period in offpeak_hours:
-                start_h, start_m = map(int, period["start"].split(":"))
-                end_h, end_m = map(int, period["end"].split(":"))
+        schedule = TariffSchedule.from_offpeak_hours(offpeak_hours)
 
-                start_minutes = start_h * 60 + start_m
-                end_minutes = end_h * 60 + end_m
-
-                # Handle overnight periods (e.g., 22:00 - 06:00)
-                if start_minutes > end_minutes:
-                    if time_minutes >= start_minutes or time_minutes < end_minutes:
-                        return True
-                elif start_minutes <= time_minutes < end_minutes:
-                    return True
+        hp_total = 0
+        hc_total = 0
+        for row in rows:
+            if schedule.is_offpeak_time(row.interval_start):
+                hc_total += row.value
+            else:
+                hp_total += row.value
 
-            return False
-        except (ValueError, KeyError):
-            return False
+        return hp_total, hc_total
 
     async def get_hp_hc_year_total(
         self,
@@ -348,16 +337,7 @@ class StatisticsService:
             .where(model.date <= end_date)
         )
 
-        hp_total = 0
-        hc_total = 0
-
-        for row in result.all():
-            if self._is_offpeak_hour(row.interval_start, offpeak_hours):
-                hc_total += row.value
-            else:
-                hp_total += row.value
-
-        return hp_total, hc_total
+        return self._split_hp_hc(result.all(), offpeak_hours)
 
     async def get_hp_hc_month_total(
         self,
@@ -395,16 +375,7 @@ class StatisticsService:
             .where(model.date <= end_date)
         )
 
-        hp_total = 0
-        hc_total = 0
-
-        for row in result.all():
-            if self._is_offpeak_hour(row.interval_start, offpeak_hours):
-                hc_total += row.value
-            else:
-                hp_total += row.value
-
-        return hp_total, hc_total
+        return self._split_hp_hc(result.all(), offpeak_hours)
 
     async def get_hp_hc_week_total(
         self,
@@ -434,16 +405,7 @@ class StatisticsService:
             .where(model.date <= end_date)
         )
 
-        hp_total = 0
-        hc_total = 0
-
-        for row in result.all():
-            if self._is_offpeak_hour(row.interval_start, offpeak_hours):
-                hc_total += row.value
-            else:
-                hp_total += row.value
-
-        return hp_total, hc_total
+        return self._split_hp_hc(result.all(), offpeak_hours)
 
     async def get_hp_hc_current_week_by_day(
         self,
@@ -471,16 +433,7 @@ class StatisticsService:
                 .where(model.date == day_date)
             )
 
-            hp_total = 0
-            hc_total = 0
-
-            for row in query_result.all():
-                if self._is_offpeak_hour(row.interval_start, offpeak_hours):
-                    hc_total += row.value
-                else:
-                    hp_total += row.value
-
-            result[day_name] = (hp_total, hc_total)
+            result[day_name] = self._split_hp_hc(query_result.all(), offpeak_hours)
 
         return result
 
@@ -501,38 +454,9 @@ class StatisticsService:
         Returns:
             Dict mapping color (BLUE, WHITE, RED) to Wh total
         """
-        model = self._get_model(direction)
-        start_date = date(year, 1, 1)
-        end_date = date(year, 12, 31)
-
-        # Get all Tempo days for the year (use ID for comparison - YYYY-MM-DD format)
-        tempo_result = await self.db.execute(
-            select(TempoDay.id, TempoDay.color)
-            .where(TempoDay.id >= start_date.isoformat())
-            .where(TempoDay.id <= end_date.isoformat())
+        return await get_tempo_consumption_totals(
+            self.db, usage_point_id, date(year, 1, 1), date(year, 12, 31), direction
         )
-        # Map date string (YYYY-MM-DD) to color
-        tempo_days = {row.id: row.color.value if hasattr(row.color, 'value') else row.color for row in tempo_result.all()}
-
-        # Get all consumption for the year
-        consumption_result = await self.db.execute(
-            select(model.date, model.value)
-            .where(model.usage_point_id == usage_point_id)
-            .where(model.granularity == DataGranularity.DAILY)
-            .where(model.date >= start_date)
-            .where(model.date <= end_date)
-        )
-
-        totals = {"BLUE": 0, "WHITE": 0, "RED": 0}
-
-        for row in consumption_result.all():
-            # Convert date to ISO format to match tempo_days keys
-            date_str = row.date.isoformat() if hasattr(row.date, 'isoformat') else str(row.date)
-            color = tempo_days.get(date_str)
-            if color and color in totals:
-                totals[color] += row.value
-
-        return totals
 
     async def get_tempo_month_totals(
         self, usage_point_id: str, year: int, month: int, direction: str = "consumption"
@@ -542,41 +466,8 @@ class StatisticsService:
         Returns:
             Dict mapping color (BLUE, WHITE, RED) to Wh total
         """
-        model = self._get_model(direction)
-        start_date = date(year, month, 1)
-        if month == 12:
-            end_date = date(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            end_date = date(year, month + 1, 1) - timedelta(days=1)
-
-        # Get Tempo days (use ID for comparison - YYYY-MM-DD format)
-        tempo_result = await self.db.execute(
-            select(TempoDay.id, TempoDay.color)
-            .where(TempoDay.id >= start_date.isoformat())
-            .where(TempoDay.id <= end_date.isoformat())
-        )
-        # Map date string (YYYY-MM-DD) to color
-        tempo_days = {row.id: row.color.value if hasattr(row.color, 'value') else row.color for row in tempo_result.all()}
-
-        # Get consumption
-        consumption_result = await self.db.execute(
-            select(model.date, model.value)
-            .where(model.usage_point_id == usage_point_id)
-            .where(model.granularity == DataGranularity.DAILY)
-            .where(model.date >= start_date)
-            .where(model.date <= end_date)
-        )
-
-        totals = {"BLUE": 0, "WHITE": 0, "RED": 0}
-
-        for row in consumption_result.all():
-            # Convert date to ISO format to match tempo_days keys
-            date_str = row.date.isoformat() if hasattr(row.date, 'isoformat') else str(row.date)
-            color = tempo_days.get(date_str)
-            if color and color in totals:
-                totals[color] += row.value
-
-        return totals
+        start_date, end_date = month_bounds(year, month)
+        return await get_tempo_consumption_totals(self.db, usage_point_id, start_date, end_date, direction)
 
     # =========================================================================
     # HELPER METHODS
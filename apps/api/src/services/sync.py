@@ -31,6 +31,9 @@ from ..models.client_mode import (
     SyncStatus,
     SyncStatusType,
 )
+from .energy_values import detailed_interval_minutes, value_to_wh
+from .pdl_cache import pdl_cache
+from .reference_cache import ECOWATT_DATASET, TEMPO_DATASET, reference_cache
 
 logger = logging.getLogger(__name__)
 
@@ -195,6 +198,7 @@ class SyncService:
                     synced_pdls.append({"usage_point_id": usage_point_id, "action": "created"})
 
             await self.db.commit()
+            await pdl_cache.invalidate(*(synced["usage_point_id"] for synced in synced_pdls))
             logger.info(f"[SYNC] PDL list sync complete: {len(synced_pdls)} PDLs")
             return synced_pdls
 
@@ -252,13 +256,10 @@ class SyncService:
         """
         logger.info(f"[SYNC] Syncing PDL {usage_point_id}...")
 
-        # Check if PDL is active before syncing
-        pdl_check = await self.db.execute(
-            select(PDL).where(PDL.usage_point_id == usage_point_id)
-        )
-        pdl_check_result = pdl_check.scalar_one_or_none()
+        # Check if PDL is active before syncing (same metadata decides on production below)
+        pdl = await pdl_cache.get(self.db, usage_point_id)
 
-        if pdl_check_result and not pdl_check_result.is_active:
+        if pdl and not pdl.is_active:
             logger.info(f"[SYNC] Skipping PDL {usage_point_id} (is_active=False)")
             return {
                 "usage_point_id": usage_point_id,
@@ -328,11 +329,6 @@ class SyncService:
             result["max_power"] = f"error: {e}"
 
         # Sync production data only if PDL has production
-        pdl_result = await self.db.execute(
-            select(PDL).where(PDL.usage_point_id == usage_point_id)
-        )
-        pdl = pdl_result.scalar_one_or_none()
-
         if pdl and pdl.has_production:
             try:
                 daily_count = await self._sync_production_daily(usage_point_id)
@@ -1108,17 +1104,22 @@ class SyncService:
                 continue
 
             try:
-                value_wh = int(float(value))
+                stored_value = int(float(value))
             except (TypeError, ValueError):
                 logger.warning(f"[SYNC] Failed to parse value '{value}' for date '{date_str}'")
                 continue
 
+            # Detailed values are W over the reading interval: normalize to Wh once, here
+            interval_minutes = detailed_interval_minutes(reading) if granularity == DataGranularity.DETAILED else None
+
             records.append({
                 "usage_point_id": usage_point_id,
                 "date": record_date,
                 "granularity": granularity,
                 "interval_start": interval_start,
-                "value": value_wh,
+                "value": stored_value,
+                "interval_minutes": interval_minutes,
+                "value_wh": value_to_wh(stored_value, interval_minutes),
                 "source": "myelectricaldata",
                 "raw_data": reading,
             })
@@ -1184,6 +1185,8 @@ class SyncService:
             "granularity": DataGranularity.DAILY,
             "interval_start": None,
             "value": 0,
+            "interval_minutes": None,
+            "value_wh": 0.0,
             "source": "myelectricaldata",
             "raw_data": {
                 "date": target_date.isoformat(),
@@ -1262,6 +1265,8 @@ class SyncService:
                 constraint=f"uq_{model_class.__tablename__}",
                 set_={
                     "value": stmt.excluded.value,
+                    "interval_minutes": stmt.excluded.interval_minutes,
+                    "value_wh": stmt.excluded.value_wh,
                     "raw_data": stmt.excluded.raw_data,
                     "updated_at": datetime.now(UTC),
                 },
@@ -1884,6 +1889,7 @@ class SyncService:
                     result["errors"].append(str(e))
 
             await self.db.commit()
+            await reference_cache.invalidate(ECOWATT_DATASET)
             await self._update_sync_tracker("ecowatt_client")
             logger.info(
                 f"[SYNC] EcoWatt sync complete: "
@@ -2000,6 +2006,7 @@ class SyncService:
                     result["errors"].append(str(e))
 
             await self.db.commit()
+            await reference_cache.invalidate(TEMPO_DATASET)
             await self._update_sync_tracker("tempo_client")
             logger.info(
                 f"[SYNC] Tempo sync complete: "
@@ -0,0 +1,228 @@
+"""
+Compiled off-peak (HC) schedules shared by statistics, exporters and offer calculators
+
+An off-peak definition (contract `offpeak_hours`, per-weekday `hc_schedules` of an offer, Tempo
+22h-6h rule) is compiled once into a slot mask of 1440 minutes per weekday. Classifying a data
+point is then a single lookup instead of re-parsing "HH:MM" strings for every point. Compiled
+schedules are memoized by their normalized ranges, so every request using the same contract
+shares one instance.
+"""
+
+import re
+from datetime import datetime, time
+from functools import lru_cache
+from typing import Any, Iterable, Mapping, Optional, Sequence, Union
+
+# NumPy is optional (extra "backtest"): only the array classification needs it
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+MINUTES_PER_DAY = 1440
+WEEKDAY_NAMES = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+# (start, end) in minutes of the day, end excluded; start > end crosses midnight
+OffpeakRange = tuple[int, int]
+DayRanges = tuple[OffpeakRange, ...]
+
+# HC range used when a contract has no schedule (exporters)
+DEFAULT_OFFPEAK_RANGES: DayRanges = ((22 * 60, 6 * 60),)
+# Tempo: HC from 22h to 6h every day
+TEMPO_OFFPEAK_RANGES: DayRanges = ((22 * 60, 6 * 60),)
+
+_TIME_PATTERN = re.compile(r"\s*(\d{1,2})[h:H](\d{2})")
+_RANGE_PATTERN = re.compile(r"(\d{1,2})[h:](\d{2})\s*-\s*(\d{1,2})[h:](\d{2})")
+
+
+@lru_cache(maxsize=4096)
+def parse_minute_of_day(value: str) -> Optional[int]:
+    """Minute of the day of a "HH:MM" (or "HHhMM") string, None if it is not a time"""
+    match = _TIME_PATTERN.match(value)
+    if not match:
+        return None
+    hour, minute = int(match.group(1)), int(match.group(2))
+    if hour > 24 or minute > 59:
+        return None
+    return min(hour * 60 + minute, MINUTES_PER_DAY)
+
+
+def normalize_offpeak_hours(offpeak_raw: Any) -> list[dict[str, str]]:
+    """Normalize off-peak configuration to [{'start': 'HH:MM', 'end': 'HH:MM'}]."""
+    normalized: list[dict[str, str]] = []
+
+    def add_range(start: str, end: str) -> None:
+        normalized.append({"start": start, "end": end})
+
+    def parse_range_string(range_str: str) -> None:
+        match = re.search(r"(\d{1,2})[h:](\d{2})\s*-\s*(\d{1,2})[h:](\d{2})", range_str)
+        if not match:
+            return
+        add_range(
+            f"{match.group(1).zfill(2)}:{match.group(2)}",
+            f"{match.group(3).zfill(2)}:{match.group(4)}",
+        )
+
+    if isinstance(offpeak_raw, list):
+        for item in offpeak_raw:
+            if isinstance(item, dict):
+                start = item.get("start")
+                end = item.get("end")
+                if isinstance(start, str) and isinstance(end, str):
+                    add_range(start, end)
+            elif isinstance(item, str):
+                parse_range_string(item)
+        return normalized
+
+    if isinstance(offpeak_raw, dict):
+        ranges = offpeak_raw.get("ranges")
+        if isinstance(ranges, list):
+            for item in ranges:
+                if isinstance(item, str):
+                    parse_range_string(item)
+                elif isinstance(item, dict):
+                    start = item.get("start")
+                    end = item.get("end")
+                    if isinstance(start, str) and isinstance(end, str):
+                        add_range(start, end)
+        for value in offpeak_raw.values():
+            if isinstance(value, str):
+                parse_range_string(value)
+            elif isinstance(value, list):
+                for sub_item in value:
+                    if isinstance(sub_item, str):
+                        parse_range_string(sub_item)
+        return normalized
+
+    return normalized
+
+
+def _ranges_from_periods(periods: Iterable[Mapping[str, Any]]) -> DayRanges:
+    """Ranges of [{'start', 'end'}] periods, invalid periods skipped, duplicates removed"""
+    ranges: list[OffpeakRange] = []
+    for period in periods:
+        start = period.get("start")
+        end = period.get("end")
+        if not isinstance(start, str) or not isinstance(end, str):
+            continue
+        start_minute = parse_minute_of_day(start)
+        end_minute = parse_minute_of_day(end)
+        if start_minute is None or end_minute is None:
+            continue
+        ranges.append((start_minute, end_minute))
+    return tuple(sorted(set(ranges)))
+
+
+def _ranges_from_string(value: str) -> DayRanges:
+    """Ranges of a "HH:MM-HH:MM" string (several ranges may be separated by any delimiter)"""
+    ranges = {
+        (int(h1) * 60 + int(m1), int(h2) * 60 + int(m2))
+        for h1, m1, h2, m2 in _RANGE_PATTERN.findall(value)
+    }
+    return tuple(sorted((min(start, MINUTES_PER_DAY), min(end, MINUTES_PER_DAY)) for start, end in ranges))
+
+
+class TariffSchedule:
+    """
+    Off-peak slot mask per weekday (Monday = 0), built from minute ranges.
+
+    Use the constructors (`from_offpeak_hours`, `from_hc_schedules`, `tempo`) rather than
+    `__init__`: they return the memoized instance of an identical schedule.
+    """
+
+    __slots__ = ("ranges", "_slots")
+
+    def __init__(self, ranges: tuple[DayRanges, ...]):
+        if len(ranges) != 7:
+            raise ValueError("A tariff schedule needs the ranges of the 7 weekdays")
+        self.ranges = ranges
+
+        slots = bytearray(7 * MINUTES_PER_DAY)
+        for weekday, day_ranges in enumerate(ranges):
+            base = weekday * MINUTES_PER_DAY
+            for start, end in day_ranges:
+                if start < end:
+                    slots[base + start:base + end] = b"\x01" * (end - start)
+                elif start > end:
+                    # Overnight range (e.g. 22:00 -> 06:00)
+                    slots[base + start:base + MINUTES_PER_DAY] = b"\x01" * (MINUTES_PER_DAY - start)
+                    slots[base:base + end] = b"\x01" * end
+        self._slots = bytes(slots)
+
+    def __repr__(self) -> str:
+        return f"TariffSchedule({self.ranges!r})"
+
+    @classmethod
+    def compile(cls, ranges: tuple[DayRanges, ...]) -> "TariffSchedule":
+        """Memoized schedule for normalized ranges (one tuple of ranges per weekday)"""
+        return _compile(ranges)
+
+    @classmethod
+    def from_offpeak_hours(cls, offpeak_hours: Any, default: DayRanges = ()) -> "TariffSchedule":
+        """Same HC ranges every day, from a contract `offpeak_hours` value (any stored format)
+
+        `default` applies when no valid range is found (no HC at all by default).
+        """
+        day_ranges = _ranges_from_periods(normalize_offpeak_hours(offpeak_hours)) or default
+        return _compile((day_ranges,) * 7)
+
+    @classmethod
+    def from_hc_schedules(cls, hc_schedules: Mapping[str, str], default: str = "22:30-06:30") -> "TariffSchedule":
+        """Per-weekday HC ranges from an offer `hc_schedules` ({"monday": "22:30-06:30", ...})"""
+        return _compile(tuple(
+            _ranges_from_string(hc_schedules.get(name) or default) for name in WEEKDAY_NAMES
+        ))
+
+    @classmethod
+    def tempo(cls) -> "TariffSchedule":
+        """Tempo rule: HC from 22h to 6h, HP from 6h to 22h"""
+        return _compile((TEMPO_OFFPEAK_RANGES,) * 7)
+
+    # -- Scalar classification ------------------------------------------------
+
+    def is_offpeak(self, minute_of_day: int, weekday: int = 0) -> bool:
+        """True if the minute of the day (0-1439) of the weekday is off-peak"""
+        return self._slots[weekday * MINUTES_PER_DAY + minute_of_day] == 1
+
+    def is_offpeak_time(self, value: Optional[str], weekday: int = 0) -> bool:
+        """True if an interval start like "14:30" is off-peak (False if missing or invalid)"""
+        if not value:
+            return False
+        minute = parse_minute_of_day(value)
+        if minute is None or minute >= MINUTES_PER_DAY:
+            return False
+        return self._slots[weekday * MINUTES_PER_DAY + minute] == 1
+
+    def is_offpeak_at(self, moment: Union[datetime, time]) -> bool:
+        """True if a timestamp (weekday and minute) or a time of day (Monday schedule) is off-peak"""
+        weekday = moment.weekday() if isinstance(moment, datetime) else 0
+        return self._slots[weekday * MINUTES_PER_DAY + moment.hour * 60 + moment.minute] == 1
+
+    # -- Vectorized classification --------------------------------------------
+
+    def classify(self, minutes: Iterable[int], weekdays: Optional[Iterable[int]] = None) -> list[bool]:
+        """Off-peak flag of each minute of the day (same weekday for all when `weekdays` is None)"""
+        slots = self._slots
+        if weekdays is None:
+            return [slots[minute] == 1 for minute in minutes]
+        return [slots[weekday * MINUTES_PER_DAY + minute] == 1 for minute, weekday in zip(minutes, weekdays)]
+
+    def classify_array(self, minutes: Sequence[int], weekdays: Optional[Sequence[int]] = None) -> "np.ndarray":
+        """NumPy version of `classify`, returning a boolean array"""
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("Array classification requires NumPy (install the 'backtest' extra)")
+        slots = np.frombuffer(self._slots, dtype=np.uint8).astype(bool)
+        index = np.asarray(minutes, dtype=np.intp)
+        if weekdays is not None:
+            index = index + np.asarray(weekdays, dtype=np.intp) * MINUTES_PER_DAY
+        return slots[index]
+
+
+@lru_cache(maxsize=256)
+def _compile(ranges: tuple[DayRanges, ...]) -> TariffSchedule:
+    return TariffSchedule(ranges)
+
+
+TEMPO_SCHEDULE = TariffSchedule.tempo()
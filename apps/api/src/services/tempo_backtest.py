@@ -0,0 +1,395 @@
+"""
+Rejeu vectorisé de l'algorithme de prévision Tempo sur des saisons passées
+
+Les couleurs réelles (tempo_days) sont comparées aux probabilités que l'algorithme aurait
+données à partir de la consommation nationale et des prévisions de production stockées
+(consumption_france, generation_forecast, rte_forecast_inputs). Seuils et probabilités sont évalués sur des
+tableaux NumPy (une ligne par jour) : une saison se rejoue en quelques millisecondes, ce qui
+permet de balayer les paramètres (A/B/C, normalisation, raideur) sans appeler RTE.
+
+Le calcul reproduit `TempoForecastService.calculate_probabilities` (branche avec données de
+consommation), avec les stocks restants reconstitués à partir des couleurs réellement tirées.
+"""
+
+import itertools
+import logging
+from dataclasses import asdict, dataclass, field, replace
+from datetime import date, timedelta
+from typing import Any, Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.consumption_france import ConsumptionFrance
+from ..models.generation_forecast import GenerationForecast
+from ..models.rte_forecast_input import RTEForecastInput, RTEInputSource
+from ..models.tempo_day import TempoDay
+from .reference_stats import TEMPO_COLORS, get_tempo_season_start
+from .tempo_forecast import (
+    NORMALIZATION_OFFSET,
+    NORMALIZATION_SCALE,
+    PARAMS_BLANC_ROUGE,
+    PARAMS_ROUGE,
+    QUOTA_BLANC,
+    QUOTA_BLEU,
+    QUOTA_ROUGE,
+)
+
+logger = logging.getLogger(__name__)
+
+# NumPy is optional (extra "backtest"): only the backtest needs it
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Données préférées quand plusieurs types couvrent le même jour
+CONSUMPTION_TYPE_PRIORITY = ("REALISED", "ID", "D-1", "D-2", "WEEKLY")
+GENERATION_TYPE_PRIORITY = ("CURRENT", "ID", "D-1", "D-2", "D-3")
+
+COLOR_INDEX = {color: index for index, color in enumerate(TEMPO_COLORS)}
+QUOTAS = np.array([QUOTA_BLEU, QUOTA_BLANC, QUOTA_ROUGE]) if NUMPY_AVAILABLE else None
+
+
+def _require_numpy() -> None:
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("The Tempo backtest requires NumPy (install the 'backtest' extra)")
+
+
+@dataclass(frozen=True)
+class BacktestParams:
+    """Paramètres de l'algorithme évalués par le rejeu (défauts = valeurs de production)"""
+
+    a_white_red: float = PARAMS_BLANC_ROUGE["A"]
+    b_white_red: float = PARAMS_BLANC_ROUGE["B"]
+    c_white_red: float = PARAMS_BLANC_ROUGE["C"]
+    a_red: float = PARAMS_ROUGE["A"]
+    b_red: float = PARAMS_ROUGE["B"]
+    c_red: float = PARAMS_ROUGE["C"]
+    normalization_offset: float = NORMALIZATION_OFFSET
+    normalization_scale: float = NORMALIZATION_SCALE
+    # Vitesse de saturation de la probabilité rouge au-dessus du seuil rouge
+    red_steepness: float = 1.2
+
+
+@dataclass
+class BacktestDataset:
+    """Jours rejoués, en tableaux alignés (un élément par jour)"""
+
+    dates: Any  # datetime64[D]
+    colors: Any  # index dans TEMPO_COLORS
+    net_consumption: Any  # MW (consommation - solaire - éolien)
+    day_in_season: Any
+    remaining: Any  # (n, 3) stocks restants BLEU/BLANC/ROUGE avant le jour
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+
+@dataclass
+class BacktestResult:
+    """Scores d'un jeu de paramètres"""
+
+    params: BacktestParams
+    days: int
+    accuracy: float
+    brier: float  # Score de Brier multi-classes (0 = parfait, 2 = pire)
+    per_color: dict[str, dict[str, float]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "params": asdict(self.params)}
+
+
+def build_dataset(
+    days: Iterable[tuple[date, str, float]],
+    season_colors: Iterable[tuple[date, str]] | None = None,
+) -> BacktestDataset:
+    """
+    Construit les tableaux du rejeu
+
+    Args:
+        days: (jour, couleur réelle, consommation nette moyenne en MW) des jours rejoués
+        season_colors: Couleurs de toutes les saisons concernées, depuis leur 1er septembre,
+            pour reconstituer les stocks restants (défaut : les jours rejoués eux-mêmes)
+    """
+    _require_numpy()
+    rows = sorted(days)
+    history = sorted(season_colors if season_colors is not None else [(d, c) for d, c, _ in rows])
+
+    # Stocks consommés avant chaque jour, remis à zéro au début de chaque saison
+    used_before: dict[date, np.ndarray] = {}
+    used = np.zeros(3, dtype=np.int64)
+    season = None
+    for day, color in history:
+        if get_tempo_season_start(day) != season:
+            season = get_tempo_season_start(day)
+            used = np.zeros(3, dtype=np.int64)
+        used_before[day] = used.copy()
+        used[COLOR_INDEX[color]] += 1
+
+    dates = np.array([d for d, _, _ in rows], dtype="datetime64[D]")
+    remaining = np.array(
+        [np.maximum(0, QUOTAS - used_before.get(d, np.zeros(3, dtype=np.int64))) for d, _, _ in rows],
+        dtype=np.int64,
+    ).reshape(len(rows), 3)
+    return BacktestDataset(
+        dates=dates,
+        colors=np.array([COLOR_INDEX[c] for _, c, _ in rows], dtype=np.int64),
+        net_consumption=np.array([v for _, _, v in rows], dtype=np.float64),
+        day_in_season=np.array([(d - get_tempo_season_start(d)).days + 1 for d, _, _ in rows], dtype=np.int64),
+        remaining=remaining,
+    )
+
+
+def compute_probabilities(dataset: BacktestDataset, params: BacktestParams) -> Any:
+    """
+    Probabilités (n, 3) BLEU/BLANC/ROUGE en pourcentages, pour tous les jours à la fois
+
+    Équivalent vectorisé de `TempoForecastService.calculate_probabilities` avec données de
+    consommation.
+    """
+    _require_numpy()
+    dates = dataset.dates
+    months = dates.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    weekdays = (dates.astype(np.int64) - 4) % 7  # 1970-01-01 était un jeudi (lundi = 0)
+    day_in_season = dataset.day_in_season
+    blue_rem, white_rem, red_rem = (dataset.remaining[:, i] for i in range(3))
+
+    is_weekend = weekdays >= 5
+    is_sunday = weekdays == 6
+    in_red_calendar = np.isin(months, (11, 12, 1, 2, 3)) & ~is_weekend
+    in_white_calendar = ~is_sunday
+    can_be_red = in_red_calendar & (red_rem > 0) & ~is_weekend
+    can_be_white = in_white_calendar & (white_rem > 0)
+
+    # Seuils RTE : Seuil = A - B.JourTempo - C.StockRestant
+    threshold_white_red = (
+        params.a_white_red - params.b_white_red * day_in_season - params.c_white_red * (white_rem + red_rem)
+    )
+    threshold_red = params.a_red - params.b_red * day_in_season - params.c_red * red_rem
+    normalized = (dataset.net_consumption - params.normalization_offset) / params.normalization_scale
+
+    dist_to_white_red = normalized - threshold_white_red
+    dist_to_red = normalized - threshold_red
+    threshold_gap = np.maximum(0.1, threshold_red - threshold_white_red)
+
+    # Zone ROUGE : au-dessus du seuil rouge
+    excess = np.minimum(dist_to_red / threshold_gap, 3.0)
+    red_zone_red = 70.0 + 22.0 * (1 - np.exp(-params.red_steepness * excess))
+    red_zone_white = np.where(can_be_white, np.maximum(1.0, (100 - red_zone_red) * 0.7), 0.0)
+    red_zone_blue = np.maximum(0.5, 100.0 - red_zone_red - red_zone_white)
+
+    # Zone INTERMÉDIAIRE : pression de stock rouge jusqu'au 31 mars
+    pos = np.minimum(dist_to_white_red / threshold_gap, 1.0)
+    years = dates.astype("datetime64[Y]").astype(np.int64) + 1970
+    march_end = np.array(
+        [f"{y if m <= 3 else y + 1}-03-31" for y, m in zip(years, months)], dtype="datetime64[D]"
+    )
+    days_until_march_end = np.maximum(1, (march_end - dates).astype(np.int64))
+    red_pressure = np.minimum(1.0, (red_rem / days_until_march_end) * 5)
+    mid_red_red = np.minimum(90.0, 55.0 + pos * 30.0 + red_pressure * 20.0)
+    mid_red_white = np.where(can_be_white, np.maximum(2.0, (100.0 - mid_red_red) * 0.8), 0.0)
+    mid_red_blue = np.maximum(1.0, 100.0 - mid_red_white - mid_red_red)
+    mid_white = np.where(can_be_white, 60.0 + pos * 25.0, 0.0)
+    mid_red = np.where(can_be_red, mid_red_red, 0.0)
+    mid_white = np.where(can_be_red, mid_red_white, mid_white)
+    mid_blue = np.where(can_be_red, mid_red_blue, np.maximum(0.0, 100.0 - mid_white))
+
+    # Zone BLEUE : sous le seuil blanc+rouge
+    norm_dist = np.minimum(-dist_to_white_red / threshold_gap, 2.0)
+    low_blue = 55.0 + 40.0 * np.minimum(1.0, norm_dist)
+    rest = 100.0 - low_blue
+    low_white = np.select(
+        [can_be_white & can_be_red, can_be_white, can_be_red], [rest * 0.65, rest * 0.9, 0.0], default=rest
+    )
+    low_red = np.select([can_be_white & can_be_red, can_be_white, can_be_red], [rest * 0.35, 0.0, rest * 0.35], 0.0)
+    low_blue = np.where(can_be_red & ~can_be_white, low_blue + rest * 0.65, low_blue)
+
+    in_red_zone = can_be_red & (dist_to_red > 0)
+    in_mid_zone = ~in_red_zone & (dist_to_white_red > 0)
+    zones = [in_red_zone, in_mid_zone]
+    prob_blue = np.select(zones, [red_zone_blue, mid_blue], low_blue)
+    prob_white = np.select(zones, [red_zone_white, mid_white], low_white)
+    prob_red = np.select(zones, [red_zone_red, mid_red], low_red)
+
+    # Contraintes finales de stock et de calendrier
+    no_red_stock = (red_rem <= 0) & (prob_red > 0)
+    prob_blue = np.where(no_red_stock, prob_blue + prob_red * 0.5, prob_blue)
+    prob_white = np.where(no_red_stock, prob_white + prob_red * 0.5, prob_white)
+    prob_red = np.where(no_red_stock, 0.0, prob_red)
+
+    no_white_stock = (white_rem <= 0) & (prob_white > 0)
+    prob_blue = np.where(no_white_stock, prob_blue + prob_white, prob_blue)
+    prob_white = np.where(no_white_stock, 0.0, prob_white)
+
+    out_of_red_calendar = (~in_red_calendar | is_weekend) & (prob_red > 0)
+    prob_blue = np.where(out_of_red_calendar, prob_blue + prob_red * 0.8, prob_blue)
+    prob_white = np.where(out_of_red_calendar, prob_white + prob_red * 0.2, prob_white)
+    prob_red = np.where(out_of_red_calendar, 0.0, prob_red)
+
+    # Normalisation (total = 100%)
+    total = prob_blue + prob_white + prob_red
+    safe_total = np.where(total > 0, total, 1.0)
+    prob_blue = np.where(total > 0, np.round(prob_blue / safe_total * 100, 1), 82.2)
+    prob_white = np.where(total > 0, np.round(prob_white / safe_total * 100, 1), 11.8)
+    prob_red = np.where(total > 0, np.round(100 - prob_blue - prob_white, 1), 6.0)
+
+    # Samedi : report vers le bleu (~70%)
+    saturday = is_weekend & ~is_sunday
+    transfer = np.where(saturday & (prob_blue < 70), np.minimum(70 - prob_blue, prob_white), 0.0)
+    prob_blue = prob_blue + transfer
+    prob_white = prob_white - transfer
+    prob_red = np.where(saturday, np.maximum(0, 100.0 - prob_blue - prob_white), prob_red)
+
+    probabilities = np.maximum(0, np.stack([prob_blue, prob_white, prob_red], axis=1))
+    # Dimanche : toujours bleu
+    probabilities[is_sunday] = (100.0, 0.0, 0.0)
+    return probabilities
+
+
+def score(dataset: BacktestDataset, params: BacktestParams) -> BacktestResult:
+    """Rejoue les jours du jeu de données et calcule précision et score de Brier"""
+    probabilities = compute_probabilities(dataset, params) / 100
+    outcomes = np.eye(3)[dataset.colors]
+    predicted = probabilities.argmax(axis=1)
+    squared_errors = (probabilities - outcomes) ** 2
+
+    per_color = {}
+    for color, index in COLOR_INDEX.items():
+        actual = dataset.colors == index
+        forecast = predicted == index
+        per_color[color] = {
+            "days": int(actual.sum()),
+            "predicted_days": int(forecast.sum()),
+            # Part des jours de cette couleur correctement prévus
+            "recall": round(float((forecast & actual).sum() / actual.sum()), 4) if actual.any() else 0.0,
+            # Part des prévisions de cette couleur qui étaient justes
+            "precision": round(float((forecast & actual).sum() / forecast.sum()), 4) if forecast.any() else 0.0,
+            "brier": round(float(squared_errors[:, index].mean()), 4) if len(dataset) else 0.0,
+        }
+
+    return BacktestResult(
+        params=params,
+        days=len(dataset),
+        accuracy=round(float((predicted == dataset.colors).mean()), 4) if len(dataset) else 0.0,
+        brier=round(float(squared_errors.sum(axis=1).mean()), 4) if len(dataset) else 0.0,
+        per_color=per_color,
+    )
+
+
+def sweep(
+    dataset: BacktestDataset,
+    grid: dict[str, Iterable[float]],
+    base: BacktestParams | None = None,
+) -> list[BacktestResult]:
+    """
+    Évalue toutes les combinaisons de paramètres de `grid` (noms des champs de BacktestParams)
+
+    Returns:
+        Résultats triés du meilleur au moins bon score de Brier
+    """
+    base = base or BacktestParams()
+    names = list(grid)
+    results = [
+        score(dataset, replace(base, **dict(zip(names, values))))
+        for values in itertools.product(*(list(grid[name]) for name in names))
+    ]
+    return sorted(results, key=lambda result: (result.brier, -result.accuracy))
+
+
+def _pick_by_priority(rows: Iterable[tuple[Any, str, float]], priority: tuple[str, ...]) -> dict[date, float]:
+    """(jour, type, valeur) -> valeur du type préféré pour chaque jour (à rang égal, la dernière lue)"""
+    best: dict[date, tuple[int, float]] = {}
+    for day, data_type, value in rows:
+        day = date.fromisoformat(str(day)[:10])
+        rank = priority.index(data_type) if data_type in priority else len(priority)
+        if day not in best or rank < best[day][0]:
+            best[day] = (rank, float(value))
+    return {day: value for day, (_, value) in best.items()}
+
+
+async def load_dataset(db: AsyncSession, start_date: date, end_date: date) -> BacktestDataset:
+    """
+    Charge les jours de start_date à end_date ayant une couleur et une consommation stockées
+
+    Les moyennes journalières sont calculées en SQL (jour UTC des valeurs horaires), comme la
+    moyenne journalière utilisée par les prévisions, à partir des tables consumption_france /
+    generation_forecast et du stock des entrées de la prévision (rte_forecast_inputs).
+    """
+    _require_numpy()
+    season_start = get_tempo_season_start(start_date)
+    tempo_result = await db.execute(
+        select(TempoDay.id, TempoDay.color)
+        .where(TempoDay.id >= season_start.isoformat())
+        .where(TempoDay.id <= end_date.isoformat())
+    )
+    season_colors = [
+        (date.fromisoformat(day), str(color.value if hasattr(color, "value") else color))
+        for day, color in tempo_result.all()
+    ]
+
+    period_end = end_date + timedelta(days=1)
+    consumption_day = func.date(ConsumptionFrance.start_date)
+    consumption_result = await db.execute(
+        select(consumption_day, ConsumptionFrance.type, func.avg(ConsumptionFrance.value))
+        .where(ConsumptionFrance.start_date >= start_date)
+        .where(ConsumptionFrance.start_date < period_end)
+        .group_by(consumption_day, ConsumptionFrance.type)
+    )
+    consumption_rows = list(consumption_result.all())
+
+    generation_day = func.date(GenerationForecast.start_date)
+    generation_result = await db.execute(
+        select(
+            generation_day,
+            GenerationForecast.production_type,
+            GenerationForecast.forecast_type,
+            func.avg(GenerationForecast.value),
+        )
+        .where(GenerationForecast.start_date >= start_date)
+        .where(GenerationForecast.start_date < period_end)
+        .where(GenerationForecast.production_type.in_(("SOLAR", "WIND")))
+        .group_by(generation_day, GenerationForecast.production_type, GenerationForecast.forecast_type)
+    )
+    generation_rows = list(generation_result.all())
+
+    # Entrées de la prévision : l'éolien y est stocké en deux séries (terrestre, en mer), sommées par jour
+    input_day = func.date(RTEForecastInput.hour)
+    input_result = await db.execute(
+        select(input_day, RTEForecastInput.source, RTEForecastInput.forecast_type, func.avg(RTEForecastInput.value))
+        .where(RTEForecastInput.hour >= start_date)
+        .where(RTEForecastInput.hour < period_end)
+        .group_by(input_day, RTEForecastInput.source, RTEForecastInput.forecast_type)
+    )
+    wind_inputs: dict[tuple[str, str], float] = {}
+    for day, source, fc_type, value in input_result.all():
+        if source == RTEInputSource.CONSUMPTION:
+            consumption_rows.append((day, fc_type, value))
+        elif source == RTEInputSource.SOLAR:
+            generation_rows.append((day, "SOLAR", fc_type, value))
+        elif source in (RTEInputSource.WIND_ONSHORE, RTEInputSource.WIND_OFFSHORE):
+            wind_inputs[(str(day), fc_type)] = wind_inputs.get((str(day), fc_type), 0.0) + value
+    generation_rows.extend((day, "WIND", fc_type, value) for (day, fc_type), value in wind_inputs.items())
+
+    consumption = _pick_by_priority(consumption_rows, CONSUMPTION_TYPE_PRIORITY)
+    generation = {
+        production_type: _pick_by_priority(
+            (
+                (day, fc_type, value)
+                for day, prod_type, fc_type, value in generation_rows
+                if prod_type == production_type
+            ),
+            GENERATION_TYPE_PRIORITY,
+        )
+        for production_type in ("SOLAR", "WIND")
+    }
+
+    days = [
+        (day, color, consumption[day] - generation["SOLAR"].get(day, 0.0) - generation["WIND"].get(day, 0.0))
+        for day, color in season_colors
+        if start_date <= day <= end_date and day in consumption
+    ]
+    logger.info(f"[TEMPO BACKTEST] {len(days)} days with stored consumption between {start_date} and {end_date}")
+    return build_dataset(days, season_colors)
@@ -17,15 +17,23 @@ Référence : Documentation RTE - Création de l'algorithme Tempo
 https://www.services-rte.com/files/live/sites/services-rte/files/pdf/20160106_Methode_de_choix_des_jours_Tempo.pdf
 """
 
+import hashlib
+import json
 import logging
-from dataclasses import dataclass
-from datetime import date, datetime, timedelta
-from typing import Any
+from dataclasses import asdict, dataclass
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Any, Awaitable, Callable
 from zoneinfo import ZoneInfo
 
 import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..config import settings
+from ..models.database import async_session_maker
+from ..models.rte_forecast_input import RTEInputSource
+from .cache import cache_service
+from .reference_stats import tempo_today
+from .rte_inputs import consumption_rows, generation_rows, load_fresh_inputs, upsert_inputs
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +71,17 @@ QUOTA_BLANC = 43
 QUOTA_ROUGE = 22
 TOTAL_DAYS = 365
 
+# Horizon des prévisions : au-delà, les données RTE (weekly_forecast) deviennent trop
+# incertaines et l'API ne fournit pas de prévisions éoliennes. Les fenêtres plus courtes
+# sont servies en découpant le calcul sur l'horizon complet.
+FORECAST_HORIZON_DAYS = 6
+
+# Cache Redis des calculs : dernier calcul du jour (relu sans appeler RTE, RTE met à jour
+# ses prévisions vers 11h et 19h30) et calculs par révision des données RTE
+FORECAST_CACHE_PREFIX = "tempo:forecast"
+FORECAST_LATEST_TTL_SECONDS = 4 * 3600
+FORECAST_RUN_TTL_SECONDS = 24 * 3600
+
 
 @dataclass
 class ConsumptionForecast:
@@ -95,6 +114,68 @@ class TempoDayForecast:
     factors: dict  # Facteurs explicatifs
 
 
+@dataclass
+class ForecastInputs:
+    """Données RTE agrégées par jour, avec leur révision"""
+
+    consumption: dict[str, dict[str, Any]]  # date -> {consumption_mw, forecast_type}
+    generation: dict[str, dict[str, float]]  # date -> {solar, wind} (MW)
+    revision: str  # Empreinte des updated_date RTE
+
+
+@dataclass
+class TempoForecastRun:
+    """Prévisions calculées pour une révision des données RTE, indexées par date"""
+
+    reference_date: str  # YYYY-MM-DD
+    revision: str
+    computed_at: str  # ISO 8601
+    forecasts: dict[str, TempoDayForecast]  # date -> prévision
+
+    def window(self, days: int) -> list[TempoDayForecast]:
+        """Prévisions de J+1 à J+days"""
+        start = date.fromisoformat(self.reference_date)
+        dates = [(start + timedelta(days=i)).isoformat() for i in range(1, min(days, FORECAST_HORIZON_DAYS) + 1)]
+        return [self.forecasts[d] for d in dates if d in self.forecasts]
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TempoForecastRun":
+        return cls(
+            reference_date=data["reference_date"],
+            revision=data["revision"],
+            computed_at=data["computed_at"],
+            forecasts={d: TempoDayForecast(**f) for d, f in data["forecasts"].items()},
+        )
+
+
+def compute_input_revision(rows: list[dict[str, Any]]) -> str:
+    """
+    Empreinte des prévisions RTE utilisées, basée sur leurs `updated_date`
+
+    Chaque valeur porte la date de sa dernière mise à jour par RTE : l'empreinte ne change
+    que lorsque RTE publie une nouvelle révision d'une série. Les séries sans updated_date
+    sont prises en compte par leurs valeurs.
+    """
+    series: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for row in rows:
+        series.setdefault((row["source"], row["forecast_type"]), []).append(row)
+
+    markers = []
+    for (source, forecast_type), series_rows in series.items():
+        updated = [row["updated_date"] for row in series_rows if row.get("updated_date")]
+        if updated:
+            marker = max(updated).isoformat()
+        else:
+            ordered = sorted(series_rows, key=lambda r: r["hour"])
+            marker = json.dumps([[row["hour"].isoformat(), row["value"]] for row in ordered])
+        first_hour = min(row["hour"] for row in series_rows).isoformat()
+        markers.append(f"{source}|{forecast_type}|{first_hour}|{marker}")
+    return hashlib.sha256("\n".join(sorted(markers)).encode()).hexdigest()[:16]
+
+
 class TempoForecastService:
     """Service de prévision Tempo utilisant les APIs RTE"""
 
@@ -113,8 +194,6 @@ class TempoForecastService:
 
     async def _get_access_token(self) -> str:
         """Obtenir un token OAuth2 pour les APIs RTE"""
-        from datetime import UTC
-
         if self._access_token and self._token_expires_at:
             if datetime.now(UTC) < self._token_expires_at:
                 return self._access_token
@@ -153,14 +232,12 @@ class TempoForecastService:
         """
         token = await self._get_access_token()
         paris_tz = ZoneInfo("Europe/Paris")
-        from datetime import time
-
         results: list[dict[str, Any]] = []
 
         # Récupérer D-1 (J+1) et D-2 (J+2)
         forecast_configs = [
-            ("D-1", date.today() + timedelta(days=1)),
-            ("D-2", date.today() + timedelta(days=2)),
+            ("D-1", tempo_today() + timedelta(days=1)),
+            ("D-2", tempo_today() + timedelta(days=2)),
         ]
 
         async with httpx.AsyncClient(timeout=30.0) as client:
@@ -250,8 +327,6 @@ class TempoForecastService:
         # L'API RTE ne fournit les prévisions de production (solaire, éolien)
         # que pour J+1 (demain) avec le type D-1.
         # Les types D-2 et D-3 retournent systématiquement 400 Bad Request.
-        from datetime import time
-
         logger.info(f"[RTE] Fetching generation forecast from {start_date} to {end_date}")
 
         results: list[dict[str, Any]] = []
@@ -260,7 +335,7 @@ class TempoForecastService:
         prod_types = ["SOLAR", "WIND_ONSHORE", "WIND_OFFSHORE"]
 
         # Seul J+1 (D-1) est disponible pour les prévisions de production
-        tomorrow = date.today() + timedelta(days=1)
+        tomorrow = tempo_today() + timedelta(days=1)
 
         # Vérifier si J+1 est dans la plage demandée
         if start_date <= tomorrow <= end_date:
@@ -388,6 +463,7 @@ class TempoForecastService:
         white_remaining: int,
         red_remaining: int,
         is_sunday: bool = False,
+        target_date: date | None = None,
     ) -> tuple[float, float, float]:
         """
         Calcule les probabilités de chaque couleur selon l'algorithme RTE officiel.
@@ -404,13 +480,17 @@ class TempoForecastService:
         Les probabilités sont calculées en fonction de la distance aux seuils,
         avec une courbe progressive (sigmoïde) pour des résultats plus nuancés.
 
+        Le jour est retrouvé à partir de day_in_season dans la saison en cours, sauf si
+        target_date est fourni (prévisions en fin de saison, rejeu de saisons passées).
+
         Returns:
             Tuple (prob_blue, prob_white, prob_red) en pourcentages
         """
         import math
 
         days_remaining = max(1, TOTAL_DAYS - day_in_season)
-        target_date = self.get_season_start(date.today()) + timedelta(days=day_in_season - 1)
+        if target_date is None:
+            target_date = self.get_season_start(tempo_today()) + timedelta(days=day_in_season - 1)
         is_sunday = target_date.weekday() == 6
 
         # ══════════════════════════════════════════════════════════════════════
@@ -691,41 +771,84 @@ class TempoForecastService:
             else:
                 return "low"
 
-    async def get_forecasts(
+    async def _load_or_fetch(
         self,
-        days_ahead: int,
-        blue_used: int,
-        white_used: int,
-        red_used: int,
-        reference_date: date | None = None,
-    ) -> list[TempoDayForecast]:
+        db: AsyncSession | None,
+        series: list[tuple[str, str]],
+        start_date: date,
+        end_date: date,
+        fetch: Callable[[], Awaitable[list[dict[str, Any]]]],
+        published: tuple[date, date] | None = None,
+    ) -> list[dict[str, Any]]:
         """
-        Génère les prévisions Tempo pour les N prochains jours
+        Valeurs horaires d'un groupe de séries RTE : relues dans le stock local si elles ont été
+        récupérées récemment sur toute la période, sinon récupérées depuis RTE et enregistrées.
 
         Args:
-            days_ahead: Nombre de jours à prévoir (max 6)
-            blue_used: Jours bleus déjà utilisés cette saison
-            white_used: Jours blancs déjà utilisés cette saison
-            red_used: Jours rouges déjà utilisés cette saison
-            reference_date: Date de référence (défaut: aujourd'hui)
+            db: Session de base de données (None = sans stock local)
+            series: Séries (source, type) attendues sur la période
+            start_date: Premier jour (heure de Paris)
+            end_date: Dernier jour inclus (heure de Paris)
+            fetch: Appel RTE retournant les lignes horaires (voir rte_inputs.hourly_rows)
+            published: Premier et dernier jour publiés par RTE pour ces séries (défaut : toute
+                la période) ; le stock n'est relu que s'il couvre chaque heure de ces jours
+        """
+        paris_tz = ZoneInfo("Europe/Paris")
 
-        Returns:
-            Liste de prévisions TempoDayForecast (J+1 à J+6)
+        def utc_midnight(day: date) -> datetime:
+            return datetime.combine(day, time()).replace(tzinfo=paris_tz).astimezone(UTC).replace(tzinfo=None)
+
+        start = utc_midnight(start_date)
+        end = utc_midnight(end_date + timedelta(days=1))
+        covered = (utc_midnight(published[0]), utc_midnight(published[1] + timedelta(days=1))) if published else None
+
+        if db is not None:
+            try:
+                stored = await load_fresh_inputs(db, series, start, end, covered=covered)
+                if stored is not None:
+                    logger.debug(f"[TEMPO FORECAST] Using stored RTE inputs for {series}")
+                    return [
+                        {"source": r.source, "forecast_type": r.forecast_type, "hour": r.hour, "value": r.value,
+                         "updated_date": r.updated_date}
+                        for r in stored
+                    ]
+            except Exception as e:
+                logger.warning(f"[TEMPO FORECAST] Could not read stored RTE inputs: {e}")
+
+        rows = await fetch()
+
+        if db is not None and rows:
+            try:
+                await upsert_inputs(db, rows)
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                logger.warning(f"[TEMPO FORECAST] Could not store RTE inputs: {e}")
+
+        return [row for row in rows if start <= row["hour"] < end]
+
+    async def fetch_inputs(
+        self, reference_date: date, end_date: date, db: AsyncSession | None = None
+    ) -> ForecastInputs:
         """
-        # Limite à 6 jours : au-delà, les données RTE (weekly_forecast) deviennent
-        # trop incertaines et l'API ne fournit pas de prévisions éoliennes
-        days_ahead = min(days_ahead, 6)
+        Récupère les prévisions RTE (consommation court terme et hebdomadaire, production)
+        et les agrège en moyennes journalières.
 
-        if reference_date is None:
-            reference_date = date.today()
+        Les valeurs horaires sont conservées dans le stock local (rte_forecast_inputs) et
+        relues tant qu'elles sont récentes, au lieu de rappeler RTE à chaque calcul.
 
-        # Quotas restants
-        blue_remaining = max(0, QUOTA_BLEU - blue_used)
-        white_remaining = max(0, QUOTA_BLANC - white_used)
-        red_remaining = max(0, QUOTA_ROUGE - red_used)
+        Args:
+            reference_date: Date de référence (les prévisions commencent à J+1)
+            end_date: Dernier jour prévu
+            db: Session de base de données (défaut : une session dédiée)
+
+        Returns:
+            ForecastInputs avec la révision des données (dérivée des `updated_date` RTE)
+        """
+        if db is None:
+            async with async_session_maker() as session:
+                return await self.fetch_inputs(reference_date, end_date, session)
 
-        # Récupérer les prévisions de consommation RTE
-        end_date = reference_date + timedelta(days=days_ahead)
         consumption_data: dict[str, dict[str, Any]] = {}
         generation_data: dict[str, dict[str, float]] = {}
 
@@ -733,44 +856,74 @@ class TempoForecastService:
         daily_consumption_values: dict[str, list[float]] = {}
         daily_generation_values: dict[str, dict[str, list[float]]] = {}
 
+        rows: list[dict[str, Any]] = []
+        paris_tz = ZoneInfo("Europe/Paris")
+        first_day = reference_date + timedelta(days=1)
+
+        def date_key_of(row: dict[str, Any]) -> str:
+            return row["hour"].replace(tzinfo=UTC).astimezone(paris_tz).strftime("%Y-%m-%d")
+
+        async def fetch_short_term() -> list[dict[str, Any]]:
+            return consumption_rows(await self.fetch_consumption_forecast(reference_date, end_date))
+
+        async def fetch_weekly() -> list[dict[str, Any]]:
+            return consumption_rows(await self.fetch_weekly_forecast(), forecast_type="WEEKLY")
+
+        async def fetch_generation() -> list[dict[str, Any]]:
+            return generation_rows(await self.fetch_generation_forecast(reference_date, end_date), forecast_type="D-1")
+
         try:
             # Prévisions court terme (D-1, D-2) - valeurs horaires en MW
-            short_term = await self.fetch_consumption_forecast(reference_date, end_date)
-            for forecast in short_term:
-                forecast_type = forecast.get("type", "UNKNOWN")
-                for value in forecast.get("values", []):
-                    dt = datetime.fromisoformat(value["start_date"])
-                    date_key = dt.strftime("%Y-%m-%d")
-                    if date_key not in daily_consumption_values:
-                        daily_consumption_values[date_key] = []
-                        consumption_data[date_key] = {"forecast_type": forecast_type}
-                    daily_consumption_values[date_key].append(value.get("value", 0))
-
+            short_term = await self._load_or_fetch(
+                db,
+                [(RTEInputSource.CONSUMPTION, "D-1"), (RTEInputSource.CONSUMPTION, "D-2")],
+                first_day,
+                end_date,
+                fetch_short_term,
+                published=(first_day, first_day + timedelta(days=1)),
+            )
             # Prévisions hebdomadaires (J+3 à J+9) - valeurs horaires en MW
-            weekly = await self.fetch_weekly_forecast()
-            for forecast in weekly:
-                for value in forecast.get("values", []):
-                    dt = datetime.fromisoformat(value["start_date"])
-                    date_key = dt.strftime("%Y-%m-%d")
-                    if date_key not in daily_consumption_values:
-                        daily_consumption_values[date_key] = []
-                        consumption_data[date_key] = {"forecast_type": "WEEKLY"}
-                    daily_consumption_values[date_key].append(value.get("value", 0))
+            weekly = await self._load_or_fetch(
+                db,
+                [(RTEInputSource.CONSUMPTION, "WEEKLY")],
+                first_day,
+                end_date,
+                fetch_weekly,
+                published=(first_day + timedelta(days=2), first_day + timedelta(days=8)),
+            )
+            rows.extend(short_term)
+            rows.extend(weekly)
+
+            # Le type retenu pour un jour est celui de sa première série (court terme avant hebdomadaire)
+            for row in short_term + weekly:
+                date_key = date_key_of(row)
+                if date_key not in daily_consumption_values:
+                    daily_consumption_values[date_key] = []
+                    consumption_data[date_key] = {"forecast_type": row["forecast_type"]}
+                daily_consumption_values[date_key].append(row["value"])
 
             # Prévisions de production (solaire, éolien) - valeurs horaires en MW
-            generation = await self.fetch_generation_forecast(reference_date, end_date)
-            for forecast in generation:
-                prod_type = forecast.get("production_type", "")
-                for value in forecast.get("values", []):
-                    dt = datetime.fromisoformat(value["start_date"])
-                    date_key = dt.strftime("%Y-%m-%d")
-                    if date_key not in daily_generation_values:
-                        daily_generation_values[date_key] = {"solar": [], "wind": []}
-
-                    if prod_type == "SOLAR":
-                        daily_generation_values[date_key]["solar"].append(value.get("value", 0))
-                    elif prod_type in ["WIND_ONSHORE", "WIND_OFFSHORE"]:
-                        daily_generation_values[date_key]["wind"].append(value.get("value", 0))
+            generation = await self._load_or_fetch(
+                db,
+                [
+                    (RTEInputSource.SOLAR, "D-1"),
+                    (RTEInputSource.WIND_ONSHORE, "D-1"),
+                    (RTEInputSource.WIND_OFFSHORE, "D-1"),
+                ],
+                first_day,
+                min(first_day, end_date),
+                fetch_generation,
+            )
+            rows.extend(generation)
+            for row in generation:
+                date_key = date_key_of(row)
+                if date_key not in daily_generation_values:
+                    daily_generation_values[date_key] = {"solar": [], "wind": []}
+
+                if row["source"] == RTEInputSource.SOLAR:
+                    daily_generation_values[date_key]["solar"].append(row["value"])
+                elif row["source"] in [RTEInputSource.WIND_ONSHORE, RTEInputSource.WIND_OFFSHORE]:
+                    daily_generation_values[date_key]["wind"].append(row["value"])
 
             # Calculer la MOYENNE de consommation journalière (selon méthode RTE)
             # Document RTE page 2 : "La grandeur utilisée dans l'algorithme est la
@@ -795,6 +948,36 @@ class TempoForecastService:
         except Exception as e:
             logger.warning(f"[TEMPO FORECAST] Error fetching RTE data: {e}")
 
+        return ForecastInputs(
+            consumption=consumption_data,
+            generation=generation_data,
+            revision=compute_input_revision(rows),
+        )
+
+    def compute_forecasts(
+        self,
+        inputs: ForecastInputs,
+        days_ahead: int,
+        blue_used: int,
+        white_used: int,
+        red_used: int,
+        reference_date: date,
+    ) -> list[TempoDayForecast]:
+        """
+        Calcule les prévisions J+1 à J+days_ahead à partir des données RTE agrégées
+
+        Les quotas restants sont décrémentés jour après jour selon la couleur la plus
+        probable : les N premiers jours d'un calcul sur H jours sont donc identiques à
+        un calcul sur N jours.
+        """
+        # Quotas restants
+        blue_remaining = max(0, QUOTA_BLEU - blue_used)
+        white_remaining = max(0, QUOTA_BLANC - white_used)
+        red_remaining = max(0, QUOTA_ROUGE - red_used)
+
+        consumption_data = inputs.consumption
+        generation_data = inputs.generation
+
         forecasts = []
 
         for i in range(1, days_ahead + 1):
@@ -840,6 +1023,7 @@ class TempoForecastService:
                 white_remaining,
                 red_remaining,
                 is_sunday,
+                target_date=target_date,
             )
 
             # Couleur la plus probable
@@ -890,6 +1074,93 @@ class TempoForecastService:
 
         return forecasts
 
+    async def get_forecast_run(
+        self,
+        blue_used: int,
+        white_used: int,
+        red_used: int,
+        reference_date: date | None = None,
+        force_refresh: bool = False,
+    ) -> TempoForecastRun:
+        """
+        Prévisions sur tout l'horizon (J+1 à J+6), calculées une fois par révision RTE
+
+        - Sans force_refresh, le dernier calcul du jour est relu depuis Redis (sans appel RTE).
+        - Sinon, les données RTE sont récupérées : si leur révision (`updated_date`) n'a pas
+          changé, le calcul existant est réutilisé au lieu d'être refait.
+
+        Args:
+            blue_used: Jours bleus déjà utilisés cette saison
+            white_used: Jours blancs déjà utilisés cette saison
+            red_used: Jours rouges déjà utilisés cette saison
+            reference_date: Date de référence (défaut: aujourd'hui, heure de Paris)
+            force_refresh: Récupérer les données RTE même si un calcul récent existe
+
+        Returns:
+            TempoForecastRun indexé par date
+        """
+        if reference_date is None:
+            reference_date = tempo_today()
+
+        # Le calcul dépend aussi des quotas déjà consommés (stock restant dans les seuils)
+        run_prefix = f"{FORECAST_CACHE_PREFIX}:{reference_date.isoformat()}:{blue_used}-{white_used}-{red_used}"
+        latest_key = f"{run_prefix}:latest"
+
+        if not force_refresh:
+            cached = await cache_service.get_raw(latest_key)
+            if cached:
+                return TempoForecastRun.from_dict(json.loads(cached))
+
+        end_date = reference_date + timedelta(days=FORECAST_HORIZON_DAYS)
+        inputs = await self.fetch_inputs(reference_date, end_date)
+        run_key = f"{run_prefix}:{inputs.revision}"
+
+        cached = await cache_service.get_raw(run_key)
+        if cached:
+            logger.info(f"[TEMPO FORECAST] RTE data unchanged (revision {inputs.revision}), reusing forecasts")
+            run = TempoForecastRun.from_dict(json.loads(cached))
+        else:
+            forecasts = self.compute_forecasts(
+                inputs, FORECAST_HORIZON_DAYS, blue_used, white_used, red_used, reference_date
+            )
+            run = TempoForecastRun(
+                reference_date=reference_date.isoformat(),
+                revision=inputs.revision,
+                computed_at=datetime.now(UTC).isoformat(),
+                forecasts={forecast.date: forecast for forecast in forecasts},
+            )
+            await cache_service.set_raw(run_key, json.dumps(run.to_dict()), ttl=FORECAST_RUN_TTL_SECONDS)
+            logger.info(f"[TEMPO FORECAST] Computed {len(forecasts)} days for RTE revision {inputs.revision}")
+
+        await cache_service.set_raw(latest_key, json.dumps(run.to_dict()), ttl=FORECAST_LATEST_TTL_SECONDS)
+        return run
+
+    async def get_forecasts(
+        self,
+        days_ahead: int,
+        blue_used: int,
+        white_used: int,
+        red_used: int,
+        reference_date: date | None = None,
+        force_refresh: bool = False,
+    ) -> list[TempoDayForecast]:
+        """
+        Génère les prévisions Tempo pour les N prochains jours
+
+        Args:
+            days_ahead: Nombre de jours à prévoir (max 6)
+            blue_used: Jours bleus déjà utilisés cette saison
+            white_used: Jours blancs déjà utilisés cette saison
+            red_used: Jours rouges déjà utilisés cette saison
+            reference_date: Date de référence (défaut: aujourd'hui)
+            force_refresh: Récupérer les données RTE même si un calcul récent existe
+
+        Returns:
+            Liste de prévisions TempoDayForecast (J+1 à J+6)
+        """
+        run = await self.get_forecast_run(blue_used, white_used, red_used, reference_date, force_refresh)
+        return run.window(days_ahead)
+
 
 # Singleton
 tempo_forecast_service = TempoForecastService()
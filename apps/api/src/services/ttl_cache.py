@@ -0,0 +1,120 @@
+"""Process-local TTL caches invalidated across workers by a Redis generation counter"""
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Generic, Optional, TypeVar
+
+from .cache import cache_service
+
+logger = logging.getLogger(__name__)
+
+# Redis counter of a cache, bumped by every invalidation
+TTL_CACHE_GENERATION_PREFIX = "ttl_cache:generation"
+# How often a worker reads the counter: upper bound for seeing another worker's invalidation
+GENERATION_CHECK_INTERVAL_SECONDS = 1.0
+
+V = TypeVar("V")
+
+
+@dataclass
+class TTLEntry(Generic[V]):
+    value: V
+    expires_at: float
+
+
+class GenerationTTLCache(Generic[V]):
+    """
+    In-memory LRU cache with a TTL, shared by the requests of one worker.
+
+    `invalidate()` drops keys in this worker and increments the Redis generation of the cache.
+    Workers read the generation at most every `check_interval` seconds (`sync_generation()`)
+    and clear all their entries when it has moved. Without Redis, entries live until their TTL.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl_seconds: int,
+        max_entries: int,
+        check_interval: float = GENERATION_CHECK_INTERVAL_SECONDS,
+    ):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.check_interval = check_interval
+        self._entries: OrderedDict[str, TTLEntry[V]] = OrderedDict()
+        self._generation: Optional[int] = None
+        self._checked_at = float("-inf")
+
+    @property
+    def generation_key(self) -> str:
+        return f"{TTL_CACHE_GENERATION_PREFIX}:{self.name}"
+
+    async def sync_generation(self) -> None:
+        """Clear the entries if the cache was invalidated by another worker since the last check"""
+        now = time.monotonic()
+        if not cache_service.redis_client or now - self._checked_at < self.check_interval:
+            return
+
+        self._checked_at = now
+        try:
+            generation = int(await cache_service.redis_client.get(self.generation_key) or 0)
+        except Exception as e:
+            logger.warning(f"[TTL CACHE] Could not read generation of {self.name}: {e}")
+            return
+        if generation != self._generation:
+            self._clear()
+            self._generation = generation
+
+    def get_cached(self, key: str) -> Optional[V]:
+        """Entry of this worker, without checking the generation (see `sync_generation`)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def store(self, key: str, value: V) -> V:
+        if self.ttl_seconds <= 0:
+            return value
+        self._entries[key] = TTLEntry(value, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+        return value
+
+    def _drop(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def _clear(self) -> None:
+        self._entries.clear()
+
+    async def invalidate(self, *keys: str) -> None:
+        """Drop keys in this worker and signal the other workers"""
+        for key in keys:
+            self._drop(key)
+        await self._publish()
+
+    async def invalidate_all(self) -> None:
+        """Drop every entry in this worker and signal the other workers"""
+        self._clear()
+        await self._publish()
+        logger.debug(f"[TTL CACHE] Cleared {self.name}")
+
+    async def _publish(self) -> None:
+        if not cache_service.redis_client:
+            return
+
+        try:
+            generation = int(await cache_service.redis_client.incr(self.generation_key))
+        except Exception as e:
+            logger.warning(f"[TTL CACHE] Could not publish invalidation of {self.name}: {e}")
+            return
+        # Another worker invalidated since our last check: its changes are not applied here yet
+        if self._generation is None or generation != self._generation + 1:
+            self._clear()
+        self._generation = generation
@@ -6,6 +6,7 @@ from .auth import (
     generate_client_id,
     generate_client_secret,
     generate_api_key,
+    hash_client_secret,
 )
 
 __all__ = [
@@ -16,4 +17,5 @@ __all__ = [
     "generate_client_id",
     "generate_client_secret",
     "generate_api_key",
+    "hash_client_secret",
 ]
@@ -1,3 +1,5 @@
+import hashlib
+import hmac
 import secrets
 import bcrypt
 from datetime import datetime, timedelta, UTC
@@ -48,6 +50,15 @@ def generate_client_secret() -> str:
     return secrets.token_urlsafe(64)
 
 
+def hash_client_secret(client_secret: str) -> str:
+    """Keyed lookup hash of a client_secret (HMAC-SHA256 with the server pepper)
+
+    Stored in users.client_secret_hash so that an API key is resolved with one indexed query.
+    """
+    pepper = settings.API_KEY_PEPPER or settings.SECRET_KEY
+    return hmac.new(pepper.encode("utf-8"), client_secret.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
 def generate_api_key() -> str:
     """Generate API key for authentication"""
     return secrets.token_urlsafe(48)
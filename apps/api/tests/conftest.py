@@ -0,0 +1,262 @@
+"""Shared test doubles: in-memory Redis, scripted and SQLite database sessions, PDF documents"""
+from contextlib import asynccontextmanager
+from fnmatch import fnmatchcase
+from typing import Any, AsyncIterator, Optional
+
+import pytest
+from sqlalchemy import Table
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+
+class FakePipeline:
+    """Queues commands and runs them against the fake Redis in one round trip"""
+
+    def __init__(self, redis: "FakeRedis"):
+        self.redis = redis
+        self.commands: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+    def __getattr__(self, name: str) -> Any:
+        def queue(*args: Any, **kwargs: Any) -> None:
+            self.commands.append((name, args, kwargs))
+
+        return queue
+
+    async def execute(self) -> list[Any]:
+        self.redis.round_trips += 1
+        commands, self.commands = self.commands, []
+        return [getattr(self.redis, f"_{name}")(*args, **kwargs) for name, args, kwargs in commands]
+
+
+class FakeRedis:
+    """In-memory subset of redis.asyncio: strings, sets, hashes, expiry and pipelines.
+
+    Commands are implemented as `_name` methods (run by pipelines) and exposed
+    as coroutines counting one round trip each. TTLs are recorded, never
+    elapsed: tests call `expire_now` to simulate an expired key.
+    """
+
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+        self.ttls: dict[str, int] = {}
+        self.round_trips = 0
+
+    def __getattr__(self, name: str) -> Any:
+        command = getattr(type(self), f"_{name}", None)
+        if command is None:
+            raise AttributeError(name)
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            self.round_trips += 1
+            return command(self, *args, **kwargs)
+
+        return call
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    def expire_now(self, *keys: str) -> None:
+        for key in keys:
+            self.data.pop(key, None)
+            self.ttls.pop(key, None)
+
+    async def scan_iter(self, match: str = "*") -> AsyncIterator[str]:
+        self.round_trips += 1
+        for key in list(self.data):
+            if fnmatchcase(key, match):
+                yield key
+
+    def _get(self, key: str) -> Any:
+        return self.data.get(key)
+
+    def _set(self, key: str, value: Any, nx: bool = False, ex: Optional[int] = None) -> bool:
+        if nx and key in self.data:
+            return False
+        self.data[key] = value
+        if ex is not None:
+            self.ttls[key] = ex
+        return True
+
+    def _setex(self, key: str, ttl: int, value: Any) -> bool:
+        return self._set(key, value, ex=ttl)
+
+    def _incr(self, key: str) -> int:
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    def _exists(self, *keys: str) -> int:
+        return sum(1 for key in keys if key in self.data)
+
+    def _delete(self, *keys: str) -> int:
+        deleted = self._exists(*keys)
+        self.expire_now(*keys)
+        return deleted
+
+    def _memory_usage(self, key: str) -> Optional[int]:
+        return len(self.data[key]) if key in self.data else None
+
+    def _expire(self, key: str, seconds: int, nx: bool = False, gt: bool = False) -> bool:
+        if key not in self.data:
+            return False
+        current = self.ttls.get(key)
+        if nx and current is not None:
+            return False
+        if gt and (current is None or seconds <= current):
+            return False
+        self.ttls[key] = seconds
+        return True
+
+    def _ttl(self, key: str) -> int:
+        if key not in self.data:
+            return -2
+        return self.ttls.get(key, -1)
+
+    def _sadd(self, key: str, *members: str) -> int:
+        values = self.data.setdefault(key, set())
+        added = len(set(members) - values)
+        values.update(members)
+        return added
+
+    def _smembers(self, key: str) -> set[str]:
+        return set(self.data.get(key, set()))
+
+    def _srem(self, key: str, *members: str) -> int:
+        values = self.data.get(key, set())
+        removed = len(values & set(members))
+        values.difference_update(members)
+        if not values:
+            self.expire_now(key)
+        return removed
+
+    def _hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        values = self.data.setdefault(key, {})
+        values[field] = str(int(values.get(field, 0)) + amount)
+        return int(values[field])
+
+    def _hset(self, key: str, mapping: dict[str, Any]) -> int:
+        self.data.setdefault(key, {}).update({field: str(value) for field, value in mapping.items()})
+        return len(mapping)
+
+    def _hmget(self, key: str, fields: list[str]) -> list[Optional[str]]:
+        values = self.data.get(key, {})
+        return [values.get(field) for field in fields]
+
+    def _hdel(self, key: str, *fields: str) -> int:
+        values = self.data.get(key, {})
+        removed = sum(1 for field in fields if values.pop(field, None) is not None)
+        if not values:
+            self.expire_now(key)
+        return removed
+
+
+class FakeResult:
+    """Rows of a scripted query"""
+
+    def __init__(self, rows: list[Any]):
+        self.rows = rows
+
+    def first(self) -> Any:
+        return self.rows[0] if self.rows else None
+
+    def one(self) -> Any:
+        assert len(self.rows) == 1, f"expected one row, got {len(self.rows)}"
+        return self.rows[0]
+
+    def all(self) -> list[Any]:
+        return self.rows
+
+
+class FakeSession:
+    """AsyncSession answering `execute` with scripted rows, in order, and `get` from `objects`.
+
+    Issued statements are kept in `statements` so that tests can check their filters.
+    """
+
+    def __init__(self, *results: list[Any], objects: Optional[dict[Any, Any]] = None, stream_error: Optional[Exception] = None):
+        self.results = list(results)
+        self.objects = objects or {}
+        self.stream_error = stream_error
+        self.statements: list[Any] = []
+        self.commits = 0
+
+    async def __aenter__(self) -> "FakeSession":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+    async def execute(self, statement: Any) -> FakeResult:
+        self.statements.append(statement)
+        return FakeResult(self.results.pop(0))
+
+    async def stream(self, statement: Any) -> Any:
+        self.statements.append(statement)
+        if self.stream_error:
+            raise self.stream_error
+        raise NotImplementedError("FakeSession only streams errors")
+
+    async def get(self, model: Any, ident: Any) -> Any:
+        return self.objects.get(ident)
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+
+def compiled(statement: Any) -> str:
+    """SQL of a statement with its parameters inlined"""
+    return str(statement.compile(compile_kwargs={"literal_binds": True}))
+
+
+@asynccontextmanager
+async def sqlite_session(*tables: Table) -> AsyncIterator[AsyncSession]:
+    """Session on a fresh in-memory SQLite database holding `tables`"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        for table in tables:
+            await conn.run_sync(table.create)
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+    finally:
+        await engine.dispose()
+
+
+def make_pdf(pages: list[list[str]]) -> bytes:
+    """Minimal PDF with one text line per entry of each page (Helvetica, A4)"""
+    def escape(line: str) -> str:
+        return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    page_ids = [4 + 2 * index for index in range(len(pages))]
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{page_id} 0 R' for page_id in page_ids)}] /Count {len(pages)} >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for page_id, lines in zip(page_ids, pages):
+        stream = "BT /F1 10 Tf 14 TL 50 800 Td " + " T* ".join(f"({escape(line)}) Tj" for line in lines) + " ET"
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    pdf += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return pdf
+
+
+@pytest.fixture
+def fake_redis() -> FakeRedis:
+    return FakeRedis()
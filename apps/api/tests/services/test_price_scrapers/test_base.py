@@ -0,0 +1,100 @@
+"""Tests for the shared price scraper helpers"""
+from datetime import datetime, UTC
+
+from src.services.price_scrapers import base
+from src.services.price_scrapers.base import OfferData, _deserialize_parsed, _serialize_parsed
+from tests.conftest import make_pdf
+
+PAGES = [[f"Page {number}", f"Option {number} 15,47 0,1952"] for number in range(10)]
+
+
+def test_offer_data_from_dict_roundtrip():
+    """Test that OfferData survives a JSON roundtrip"""
+    offer = OfferData(
+        name="Tarif Bleu - Base 6 kVA",
+        offer_type="BASE",
+        subscription_price=15.47,
+        base_price=0.1952,
+        power_kva=6,
+        valid_from=datetime(2025, 8, 1, tzinfo=UTC),
+    )
+
+    restored = OfferData.from_dict(offer.to_dict(for_json=True))
+
+    assert restored.name == offer.name
+    assert restored.base_price == offer.base_price
+    assert restored.valid_from == offer.valid_from
+    assert restored.valid_to is None
+
+
+def test_parsed_document_serialization():
+    """Test that cached parser outputs keep their type"""
+    offers = [OfferData(name="Offre", offer_type="BASE", subscription_price=10.0, base_price=0.2, power_kva=3)]
+
+    restored = _deserialize_parsed(_serialize_parsed(offers))
+    assert isinstance(restored[0], OfferData)
+    assert restored[0].power_kva == 3
+
+    assert _deserialize_parsed(_serialize_parsed("texte extrait")) == "texte extrait"
+
+
+def test_find_markers_in_order():
+    """Test the early-exit condition of page-level PDF extraction"""
+    from src.services.price_scrapers.base import _find_markers
+
+    text = "Option Base ... Option Heures Creuses ... Option Tempo ... Majoration"
+    assert _find_markers(text, ("Option Base", "Option Tempo", "Majoration")) == (3, len(text))
+    assert _find_markers(text, ("Majoration", "Option Tempo"))[0] == 1
+    assert _find_markers("Option Base", ("Option Base", "Option Tempo")) == (1, len("Option Base"))
+
+
+def test_find_markers_resumes_on_next_page():
+    """Test that matching resumes from the markers already found"""
+    from src.services.price_scrapers.base import _find_markers
+
+    markers = ("Option Base", "Option Tempo")
+    found, _ = _find_markers("Option Base ...", markers)
+    assert _find_markers("... Option Tempo", markers, found) == (2, len("... Option Tempo"))
+
+
+def test_register_pattern_reuses_compiled_pattern():
+    """Test that registered patterns are compiled once"""
+    from src.services.price_scrapers.base import PDF_PATTERNS, register_pattern
+
+    first = register_pattern("test.row", r"^(\d+)\s+([\d,]+)")
+    assert register_pattern("test.row", r"^(\d+)\s+([\d,]+)") is first
+    assert PDF_PATTERNS["test.row"].match("6 15,47").group(2) == "15,47"
+
+
+def _inline_pool(monkeypatch) -> list[str]:
+    """Run process pool tasks in the test process, recording the function names"""
+    calls = []
+
+    async def run(func, *args):
+        calls.append(func.__name__)
+        return func(*args)
+
+    monkeypatch.setattr(base, "run_sync_in_process", run)
+    return calls
+
+
+async def test_parallel_extraction_matches_sequential(monkeypatch):
+    """Test that page-level extraction returns the text of the sequential one, pages in order"""
+    calls = _inline_pool(monkeypatch)
+    content = make_pdf(PAGES)
+
+    text = await base.extract_pdf_text_parallel(content, min_pages=2)
+
+    assert text == base.extract_pdf_text(content)
+    assert text.index("Page 2") < text.index("Page 9")
+    assert calls.count("extract_pdf_page") == len(PAGES)
+    assert await base.extract_pdf_text_parallel(content, max_pages=3, min_pages=2) == base.extract_pdf_text(content, max_pages=3)
+
+
+async def test_short_documents_are_extracted_by_one_worker(monkeypatch):
+    """Test that documents under the page threshold are not split across workers"""
+    calls = _inline_pool(monkeypatch)
+    content = make_pdf(PAGES[:2])
+
+    assert await base.extract_pdf_text_parallel(content) == base.extract_pdf_text(content)
+    assert calls == ["pdf_page_count", "extract_pdf_text"]
@@ -6,6 +6,7 @@ from src.utils.auth import (
     decode_access_token,
     generate_client_id,
     generate_client_secret,
+    hash_client_secret,
 )
 
 
@@ -60,3 +61,25 @@ def test_client_secret_generation():
     assert secret_1 != secret_2
     assert len(secret_1) > 50
     assert len(secret_2) > 50
+
+
+def test_client_secret_hash():
+    """Test the keyed lookup hash of a client_secret"""
+    secret = generate_client_secret()
+    digest = hash_client_secret(secret)
+
+    assert digest == hash_client_secret(secret)
+    assert digest != hash_client_secret(generate_client_secret())
+    assert len(digest) == 64
+    assert secret not in digest
+
+
+def test_user_client_secret_hash_follows_secret():
+    """Test that setting or regenerating client_secret updates the lookup hash"""
+    from src.models import User
+
+    user = User(email="hash@example.com", hashed_password="x", client_id="cli_hash", client_secret="first")
+    assert user.client_secret_hash == hash_client_secret("first")
+
+    user.client_secret = "second"
+    assert user.client_secret_hash == hash_client_secret("second")
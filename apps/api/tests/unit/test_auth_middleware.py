@@ -0,0 +1,108 @@
+"""Tests for authentication through the principal cache"""
+import pytest
+from fastapi import HTTPException, Request
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import delete
+
+from src.config import settings
+from src.middleware import auth
+from src.middleware.auth import get_current_user, get_user_by_api_key
+from src.models import Permission, Role, User, role_permissions
+from src.services.cache import cache_service
+from src.services.principal_cache import PrincipalCache
+from src.utils.auth import create_access_token, hash_client_secret
+from tests.conftest import sqlite_session
+
+
+@pytest.fixture
+async def db():
+    tables = (Permission.__table__, Role.__table__, role_permissions, User.__table__)
+    async with sqlite_session(*tables) as session:
+        session.add(
+            User(
+                id="user-1",
+                email="user@example.com",
+                hashed_password="hash",
+                client_id="cli_user-1",
+                client_secret="old-secret",
+                client_secret_hash=hash_client_secret("old-secret"),
+                is_active=True,
+                email_verified=True,
+            )
+        )
+        await session.commit()
+        session.expunge_all()
+        yield session
+
+
+@pytest.fixture
+def workers(fake_redis, monkeypatch):
+    """Principal caches of two workers sharing Redis; the middleware runs on the first one"""
+    monkeypatch.setattr(settings, "SERVER_MODE", True)
+    monkeypatch.setattr(cache_service, "redis_client", fake_redis)
+    worker_a = PrincipalCache(ttl_seconds=60, check_interval=0)
+    worker_b = PrincipalCache(ttl_seconds=60, check_interval=0)
+    monkeypatch.setattr(auth, "principal_cache", worker_a)
+    return worker_a, worker_b
+
+
+async def _authenticate(db, token: str) -> User:
+    """Authenticate a request carrying `token` as a Bearer header, in a fresh session state"""
+    db.expunge_all()
+    request = Request({"type": "http", "headers": []})
+    return await get_current_user(request, None, HTTPAuthorizationCredentials(scheme="Bearer", credentials=token), db)
+
+
+async def _update_user(db, **values) -> None:
+    db.expunge_all()
+    user = await db.get(User, "user-1")
+    for name, value in values.items():
+        setattr(user, name, value)
+    await db.commit()
+
+
+async def test_deactivated_user_is_rejected_after_invalidation(db, workers):
+    """Test that a JWT of a user deactivated on another worker stops authenticating"""
+    worker_a, worker_b = workers
+    token = create_access_token({"sub": "user-1"})
+    assert (await _authenticate(db, token)).id == "user-1"
+    assert await worker_a.get("user-1") is not None
+
+    await _update_user(db, is_active=False)
+    # Until invalidation the cached principal is still served
+    assert (await _authenticate(db, token)).is_active
+
+    await worker_b.invalidate("user-1")
+    with pytest.raises(HTTPException) as exc_info:
+        await _authenticate(db, token)
+    assert exc_info.value.status_code == 401
+
+
+async def test_revoked_secret_stops_authenticating(db, workers):
+    """Test that the previous client secret is refused once the secret is regenerated"""
+    worker_a, worker_b = workers
+    assert (await get_user_by_api_key(db, "old-secret")).id == "user-1"
+    assert (await get_user_by_api_key(db, "old-secret")).id == "user-1"
+
+    await _update_user(db, client_secret="new-secret", client_secret_hash=hash_client_secret("new-secret"))
+    await worker_b.invalidate("user-1")
+
+    db.expunge_all()
+    assert await get_user_by_api_key(db, "old-secret") is None
+    assert (await get_user_by_api_key(db, "new-secret")).id == "user-1"
+    with pytest.raises(HTTPException):
+        await _authenticate(db, "old-secret")
+
+
+async def test_deleted_user_is_rejected(db, workers):
+    """Test that a cached user deleted elsewhere is not rebuilt from the cache"""
+    worker_a, worker_b = workers
+    token = create_access_token({"sub": "user-1"})
+    await _authenticate(db, token)
+
+    await db.execute(delete(User).where(User.id == "user-1"))
+    await db.commit()
+    await worker_b.invalidate("user-1")
+
+    with pytest.raises(HTTPException):
+        await _authenticate(db, token)
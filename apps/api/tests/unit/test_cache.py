@@ -1,5 +1,14 @@
 import pytest
-from src.services.cache import CacheService
+from src.config import settings
+from src.services.cache import (
+    CIPHER_CACHE_SIZE,
+    ENVELOPE_V2,
+    SWR_POLICIES,
+    CacheService,
+    CACHE_INDEX_PDLS_KEY,
+    SWRPolicy,
+    index_for_key,
+)
 
 
 @pytest.fixture
@@ -24,3 +33,191 @@ async def test_cache_encryption(cache_service):
     """Test that cache service properly initializes"""
     assert cache_service.ttl > 0
     assert cache_service.redis_client is None  # Not connected yet
+
+
+def test_swr_policy_fresh_until_within_jitter():
+    """Test that soft TTL jitter stays within the configured spread"""
+    policy = SWRPolicy(soft_ttl=1000, hard_ttl=10000, jitter=0.1)
+    for _ in range(100):
+        fresh_until = policy.fresh_until(0.0)
+        assert 900 <= fresh_until <= 1100
+
+
+def test_swr_policies_cover_customer_data():
+    """Test that customer data families have a soft TTL shorter than the hard TTL"""
+    for family in ("contract", "address", "customer", "contact"):
+        policy = SWR_POLICIES[family]
+        assert policy.soft_ttl < policy.hard_ttl
+
+
+@pytest.mark.asyncio
+async def test_get_swr_without_redis(cache_service):
+    """Test that SWR lookups degrade to a miss when Redis is not connected"""
+
+    async def refresh():
+        raise AssertionError("refresh must not be called without Redis")
+
+    assert await cache_service.get_swr("00000000000000:contract", "secret", refresh, SWR_POLICIES["contract"]) is None
+    assert await cache_service.set_swr("00000000000000:contract", {}, "secret", SWR_POLICIES["contract"]) is False
+
+
+def test_compact_envelope_roundtrip(cache_service):
+    """Test that v2 envelopes decrypt back to the original value"""
+    value = {"meter_reading": {"interval_reading": [{"date": "2024-01-01", "value": "1234"}] * 200}}
+    cache_service.compact_envelope = True
+
+    encrypted = cache_service.encrypt_value(value, "client-secret")
+
+    assert encrypted[0] == ENVELOPE_V2
+    assert cache_service.decrypt_value(encrypted, "client-secret") == value
+
+
+def test_legacy_fernet_entries_still_readable(cache_service):
+    """Test that entries written before the v2 envelope can still be read"""
+    value = {"contract": {"subscribed_power": "6 kVA"}}
+    cache_service.compact_envelope = False
+
+    encrypted = cache_service.encrypt_value(value, "client-secret")
+    cache_service.compact_envelope = True
+
+    assert encrypted.startswith(b"gAAAAA")
+    assert cache_service.decrypt_value(encrypted, "client-secret") == value
+
+
+def test_cipher_cache_is_bounded(cache_service):
+    """Test that derived ciphers are reused and evicted in LRU order"""
+    first = cache_service._get_ciphers("secret-0")
+    assert cache_service._get_ciphers("secret-0") is first
+
+    for i in range(1, CIPHER_CACHE_SIZE + 1):
+        cache_service._get_ciphers(f"secret-{i}")
+
+    assert len(cache_service._ciphers) == CIPHER_CACHE_SIZE
+    assert cache_service._get_ciphers("secret-0") is not first
+
+
+def test_index_for_key_pdl_keys():
+    """Test that PDL cache keys are mapped to their registry family"""
+    assert index_for_key("consumption:daily:00000000000000:2024-01-01") == ("00000000000000", "consumption:daily")
+    assert index_for_key("production:detail:daily:00000000000000:2024-01-01") == (
+        "00000000000000",
+        "production:detail:daily",
+    )
+    assert index_for_key("consumption:reading_type:00000000000000") == ("00000000000000", "consumption:reading_type")
+    assert index_for_key("00000000000000:contract") == ("00000000000000", "contract")
+    assert index_for_key("00000000000000:power:end:2024-01-31:start:2024-01-01") == ("00000000000000", "power")
+
+
+def test_index_for_key_ignores_other_keys():
+    """Test that non-PDL keys are not registered"""
+    assert index_for_key("tempo:forecast:2024-01-01:8") is None
+    assert index_for_key("rate_limit:user:cached:2024-01-01") is None
+    assert index_for_key("demo:contract:00000000000000") is None
+
+
+PDL = "00000000000000"
+OTHER_PDL = "11111111111111"
+
+
+@pytest.fixture
+def indexed_cache(cache_service, fake_redis, monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_INDEX_SCAN_FALLBACK", False)
+    cache_service.redis_client = fake_redis
+    return cache_service
+
+
+async def test_set_registers_pdl_keys(indexed_cache, fake_redis):
+    """Test that PDL keys are registered with expiring index and families sets"""
+    await indexed_cache.set_raw(f"consumption:daily:{PDL}:2024-01-01", "{}", ttl=100)
+    await indexed_cache.set_raw(f"consumption:daily:{PDL}:2024-01-02", "{}", ttl=300)
+    await indexed_cache.set_raw(f"{PDL}:contract", "{}", ttl=200)
+    await indexed_cache.set_raw("tempo:forecast:2024-01-01:8", "{}", ttl=100)
+
+    assert fake_redis.data[f"cache_index:{PDL}:consumption:daily"] == {
+        f"consumption:daily:{PDL}:2024-01-01",
+        f"consumption:daily:{PDL}:2024-01-02",
+    }
+    assert fake_redis.data[f"cache_index:{PDL}"] == {"consumption:daily", "contract"}
+    assert fake_redis.data[CACHE_INDEX_PDLS_KEY] == {PDL}
+    # Index sets live as long as their longest-lived member
+    assert fake_redis.ttls[f"cache_index:{PDL}:consumption:daily"] == 300
+    assert fake_redis.ttls[f"cache_index:{PDL}:contract"] == 200
+    assert fake_redis.ttls[f"cache_index:{PDL}"] == 300
+    assert await indexed_cache.get_indexed_pdls() == [PDL]
+
+
+async def test_delete_indexed_by_family_prefix(indexed_cache, fake_redis):
+    """Test that only the families under the prefix are deleted, SWR metadata included"""
+    await indexed_cache.set_raw(f"consumption:daily:{PDL}:2024-01-01", "{}")
+    await indexed_cache.set_raw(f"consumption:detail:{PDL}:2024-01-01", "{}")
+    await indexed_cache.set_swr(f"{PDL}:contract", {}, "secret", SWR_POLICIES["contract"])
+
+    assert await indexed_cache.delete_indexed(PDL, "consumption:") == 2
+    assert set(fake_redis.data) == {
+        f"{PDL}:contract",
+        f"{PDL}:contract:swr",
+        f"cache_index:{PDL}:contract",
+        f"cache_index:{PDL}",
+        CACHE_INDEX_PDLS_KEY,
+    }
+    assert fake_redis.data[f"cache_index:{PDL}"] == {"contract"}
+
+    assert await indexed_cache.delete_indexed(PDL) == 1
+    assert fake_redis.data == {}
+
+
+async def test_delete_indexed_all(indexed_cache, fake_redis):
+    """Test that every indexed PDL is cleared"""
+    await indexed_cache.set_raw(f"production:daily:{PDL}:2024-01-01", "{}")
+    await indexed_cache.set_raw(f"production:daily:{OTHER_PDL}:2024-01-01", "{}")
+    await indexed_cache.set_raw(f"consumption:daily:{OTHER_PDL}:2024-01-01", "{}")
+
+    assert await indexed_cache.delete_indexed_all("production:") == 2
+    assert await indexed_cache.get_indexed_pdls() == [OTHER_PDL]
+    assert f"consumption:daily:{OTHER_PDL}:2024-01-01" in fake_redis.data
+
+
+async def test_stats_prune_expired_registry_entries(indexed_cache, fake_redis):
+    """Test that expired keys, families and PDLs are dropped from the registry"""
+    await indexed_cache.set_raw(f"consumption:daily:{PDL}:2024-01-01", "{}")
+    await indexed_cache.set_raw(f"consumption:daily:{PDL}:2024-01-02", "{}")
+    await indexed_cache.set_raw(f"{PDL}:contract", "{}")
+    await indexed_cache.set_raw(f"{OTHER_PDL}:contract", "{}")
+
+    fake_redis.expire_now(f"consumption:daily:{PDL}:2024-01-01", f"cache_index:{PDL}:contract")
+    stats = await indexed_cache.get_pdl_cache_stats(PDL)
+    assert stats == {"consumption:daily": {"keys": 1, "estimated_bytes": 2}}
+    assert fake_redis.data[f"cache_index:{PDL}:consumption:daily"] == {f"consumption:daily:{PDL}:2024-01-02"}
+    assert fake_redis.data[f"cache_index:{PDL}"] == {"consumption:daily"}
+
+    # Members expired before their index set
+    fake_redis.expire_now(f"consumption:daily:{PDL}:2024-01-02")
+    assert await indexed_cache.get_pdl_cache_stats(PDL) == {}
+    assert await indexed_cache.get_indexed_pdls() == [OTHER_PDL]
+
+    # The whole families set expired
+    fake_redis.expire_now(f"cache_index:{OTHER_PDL}")
+    assert await indexed_cache.get_pdl_cache_stats(OTHER_PDL) == {}
+    assert await indexed_cache.get_indexed_pdls() == []
+
+
+async def test_delete_indexed_scans_unregistered_keys(indexed_cache, fake_redis, monkeypatch):
+    """Test that keys written before the registry are still deleted by the SCAN fallback"""
+    monkeypatch.setattr(settings, "CACHE_INDEX_SCAN_FALLBACK", True)
+    await indexed_cache.set_raw(f"consumption:daily:{PDL}:2024-01-01", "{}")
+    legacy = [
+        f"consumption:daily:{PDL}:2023-01-01",
+        f"consumption:reading_type:{PDL}",
+        f"{PDL}:contract",
+        f"production:daily:{OTHER_PDL}:2023-01-01",
+    ]
+    for key in legacy:
+        fake_redis.data[key] = "{}"
+    fake_redis.data["enedis:blacklist:" + PDL] = {}
+
+    assert await indexed_cache.delete_indexed(PDL, "consumption:") == 3
+    assert f"{PDL}:contract" in fake_redis.data
+
+    assert await indexed_cache.delete_indexed_all("production:") == 1
+    assert await indexed_cache.delete_indexed(PDL) == 1
+    assert set(fake_redis.data) == {"enedis:blacklist:" + PDL}
@@ -0,0 +1,26 @@
+"""Tests for the managed CPU process pool"""
+import pytest
+
+from src.services.cpu_executor import CPUExecutorService
+
+
+def _square(value: int) -> int:
+    return value * value
+
+
+@pytest.mark.asyncio
+async def test_pool_is_created_lazily_and_records_timings():
+    """Test that the pool starts on first use and records per-task timings"""
+    service = CPUExecutorService(max_workers=1, warm_modules=())
+    assert service.get_stats()["started"] is False
+
+    try:
+        assert await service.run(_square, 7, label="square") == 49
+        stats = service.get_stats()
+        assert stats["started"] is True
+        assert stats["tasks"]["square"]["count"] == 1
+        assert stats["tasks"]["square"]["exec_ms_avg"] >= 0
+    finally:
+        await service.shutdown()
+
+    assert service.get_stats()["started"] is False
@@ -0,0 +1,82 @@
+"""Tests for the per-PDL Enedis date blacklist and fail counters"""
+from datetime import UTC, datetime
+
+import pytest
+
+from src.routers import enedis
+from src.routers.enedis import (
+    BLACKLIST_TTL_SECONDS,
+    blacklist_dates,
+    date_range,
+    filter_blacklisted_dates,
+    increment_date_fail_count,
+    increment_date_fail_counts,
+    is_date_blacklisted,
+)
+
+PDL = "00000000000000"
+
+
+@pytest.fixture
+def redis(fake_redis, monkeypatch):
+    monkeypatch.setattr(enedis.cache_service, "redis_client", fake_redis)
+    return fake_redis
+
+
+def test_date_range_excludes_end():
+    """Test that the range covers start included to end excluded"""
+    assert date_range("2024-02-27", "2024-03-01") == ["2024-02-27", "2024-02-28", "2024-02-29"]
+    assert date_range("2024-03-01", "2024-03-01") == []
+
+
+async def test_fail_counts_are_incremented_in_one_round_trip(redis):
+    """Test that a batch of failed dates costs a single pipeline"""
+    dates = ["2024-01-01", "2024-01-02", "2024-01-03"]
+
+    assert await increment_date_fail_counts(PDL, dates) == {date: 1 for date in dates}
+    assert await increment_date_fail_counts(PDL, dates[:2]) == {"2024-01-01": 2, "2024-01-02": 2}
+    assert redis.round_trips == 2
+    assert await increment_date_fail_count(PDL, "2024-01-01") == 3
+    assert redis.ttls[f"enedis:fail:{PDL}"] == BLACKLIST_TTL_SECONDS
+
+
+async def test_fail_counts_without_redis(monkeypatch):
+    """Test that fail counts degrade to zero when Redis is not connected"""
+    monkeypatch.setattr(enedis.cache_service, "redis_client", None)
+
+    assert await increment_date_fail_counts(PDL, ["2024-01-01"]) == {"2024-01-01": 0}
+    assert await increment_date_fail_counts(PDL, []) == {}
+
+
+async def test_blacklisted_dates_are_filtered_in_one_lookup(redis):
+    """Test that blacklisted dates are split from the allowed ones"""
+    await blacklist_dates(PDL, ["2024-01-02", "2024-01-03"])
+    redis.round_trips = 0
+
+    allowed, blacklisted = await filter_blacklisted_dates(PDL, ["2024-01-01", "2024-01-02", "2024-01-03"])
+
+    assert allowed == ["2024-01-01"]
+    assert blacklisted == ["2024-01-02", "2024-01-03"]
+    assert redis.round_trips == 1
+    assert await is_date_blacklisted(PDL, "2024-01-02")
+    assert not await is_date_blacklisted(PDL, "2024-01-01")
+
+
+async def test_expired_blacklist_entries_are_removed(redis):
+    """Test that entries past their expiry are allowed again and dropped from the hash"""
+    expired = int(datetime.now(UTC).timestamp()) - 1
+    redis.data[f"enedis:blacklist:{PDL}"] = {"2024-01-01": str(expired)}
+
+    allowed, blacklisted = await filter_blacklisted_dates(PDL, ["2024-01-01"])
+
+    assert allowed == ["2024-01-01"]
+    assert blacklisted == []
+    assert f"enedis:blacklist:{PDL}" not in redis.data
+
+
+async def test_blacklist_without_redis(monkeypatch):
+    """Test that every date is allowed when Redis is not connected"""
+    monkeypatch.setattr(enedis.cache_service, "redis_client", None)
+    await blacklist_dates(PDL, ["2024-01-01"])
+
+    assert await filter_blacklisted_dates(PDL, ["2024-01-01"]) == (["2024-01-01"], [])
@@ -0,0 +1,108 @@
+"""Tests for the in-memory global Enedis token manager"""
+import asyncio
+from datetime import UTC, datetime, timedelta
+from typing import Any, Optional
+
+from src.adapters import enedis
+from src.adapters.enedis import TOKEN_LOCK_KEY, GlobalTokenManager
+from tests.conftest import FakeRedis
+
+
+class FakeAdapter:
+    def __init__(self, expires_in: int = 3600):
+        self.calls = 0
+        self.expires_in = expires_in
+
+    async def get_client_credentials_token(self) -> dict[str, Any]:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {"access_token": f"token-{self.calls}", "expires_in": self.expires_in, "scope": None}
+
+
+class LockRedis(FakeRedis):
+    """Runs the compare-and-delete release script of the refresh lock"""
+
+    def _eval(self, script: str, numkeys: int, key: str, token: str) -> int:
+        if self.data.get(key) == token:
+            return self._delete(key)
+        return 0
+
+
+class InMemoryTokenManager(GlobalTokenManager):
+    """Token manager persisting to a dict instead of the database"""
+
+    def __init__(self, adapter: FakeAdapter, persisted: Optional[tuple[str, datetime]] = None):
+        super().__init__(adapter, refresh_margin_seconds=300)  # type: ignore[arg-type]
+        self.persisted = persisted
+
+    async def _load_persisted(self) -> bool:
+        if self.persisted is None:
+            return False
+        self._adopt(*self.persisted)
+        return self._remaining() > self.refresh_margin
+
+    async def _persist(self, access_token: str, expires_at: datetime, scope: Optional[str]) -> None:
+        self.persisted = (access_token, expires_at)
+
+
+async def test_concurrent_requests_share_one_refresh():
+    """Test that concurrent cold requests trigger a single Enedis call"""
+    adapter = FakeAdapter()
+    manager = InMemoryTokenManager(adapter)
+
+    tokens = await asyncio.gather(*(manager.get_token() for _ in range(10)))
+
+    assert set(tokens) == {"token-1"}
+    assert adapter.calls == 1
+    assert manager.persisted is not None and manager.persisted[0] == "token-1"
+
+
+async def test_cold_start_reuses_persisted_token():
+    """Test that a valid token from the database is adopted without calling Enedis"""
+    adapter = FakeAdapter()
+    manager = InMemoryTokenManager(adapter, persisted=("stored", datetime.now(UTC) + timedelta(hours=1)))
+
+    assert await manager.get_token() == "stored"
+    assert adapter.calls == 0
+
+
+async def test_token_near_expiry_is_served_and_refreshed_in_background():
+    """Test that a token within the refresh margin is returned while a new one is fetched"""
+    adapter = FakeAdapter()
+    manager = InMemoryTokenManager(adapter, persisted=("stored", datetime.now(UTC) + timedelta(seconds=60)))
+
+    assert await manager.get_token() == "stored"
+    assert await manager.get_token() == "stored"
+    assert manager._refresh_task is not None
+    await manager._refresh_task
+
+    assert adapter.calls == 1
+    assert await manager.get_token() == "token-1"
+
+
+async def test_refresh_releases_its_redis_lock(monkeypatch):
+    """Test that the worker holding the lock releases it after fetching"""
+    redis = LockRedis()
+    monkeypatch.setattr(enedis.cache_service, "redis_client", redis)
+    adapter = FakeAdapter()
+    manager = InMemoryTokenManager(adapter)
+
+    assert await manager.get_token() == "token-1"
+    assert TOKEN_LOCK_KEY not in redis.data
+
+
+async def test_refresh_keeps_a_lock_taken_over_by_another_worker(monkeypatch):
+    """Test that an expired lock re-acquired by another worker is not released by the first holder"""
+    redis = LockRedis()
+    monkeypatch.setattr(enedis.cache_service, "redis_client", redis)
+
+    class SlowAdapter(FakeAdapter):
+        async def get_client_credentials_token(self) -> dict[str, Any]:
+            # Our lock expired during the call and another worker took it
+            redis.data[TOKEN_LOCK_KEY] = "other-worker"
+            return await super().get_client_credentials_token()
+
+    manager = InMemoryTokenManager(SlowAdapter())
+
+    assert await manager.get_token() == "token-1"
+    assert redis.data[TOKEN_LOCK_KEY] == "other-worker"
@@ -0,0 +1,41 @@
+"""Tests for the exporter energy history reads"""
+from datetime import date
+
+from src.models.client_mode import ConsumptionData, DataGranularity
+from src.services.exporters.energy_reader import find_energy_history
+from src.services.exporters.home_assistant import HomeAssistantExporter
+from tests.conftest import FakeSession, compiled
+
+
+async def test_detailed_history_is_preferred():
+    """Test that daily data is not looked up when detailed data exists"""
+    db = FakeSession([(date(2024, 1, 1), date(2025, 12, 31), 35040)])
+
+    history = await find_energy_history(db, ConsumptionData, "12345678901234")
+
+    assert history is not None and history.is_detailed
+    assert (history.first_date, history.last_date, history.row_count) == (date(2024, 1, 1), date(2025, 12, 31), 35040)
+    assert len(db.statements) == 1
+    sql = compiled(db.statements[0])
+    assert "usage_point_id = '12345678901234'" in sql
+    assert "granularity = 'detailed'" in sql
+
+
+async def test_daily_fallback_and_empty_history():
+    """Test the daily fallback, and None when nothing is stored"""
+    db = FakeSession([(None, None, 0)], [(date(2023, 1, 1), date(2025, 12, 31), 1096)])
+    history = await find_energy_history(db, ConsumptionData, "12345678901234", since=date(2023, 1, 1))
+
+    assert history is not None
+    assert history.granularity == DataGranularity.DAILY
+    assert history.since == date(2023, 1, 1)
+
+    assert await find_energy_history(FakeSession([(None, None, 0)], [(None, None, 0)]), ConsumptionData, "1") is None
+
+
+async def test_production_statistics_are_empty_when_streaming_fails():
+    """Test that a failure while streaming the rows gives no statistics instead of raising"""
+    db = FakeSession([(date(2024, 1, 1), date(2025, 12, 31), 35040)], stream_error=ConnectionError("connection lost"))
+    exporter = HomeAssistantExporter({"mqtt_broker": "localhost"})
+
+    assert await exporter._get_production_statistics(db, "12345678901234") == []
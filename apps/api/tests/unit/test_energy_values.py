@@ -0,0 +1,31 @@
+"""Tests for the energy value normalization computed at ingestion"""
+from src.services.energy_values import (
+    DEFAULT_INTERVAL_MINUTES,
+    detailed_interval_minutes,
+    parse_interval_minutes,
+    value_to_wh,
+)
+
+
+def test_parse_interval_minutes():
+    """Test minute and hour durations, other durations are not intervals"""
+    assert parse_interval_minutes("PT10M") == 10
+    assert parse_interval_minutes("PT30M") == 30
+    assert parse_interval_minutes("PT1H") == 60
+    assert parse_interval_minutes("P1D") is None
+
+
+def test_detailed_interval_minutes_defaults_to_30():
+    """Test that readings without interval length use the 30-minute default"""
+    assert detailed_interval_minutes(None) == DEFAULT_INTERVAL_MINUTES
+    assert detailed_interval_minutes({"value": "1200"}) == DEFAULT_INTERVAL_MINUTES
+    assert detailed_interval_minutes({"value": "1200", "interval_length": "PT15M"}) == 15
+
+
+def test_value_to_wh():
+    """Test W to Wh conversion over the interval, daily values kept as Wh"""
+    assert value_to_wh(1200, 30) == 600.0
+    assert value_to_wh(1200, 10) == 200.0
+    assert value_to_wh(1200, 60) == 1200.0
+    assert value_to_wh(8500, None) == 8500.0
+    assert value_to_wh(None, 30) == 0.0
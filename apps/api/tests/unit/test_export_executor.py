@@ -0,0 +1,149 @@
+"""Tests for the concurrent export executor and its run ledger"""
+import asyncio
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from src.models.client_mode import ExportType
+from src.services.exporters import executor
+from src.services.exporters.executor import (
+    ExportExecutor,
+    ExportLedger,
+    ExportRun,
+    count_points,
+    map_pdls,
+    next_run_at,
+    recorded_run,
+)
+from tests.conftest import FakeSession
+
+
+def _config(config_id: str, **config) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=config_id,
+        name=f"config {config_id}",
+        export_type=ExportType.MQTT,
+        config=config,
+        last_export_status=None,
+    )
+
+
+def test_count_points_and_ledger():
+    """Test the points of a run_full_export result and the newest-first ledger"""
+    assert count_points({"consumption": 2, "tempo": 3, "errors": ["x"]}) == 5
+
+    ledger = ExportLedger(max_runs=2)
+    for config_id in ("a", "b", "a"):
+        ledger.record(ExportRun(config_id=config_id))
+
+    assert [run.config_id for run in ledger.recent()] == ["a", "b"]
+    assert len(ledger.recent("a")) == 1
+
+
+async def test_map_pdls_is_bounded_and_keeps_order(monkeypatch):
+    """Test that PDLs run concurrently up to the limit, results in input order, errors captured"""
+    monkeypatch.setattr(executor, "async_session_maker", lambda: FakeSession())
+    running = 0
+    peak = 0
+
+    async def step(db, pdl):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if pdl == "bad":
+            raise ValueError("boom")
+        return pdl.upper()
+
+    results = await map_pdls(["a", "bad", "c", "d"], step, max_workers=2)
+
+    assert peak == 2
+    assert results[0] == "A" and results[2:] == ["C", "D"]
+    assert isinstance(results[1], ValueError)
+
+
+async def test_executor_runs_configs_concurrently_with_timeouts(monkeypatch):
+    """Test that a slow config times out without holding back the others"""
+    configs = {"slow": _config("slow", timeout_seconds=0.05), "fast": _config("fast")}
+    sessions = []
+
+    def session_maker():
+        sessions.append(FakeSession(objects=configs))
+        return sessions[-1]
+
+    monkeypatch.setattr(executor, "async_session_maker", session_maker)
+
+    async def runner(db, config, run):
+        if config.id == "slow":
+            await asyncio.sleep(1)
+        run.points = 3
+        run.bytes_sent = 120
+
+    def on_failure(config, run):
+        config.last_export_status = "failed"
+
+    ledger = ExportLedger()
+    runs = await ExportExecutor(max_concurrent_configs=2, ledger=ledger).run(["slow", "fast"], runner, on_failure)
+
+    assert [run.status for run in runs] == ["timeout", "success"]
+    assert (runs[1].points, runs[1].bytes_sent) == (3, 120)
+    assert runs[0].duration_seconds < 1
+    assert configs["slow"].last_export_status == "failed"
+    assert len(ledger.recent()) == 2
+
+
+async def test_dispatch_never_runs_a_config_twice_at_a_time(monkeypatch):
+    """Test that dispatched configs run in the background and a running one is not started again"""
+    configs = {"slow": _config("slow"), "fast": _config("fast")}
+    monkeypatch.setattr(executor, "async_session_maker", lambda: FakeSession(objects=configs))
+    release = asyncio.Event()
+    started = []
+
+    async def runner(db, config, run):
+        started.append(config.id)
+        if config.id == "slow":
+            await release.wait()
+
+    export_executor = ExportExecutor(max_concurrent_configs=2, ledger=ExportLedger())
+
+    assert export_executor.dispatch(["slow", "fast"], runner) == ["slow", "fast"]
+    await asyncio.sleep(0.01)
+    # Next check: the fast export is done and starts again, the slow one is still running
+    assert export_executor.dispatch(["slow", "fast"], runner) == ["fast"]
+    await asyncio.sleep(0.01)
+    assert started == ["slow", "fast", "fast"]
+
+    release.set()
+    await asyncio.sleep(0.01)
+    assert export_executor.dispatch(["slow"], runner) == ["slow"]
+    await asyncio.gather(*export_executor._tasks)
+
+
+def test_next_run_stays_on_the_schedule_grid():
+    """Test that the next run is computed from the previous slot, not from the completion time"""
+    slot = datetime(2026, 10, 18, 8, 0, tzinfo=UTC)
+
+    # Run finished 7 minutes late: the next slot is still at 9h00
+    assert next_run_at(slot, 60, now=slot + timedelta(minutes=7)) == slot + timedelta(hours=1)
+    # Slots missed during a long run are skipped
+    assert next_run_at(slot, 60, now=slot + timedelta(hours=2, minutes=30)) == slot + timedelta(hours=3)
+    # A schedule not due yet is kept; naive datetimes (SQLite) are UTC
+    assert next_run_at(slot.replace(tzinfo=None), 60, now=slot - timedelta(minutes=5)) == slot
+    assert next_run_at(None, None, now=slot) == slot + timedelta(hours=1)
+
+
+async def test_recorded_run_fills_the_ledger():
+    """Test that runs started outside the executor (manual runs) are recorded with their status"""
+    ledger = ExportLedger()
+
+    async with recorded_run(_config("manual"), ledger) as run:
+        run.points = 4
+    with pytest.raises(RuntimeError):
+        async with recorded_run(_config("manual"), ledger):
+            raise RuntimeError("broker unreachable")
+
+    failed, succeeded = ledger.recent("manual")
+    assert (succeeded.status, succeeded.points, succeeded.export_type) == ("success", 4, "mqtt")
+    assert (failed.status, failed.errors) == ("failed", ["broker unreachable"])
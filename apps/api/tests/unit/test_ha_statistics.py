@@ -0,0 +1,100 @@
+"""Tests for the Home Assistant statistics import flow control and incremental resume"""
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from src.services.exporters.ha_statistics import (
+    ImportFlowControl,
+    parse_statistic_time,
+    resume_since,
+    resume_statistics,
+)
+
+TZ_PARIS = ZoneInfo("Europe/Paris")
+
+
+def _stats(hours: list[int]) -> list[dict]:
+    return [
+        {"start": datetime(2026, 1, 10, hour, tzinfo=TZ_PARIS).isoformat(), "state": 1.5, "sum": 1.5 * (i + 1)}
+        for i, hour in enumerate(hours)
+    ]
+
+
+def test_flow_control_speeds_up_while_ha_is_fast():
+    """Test that fast responses grow the chunks up to the limit without any delay"""
+    flow = ImportFlowControl(chunk_size=500, max_delay=10.0, max_in_flight=4)
+
+    for _ in range(5):
+        flow.record(0.2, True)
+
+    assert flow.window == 4
+    assert flow.chunk_size == 2000
+    assert flow.delay == 0.0
+
+
+def test_flow_control_backs_off_on_slow_responses_and_errors():
+    """Test that slow responses and errors shrink the window and chunks and add a bounded delay"""
+    flow = ImportFlowControl(chunk_size=500, max_delay=1.0, max_in_flight=4)
+
+    flow.record(6.0, True)
+    assert (flow.window, flow.chunk_size, flow.delay) == (2, 250, 0.5)
+
+    flow.record(0.1, False)
+    assert (flow.window, flow.chunk_size, flow.delay) == (1, 125, 1.0)
+
+    flow.record(0.1, False)
+    assert flow.delay == 1.0  # Bounded by max_delay
+
+    flow.record(0.1, True)
+    assert (flow.window, flow.delay) == (2, 0.5)
+    flow.record(0.1, True)
+    assert flow.delay == 0.0
+
+
+def test_flow_control_never_waits_without_max_delay():
+    """Test that sync_delay_ms=0 disables the back-off delay"""
+    flow = ImportFlowControl(chunk_size=100, max_delay=0.0)
+
+    flow.record(30.0, False)
+
+    assert flow.delay == 0.0
+    assert flow.window == 1
+
+
+def test_resume_statistics_continues_last_sum():
+    """Test that only hours after the last import are kept, with sums continuing from HA"""
+    last_start = datetime(2026, 1, 10, 1, tzinfo=TZ_PARIS)
+
+    resumed = resume_statistics(_stats([0, 1, 2, 3]), (last_start, 100.0))
+
+    assert [stat["start"][11:13] for stat in resumed] == ["02", "03"]
+    assert [stat["sum"] for stat in resumed] == [101.5, 103.0]
+
+
+def test_resume_statistics_without_resume_point_is_full_import():
+    """Test that statistics never imported are sent as built"""
+    stats = _stats([0, 1])
+
+    assert resume_statistics(stats, None) is stats
+
+
+def test_resume_since_uses_oldest_matching_statistic():
+    """Test that the rebuild starts one hour after the oldest last import of the PDL statistics"""
+    points = {
+        "med:consumption_123_hc": (datetime(2026, 1, 10, 5, tzinfo=TZ_PARIS), 10.0),
+        "med:consumption_123_hp": (datetime(2026, 1, 10, 21, tzinfo=TZ_PARIS), 20.0),
+        "med:consumption_456_base": (datetime(2026, 1, 1, 0, tzinfo=TZ_PARIS), 5.0),
+    }
+
+    assert resume_since(points, "med:consumption_123_", "med:cost_123_") == datetime(2026, 1, 10, 6, tzinfo=TZ_PARIS)
+    assert resume_since(points, "med:production_123") is None
+
+
+def test_parse_statistic_time_formats():
+    """Test that HA timestamps in milliseconds, seconds and ISO strings are parsed"""
+    expected = datetime(2026, 1, 10, 12, tzinfo=TZ_PARIS)
+    timestamp = expected.timestamp()
+
+    assert parse_statistic_time(timestamp * 1000) == expected
+    assert parse_statistic_time(timestamp) == expected
+    assert parse_statistic_time("2026-01-10T11:00:00Z") == expected
+    assert parse_statistic_time("not a date") is None
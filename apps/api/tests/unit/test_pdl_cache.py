@@ -0,0 +1,110 @@
+"""Tests for the in-memory PDL metadata cache"""
+import pytest
+
+from src.models import PDL
+from src.services.cache import cache_service
+from src.services.pdl_cache import PDLCache, PDLMetadata
+from tests.conftest import sqlite_session
+
+
+@pytest.fixture
+async def db():
+    async with sqlite_session(PDL.__table__) as session:
+        session.add_all([
+            PDL(id="id-1", usage_point_id="11111111111111", user_id="user-1", pricing_option="HC_HP",
+                offpeak_hours={"ranges": ["22:00-06:00"]}),
+            PDL(id="id-2", usage_point_id="22222222222222", user_id="user-2", is_active=False),
+            PDL(id="id-3", usage_point_id="33333333333333", user_id="user-1"),
+        ])
+        await session.commit()
+        yield session
+
+
+class CountingSession:
+    """Session wrapper counting the queries sent to the database"""
+
+    def __init__(self, session):
+        self.session = session
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+        return await self.session.execute(statement)
+
+
+async def test_get_is_cached_until_invalidated(db):
+    """Test that a PDL is loaded once, then reloaded after invalidation"""
+    cache = PDLCache(ttl_seconds=60)
+    counting = CountingSession(db)
+
+    first = await cache.get(counting, "11111111111111")
+    second = await cache.get(counting, "11111111111111")
+    assert first == second
+    assert first is not None
+    assert (first.id, first.user_id, first.pricing_option) == ("id-1", "user-1", "HC_HP")
+    assert first.is_owned_by("user-1", active_only=True)
+    assert counting.queries == 1
+
+    await cache.invalidate("11111111111111")
+    await cache.get(counting, "11111111111111")
+    assert counting.queries == 2
+
+
+async def test_missing_pdl_is_not_cached(db):
+    """Test that unknown PDLs are looked up again (they may be created meanwhile)"""
+    cache = PDLCache(ttl_seconds=60)
+    counting = CountingSession(db)
+
+    assert await cache.get(counting, "00000000000000") is None
+    assert await cache.get(counting, "00000000000000") is None
+    assert counting.queries == 2
+
+
+async def test_get_many_only_queries_misses(db):
+    """Test that cached PDLs are served from memory and only the requested misses are loaded"""
+    cache = PDLCache(ttl_seconds=60)
+    await cache.get(db, "11111111111111")
+    counting = CountingSession(db)
+
+    found = await cache.get_many(counting, ["11111111111111", "22222222222222", "11111111111111", "00000000000000"])
+
+    assert set(found) == {"11111111111111", "22222222222222"}
+    assert found["22222222222222"].user_id == "user-2"
+    assert not found["22222222222222"].is_owned_by("user-1")
+    assert counting.queries == 1
+
+
+async def test_changes_reach_other_workers(db, fake_redis, monkeypatch):
+    """Test that a PDL modified through one worker is reloaded by the others"""
+    monkeypatch.setattr(cache_service, "redis_client", fake_redis)
+    worker_a = PDLCache(ttl_seconds=60, check_interval=0)
+    worker_b = PDLCache(ttl_seconds=60, check_interval=0)
+    assert (await worker_b.get(db, "33333333333333")).user_id == "user-1"
+
+    pdl = await db.get(PDL, "id-3")
+    pdl.user_id = "user-2"
+    await db.commit()
+    await worker_a.invalidate(pdl.usage_point_id)
+
+    assert (await worker_b.get(db, "33333333333333")).user_id == "user-2"
+
+
+def test_ownership_checks():
+    """Test owner and active checks"""
+    inactive = PDLMetadata(
+        id="id-1",
+        usage_point_id="12345678901234",
+        user_id="user-1",
+        is_active=False,
+        has_consumption=True,
+        has_production=False,
+        subscribed_power=6,
+        pricing_option="HC_HP",
+        offpeak_hours=None,
+        linked_production_pdl_id=None,
+        selected_offer_id=None,
+    )
+
+    assert inactive.is_owned_by("user-1")
+    assert not inactive.is_owned_by("user-1", active_only=True)
+    assert not inactive.is_owned_by("user-2")
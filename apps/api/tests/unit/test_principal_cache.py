@@ -0,0 +1,117 @@
+"""Tests for the in-memory principal cache"""
+from types import MappingProxyType
+
+from sqlalchemy import inspect
+
+from src.models import User
+from src.services.cache import cache_service
+from src.services.principal_cache import Principal, PrincipalCache
+
+
+def _principal(user_id: str = "user-1", client_secret: str = "secret", **overrides) -> Principal:
+    user = User(
+        id=user_id,
+        email=f"{user_id}@example.com",
+        hashed_password="hash",
+        client_id=f"cli_{user_id}",
+        client_secret=client_secret,
+        is_active=True,
+        is_admin=False,
+        email_verified=True,
+        **overrides,
+    )
+    columns = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+    return Principal(
+        columns=MappingProxyType(columns),
+        role_name="moderator",
+        permission_names=frozenset({"admin.offers.edit"}),
+        permission_resources=frozenset({"offers"}),
+    )
+
+
+async def test_get_and_alias_until_invalidated():
+    """Test that principals and their aliases are served until the user is invalidated"""
+    cache = PrincipalCache(ttl_seconds=60)
+    principal = cache.put(_principal(), alias="digest")
+
+    assert await cache.get("user-1") is principal
+    assert await cache.get_alias("digest") is principal
+
+    await cache.invalidate("user-1")
+    assert await cache.get("user-1") is None
+    assert await cache.get_alias("digest") is None
+
+
+async def test_invalidate_all_and_expiry():
+    """Test role changes dropping every principal and the TTL"""
+    cache = PrincipalCache(ttl_seconds=60)
+    cache.put(_principal("user-1"))
+    cache.put(_principal("user-2"), alias="local")
+    await cache.invalidate_all()
+    assert await cache.get("user-1") is None
+    assert await cache.get_alias("local") is None
+
+    disabled = PrincipalCache(ttl_seconds=0)
+    disabled.put(_principal())
+    assert await disabled.get("user-1") is None
+
+
+async def test_max_entries_evicts_least_recent():
+    """Test that the oldest principal is evicted with its aliases"""
+    cache = PrincipalCache(ttl_seconds=60, max_entries=2)
+    cache.put(_principal("user-1"), alias="key-1")
+    cache.put(_principal("user-2"))
+    await cache.get("user-1")
+    cache.put(_principal("user-3"))
+
+    assert await cache.get("user-2") is None
+    assert await cache.get_alias("key-1") is not None
+    assert await cache.get("user-3") is not None
+
+
+async def test_invalidation_reaches_other_workers(fake_redis, monkeypatch):
+    """Test that a user invalidated in one worker is dropped by the others at their next check"""
+    monkeypatch.setattr(cache_service, "redis_client", fake_redis)
+    worker_a = PrincipalCache(ttl_seconds=60, check_interval=0)
+    worker_b = PrincipalCache(ttl_seconds=60, check_interval=0)
+    for worker in (worker_a, worker_b):
+        await worker.get("user-1")
+        worker.put(_principal("user-1"), alias="digest")
+        worker.put(_principal("user-2"))
+
+    await worker_a.invalidate("user-1")
+
+    assert await worker_a.get("user-1") is None
+    assert await worker_a.get("user-2") is not None
+    assert await worker_b.get_alias("digest") is None
+    assert await worker_b.get("user-2") is None
+    assert fake_redis.data[worker_a.generation_key] == 1
+
+
+async def test_other_workers_keep_entries_until_the_check_interval(fake_redis, monkeypatch):
+    """Test that the generation is read at most once per check interval"""
+    monkeypatch.setattr(cache_service, "redis_client", fake_redis)
+    worker_a = PrincipalCache(ttl_seconds=60, check_interval=0)
+    worker_b = PrincipalCache(ttl_seconds=60, check_interval=3600)
+    await worker_b.get("user-1")
+    worker_b.put(_principal("user-1"))
+    fake_redis.round_trips = 0
+
+    await worker_a.invalidate("user-1")
+
+    assert await worker_b.get("user-1") is not None
+    assert fake_redis.round_trips == 1
+
+
+def test_to_user_rebuilds_detached_user():
+    """Test that the snapshot rebuilds a clean detached user with the same columns"""
+    principal = _principal(client_secret="abc")
+
+    user = principal.to_user()
+    state = inspect(user)
+
+    assert state.detached
+    assert not state.modified
+    assert user.id == "user-1"
+    assert user.client_secret == "abc"
+    assert user.client_secret_hash == principal.columns["client_secret_hash"]
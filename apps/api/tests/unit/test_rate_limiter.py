@@ -2,6 +2,7 @@ import pytest
 import asyncio
 from datetime import datetime, UTC
 from src.adapters.enedis import RateLimiter
+from src.services.rate_limiter import RateLimiterService
 
 
 @pytest.mark.asyncio
@@ -41,3 +42,25 @@ async def test_rate_limiter_time_window():
 
     # Should not have waited
     assert elapsed < 0.1
+
+
+def test_usage_stats_keys():
+    """Test daily aggregate key naming"""
+    service = RateLimiterService()
+    assert service._get_stats_key("2024-01-01", "endpoints") == "rate_limit_stats:2024-01-01:endpoints"
+
+
+@pytest.mark.asyncio
+async def test_daily_aggregates_without_redis():
+    """Test that aggregates are empty when Redis is not connected"""
+    service = RateLimiterService()
+    aggregates = await service.get_daily_aggregates("2024-01-01")
+
+    assert aggregates["date"] == "2024-01-01"
+    assert aggregates["totals"] == {"cached": 0, "no_cache": 0, "total": 0}
+    assert aggregates["endpoints"] == {}
+    assert aggregates["users"] == {}
+
+    history = await service.get_daily_totals_history(7)
+    assert len(history) == 7
+    assert all(day["total"] == 0 for day in history)
@@ -0,0 +1,54 @@
+"""Tests for the in-memory reference data cache (Tempo, EcoWatt)"""
+from datetime import timedelta
+from email.utils import format_datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.services.reference_cache import ReferenceDataCache, is_not_modified
+
+
+@pytest.mark.asyncio
+async def test_loader_called_once_until_invalidated():
+    """Test that entries are served from memory until the dataset is invalidated"""
+    cache = ReferenceDataCache(ttl_seconds=60)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        return [{"date": "2025-01-01", "color": "BLUE"}]
+
+    first = await cache.get_or_load("tempo", "week", load)
+    second = await cache.get_or_load("tempo", "week", load)
+    assert first is second
+    assert len(calls) == 1
+
+    await cache.invalidate("tempo")
+    third = await cache.get_or_load("tempo", "week", load)
+    assert len(calls) == 2
+    # Same content, same validator
+    assert third.etag == first.etag
+
+
+@pytest.mark.asyncio
+async def test_conditional_headers():
+    """Test If-None-Match and If-Modified-Since matching"""
+    cache = ReferenceDataCache(ttl_seconds=60)
+
+    async def load():
+        return {"year": 2025, "green_days": 12}
+
+    entry = await cache.get_or_load("ecowatt", "statistics:2025", load)
+
+    request = MagicMock()
+    request.headers = {"if-none-match": entry.etag}
+    assert is_not_modified(request, entry)
+
+    request.headers = {"if-none-match": '"other"'}
+    assert not is_not_modified(request, entry)
+
+    request.headers = {"if-modified-since": format_datetime(entry.last_modified + timedelta(seconds=1), usegmt=True)}
+    assert is_not_modified(request, entry)
+
+    request.headers = {"if-modified-since": format_datetime(entry.last_modified - timedelta(hours=1), usegmt=True)}
+    assert not is_not_modified(request, entry)
@@ -0,0 +1,82 @@
+"""Tests for reference data aggregation helpers"""
+from datetime import UTC, date, datetime
+
+from sqlalchemy.dialects import postgresql
+
+from src.models.client_mode import ConsumptionData, DataGranularity, ProductionData
+from src.models.tempo_day import TempoColor, TempoDay
+from src.services import reference_stats
+from src.services.reference_stats import (
+    day_key,
+    get_tempo_consumption_totals,
+    get_tempo_season_start,
+    month_bounds,
+    tempo_today,
+)
+from tests.conftest import sqlite_session
+
+PDL = "11111111111111"
+
+
+def test_tempo_season_start():
+    """Test that a Tempo season starts on September 1st"""
+    assert get_tempo_season_start(date(2025, 9, 1)) == date(2025, 9, 1)
+    assert get_tempo_season_start(date(2025, 12, 24)) == date(2025, 9, 1)
+    assert get_tempo_season_start(date(2026, 8, 31)) == date(2025, 9, 1)
+
+
+def test_tempo_today_is_the_paris_day(monkeypatch):
+    """Test that the Tempo day changes at midnight in Paris, not at midnight UTC"""
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2026, 1, 14, 23, 30, tzinfo=UTC).astimezone(tz)
+
+    monkeypatch.setattr(reference_stats, "datetime", FrozenDatetime)
+    assert tempo_today() == date(2026, 1, 15)
+
+
+def test_month_bounds():
+    """Test first and last day of a month"""
+    assert month_bounds(2024, 2) == (date(2024, 2, 1), date(2024, 2, 29))
+    assert month_bounds(2025, 12) == (date(2025, 12, 1), date(2025, 12, 31))
+
+
+def test_day_key_does_not_depend_on_datestyle():
+    """Test that PostgreSQL formats the day explicitly instead of casting it to text"""
+    sql = str(day_key(ConsumptionData.date, "postgresql").compile(dialect=postgresql.dialect()))
+    assert sql.startswith("to_char(consumption_data.date")
+
+
+async def test_tempo_consumption_totals_per_color():
+    """Test that daily values are summed per Tempo color of their day"""
+    async with sqlite_session(TempoDay.__table__, ConsumptionData.__table__, ProductionData.__table__) as db:
+        colors = {1: TempoColor.BLUE, 2: TempoColor.RED, 3: TempoColor.BLUE, 4: TempoColor.WHITE}
+        db.add_all(
+            TempoDay(id=f"2026-01-0{day}", date=datetime(2026, 1, day, tzinfo=UTC), color=color)
+            for day, color in colors.items()
+        )
+        db.add_all(
+            ConsumptionData(usage_point_id=PDL, date=date(2026, 1, day), granularity=DataGranularity.DAILY, value=value)
+            for day, value in ((1, 1000), (2, 5000), (3, 2000), (4, 700), (5, 9999))
+        )
+        # Other PDL, detailed points and production are not counted
+        db.add_all([
+            ConsumptionData(usage_point_id="22222222222222", date=date(2026, 1, 1), granularity=DataGranularity.DAILY, value=1),
+            ConsumptionData(
+                usage_point_id=PDL, date=date(2026, 1, 2), granularity=DataGranularity.DETAILED, value=1,
+                interval_start="00:00",
+            ),
+            ProductionData(usage_point_id=PDL, date=date(2026, 1, 1), granularity=DataGranularity.DAILY, value=300),
+        ])
+        await db.commit()
+
+        assert await get_tempo_consumption_totals(db, PDL, date(2026, 1, 1), date(2026, 1, 31)) == {
+            "BLUE": 3000, "WHITE": 700, "RED": 5000,
+        }
+        assert await get_tempo_consumption_totals(db, PDL, date(2026, 1, 2), date(2026, 1, 3)) == {
+            "BLUE": 2000, "WHITE": 0, "RED": 5000,
+        }
+        assert await get_tempo_consumption_totals(db, PDL, date(2026, 1, 1), date(2026, 1, 31), "production") == {
+            "BLUE": 300, "WHITE": 0, "RED": 0,
+        }
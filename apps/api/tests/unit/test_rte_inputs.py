@@ -0,0 +1,122 @@
+"""Tests for the hourly RTE forecast input rows"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.rte_forecast_input import RTEForecastInput
+from src.services.rte_inputs import consumption_rows, generation_rows, hourly_rows, load_fresh_inputs, upsert_inputs
+from tests.conftest import sqlite_session
+
+HOUR = datetime(2026, 1, 15, 23)
+
+
+@pytest.fixture
+async def db():
+    async with sqlite_session(RTEForecastInput.__table__) as session:
+        yield session
+
+
+def _row(value: float, updated_date: datetime | None, hour: datetime = HOUR) -> dict:
+    return {"source": "CONSUMPTION", "forecast_type": "D-1", "hour": hour, "value": value, "updated_date": updated_date}
+
+
+async def _stored(db: AsyncSession) -> list[tuple[datetime, float, datetime | None]]:
+    result = await db.execute(
+        select(RTEForecastInput.hour, RTEForecastInput.value, RTEForecastInput.updated_date).order_by(RTEForecastInput.hour)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+def test_hourly_rows_average_sub_hourly_values():
+    """Test that 15-minute values are averaged per UTC hour with their latest revision"""
+    values = [
+        {"start_date": "2026-01-16T00:00:00+01:00", "value": 60000, "updated_date": "2026-01-15T11:00:00+01:00"},
+        {"start_date": "2026-01-16T00:15:00+01:00", "value": 62000, "updated_date": "2026-01-15T19:30:00+01:00"},
+        {"start_date": "2026-01-16T01:00:00+01:00", "value": 58000},
+        {"start_date": "2026-01-16T01:15:00+01:00", "value": None},
+    ]
+
+    rows = hourly_rows("CONSUMPTION", "D-1", values)
+
+    assert rows == [
+        {
+            "source": "CONSUMPTION",
+            "forecast_type": "D-1",
+            "hour": datetime(2026, 1, 15, 23),
+            "value": 61000,
+            "updated_date": datetime(2026, 1, 15, 18, 30),
+        },
+        {
+            "source": "CONSUMPTION",
+            "forecast_type": "D-1",
+            "hour": datetime(2026, 1, 16, 0),
+            "value": 58000,
+            "updated_date": None,
+        },
+    ]
+
+
+def test_series_keys_from_rte_payloads():
+    """Test that consumption and generation payloads map to (source, type) series"""
+    value = {"start_date": "2026-01-16T00:00:00+01:00", "value": 1000}
+
+    short_term = consumption_rows([{"type": "D-2", "values": [value]}])
+    weekly = consumption_rows([{"values": [value]}], forecast_type="WEEKLY")
+    generation = generation_rows([{"production_type": "WIND_OFFSHORE", "values": [value]}], forecast_type="D-1")
+
+    assert (short_term[0]["source"], short_term[0]["forecast_type"]) == ("CONSUMPTION", "D-2")
+    assert (weekly[0]["source"], weekly[0]["forecast_type"]) == ("CONSUMPTION", "WEEKLY")
+    assert (generation[0]["source"], generation[0]["forecast_type"]) == ("WIND_OFFSHORE", "D-1")
+
+
+async def test_upsert_inputs_inserts_rows(db):
+    """Test that new rows are inserted, keeping the last value of a key repeated in the batch"""
+    next_hour = datetime(2026, 1, 16, 0)
+    rows = [_row(60000, None), _row(61000, datetime(2026, 1, 15, 18)), _row(58000, None, next_hour)]
+
+    assert await upsert_inputs(db, rows) == 2
+    assert await upsert_inputs(db, []) == 0
+    assert await _stored(db) == [(HOUR, 61000, datetime(2026, 1, 15, 18)), (next_hour, 58000, None)]
+
+
+async def test_upsert_inputs_keeps_the_latest_revision(db):
+    """Test that a conflicting row only replaces a revision that is not newer"""
+    await upsert_inputs(db, [_row(61000, datetime(2026, 1, 15, 18))])
+
+    await db.execute(update(RTEForecastInput).values(fetched_at=datetime(2026, 1, 1)))
+
+    # Older revision: the value is kept, but the row counts as fetched again
+    await upsert_inputs(db, [_row(59000, datetime(2026, 1, 15, 11))])
+    assert await _stored(db) == [(HOUR, 61000, datetime(2026, 1, 15, 18))]
+    fetched_at = (await db.execute(select(RTEForecastInput.fetched_at))).scalar_one()
+    assert fetched_at > datetime(2026, 1, 1)
+
+    # Newer revision: replaces the value
+    await upsert_inputs(db, [_row(62000, datetime(2026, 1, 15, 19, 30))])
+    assert await _stored(db) == [(HOUR, 62000, datetime(2026, 1, 15, 19, 30))]
+
+    # No revision date: replaces the value and keeps the stored revision
+    await upsert_inputs(db, [_row(63000, None)])
+    assert await _stored(db) == [(HOUR, 63000, datetime(2026, 1, 15, 19, 30))]
+
+
+async def test_fresh_inputs_must_cover_the_window(db):
+    """Test that stored rows are only reused when every hour of the window is fresh"""
+    series = [("CONSUMPTION", "D-1"), ("CONSUMPTION", "D-2")]
+    end = HOUR + timedelta(hours=4)
+    await upsert_inputs(db, [_row(60000, None, HOUR + timedelta(hours=h)) for h in range(2)])
+    await upsert_inputs(db, [{**_row(60000, None, HOUR + timedelta(hours=2)), "forecast_type": "D-2"}])
+
+    # The last hour is missing
+    assert await load_fresh_inputs(db, series, HOUR, end) is None
+    # ... unless RTE does not publish it for these series
+    assert len(await load_fresh_inputs(db, series, HOUR, end, covered=(HOUR, end - timedelta(hours=1)))) == 3
+    # A series without any row
+    assert await load_fresh_inputs(db, series + [("CONSUMPTION", "WEEKLY")], HOUR, HOUR + timedelta(hours=3)) is None
+
+    # One stale row is enough to fetch again
+    assert len(await load_fresh_inputs(db, series, HOUR, HOUR + timedelta(hours=3))) == 3
+    await db.execute(update(RTEForecastInput).where(RTEForecastInput.hour == HOUR).values(fetched_at=datetime(2026, 1, 1)))
+    assert await load_fresh_inputs(db, series, HOUR, HOUR + timedelta(hours=3)) is None
@@ -0,0 +1,74 @@
+"""Tests for the compiled off-peak tariff schedules"""
+from datetime import datetime, time
+
+import pytest
+
+from src.services.tariff_schedule import (
+    DEFAULT_OFFPEAK_RANGES,
+    NUMPY_AVAILABLE,
+    TEMPO_SCHEDULE,
+    TariffSchedule,
+    normalize_offpeak_hours,
+)
+
+
+def test_offpeak_hours_overnight_and_daytime_ranges():
+    """Test overnight and daytime ranges, with the end minute excluded"""
+    schedule = TariffSchedule.from_offpeak_hours([
+        {"start": "22:00", "end": "06:00"},
+        {"start": "13:30", "end": "15:30"},
+    ])
+
+    assert schedule.is_offpeak_time("23:30")
+    assert schedule.is_offpeak_time("00:00")
+    assert not schedule.is_offpeak_time("06:00")
+    assert schedule.is_offpeak_time("13:30")
+    assert not schedule.is_offpeak_time("15:30")
+    assert not schedule.is_offpeak_time("12:00")
+    assert not schedule.is_offpeak_time(None)
+    assert not schedule.is_offpeak_time("invalid")
+
+
+def test_offpeak_hours_stored_formats_and_default():
+    """Test that every stored offpeak_hours format compiles to the same memoized schedule"""
+    expected = TariffSchedule.from_offpeak_hours([{"start": "22:30", "end": "06:30"}])
+
+    assert TariffSchedule.from_offpeak_hours({"ranges": ["22h30-6h30"]}) is expected
+    assert TariffSchedule.from_offpeak_hours({"default": "HC (22h30-6h30)"}) is expected
+    assert normalize_offpeak_hours(["22:30-06:30"]) == [{"start": "22:30", "end": "06:30"}]
+
+    assert not TariffSchedule.from_offpeak_hours(None).is_offpeak(0)
+    assert TariffSchedule.from_offpeak_hours(None, default=DEFAULT_OFFPEAK_RANGES).is_offpeak(0)
+
+
+def test_hc_schedules_per_weekday():
+    """Test per-weekday offer schedules with the default range for missing days"""
+    schedule = TariffSchedule.from_hc_schedules({"saturday": "12:00-14:00"})
+
+    assert schedule.is_offpeak_at(datetime(2026, 1, 10, 13, 0))  # Saturday
+    assert not schedule.is_offpeak_at(datetime(2026, 1, 10, 23, 0))
+    assert schedule.is_offpeak_at(datetime(2026, 1, 12, 23, 0))  # Monday, 22:30-06:30
+    assert schedule.is_offpeak_at(time(6, 29, 59))
+    assert not schedule.is_offpeak_at(time(6, 30))
+
+
+def test_tempo_rule_and_vectorized_classification():
+    """Test the Tempo 22h-6h rule through the scalar and vectorized APIs"""
+    minutes = [0, 359, 360, 1319, 1320]
+    expected = [True, True, False, False, True]
+
+    assert [TEMPO_SCHEDULE.is_offpeak(minute) for minute in minutes] == expected
+    assert TEMPO_SCHEDULE.classify(minutes) == expected
+    assert TEMPO_SCHEDULE.classify(minutes, [6] * len(minutes)) == expected
+
+
+@pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy not installed")
+def test_classify_array_matches_scalar():
+    """Test that the NumPy classification matches the scalar one on every slot"""
+    schedule = TariffSchedule.from_hc_schedules({"sunday": "01:52-07:52;13:22-15:22"})
+    minutes = list(range(1440)) * 7
+    weekdays = [minute // 1440 for minute in range(1440 * 7)]
+
+    result = schedule.classify_array(minutes, weekdays)
+
+    assert result.tolist() == [schedule.is_offpeak(m, w) for m, w in zip(minutes, weekdays)]
@@ -0,0 +1,78 @@
+"""Tests for the vectorized Tempo backtest"""
+from datetime import date, timedelta
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.services.tempo_backtest import BacktestParams, build_dataset, compute_probabilities, score, sweep  # noqa: E402
+from src.services.tempo_forecast import tempo_forecast_service  # noqa: E402
+
+
+def _season(start: date, days: int) -> list[tuple[date, str, float]]:
+    """Synthetic season: cold weekdays in winter are red/white, the rest blue"""
+    rows = []
+    for i in range(days):
+        day = start + timedelta(days=i)
+        consumption = 52000 + 9000 * np.cos((i - 120) / 60) + (i * 7919 % 5000)
+        color = "BLUE"
+        if day.weekday() < 5 and day.month in (12, 1, 2) and consumption > 62000:
+            color = "RED" if day.weekday() < 4 and i % 3 == 0 else "WHITE"
+        rows.append((day, color, float(consumption)))
+    return rows
+
+
+def test_probabilities_match_scalar_algorithm():
+    """Test that the vectorized probabilities reproduce calculate_probabilities"""
+    rows = _season(date(2024, 9, 1), 365)
+    dataset = build_dataset(rows)
+    params = BacktestParams()
+    vectorized = compute_probabilities(dataset, params)
+
+    for i, (day, _, net_consumption) in enumerate(rows):
+        white_remaining, red_remaining = int(dataset.remaining[i, 1]), int(dataset.remaining[i, 2])
+        day_in_season = int(dataset.day_in_season[i])
+        threshold_white_red, threshold_red = tempo_forecast_service.calculate_thresholds(
+            day_in_season, white_remaining, red_remaining
+        )
+        expected = tempo_forecast_service.calculate_probabilities(
+            tempo_forecast_service.normalize_consumption(net_consumption),
+            threshold_white_red,
+            threshold_red,
+            day_in_season,
+            day.month in (11, 12, 1, 2, 3),
+            day.weekday() >= 5,
+            int(dataset.remaining[i, 0]),
+            white_remaining,
+            red_remaining,
+            target_date=day,
+        )
+        assert vectorized[i] == pytest.approx(expected, abs=0.11), day
+
+
+def test_remaining_stock_resets_each_season():
+    """Test that stocks are rebuilt from the colors drawn since September 1st"""
+    rows = [
+        (date(2025, 8, 30), "RED", 60000.0),
+        (date(2025, 8, 31), "WHITE", 60000.0),
+        (date(2025, 9, 1), "BLUE", 60000.0),
+    ]
+    dataset = build_dataset(rows)
+
+    assert dataset.remaining.tolist() == [[300, 43, 22], [300, 43, 21], [300, 43, 22]]
+    assert dataset.day_in_season.tolist() == [364, 365, 1]
+
+
+def test_score_and_sweep():
+    """Test scores bounds and that the sweep evaluates every combination"""
+    dataset = build_dataset(_season(date(2024, 9, 1), 365))
+
+    result = score(dataset, BacktestParams())
+    assert result.days == 365
+    assert 0 <= result.accuracy <= 1
+    assert 0 <= result.brier <= 2
+    assert sum(color["days"] for color in result.per_color.values()) == 365
+
+    results = sweep(dataset, {"normalization_offset": [53000, 55000, 57000], "red_steepness": [0.8, 1.2]})
+    assert len(results) == 6
+    assert [r.brier for r in results] == sorted(r.brier for r in results)
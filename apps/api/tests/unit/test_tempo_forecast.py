@@ -0,0 +1,61 @@
+"""Tests for Tempo forecast revision and windowing"""
+from datetime import date, datetime
+
+from src.services.tempo_forecast import (
+    ForecastInputs,
+    TempoForecastRun,
+    compute_input_revision,
+    tempo_forecast_service,
+)
+
+
+def _rows(updated_date: datetime | None, value: float = 60000, source: str = "CONSUMPTION") -> list[dict]:
+    return [
+        {"source": source, "forecast_type": "D-1", "hour": datetime(2026, 1, 15, 23), "value": value,
+         "updated_date": updated_date},
+    ]
+
+
+def test_input_revision_follows_updated_date():
+    """Test that the revision only changes when RTE publishes new data"""
+    first = compute_input_revision(_rows(datetime(2026, 1, 15, 10), value=60000))
+
+    assert compute_input_revision(_rows(datetime(2026, 1, 15, 10), value=60500)) == first
+    assert compute_input_revision(_rows(datetime(2026, 1, 15, 18, 30))) != first
+
+
+def test_input_revision_without_updated_date_uses_values():
+    """Test that series without updated_date are fingerprinted by their values"""
+    assert compute_input_revision(_rows(None, 58000)) != compute_input_revision(_rows(None, 61000))
+    assert compute_input_revision(_rows(None, 58000)) != compute_input_revision(_rows(None, 58000, "SOLAR"))
+
+
+def test_window_is_prefix_of_full_horizon():
+    """Test that a shorter window equals a computation over fewer days"""
+    reference_date = date(2026, 1, 15)
+    inputs = ForecastInputs(
+        consumption={"2026-01-16": {"consumption_mw": 66000, "forecast_type": "D-1"}},
+        generation={},
+        revision="test",
+    )
+    full = tempo_forecast_service.compute_forecasts(inputs, 6, 60, 10, 5, reference_date)
+    short = tempo_forecast_service.compute_forecasts(inputs, 3, 60, 10, 5, reference_date)
+
+    run = TempoForecastRun(
+        reference_date=reference_date.isoformat(),
+        revision="test",
+        computed_at="2026-01-15T12:00:00+00:00",
+        forecasts={f.date: f for f in full},
+    )
+
+    assert run.window(3) == short
+    assert [f.date for f in run.window(6)] == [f"2026-01-{day}" for day in range(16, 22)]
+
+
+def test_run_round_trip():
+    """Test that a run survives JSON serialization in Redis"""
+    inputs = ForecastInputs(consumption={}, generation={}, revision="abc")
+    forecasts = tempo_forecast_service.compute_forecasts(inputs, 2, 0, 0, 0, date(2025, 10, 1))
+    run = TempoForecastRun("2025-10-01", "abc", "2025-10-01T00:00:00+00:00", {f.date: f for f in forecasts})
+
+    assert TempoForecastRun.from_dict(run.to_dict()) == run
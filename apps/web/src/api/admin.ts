@@ -50,6 +50,14 @@ export const adminApi = {
     return apiClient.delete('admin/cache/clear-all')
   },
 
+  getCacheFootprint: async () => {
+    return apiClient.get('admin/cache/footprint')
+  },
+
+  getCpuPoolStats: async () => {
+    return apiClient.get('admin/cpu-pool/stats')
+  },
+
   toggleUserDebugMode: async (userId: string) => {
     return apiClient.post(`admin/users/${userId}/toggle-debug`)
   },
@@ -58,6 +66,10 @@ export const adminApi = {
     return apiClient.get('admin/stats')
   },
 
+  getStatsHistory: async (days = 30) => {
+    return apiClient.get('admin/stats/history', { days })
+  },
+
   getLogs: async (level?: string, limit?: number, offset?: number) => {
     const params: Record<string, string | number> = {}
     if (level) params.level = level